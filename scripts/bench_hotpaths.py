@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+핫패스 마이크로 벤치마크 스크립트.
+
+봇/웹 API가 메시지마다 반복하는 작업의 소요 시간을 측정한다.
+
+사용법:
+    python scripts/bench_hotpaths.py                      # 기본 데이터(jsonbin_enriched.json)
+    python scripts/bench_hotpaths.py path/to/trip.json    # 다른 여행 데이터 파일
+    python scripts/bench_hotpaths.py -n 500               # 반복 횟수 지정
+    python scripts/bench_hotpaths.py --items 2000         # 합성 데이터 항목 수 지정
+"""
+
+import argparse
+import copy
+import json
+import os
+import sys
+import timeit
+from typing import Callable, List, Tuple
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import json_codec  # noqa: E402
+import tool_executor  # noqa: E402
+from tool_definitions import TOOLS  # noqa: E402
+from tool_executor import ExecutionContext, execute_tool  # noqa: E402
+from tool_validation import VALIDATORS  # noqa: E402
+
+DEFAULT_DATA_PATH = os.path.join(ROOT, "jsonbin_enriched.json")
+
+
+def _measure(fn: Callable[[], object], number: int) -> float:
+    """fn 1회 평균 소요 시간 (마이크로초). 5번 측정 중 최솟값을 쓴다."""
+    best = min(timeit.repeat(fn, number=number, repeat=5))
+    return best / number * 1e6
+
+
+def bench_json(data: dict) -> List[Tuple[str, Callable, Callable]]:
+    """JSON 직렬화 핫패스: (이름, 표준 json, json_codec) 목록"""
+    raw = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    ctx = ExecutionContext(data)
+    tool_result = execute_tool(ctx, "get_schedule", {"day_num": 2})
+
+    return [
+        ("여행 데이터 파싱 (GET/스냅샷 로드)",
+         lambda: json.loads(raw),
+         lambda: json_codec.loads(raw)),
+        ("여행 데이터 직렬화 (PUT/스냅샷 저장)",
+         lambda: json.dumps(data, ensure_ascii=False).encode("utf-8"),
+         lambda: json_codec.dumps_bytes(data)),
+        ("도구 결과 직렬화 (get_schedule)",
+         lambda: json.dumps(tool_result, ensure_ascii=False),
+         lambda: json_codec.dumps(tool_result)),
+    ]
+
+
+def make_synthetic_trip(total_items: int, items_per_day: int = 20) -> dict:
+    """항목 수를 늘린 합성 여행 데이터 (조회/검색 벤치마크용)"""
+    days = []
+    for d in range(1, total_items // items_per_day + 1):
+        items = []
+        for i in range(items_per_day):
+            items.append({
+                "id": f"d{d}_item{i}",
+                "time": f"{9 + i % 12:02d}:00",
+                "cat": ("meal", "cafe", "activity")[i % 3],
+                "title": f"장소 {d}-{i}",
+                "options": [{"name": f"옵션 {d}-{i}-{k}",
+                             "dad": ("good", "caution")[(i + k) % 2],
+                             "hiro": ("good", "caution")[(i + k) // 2 % 2],
+                             "rating": 3.5 + (i + k) % 15 / 10,
+                             "category": ("한식 · 국밥", "카페 · 베이커리", "한정식")[k],
+                             "hours": "11:00~21:00 (브레이크 15:00~17:00)"}
+                            for k in range(3)],
+                "chosen": "",
+                "status": "planned",
+                "note": "",
+            })
+        days.append({"date": f"2026-03-{d:02d}", "dayNum": d, "title": f"Day {d}", "items": items})
+    return {"meta": {"lastUpdated": "2026-02-10T09:00:00+09:00"}, "days": days}
+
+
+def _scan_find_item(data: dict, item_id: str):
+    """인덱스 도입 전의 find_item (전체 순회)"""
+    for day in data.get("days", []):
+        for item in day.get("items", []):
+            if item.get("id") == item_id:
+                return day, item
+    return None
+
+
+def _scan_find_query(data: dict, query: str) -> list:
+    """검색 인덱스 도입 전의 find_items_by_query (전체 순회, 부분 일치)"""
+    query_lower = query.lower()
+    return [
+        item for day in data.get("days", []) for item in day.get("items", [])
+        if query_lower in item.get("title", "").lower()
+        or any(query_lower in o.get("name", "").lower() for o in item.get("options", []))
+    ]
+
+
+def bench_lookup(data: dict) -> List[Tuple[str, Callable, Callable]]:
+    """조회 핫패스: (이름, 전체 순회, 인덱스) 목록"""
+    ctx = ExecutionContext(data)
+    last_id = data["days"][-1]["items"][-1]["id"]
+    last_title = data["days"][-1]["items"][-1]["title"]
+    ctx.find_item(last_id)  # 인덱스 생성
+    ctx.find_items_by_query(last_title)  # 검색 인덱스 생성
+    return [
+        ("find_item (마지막 항목)",
+         lambda: _scan_find_item(ctx.data, last_id),
+         lambda: ctx.find_item(last_id)),
+        ("find_items_by_query (제목)",
+         lambda: _scan_find_query(ctx.data, last_title),
+         lambda: ctx.find_items_by_query(last_title)),
+    ]
+
+
+def bench_context(data: dict) -> List[Tuple[str, Callable, Callable]]:
+    """메시지당 컨텍스트 핫패스: (이름, 전체 deepcopy, copy-on-write) 목록"""
+    item_id = data["days"][-1]["items"][-1]["id"]
+
+    def read_message(ctx_factory):
+        ctx = ctx_factory()
+        execute_tool(ctx, "get_item_detail", {"item_id": item_id})
+
+    def write_message(ctx_factory):
+        ctx = ctx_factory()
+        execute_tool(ctx, "update_status", {"item_id": item_id, "status": "done"})
+
+    deep = lambda: ExecutionContext(copy.deepcopy(data))  # noqa: E731
+    cow = lambda: ExecutionContext(data)  # noqa: E731
+    return [
+        ("조회 메시지 (컨텍스트+get_item_detail)",
+         lambda: read_message(deep), lambda: read_message(cow)),
+        ("변경 메시지 (컨텍스트+update_status)",
+         lambda: write_message(deep), lambda: write_message(cow)),
+    ]
+
+
+def _scan_search_items(data: dict, cat: str, hiro: str, status: str) -> list:
+    """필터 인덱스 도입 전의 search_items (항목별 조건 확인)"""
+    return [
+        item for day in data.get("days", []) for item in day.get("items", [])
+        if item.get("cat") == cat and item.get("status") == status
+        and any(o.get("hiro") == hiro for o in item.get("options", []))
+    ]
+
+
+def bench_filter(data: dict) -> List[Tuple[str, Callable, Callable]]:
+    """search_items 핫패스: (이름, 항목별 순회, 포스팅 집합) 목록"""
+    ctx = ExecutionContext(data)
+    filters = {"cat": "meal", "hiro": "good", "status": "planned"}
+    ctx.index.filter(filters)  # 필터 인덱스 생성
+    return [
+        ("search_items (cat+hiro+status)",
+         lambda: _scan_search_items(ctx.data, **filters),
+         lambda: ctx.index.filter(filters)),
+    ]
+
+
+_SCHEMA_TYPES = {"string": str, "integer": int, "number": (int, float),
+                 "boolean": bool, "object": dict, "array": list}
+
+
+def _interpret_schema(schema: dict, value, where: str = "input"):
+    """컴파일 전 방식의 검증 (호출마다 스키마 dict를 해석)"""
+    expected = _SCHEMA_TYPES.get(schema.get("type"))
+    if expected is not None and (not isinstance(value, expected)
+                                 or (isinstance(value, bool) and schema["type"] != "boolean")):
+        return f"{where}: {schema['type']} 타입이어야 합니다"
+    if "enum" in schema and value not in schema["enum"]:
+        return f"{where}: 허용되지 않는 값 {value!r}"
+    if isinstance(value, dict):
+        for key in schema.get("required", []):
+            if key not in value:
+                return f"{where}: {key}가 필요합니다"
+        for key, sub in schema.get("properties", {}).items():
+            if key in value:
+                problem = _interpret_schema(sub, value[key], f"{where}.{key}")
+                if problem:
+                    return problem
+    if isinstance(value, list) and "items" in schema:
+        for i, element in enumerate(value):
+            problem = _interpret_schema(schema["items"], element, f"{where}[{i}]")
+            if problem:
+                return problem
+    return None
+
+
+def bench_validation(data: dict) -> List[Tuple[str, Callable, Callable]]:
+    """도구 입력 검증: (이름, 스키마 해석, 컴파일한 검증 함수) 목록"""
+    schemas = {tool["name"]: tool["input_schema"] for tool in TOOLS}
+    item_id = data["days"][-1]["items"][-1]["id"]
+    cases = [
+        ("update_option", {"item_id": item_id, "option_name": "옵션",
+                           "fields": {"dad": "good", "hiro": "caution", "tags": ["한식", "국밥"]}}),
+        ("add_item", {"day_num": 1, "title": "카페", "cat": "cafe",
+                      "options": [{"name": f"옵션 {k}", "dad": "good", "lat": 35.8} for k in range(3)]}),
+    ]
+    return [
+        (f"입력 검증 ({name})",
+         lambda name=name, inp=inp: _interpret_schema(schemas[name], inp),
+         lambda name=name, inp=inp: VALIDATORS[name](inp))
+        for name, inp in cases
+    ]
+
+
+def bench_validation_overhead(data: dict) -> List[Tuple[str, Callable, Callable]]:
+    """execute_tool의 입력 검증 + 계측 비용: (이름, 핸들러 직접 호출, execute_tool) 목록"""
+    ctx = ExecutionContext(data)
+    item_id = data["days"][-1]["items"][-1]["id"]
+    calls = [
+        ("get_item_detail", {"item_id": item_id}),
+        ("search_items", {"cat": "meal", "hiro": "good", "status": "planned"}),
+    ]
+    for name, inp in calls:
+        execute_tool(ctx, name, inp)  # 인덱스 생성
+    return [
+        (f"도구 실행 ({name})",
+         lambda name=name, inp=inp: tool_executor._HANDLERS[name](ctx, inp),
+         lambda name=name, inp=inp: execute_tool(ctx, name, inp))
+        for name, inp in calls
+    ]
+
+
+def _print_rows(rows: List[Tuple[str, Callable, Callable]], number: int, header: Tuple[str, str]) -> None:
+    print(f"{'항목':<36}{header[0]:>12}{header[1]:>12}{'배속':>8}")
+    for name, baseline, candidate in rows:
+        base_us = _measure(baseline, number)
+        cand_us = _measure(candidate, number)
+        print(f"{name:<36}{base_us:>12.1f}{cand_us:>12.1f}{base_us / cand_us:>7.1f}x")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="핫패스 마이크로 벤치마크")
+    parser.add_argument("path", nargs="?", default=DEFAULT_DATA_PATH, help="여행 데이터 JSON 파일")
+    parser.add_argument("-n", "--number", type=int, default=200, help="측정당 반복 횟수")
+    parser.add_argument("--items", type=int, default=1000, help="합성 데이터 항목 수")
+    args = parser.parse_args()
+
+    with open(args.path, encoding="utf-8") as f:
+        data = json.load(f)
+    size_kb = len(json.dumps(data, ensure_ascii=False).encode("utf-8")) / 1024
+
+    print(f"데이터: {os.path.basename(args.path)} ({size_kb:.1f} KB), json_codec: {json_codec.BACKEND}")
+    print()
+    _print_rows(bench_json(data), args.number, ("json (µs)", "codec (µs)"))
+
+    synthetic = make_synthetic_trip(args.items)
+    print()
+    print(f"합성 데이터: 항목 {args.items}개")
+    _print_rows(bench_lookup(synthetic), args.number, ("순회 (µs)", "인덱스 (µs)"))
+    _print_rows(bench_filter(synthetic), args.number, ("순회 (µs)", "포스팅 (µs)"))
+    print()
+    _print_rows(bench_validation(synthetic), args.number * 10, ("해석 (µs)", "컴파일 (µs)"))
+    _print_rows(bench_validation_overhead(synthetic), args.number, ("핸들러 (µs)", "execute_tool (µs)"))
+    print()
+    _print_rows(bench_context(synthetic), max(1, args.number // 10), ("deepcopy (µs)", "COW (µs)"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
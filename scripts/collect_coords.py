@@ -9,6 +9,8 @@
     python scripts/collect_coords.py --dry-run    # 결과만 출력 (jsonbin 변경 없음)
     python scripts/collect_coords.py --apply       # jsonbin에 실제 반영
     python scripts/collect_coords.py --kakao       # Kakao REST API로 검증 (API 키 필요)
+
+STORAGE_BACKEND=local이면 jsonbin 대신 로컬 데이터 파일(LOCAL_DATA_PATH)을 읽고 쓴다.
 """
 
 import argparse
@@ -33,6 +35,9 @@ logging.basicConfig(
 # 타임아웃 (초)
 REQUEST_TIMEOUT = 15
 
+# src/ 모듈 (로컬 저장소 파일 읽기/쓰기)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
 # ============================================================
 # 알려진 장소 좌표 딕셔너리
 # 출처: 경주문화관광(gyeongju.go.kr), 네이버지도, 카카오맵 등
@@ -385,9 +390,10 @@ def main() -> int:
     args = parser.parse_args()
 
     # 환경변수 확인
+    local = os.environ.get("STORAGE_BACKEND", "jsonbin").strip().lower() == "local"
     bin_id = os.environ.get("JSONBIN_BIN_ID")
     api_key = os.environ.get("JSONBIN_API_KEY")
-    if not bin_id or not api_key:
+    if not local and (not bin_id or not api_key):
         logger.error("JSONBIN_BIN_ID, JSONBIN_API_KEY 환경변수가 필요합니다")
         return 1
 
@@ -396,9 +402,20 @@ def main() -> int:
         logger.error("--kakao 모드에는 KAKAO_REST_API_KEY 환경변수가 필요합니다")
         return 1
 
-    # jsonbin에서 데이터 가져오기
-    logger.info("jsonbin에서 여행 데이터를 가져오는 중...")
-    data = get_jsonbin_data(bin_id, api_key)
+    if local:
+        from atomic_file import read_json, write_json_atomic
+        from storage import DEFAULT_LOCAL_PATH
+
+        local_path = os.environ.get("LOCAL_DATA_PATH", DEFAULT_LOCAL_PATH)
+        logger.info("로컬 파일에서 여행 데이터를 가져오는 중... (%s)", local_path)
+        data = read_json(local_path)
+        if not isinstance(data, dict):
+            logger.error("로컬 데이터 파일을 읽을 수 없습니다: %s", local_path)
+            return 1
+    else:
+        # jsonbin에서 데이터 가져오기
+        logger.info("jsonbin에서 여행 데이터를 가져오는 중...")
+        data = get_jsonbin_data(bin_id, api_key)
     logger.info("데이터 로드 완료")
 
     # 좌표 수집
@@ -422,6 +439,10 @@ def main() -> int:
             return 0
 
         logger.info("%d개 option에 좌표를 추가합니다...", updated)
+        if local:
+            write_json_atomic(local_path, data)
+            logger.info("로컬 파일 업데이트 완료! (%d개 option 갱신)", updated)
+            return 0
         success = put_jsonbin_data(bin_id, api_key, data)
         if success:
             logger.info("jsonbin 업데이트 완료! (%d개 option 갱신)", updated)
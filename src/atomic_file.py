@@ -0,0 +1,82 @@
+"""
+로컬 JSON 파일 읽기/쓰기 유틸리티 모듈.
+
+같은 파일을 봇과 웹 API 프로세스가 함께 쓰더라도 읽는 쪽이 반쯤 쓰인 파일을
+보지 않도록, 임시 파일에 쓴 뒤 os.replace()로 교체한다.
+"""
+
+import contextlib
+import logging
+import os
+import tempfile
+from typing import Any, Optional
+
+import json_codec
+
+logger = logging.getLogger(__name__)
+
+
+def write_json_atomic(path: str, obj: Any) -> None:
+    """
+    JSON을 파일에 원자적으로 기록한다.
+
+    Args:
+        path: 대상 파일 경로
+        obj: 직렬화할 객체
+
+    Raises:
+        OSError: 파일 기록 실패 시
+    """
+    write_bytes_atomic(path, json_codec.dumps_bytes(obj))
+
+
+def write_bytes_atomic(path: str, content: bytes) -> None:
+    """
+    바이트를 파일에 원자적으로 기록한다.
+
+    같은 디렉토리의 임시 파일에 쓰고 fsync한 뒤 대상 파일과 교체한다.
+    디렉토리가 없으면 만든다.
+
+    Args:
+        path: 대상 파일 경로
+        content: 기록할 내용
+
+    Raises:
+        OSError: 파일 기록 실패 시
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+def read_json(path: str) -> Optional[Any]:
+    """
+    JSON 파일을 읽는다.
+
+    파일이 없거나 손상되었으면 None을 반환한다.
+
+    Args:
+        path: 파일 경로
+
+    Returns:
+        역직렬화된 객체 또는 None
+    """
+    try:
+        with open(path, "rb") as f:
+            return json_codec.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("JSON 파일 읽기 실패 (%s): %s", path, e)
+        return None
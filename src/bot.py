@@ -2,7 +2,7 @@
 경주 가족여행 텔레그램 봇 (엔트리포인트)
 
 텔레그램 메시지를 수신하여 Anthropic API(Tool Use) 또는 Claude CLI로 처리하고,
-jsonbin.io의 여행 데이터를 업데이트하거나 조회 결과를 응답한다.
+여행 데이터 저장소(jsonbin.io 또는 로컬 파일)를 업데이트하거나 조회 결과를 응답한다.
 
 USE_TOOL_API=true (기본): Anthropic SDK + Tool Use
 USE_TOOL_API=false: Claude CLI subprocess (레거시, 롤백용)
@@ -24,7 +24,10 @@ from telegram.ext import (
     ContextTypes,
 )
 
-from jsonbin_client import JsonBinClient
+from jsonbin_client import DEFAULT_SNAPSHOT_PATH
+from overview_cache import DEFAULT_OVERVIEW_PATH
+from snapshot_ring import DEFAULT_HISTORY_PATH
+from storage import DEFAULT_LOCAL_PATH, UndoLog, create_storage
 
 # 환경 변수 로드
 load_dotenv()
@@ -33,7 +36,7 @@ load_dotenv()
 USE_TOOL_API = os.getenv("USE_TOOL_API", "true").lower() in ("true", "1", "yes")
 
 if USE_TOOL_API:
-    from claude_api_handler import process_message_api
+    from claude_api_handler import close_client, configure_overview_cache, process_message_api, start_client
 else:
     from claude_handler import process_message
 
@@ -48,6 +51,12 @@ logger = logging.getLogger(__name__)
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
 JSONBIN_BIN_ID = os.getenv("JSONBIN_BIN_ID", "")
 JSONBIN_API_KEY = os.getenv("JSONBIN_API_KEY", "")
+JSONBIN_SNAPSHOT_PATH = os.getenv("JSONBIN_SNAPSHOT_PATH", DEFAULT_SNAPSHOT_PATH)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "jsonbin")  # jsonbin | local
+STORAGE_REPLICA = os.getenv("STORAGE_REPLICA", "")  # local 모드의 복제 대상 (jsonbin)
+LOCAL_DATA_PATH = os.getenv("LOCAL_DATA_PATH", DEFAULT_LOCAL_PATH)
+SNAPSHOT_HISTORY_PATH = os.getenv("SNAPSHOT_HISTORY_PATH", DEFAULT_HISTORY_PATH)  # 빈 값이면 버전 기록 끔
+OVERVIEW_CACHE_PATH = os.getenv("OVERVIEW_CACHE_PATH", DEFAULT_OVERVIEW_PATH)  # 빈 값이면 프로세스 메모리에만 캐시
 ALLOWED_USER_IDS = [
     int(uid.strip())
     for uid in os.getenv("ALLOWED_USER_IDS", "").split(",")
@@ -60,14 +69,29 @@ MAX_MESSAGE_LENGTH = 4096
 # 대화 히스토리 설정
 MAX_HISTORY = 20  # 최근 20개 메시지 (10턴)
 
+# /rollback 목록에 보여줄 버전 수
+ROLLBACK_LIST_SIZE = 10
+
 # 채팅별 대화 히스토리: {chat_id: [{role, content}, ...]}
 _chat_histories: dict[int, list] = {}
 
 # 한국 표준시
 KST = timezone(timedelta(hours=9))
 
-# jsonbin 클라이언트 (전역 인스턴스)
-jsonbin = JsonBinClient(bin_id=JSONBIN_BIN_ID, api_key=JSONBIN_API_KEY)
+# 여행 데이터 저장소 (전역 인스턴스, 연결 풀 공유)
+storage = create_storage(
+    STORAGE_BACKEND,
+    bin_id=JSONBIN_BIN_ID,
+    api_key=JSONBIN_API_KEY,
+    snapshot_path=JSONBIN_SNAPSHOT_PATH,
+    local_path=LOCAL_DATA_PATH,
+    replica=STORAGE_REPLICA,
+    history_path=SNAPSHOT_HISTORY_PATH or None,
+    role="bot",
+)
+
+# 최근 저장한 턴의 역연산 (/undo)
+undo_log = UndoLog()
 
 
 def _is_allowed(user_id: int) -> bool:
@@ -104,6 +128,9 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         '- "아버지한테 괜찮은 저녁?"\n\n'
         "명령어:\n"
         "/today - 오늘 일정 요약\n"
+        "/status - 데이터 저장소 상태\n"
+        "/undo - 마지막 변경 되돌리기\n"
+        "/rollback [버전] - 저장 기록 보기 / 해당 버전으로 되돌리기\n"
     )
     await update.message.reply_text(welcome)
 
@@ -120,6 +147,96 @@ async def today_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     await _handle_user_message(update, "오늘 일정 알려줘", chat_id)
 
 
+async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """/status 명령어 핸들러 - 저장소와 jsonbin 회로 차단기 상태 확인"""
+    user_id = update.effective_user.id
+    if not _is_allowed(user_id):
+        logger.warning("허용되지 않은 사용자의 /status: %d", user_id)
+        return
+
+    status = storage.status()
+    lines = [f"저장소: {status['backend']}"]
+    if status["backend"] == "local":
+        lines.append(f"데이터 버전: {status['version'] or '-'}")
+        status = status["replica"]  # jsonbin 복제본 (없으면 None)
+
+    if status is not None:
+        breaker = status["breaker"]
+        lines += [
+            f"jsonbin 회로 차단기: {breaker['state']} (연속 실패 {breaker['consecutiveFailures']}회)",
+            f"전송 대기 변경: {status['pendingOps']}건",
+            f"캐시 버전: {status['cacheVersion'] or '-'}",
+        ]
+        if breaker["state"] == "open":
+            lines.append(f"재시도까지: {breaker['retryIn']:.0f}초")
+    await update.message.reply_text("\n".join(lines))
+
+
+async def rollback_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    /rollback 명령어 핸들러.
+
+    인자 없이 호출하면 최근 저장 버전 목록을, 버전 번호를 주면 그 버전으로 되돌린다.
+    """
+    user_id = update.effective_user.id
+    if not _is_allowed(user_id):
+        logger.warning("허용되지 않은 사용자의 /rollback: %d", user_id)
+        return
+
+    history = getattr(storage, "history", None)
+    if history is None:
+        await update.message.reply_text("버전 기록이 꺼져 있어요.")
+        return
+
+    args = context.args or []
+    if not args:
+        versions = history.versions()[:ROLLBACK_LIST_SIZE]
+        if not versions:
+            await update.message.reply_text("저장된 버전이 아직 없어요.")
+            return
+        lines = ["최근 저장 버전 (/rollback 번호 로 되돌리기)"]
+        for v in versions:
+            saved = datetime.fromtimestamp(v["savedAt"], KST).strftime("%m/%d %H:%M")
+            lines.append(f"{v['v']}. {saved} {v['note'] or ''}".rstrip())
+        await update.message.reply_text("\n".join(lines))
+        return
+
+    try:
+        version = int(args[0])
+        storage.rollback(version)
+    except ValueError:
+        await update.message.reply_text("버전 번호를 숫자로 입력해주세요. 예: /rollback 12")
+        return
+    except Exception as e:
+        logger.error("버전 되돌리기 실패: %s", e)
+        await update.message.reply_text(f"되돌리지 못했어요: {e}")
+        return
+    await update.message.reply_text(f"{version}번 버전으로 되돌렸어요.")
+
+
+async def undo_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    /undo 명령어 핸들러.
+
+    마지막으로 저장한 턴의 변경을 역연산으로 바로 되돌린다 (LLM 호출 없음).
+    """
+    user_id = update.effective_user.id
+    if not _is_allowed(user_id):
+        logger.warning("허용되지 않은 사용자의 /undo: %d", user_id)
+        return
+
+    try:
+        note = undo_log.undo(storage)
+    except Exception as e:
+        logger.error("마지막 변경 되돌리기 실패: %s", e)
+        await update.message.reply_text(f"되돌리지 못했어요: {e}")
+        return
+    if note is None:
+        await update.message.reply_text("되돌릴 변경이 없어요.")
+        return
+    await update.message.reply_text(f"마지막 변경을 되돌렸어요. ({note or '변경'})")
+
+
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """텍스트 메시지 핸들러"""
     user_id = update.effective_user.id
@@ -149,10 +266,10 @@ async def _handle_user_message(update: Update, user_message: str, chat_id: int =
 
         # 1. 현재 데이터 가져오기
         try:
-            json_data = jsonbin.get_data()
+            json_data = await storage.get_data()
         except Exception as e:
-            logger.error("jsonbin 데이터 조회 실패: %s", e)
-            cached = jsonbin.get_cached()
+            logger.error("여행 데이터 조회 실패: %s", e)
+            cached = storage.get_cached()
             if cached:
                 logger.info("캐시된 데이터로 대체")
                 json_data = cached
@@ -215,14 +332,14 @@ async def _process_with_api(json_data: dict, user_message: str, history: list |
     if response.error:
         logger.error("API 에러: %s", response.error)
 
-    # 데이터 변경이 있으면 jsonbin에 저장
-    if response.data_modified and response.updated_data:
+    # 데이터 변경이 있으면 변경 연산만 저장 예약
+    # (짧은 구간의 변경은 한 번의 PUT으로 합쳐지고, 최신 원격 데이터 위에 다시 적용됨)
+    if response.data_modified and response.patch:
         try:
-            success = jsonbin.put_data(response.updated_data)
-            if not success:
-                logger.error("jsonbin PUT 실패")
+            storage.schedule_patch(response.patch)
+            undo_log.push(response.patch, response.undo)
         except Exception as e:
-            logger.error("jsonbin PUT 실패: %s", e)
+            logger.error("저장 예약 실패: %s", e)
 
     return response.text or "처리 중 문제가 발생했어요."
 
@@ -236,7 +353,7 @@ async def _process_with_cli(json_data: dict, user_message: str) -> str:
 
     if response.response_type == "update" and response.updated_json:
         try:
-            success = jsonbin.put_data(response.updated_json)
+            success = await storage.put_data(response.updated_json)
             if success:
                 update_note = response.updated_json.get("meta", {}).get(
                     "updateNote", "업데이트"
@@ -245,7 +362,7 @@ async def _process_with_cli(json_data: dict, user_message: str) -> str:
             else:
                 return "데이터 업데이트에 실패했어요. 다시 시도해주세요."
         except Exception as e:
-            logger.error("jsonbin PUT 실패: %s", e)
+            logger.error("데이터 저장 실패: %s", e)
             return "데이터 저장 중 문제가 발생했어요."
 
     elif response.response_type == "text":
@@ -262,6 +379,20 @@ async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> N
     logger.error("봇 에러 발생: %s", context.error, exc_info=context.error)
 
 
+async def _on_startup(app: Application) -> None:
+    """봇 시작 시 모든 메시지가 공유할 Anthropic 클라이언트와 일정 개요 캐시를 만든다."""
+    if USE_TOOL_API:
+        start_client()
+        configure_overview_cache(OVERVIEW_CACHE_PATH or None)
+
+
+async def _on_shutdown(app: Application) -> None:
+    """봇 종료 시 대기 중인 변경을 전송하고 저장소/Anthropic 연결을 정리한다."""
+    await storage.close()
+    if USE_TOOL_API:
+        await close_client()
+
+
 def main() -> None:
     """봇을 시작한다."""
     if not TELEGRAM_BOT_TOKEN:
@@ -275,11 +406,20 @@ def main() -> None:
     logger.info("봇 시작 (모드: %s, 허용 사용자: %s)", mode, ALLOWED_USER_IDS)
 
     # Application 빌더 패턴으로 봇 초기화
-    app = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+    app = (
+        Application.builder()
+        .token(TELEGRAM_BOT_TOKEN)
+        .post_init(_on_startup)
+        .post_shutdown(_on_shutdown)
+        .build()
+    )
 
     # 명령어 핸들러 등록
     app.add_handler(CommandHandler("start", start_command))
     app.add_handler(CommandHandler("today", today_command))
+    app.add_handler(CommandHandler("status", status_command))
+    app.add_handler(CommandHandler("undo", undo_command))
+    app.add_handler(CommandHandler("rollback", rollback_command))
 
     # 텍스트 메시지 핸들러 등록
     app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
@@ -7,19 +7,38 @@ Messages API와 Tool Use를 사용한다.
     사용자 메시지 -> 시스템 프롬프트(일정 개요 포함) -> API 호출 ->
     tool_use 응답이면 -> 도구 실행 -> 결과를 Claude에 반환 -> 반복
     text 응답이면 -> 최종 응답 반환
+
+시스템 프롬프트는 고정 블록(페르소나/가족 정보/규칙)과 변동 블록(오늘 날짜,
+진행 현황, 일정 개요)으로 나눈다. 도구 정의와 고정 블록, 대화의 마지막 메시지에
+캐시 지점(cache_control)을 두어 라운드/메시지마다 같은 앞부분을 캐시에서 읽는다.
+라운드마다 첫 토큰까지 걸린 시간과 입력/캐시 토큰 수를 tool_stats에 기록한다.
+
+Anthropic 클라이언트는 프로세스에 하나만 두고 모든 메시지/라운드가 공유한다
+(연결 풀과 TLS 세션 재사용). bot/web_api가 시작할 때 start_client, 종료할 때
+close_client를 호출한다. 연결 수/타임아웃/재시도는 ANTHROPIC_* 환경 변수로 정한다.
+
+일정 개요는 데이터 버전(meta.lastUpdated)별로 캐시하고, 버전이 바뀌면 달라진
+일차만 다시 만든다 (overview_cache). 시작할 때 configure_overview_cache로
+두 프로세스가 공유할 캐시 파일을 지정한다.
 """
 
-import json
 import logging
-from dataclasses import dataclass
+import os
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
 from typing import Optional
 
 import anthropic
+import httpx
 from anthropic import AsyncAnthropic
 
+import json_codec
+import overview_cache
+import trip_stats
 from tool_definitions import TOOLS
-from tool_executor import ExecutionContext, execute_tool
+from tool_stats import STATS
+from tool_executor import WRITE_TOOLS, ExecutionContext, execute_tool
 
 logger = logging.getLogger(__name__)
 
@@ -29,13 +48,22 @@ MODEL = "claude-sonnet-4-5-20250929"
 MAX_TOOL_ROUNDS = 10
 MAX_TOKENS = 2048
 
+# Anthropic 클라이언트 연결 설정 기본값 (환경 변수로 덮어쓴다)
+API_TIMEOUT = 60.0  # 요청 하나의 읽기/쓰기 타임아웃 (초)
+API_CONNECT_TIMEOUT = 5.0  # 죽은 연결에서 전체 타임아웃까지 기다리지 않도록
+API_MAX_CONNECTIONS = 10  # 동시 연결 상한 (채팅 동시 처리 수)
+API_MAX_KEEPALIVE = 5  # 유휴 상태로 유지할 연결 수
+API_KEEPALIVE_EXPIRY = 30.0  # 유휴 연결 유지 시간 (초)
+API_MAX_RETRIES = 2  # SDK 재시도 횟수 (429/5xx/연결 오류)
+
 KST = timezone(timedelta(hours=9))
 TRIP_START = datetime(2026, 2, 19, tzinfo=KST)
 TRIP_END = datetime(2026, 2, 24, 23, 59, 59, tzinfo=KST)
 
 # ── 시스템 프롬프트 ───────────────────────────────────────────
 
-SYSTEM_PROMPT_TEMPLATE = """너는 '포저'다. 죠죠의 경주 가족여행을 가장 가까이에서 보필하는 여행 보좌관이다.
+# 고정 블록: 메시지마다 같은 내용이라 도구 정의와 함께 캐시한다. 바뀌는 값은 넣지 않는다.
+SYSTEM_PROMPT_STATIC = """너는 '포저'다. 죠죠의 경주 가족여행을 가장 가까이에서 보필하는 여행 보좌관이다.
 
 [포저의 역할]
 - 단순 일정 안내가 아니라, 가족 상황을 고려한 우선순위와 대안을 제안하는 전략적 여행 참모다.
@@ -63,8 +91,6 @@ SYSTEM_PROMPT_TEMPLATE = """너는 '포저'다. 죠죠의 경주 가족여행을
 - 인원: 아버지(당뇨 관리), 어머니(운전 담당), 죠죠, 아내, 히로(27개월, 밀/계란 알러지)
 - 숙소: 까사멜로우(경북 경주시 북군4길 75)
 - 특별 일정: 2/22(일) 대구국제마라톤 풀코스 (죠죠 참가)
-- 오늘 날짜: {today}
-- 여행 {day_status}
 
 [도구 사용 — 절대 규칙]
 - 일정을 조회·변경·기록할 때는 반드시 도구를 호출해야 한다. 도구 없이 "반영했습니다", "완료했습니다", "옮겼습니다" 등의 완료 표현을 절대 사용하지 않는다.
@@ -73,14 +99,20 @@ SYSTEM_PROMPT_TEMPLATE = """너는 '포저'다. 죠죠의 경주 가족여행을
 - 죠죠가 먼저 제안을 요청한 경우에만 제안 후 확인을 기다린다. "옮겨줘", "바꿔줘", "변경해줘" 같은 직접 지시에는 즉시 실행한다.
 
 [도구 목록]
-- 조회: get_schedule, find_item, search_items, get_item_detail, get_trip_summary
+- 조회: get_schedule, find_item, search_items, get_item_detail, get_trip_summary, get_now_next, find_nearby
 - 변경: update_item, update_status, update_visit, update_review, update_note, update_option, add_item, add_option, move_item, remove_item
+- 일괄 변경: apply_batch (여러 변경을 한 번에, 하나라도 실패하면 전부 취소)
 - 시간/제목 변경이 필요하면 update_item을 사용한다. (예: 체크아웃 시간 변경, 일정 이름 수정)
 - item_id가 확실하지 않으면 find_item으로 먼저 검색한다.
+- "지금 뭐 해?", "다음 일정 뭐야?"처럼 현재 시각 기준 질문은 get_now_next로 조회한다. approx=true인 시각은 추정이니 "쯤"으로 말한다.
+- "숙소 근처 식당", "여기서 가까운 카페"처럼 거리 질문은 find_nearby 한 번으로 찾는다 (place에 장소 이름이나 '숙소'). 거리는 직선 거리이니 "직선으로 약 500m"처럼 말한다.
 - 변경 후에는 간결한 확인 메시지를 제공한다.
 - add_item, move_item은 after_item_id로 삽입 위치를 지정할 수 있다. 죠죠가 "A와 B 사이에 넣어줘"라고 하면 after_item_id에 A의 ID를 지정한다.
-- 여러 변경이 필요하면 도구를 순차적으로 호출한다.
-- 관광지 상세 정보(입장료, 주차, 유모차, 수유실, must-do 등)가 필요하면 get_item_detail로 해당 activity 아이템을 조회한다. guide 필드에 상세 가이드가 포함되어 있다.
+- 여러 변경이 필요하면 apply_batch 한 번으로 묶어 실행한다. (예: "3일차 점심이랑 저녁 스킵하고 카페 하나 추가해줘" → update_status 2개 + add_item 1개를 한 배치로)
+- apply_batch가 실패하면 아무것도 바뀌지 않은 것이다. 오류를 확인하고 고쳐서 다시 실행한다.
+- 변경 도구가 실패하면(rolled_back) 이번 요청에서 앞서 성공한 변경도 모두 취소된 것이다. 필요한 변경을 처음부터 다시 실행하거나, 바뀐 것이 없다고 안내한다.
+- 관광지 상세 정보(입장료, 주차, 유모차, 수유실, must-do 등)가 필요하면 get_item_detail에 fields=["guide"]를 주어 해당 activity 아이템의 상세 가이드를 조회한다.
+- 조회 결과는 필요한 필드만 작게 받는다. 결과에 next_cursor가 있으면 더 있는 것이니, 필요할 때만 cursor로 이어서 조회한다.
 
 [방문 기록 & 리뷰]
 - 사용자가 "~~ 다녀왔어", "~~ 도착했어", "~~ 갔어" 등 방문 사실을 말하면 update_visit으로 기록
@@ -91,11 +123,23 @@ SYSTEM_PROMPT_TEMPLATE = """너는 '포저'다. 죠죠의 경주 가족여행을
 
 [맥락 유지]
 - 이전 대화 내용이 함께 전달된다. 죠죠가 "거기", "그거", "아까 말한 것" 등 대명사를 쓰면 이전 대화에서 맥락을 찾는다.
-- 맥락을 찾을 수 없으면 솔직하게 "어떤 항목을 말씀하시는 건지 다시 한번 알려주시겠어요?"라고 묻는다. 추측으로 엉뚱한 답변을 만들지 않는다.
+- 맥락을 찾을 수 없으면 솔직하게 "어떤 항목을 말씀하시는 건지 다시 한번 알려주시겠어요?"라고 묻는다. 추측으로 엉뚱한 답변을 만들지 않는다."""
+
+# 변동 블록: 날짜/데이터에 따라 바뀌는 값 (캐시한 고정 블록 뒤에 둔다)
+SYSTEM_PROMPT_VOLATILE_TEMPLATE = """[오늘]
+- 오늘 날짜: {today}
+- 여행 {day_status}
+- 진행 현황: {progress}
 
 [일정 개요]
 {schedule_overview}"""
 
+# 프롬프트 캐시 지점 (5분 TTL, 읽을 때마다 갱신)
+CACHE_CONTROL = {"type": "ephemeral"}
+
+# 마지막 도구에 캐시 지점을 둔 도구 목록 (도구 정의 전체가 캐시 앞부분이 된다)
+CACHED_TOOLS = TOOLS[:-1] + [dict(TOOLS[-1], cache_control=CACHE_CONTROL)]
+
 
 # ── 헬퍼 함수 ─────────────────────────────────────────────────
 
@@ -114,48 +158,104 @@ def _get_day_status(now: Optional[datetime] = None) -> str:
         return f"Day {day_num} 진행 중"
 
 
+def build_progress(data: dict) -> str:
+    """저장된 진행 통계(trip_stats)로 진행 현황 한 줄을 만든다."""
+    _, totals = trip_stats.summarize(data)
+    return (
+        f"완료 {totals['done']} / 건너뜀 {totals['skipped']} / 남음 {totals['planned']} "
+        f"(전체 {totals['total']})"
+    )
+
+
 def build_schedule_overview(data: dict) -> str:
     """여행 데이터에서 일정 개요 텍스트를 생성한다.
 
     각 일차별로 항목 ID, 시간, 제목, 상태, 확정/후보 정보를 포함한다.
+    메시지 처리에서는 버전별 캐시(get_schedule_overview)를 쓴다.
     """
-    lines = []
-    for day in data.get("days", []):
-        date = day.get("date", "")
-        dow = day.get("dow", "")
-        day_num = day.get("dayNum", "")
-        title = day.get("title", "")
-        lines.append(f"### Day {day_num} ({date}, {dow}) - {title}")
+    return overview_cache.join_days(
+        [overview_cache.render_day(overview_cache.day_key(day)) for day in data.get("days", [])]
+    )
+
 
-        for item in day.get("items", []):
-            status = item.get("status", "planned")
-            if status == "done":
-                icon = "[v]"
-            elif status == "skipped":
-                icon = "[x]"
-            else:
-                icon = "[ ]"
+# 일정 개요 캐시 (configure_overview_cache로 공유 파일을 지정한다)
+_overview_cache = overview_cache.OverviewCache()
 
-            item_id = item.get("id", "")
-            time = item.get("time", "")
-            item_title = item.get("title", "")
 
-            chosen = item.get("chosen", "")
-            options = item.get("options", [])
+def configure_overview_cache(path: Optional[str] = None) -> overview_cache.OverviewCache:
+    """
+    일정 개요 캐시를 새로 만든다. 프로세스 시작 시 한 번 호출한다.
+
+    Args:
+        path: 봇/웹 API 프로세스가 공유할 캐시 파일 경로 (None이면 메모리에만 둔다)
+    """
+    global _overview_cache
+    _overview_cache = overview_cache.OverviewCache(path)
+    return _overview_cache
+
 
-            suffix = ""
-            if chosen:
-                suffix = f" [확정: {chosen}]"
-            elif options:
-                names = [o.get("name", "") for o in options if o.get("name")]
-                if names:
-                    suffix = f" (후보: {', '.join(names)})"
+def get_schedule_overview(data: dict) -> str:
+    """데이터 버전(meta.lastUpdated)별로 캐시한 일정 개요 텍스트."""
+    return _overview_cache.get(data)
 
-            lines.append(f"  {icon} {item_id} | {time} | {item_title}{suffix}")
 
-        lines.append("")  # 일차 간 빈 줄
+def build_system_blocks(data: dict, now: Optional[datetime] = None) -> list:
+    """
+    시스템 프롬프트 블록 [고정 블록(캐시 지점), 변동 블록].
 
-    return "\n".join(lines).rstrip()
+    Args:
+        data: 현재 여행 데이터
+        now: 기준 시각 (None이면 현재 KST)
+    """
+    if now is None:
+        now = datetime.now(KST)
+    volatile = SYSTEM_PROMPT_VOLATILE_TEMPLATE.format(
+        today=now.strftime("%Y-%m-%d (%a)"),
+        day_status=_get_day_status(now),
+        progress=build_progress(data),
+        schedule_overview=get_schedule_overview(data),
+    )
+    return [
+        {"type": "text", "text": SYSTEM_PROMPT_STATIC, "cache_control": CACHE_CONTROL},
+        {"type": "text", "text": volatile},
+    ]
+
+
+def _mark_cache_tail(messages: list, marked: Optional[dict]) -> Optional[dict]:
+    """
+    마지막 user 메시지의 마지막 블록으로 캐시 지점을 옮긴다.
+
+    다음 라운드는 이번 라운드까지의 대화를 캐시에서 읽는다. 캐시 지점은 요청당
+    4개까지라 이전 라운드의 지점은 지운다.
+
+    Returns:
+        새로 표시한 블록 (다음 호출에 marked로 넘긴다)
+    """
+    if marked is not None:
+        marked.pop("cache_control", None)
+    last = messages[-1]
+    if isinstance(last["content"], str):
+        last["content"] = [{"type": "text", "text": last["content"]}]
+    block = last["content"][-1]
+    block["cache_control"] = CACHE_CONTROL
+    return block
+
+
+async def _create_message(client: AsyncAnthropic, **request):
+    """
+    스트리밍으로 응답을 받아 (최종 메시지, 첫 토큰까지 초, 전체 초)를 반환한다.
+
+    첫 토큰은 첫 content block 이벤트가 도착한 시점이다.
+    """
+    started = time.perf_counter()
+    first_token = None
+    async with client.messages.stream(**request) as stream:
+        async for event in stream:
+            if first_token is None and event.type in ("content_block_start", "content_block_delta"):
+                first_token = time.perf_counter() - started
+        response = await stream.get_final_message()
+    elapsed = time.perf_counter() - started
+    return response, (first_token if first_token is not None else elapsed), elapsed
 
 
 def _extract_text(response) -> str:
@@ -171,16 +271,94 @@ def _extract_text(response) -> str:
 
 @dataclass
 class ApiResponse:
-    """API 응답 결과"""
+    """API 응답 결과
+
+    patch는 이번 턴의 변경을 trip_patch 연산으로 담는다. 저장 시에는
+    updated_data 전체 대신 patch를 최신 원격 데이터 위에 다시 적용한다.
+    undo는 patch를 되돌리는 역연산이다 (/undo에서 저장소에 적용).
+    """
     text: str
     data_modified: bool
     updated_data: Optional[dict]
     error: Optional[str] = None
+    patch: list = field(default_factory=list)
+    undo: list = field(default_factory=list)
+
+
+# ── Anthropic 클라이언트 ──────────────────────────────────────
+
+# 프로세스 공유 클라이언트 (start_client로 만들고 close_client로 닫는다)
+_client: Optional[AsyncAnthropic] = None
+
+
+def client_options_from_env() -> dict:
+    """ANTHROPIC_* 환경 변수의 클라이언트 연결 설정 (없으면 기본값)."""
+    return {
+        "timeout": float(os.getenv("ANTHROPIC_TIMEOUT", API_TIMEOUT)),
+        "connect_timeout": float(os.getenv("ANTHROPIC_CONNECT_TIMEOUT", API_CONNECT_TIMEOUT)),
+        "max_connections": int(os.getenv("ANTHROPIC_MAX_CONNECTIONS", API_MAX_CONNECTIONS)),
+        "max_keepalive": int(os.getenv("ANTHROPIC_MAX_KEEPALIVE", API_MAX_KEEPALIVE)),
+        "max_retries": int(os.getenv("ANTHROPIC_MAX_RETRIES", API_MAX_RETRIES)),
+    }
+
+
+def create_client(
+    timeout: float = API_TIMEOUT,
+    connect_timeout: float = API_CONNECT_TIMEOUT,
+    max_connections: int = API_MAX_CONNECTIONS,
+    max_keepalive: int = API_MAX_KEEPALIVE,
+    max_retries: int = API_MAX_RETRIES,
+) -> AsyncAnthropic:
+    """연결 풀 크기와 타임아웃을 지정한 AsyncAnthropic 클라이언트를 만든다."""
+    request_timeout = anthropic.Timeout(timeout, connect=connect_timeout)
+    http_client = anthropic.DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=API_KEEPALIVE_EXPIRY,
+        ),
+        timeout=request_timeout,
+    )
+    return AsyncAnthropic(http_client=http_client, timeout=request_timeout, max_retries=max_retries)
+
+
+def start_client(**options) -> AsyncAnthropic:
+    """
+    공유 클라이언트를 만든다 (이미 있으면 그대로 반환). 프로세스 시작 시 한 번 호출한다.
+
+    Args:
+        **options: create_client 인자 (생략한 값은 환경 변수/기본값)
+    """
+    global _client
+    if _client is None:
+        settings = dict(client_options_from_env(), **options)
+        _client = create_client(**settings)
+        logger.info("Anthropic 클라이언트 생성 (연결 %d개, 타임아웃 %.0f초)",
+                    settings["max_connections"], settings["timeout"])
+    return _client
+
+
+def get_client() -> AsyncAnthropic:
+    """공유 클라이언트 (start_client 전이면 환경 변수 설정으로 만든다)."""
+    return _client if _client is not None else start_client()
+
+
+async def close_client() -> None:
+    """공유 클라이언트의 연결 풀을 닫는다. 종료 시 한 번 호출한다."""
+    global _client
+    client, _client = _client, None
+    if client is not None:
+        await client.close()
 
 
 # ── 메인 처리 함수 ────────────────────────────────────────────
 
-async def process_message_api(json_data: dict, user_message: str, history: list | None = None) -> ApiResponse:
+async def process_message_api(
+    json_data: dict,
+    user_message: str,
+    history: list | None = None,
+    client: Optional[AsyncAnthropic] = None,
+) -> ApiResponse:
     """Anthropic API로 사용자 메시지를 처리한다.
 
     시스템 프롬프트에 일정 개요를 포함하고, Tool Use 루프를 통해
@@ -190,23 +368,16 @@ async def process_message_api(json_data: dict, user_message: str, history: list
         json_data: jsonbin에서 가져온 현재 여행 데이터
         user_message: 사용자가 텔레그램에 보낸 메시지
         history: 이전 대화 히스토리 [{role, content}, ...]
+        client: 사용할 클라이언트 (생략하면 프로세스 공유 클라이언트)
 
     Returns:
         ApiResponse 객체 (텍스트, 데이터 변경 여부, 변경된 데이터)
     """
-    # 1. 시스템 프롬프트 구성
-    now = datetime.now(KST)
-    today = now.strftime("%Y-%m-%d (%a)")
-    day_status = _get_day_status(now)
-    schedule_overview = build_schedule_overview(json_data)
-    system_prompt = SYSTEM_PROMPT_TEMPLATE.format(
-        today=today,
-        day_status=day_status,
-        schedule_overview=schedule_overview,
-    )
+    # 1. 시스템 프롬프트 구성 (고정 블록은 캐시, 변동 블록은 메시지마다 새로)
+    system_blocks = build_system_blocks(json_data)
 
-    # 2. Anthropic 클라이언트 및 실행 컨텍스트 초기화
-    client = AsyncAnthropic()
+    # 2. Anthropic 클라이언트(공유) 및 실행 컨텍스트 초기화
+    client = client or get_client()
     ctx = ExecutionContext(json_data)
 
     # 3. 초기 메시지 (대화 히스토리 포함)
@@ -216,22 +387,36 @@ async def process_message_api(json_data: dict, user_message: str, history: list
             if msg.get("role") in ("user", "assistant") and msg.get("content"):
                 messages.append({"role": msg["role"], "content": msg["content"]})
     messages.append({"role": "user", "content": user_message})
+    cache_tail = None
 
     response = None
+    # 변경 도구가 실패하면 이번 턴의 변경을 모두 되돌린다 (일부만 저장되지 않도록)
+    turn = ctx.savepoint()
+    STATS.record_turn()
 
     try:
         # 4. Tool Use 루프
         for round_num in range(MAX_TOOL_ROUNDS):
             logger.info("API 호출 (라운드 %d/%d)", round_num + 1, MAX_TOOL_ROUNDS)
 
-            response = await client.messages.create(
+            cache_tail = _mark_cache_tail(messages, cache_tail)
+            response, first_token, elapsed = await _create_message(
+                client,
                 model=MODEL,
                 max_tokens=MAX_TOKENS,
-                system=system_prompt,
-                tools=TOOLS,
+                system=system_blocks,
+                tools=CACHED_TOOLS,
                 messages=messages,
             )
-
+            usage = response.usage
+            STATS.record_api_call(first_token, elapsed, usage)
+            logger.info(
+                "API 응답: 첫 토큰 %.0fms, 입력 %d (캐시 읽기 %d, 캐시 쓰기 %d), 출력 %d",
+                first_token * 1000, usage.input_tokens,
+                getattr(usage, "cache_read_input_tokens", 0) or 0,
+                getattr(usage, "cache_creation_input_tokens", 0) or 0,
+                usage.output_tokens,
+            )
             logger.debug("stop_reason: %s", response.stop_reason)
 
             # 텍스트 응답 완료
@@ -241,6 +426,8 @@ async def process_message_api(json_data: dict, user_message: str, history: list
                     text=text,
                     data_modified=ctx.modified,
                     updated_data=ctx.data if ctx.modified else None,
+                    patch=ctx.patch if ctx.modified else [],
+                    undo=ctx.undo_patch if ctx.modified else [],
                 )
 
             # 도구 호출 처리
@@ -252,10 +439,21 @@ async def process_message_api(json_data: dict, user_message: str, history: list
                     if block.type == "tool_use":
                         logger.info("도구 실행: %s (input: %s)", block.name, block.input)
                         result = execute_tool(ctx, block.name, block.input)
+                        if "error" in result and block.name in WRITE_TOOLS and ctx.changed_since(turn):
+                            ctx.rollback_to(turn)
+                            turn = ctx.savepoint()
+                            logger.warning("변경 도구 실패로 이번 턴의 변경을 되돌림: %s", block.name)
+                            result = dict(
+                                result,
+                                error=result["error"] + " (이번 요청에서 앞서 적용한 변경도 모두 취소했습니다)",
+                                rolled_back=True,
+                            )
+                        content = json_codec.dumps(result)
+                        STATS.record_result_size(block.name, len(content.encode("utf-8")))
                         tool_results.append({
                             "type": "tool_result",
                             "tool_use_id": block.id,
-                            "content": json.dumps(result, ensure_ascii=False),
+                            "content": content,
                         })
 
                 messages.append({"role": "user", "content": tool_results})
@@ -273,6 +471,8 @@ async def process_message_api(json_data: dict, user_message: str, history: list
             text=text,
             data_modified=ctx.modified,
             updated_data=ctx.data if ctx.modified else None,
+            patch=ctx.patch if ctx.modified else [],
+            undo=ctx.undo_patch if ctx.modified else [],
         )
 
     except anthropic.AuthenticationError as e:
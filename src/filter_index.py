@@ -0,0 +1,158 @@
+"""
+search_items용 컬럼형 필터 인덱스 모듈.
+
+항목마다 필터 키(속성, 값)를 뽑아 키별 포스팅 집합(항목 위치의 집합)을 만든다.
+여러 조건의 AND 결합은 포스팅 집합의 교집합(작은 것부터)으로 처리한다.
+
+    ("cat", "meal"), ("status", "planned"), ("day_num", 2), ("optional", True)
+    ("dad", "good"), ("hiro", "caution")       옵션 중 하나라도 해당하면
+    ("category", "카페")                        옵션 category를 "·"로 나눈 토큰
+    ("rating", 43)                             옵션 최고 평점 (0.1 단위)
+    ("hours", "11:00~21:00 ...")               옵션 영업시간 문자열
+
+값의 범위나 부분 일치로 찾는 조건(min_rating, category, open_at)은 해당하는
+키들의 포스팅 합집합이 된다. 키 종류(평점 단계, 업종 토큰, 영업시간 문자열)는
+항목 수와 달리 수십 개 수준이라 합집합도 작다.
+
+같은 키 규칙(item_keys)으로 항목 하나를 바로 판정할 수도 있다 (matches).
+"""
+
+import functools
+import math
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from opening_hours import is_open, parse_hours
+
+# search_items 필터 이름 (tool input 이름과 같다, open_at은 open_now에서 만든다)
+FILTER_FIELDS = ("cat", "status", "day_num", "dad", "hiro", "min_rating", "category", "optional", "open_at")
+
+Key = Tuple[Any, ...]
+
+
+def _category_tokens(category: Any) -> List[str]:
+    if not isinstance(category, str):
+        return []
+    tokens = category.replace("/", "·").replace(",", "·").split("·")
+    return [t.strip().lower() for t in tokens if t.strip()]
+
+
+@functools.lru_cache(maxsize=1024)
+def _schedule(hours: str):
+    """영업시간 문자열 파싱 결과 (같은 문자열이 많아 캐시한다, 읽기 전용)"""
+    return parse_hours(hours)
+
+
+def item_keys(day: dict, item: dict) -> Set[Key]:
+    """항목의 필터 키 집합."""
+    keys: Set[Key] = {
+        ("cat", item.get("cat")),
+        ("status", item.get("status", "planned")),
+        ("day_num", day.get("dayNum")),
+        ("optional", bool(item.get("optional", False))),
+    }
+    best_rating = None
+    for opt in item.get("options", []):
+        for field in ("dad", "hiro"):
+            if opt.get(field) is not None:
+                keys.add((field, opt[field]))
+        rating = opt.get("rating")
+        if isinstance(rating, (int, float)) and not isinstance(rating, bool):
+            best_rating = rating if best_rating is None else max(best_rating, rating)
+        for token in _category_tokens(opt.get("category")):
+            keys.add(("category", token))
+        hours = opt.get("hours")
+        if isinstance(hours, str) and _schedule(hours) is not None:
+            keys.add(("hours", hours))
+    if best_rating is not None:
+        keys.add(("rating", int(round(best_rating * 10))))
+    return keys
+
+
+def _key_test(field: str, value: Any) -> Callable[[Key], bool]:
+    """필터 조건 하나를 키 판정 함수로 바꾼다."""
+    if field == "min_rating":
+        threshold = math.ceil(round(float(value) * 10, 6))
+        return lambda key: key[0] == "rating" and key[1] >= threshold
+    if field == "category":
+        query = str(value).strip().lower()
+        return lambda key: key[0] == "category" and query in key[1]
+    if field == "open_at":
+        at: datetime = value
+        weekday, minute = at.weekday(), at.hour * 60 + at.minute
+        return lambda key: key[0] == "hours" and bool(is_open(_schedule(key[1]), weekday, minute))
+    target = _exact_key(field, value)
+    return lambda key: key == target
+
+
+def _exact_key(field: str, value: Any) -> Key:
+    return (field, bool(value)) if field == "optional" else (field, value)
+
+
+# 값 범위/부분 일치 조건이 보는 키 종류
+_RANGE_FIELDS = {"min_rating": "rating", "category": "category", "open_at": "hours"}
+_RANGE_KINDS = set(_RANGE_FIELDS.values())
+
+
+def matches(day: dict, item: dict, filters: Dict[str, Any]) -> bool:
+    """항목 하나가 모든 필터 조건을 만족하는지 여부 (FilterIndex와 같은 규칙)."""
+    keys = item_keys(day, item)
+    return all(any(map(_key_test(f, v), keys)) for f, v in filters.items())
+
+
+class FilterIndex:
+    """항목 위치(문서 순서)에 대한 필터 키별 포스팅 집합"""
+
+    def __init__(self, days: Iterable[dict]) -> None:
+        """
+        인덱스를 만든다.
+
+        Args:
+            days: 여행 데이터의 days 배열
+        """
+        self._entries: List[Tuple[dict, dict]] = []
+        self._postings: Dict[Key, Set[int]] = {}
+        self._kinds: Dict[str, Set[Key]] = {}  # 범위 조건용: 키 종류 -> 키 목록
+        for day in days or []:
+            for item in day.get("items", []):
+                pos = len(self._entries)
+                self._entries.append((day, item))
+                for key in item_keys(day, item):
+                    self._postings.setdefault(key, set()).add(pos)
+                    if key[0] in _RANGE_KINDS:
+                        self._kinds.setdefault(key[0], set()).add(key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def entry(self, pos: int) -> Tuple[dict, dict]:
+        """위치의 (day, item)"""
+        return self._entries[pos]
+
+    def _posting(self, field: str, value: Any) -> Set[int]:
+        kind = _RANGE_FIELDS.get(field)
+        if kind is None:
+            return self._postings.get(_exact_key(field, value), set())
+        test = _key_test(field, value)
+        result: Set[int] = set()
+        for key in self._kinds.get(kind, ()):
+            if test(key):
+                result |= self._postings[key]
+        return result
+
+    def match(self, filters: Dict[str, Any]) -> List[int]:
+        """
+        모든 조건을 만족하는 항목 위치 (문서 순서).
+
+        Args:
+            filters: {필터 이름: 값} (FILTER_FIELDS, 조건이 없으면 전체)
+        """
+        if not filters:
+            return list(range(len(self._entries)))
+        postings = sorted((self._posting(f, v) for f, v in filters.items()), key=len)
+        result: Optional[Set[int]] = None
+        for posting in postings:
+            result = set(posting) if result is None else result & posting
+            if not result:
+                return []
+        return sorted(result)
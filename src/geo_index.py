@@ -0,0 +1,170 @@
+"""
+장소 좌표 인덱스 모듈.
+
+옵션(식당/카페/관광지)의 lat/lng와 숙소 좌표를 위경도 격자(CELL_DEG 간격)에
+나눠 담고, 기준 좌표에서 가까운 순서로 장소를 꺼낸다.
+
+    격자 칸 (위도 칸, 경도 칸) -> [Place, ...]
+
+가까운 순 조회(nearest)는 기준 칸에서 바깥쪽 고리(ring) 순으로 칸을 훑는다.
+고리 r까지 훑으면 아직 안 본 장소는 모두 r칸 너비 이상 떨어져 있으므로,
+그보다 가까운 후보는 순서를 확정해 내보낸다. 호출자는 필요한 개수를 채우면
+멈추므로 반경 안 장소 수가 아니라 실제로 꺼낸 수만큼만 거리 계산을 한다.
+
+거리는 하버사인 공식(구면 근사)으로 계산한 직선 거리(미터)다.
+"""
+
+import heapq
+import math
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# 격자 칸 크기 (도). 경주 위도에서 남북 약 1.1km, 동서 약 0.9km
+CELL_DEG = 0.01
+
+EARTH_RADIUS_M = 6_371_000
+_METERS_PER_DEG = math.pi * EARTH_RADIUS_M / 180
+
+# 숙소 기본값 (주소 기반 추정 좌표). 데이터 meta.accommodation에 lat/lng가 있으면 그것을 쓴다.
+ACCOMMODATION = {
+    "name": "까사멜로우",
+    "address": "경북 경주시 북군4길 75",
+    "lat": 35.8460,
+    "lng": 129.2620,
+}
+
+# place 입력에서 숙소로 보는 이름
+ACCOMMODATION_ALIASES = ("숙소", "까사멜로우", "까사멜로우풀빌라", "casa mellow")
+
+
+class Place(NamedTuple):
+    """좌표가 있는 장소"""
+    name: str
+    lat: float
+    lng: float
+    item_id: Any = None  # 숙소는 None
+    option_name: Optional[str] = None
+
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """두 좌표 사이의 직선 거리 (미터)."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def coords(obj: dict) -> Optional[Tuple[float, float]]:
+    """dict의 (lat, lng) - 숫자 좌표가 없으면 None."""
+    lat, lng = obj.get("lat"), obj.get("lng")
+    for value in (lat, lng):
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            return None
+    return float(lat), float(lng)
+
+
+def accommodation(data: dict) -> dict:
+    """숙소 정보 (meta.accommodation에 좌표가 있으면 우선)."""
+    meta_stay = (data.get("meta") or {}).get("accommodation")
+    if isinstance(meta_stay, dict) and coords(meta_stay) is not None:
+        return dict(ACCOMMODATION, **meta_stay)
+    return dict(ACCOMMODATION)
+
+
+def item_places(item: dict) -> List[Place]:
+    """항목과 그 옵션 중 좌표가 있는 장소."""
+    places = []
+    point = coords(item)
+    if point is not None:
+        places.append(Place(item.get("title", ""), point[0], point[1], item.get("id")))
+    for opt in item.get("options", []):
+        point = coords(opt)
+        if point is not None:
+            places.append(Place(opt.get("name", ""), point[0], point[1], item.get("id"), opt.get("name")))
+    return places
+
+
+def day_places(days: Iterable[dict]) -> List[Place]:
+    """days 배열의 좌표가 있는 장소 (문서 순서)."""
+    return [place for day in days or [] for item in day.get("items", []) for place in item_places(item)]
+
+
+def _cell(lat: float, lng: float) -> Tuple[int, int]:
+    return math.floor(lat / CELL_DEG), math.floor(lng / CELL_DEG)
+
+
+class GeoIndex:
+    """위경도 격자 장소 인덱스"""
+
+    def __init__(self, places: Iterable[Place]) -> None:
+        """
+        인덱스를 만든다.
+
+        Args:
+            places: 좌표가 있는 장소
+        """
+        self._cells: Dict[Tuple[int, int], List[Place]] = {}
+        self._size = 0
+        self._max_abs_lat = 0.0
+        for place in places:
+            self._cells.setdefault(_cell(place.lat, place.lng), []).append(place)
+            self._max_abs_lat = max(self._max_abs_lat, abs(place.lat))
+            self._size += 1
+        if self._cells:
+            rows = [c[0] for c in self._cells]
+            cols = [c[1] for c in self._cells]
+            self._bounds = (min(rows), max(rows), min(cols), max(cols))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _ring(self, center: Tuple[int, int], r: int) -> Iterator[List[Place]]:
+        """center에서 체비쇼프 거리 r인 칸들의 장소 목록."""
+        row, col = center
+        if r == 0:
+            cells = [(row, col)]
+        else:
+            cells = [(row + dr, col + dc) for dr in (-r, r) for dc in range(-r, r + 1)]
+            cells += [(row + dr, col + dc) for dc in (-r, r) for dr in range(-r + 1, r)]
+        for cell in cells:
+            places = self._cells.get(cell)
+            if places:
+                yield places
+
+    def nearest(self, lat: float, lng: float, radius_m: Optional[float] = None) -> Iterator[Tuple[float, Place]]:
+        """
+        기준 좌표에서 가까운 순으로 (거리 m, 장소)를 내보낸다.
+
+        Args:
+            lat, lng: 기준 좌표
+            radius_m: 최대 거리 (None이면 전체)
+        """
+        if not self._cells:
+            return
+        center = _cell(lat, lng)
+        # 고리 r 바깥의 장소까지 최소 거리 = r * (칸의 남북/동서 너비 중 짧은 쪽)
+        max_lat = math.radians(min(89.0, max(self._max_abs_lat, abs(lat)) + CELL_DEG))
+        cell_m = CELL_DEG * _METERS_PER_DEG * min(1.0, math.cos(max_lat))
+        lo_row, hi_row, lo_col, hi_col = self._bounds
+        last_ring = max(abs(center[0] - lo_row), abs(center[0] - hi_row),
+                        abs(center[1] - lo_col), abs(center[1] - hi_col))
+
+        heap: List[Tuple[float, int, Place]] = []
+        seq = 0
+        for r in range(last_ring + 1):
+            for places in self._ring(center, r):
+                for place in places:
+                    heapq.heappush(heap, (haversine_m(lat, lng, place.lat, place.lng), seq, place))
+                    seq += 1
+            settled = r * cell_m
+            if radius_m is not None and settled >= radius_m:
+                break
+            while heap and heap[0][0] <= settled:
+                dist, _, place = heapq.heappop(heap)
+                if radius_m is not None and dist > radius_m:
+                    return
+                yield dist, place
+        while heap:
+            dist, _, place = heapq.heappop(heap)
+            if radius_m is not None and dist > radius_m:
+                return
+            yield dist, place
@@ -0,0 +1,55 @@
+"""
+JSON 직렬화 모듈.
+
+여행 데이터(수십 KB)는 jsonbin GET/PUT, 스냅샷 저장, 도구 결과, 웹 API 응답마다
+직렬화/역직렬화된다. orjson이 설치되어 있으면 사용하고, 없으면 표준 json으로
+동작한다. 출력 형식은 두 경우 모두 ensure_ascii=False와 같다(한글을 그대로 쓴다).
+
+    dumps(obj) -> str
+    dumps_bytes(obj) -> bytes (파일/HTTP 본문용, 인코딩 단계 생략)
+    loads(str | bytes) -> Any
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+# 사용 중인 구현 이름 (벤치마크/로그용)
+BACKEND = "orjson" if orjson is not None else "json"
+
+# 역직렬화 실패 예외 (orjson.JSONDecodeError도 이 클래스의 하위 클래스다)
+JSONDecodeError = json.JSONDecodeError
+
+if orjson is not None:
+    # 표준 json처럼 int 등 문자열이 아닌 dict 키를 허용한다
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """객체를 UTF-8 JSON 바이트로 직렬화한다."""
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+
+    def dumps(obj: Any) -> str:
+        """객체를 JSON 문자열로 직렬화한다."""
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode("utf-8")
+
+    def loads(data: Union[str, bytes, bytearray]) -> Any:
+        """JSON 문자열/바이트를 역직렬화한다."""
+        return orjson.loads(data)
+
+else:
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """객체를 UTF-8 JSON 바이트로 직렬화한다."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def dumps(obj: Any) -> str:
+        """객체를 JSON 문자열로 직렬화한다."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+    def loads(data: Union[str, bytes, bytearray]) -> Any:
+        """JSON 문자열/바이트를 역직렬화한다."""
+        return json.loads(data)
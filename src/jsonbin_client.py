@@ -2,15 +2,48 @@
 jsonbin.io API 클라이언트 모듈.
 
 jsonbin.io의 GET/PUT API를 통해 여행 일정 JSON 데이터를 읽고 쓴다.
-로컬 캐시를 유지하여 jsonbin 장애 시 폴백으로 사용한다.
+로컬 캐시를 유지하여 신선도 구간(CACHE_FRESH_SECONDS) 안의 읽기는 메모리에서
+응답하고, jsonbin 장애 시에는 폴백으로 사용한다.
+snapshot_path를 지정하면 마지막 정상 데이터를 디스크에 원자적으로 저장하고
+시작 시 불러와, 재시작 직후 jsonbin 장애 중에도 폴백이 동작한다.
+
+AsyncJsonBinClient.schedule_patch()는 변경을 trip_patch 연산으로 받아 짧은
+구간(WRITE_BEHIND_DELAY) 안의 변경을 한 번의 PUT으로 합쳐 보낸다(write-behind).
+전송 시에는 최신 원격 데이터 위에 연산을 다시 적용하고, 전송 직전 원격 버전이
+기반 버전과 같은지 확인하여(낙관적 동시성) 다른 작성자의 변경을 덮어쓰지 않는다.
+전송 전까지의 상태는 캐시와 스냅샷(pendingOps)에 반영되어 읽기와 재시작 후
+재전송에 쓰인다.
+
+동시에 들어온 읽기는 진행 중인 요청 하나를 공유한다(single-flight).
+
+일시적 실패(타임아웃, 연결 실패, 429, 5xx)는 지터를 넣은 지수 백오프로
+재시도하고 Retry-After를 따른다. 실패가 계속되면 회로 차단기(CircuitBreaker)가
+열려 일정 시간 동안 요청 없이 바로 캐시로 폴백한다.
+
+JsonBinClient: requests 기반 동기 클라이언트 (스크립트/테스트용)
+AsyncJsonBinClient: aiohttp 기반 비동기 클라이언트 (봇/웹 API용)
 """
 
+import asyncio
+import contextlib
+import copy
 import logging
+import os
+import random
+import time
+from email.utils import parsedate_to_datetime
 from datetime import datetime, timezone, timedelta
-from typing import Optional
+from typing import Any, Callable, List, Optional
 
+import aiohttp
 import requests
 
+import json_codec
+from atomic_file import read_json, write_json_atomic
+from snapshot_ring import SnapshotRing
+from trip_patch import apply_patch
+from trip_stats import refresh_stats, set_last_updated
+
 logger = logging.getLogger(__name__)
 
 # 한국 표준시 (UTC+9)
@@ -18,6 +51,55 @@ KST = timezone(timedelta(hours=9))
 
 # 타임아웃 (초)
 REQUEST_TIMEOUT = 15
+CONNECT_TIMEOUT = 5  # 죽은 연결에서 전체 타임아웃까지 기다리지 않도록
+
+# 재시도 설정 (비동기 클라이언트)
+RETRY_ATTEMPTS = 3  # 첫 시도 포함
+RETRY_BASE_DELAY = 0.5  # 지수 백오프 기본 간격 (초)
+RETRY_MAX_DELAY = 8.0  # 재시도 간격 상한 (Retry-After가 이보다 길면 재시도하지 않음)
+
+# 회로 차단기 설정
+BREAKER_FAILURE_THRESHOLD = 5  # 연속 실패 횟수
+BREAKER_RESET_TIMEOUT = 30.0  # 열린 뒤 시험 요청까지의 시간 (초)
+
+# 읽기 캐시 신선도 (초)
+CACHE_FRESH_SECONDS = 10  # 이 시간 안의 읽기는 네트워크 없이 캐시로 응답
+CACHE_STALE_SECONDS = 120  # 이 시간까지는 캐시로 즉시 응답하고 백그라운드 재검증
+
+# 디스크 스냅샷 기본 경로. 스냅샷에는 그 프로세스의 전송 대기 연산(pendingOps)이
+# 들어 있으므로 봇/웹 API는 process_snapshot_path로 프로세스별 파일을 쓴다.
+DEFAULT_SNAPSHOT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "jsonbin_snapshot.json",
+)
+
+
+def process_snapshot_path(path: str, role: str) -> str:
+    """
+    프로세스별 스냅샷 경로 (data/jsonbin_snapshot.json -> data/jsonbin_snapshot.bot.json).
+
+    같은 스냅샷을 두 프로세스가 쓰면 서로의 대기 연산을 덮어쓰거나, 재시작할 때
+    다른 프로세스의 연산을 가져와 다시 보내게 된다.
+
+    Args:
+        path: 설정된 스냅샷 경로
+        role: 프로세스 이름 ("bot", "web")
+    """
+    root, ext = os.path.splitext(path)
+    return f"{root}.{role}{ext or '.json'}"
+
+# write-behind 설정 (초)
+WRITE_BEHIND_DELAY = 2.0  # 이 시간 안의 변경은 한 번의 PUT으로 합친다
+WRITE_RETRY_MAX_DELAY = 60.0  # 전송 실패 시 재시도 간격 상한
+PATCH_MAX_ATTEMPTS = 3  # 버전 충돌 시 최신 데이터로 다시 적용하는 최대 횟수
+
+# 버전 확인용 JSONPath (meta.lastUpdated만 가져온다)
+VERSION_JSON_PATH = "$.meta.lastUpdated"
+
+# 비동기 클라이언트 연결 풀 설정
+POOL_LIMIT = 10  # 동시 연결 수 상한
+KEEPALIVE_TIMEOUT = 60  # 유휴 keep-alive 연결 유지 시간 (초)
 
 
 class JsonBinError(Exception):
@@ -25,21 +107,142 @@ class JsonBinError(Exception):
     pass
 
 
+class CircuitOpenError(JsonBinError):
+    """회로 차단기가 열려 요청을 보내지 않았을 때 발생하는 예외"""
+    pass
+
+
+class CircuitBreaker:
+    """jsonbin 연속 실패 시 요청을 잠시 막는 회로 차단기
+
+    closed: 정상. 연속 실패가 failure_threshold에 이르면 open으로 전환한다.
+    open: 요청을 보내지 않는다. reset_timeout이 지나면 half_open으로 전환한다.
+    half_open: 시험 요청 하나만 허용한다. 성공하면 closed, 실패하면 다시 open.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """현재 상태 (reset_timeout이 지난 open은 half_open으로 보고한다)"""
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        """요청을 보내도 되는지 확인한다. half_open에서는 시험 요청 하나만 허용한다."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial_in_flight:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = True
+            return True
+        return False
+
+    @property
+    def trial_in_flight(self) -> bool:
+        """half_open 시험 요청이 진행 중인지"""
+        return self._trial_in_flight
+
+    def release_trial(self) -> None:
+        """
+        결과를 기록하지 못하고 끝난 시험 요청을 놓아준다 (취소, 응답 해석 오류 등).
+
+        상태는 그대로 두므로 다음 요청이 다시 시험 요청이 된다.
+        """
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        """jsonbin이 응답했음을 기록한다."""
+        if self._state != self.CLOSED:
+            logger.info("jsonbin 회로 차단기 닫힘 (복구)")
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """재시도 후에도 실패한 요청을 기록한다."""
+        self._failures += 1
+        self._trial_in_flight = False
+        if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                logger.error(
+                    "jsonbin 회로 차단기 열림 (연속 실패 %d회, %.0f초간 캐시로 응답)",
+                    self._failures,
+                    self.reset_timeout,
+                )
+            self._state = self.OPEN
+            self._opened_at = self._clock()
+
+    def retry_in(self) -> float:
+        """시험 요청이 허용되기까지 남은 시간 (초)"""
+        if self._state != self.OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+    def snapshot(self) -> dict:
+        """운영 확인용 상태 요약"""
+        return {
+            "state": self.state,
+            "consecutiveFailures": self._failures,
+            "retryIn": round(self.retry_in(), 1),
+        }
+
+
 class JsonBinClient:
     """jsonbin.io GET/PUT 클라이언트"""
 
-    def __init__(self, bin_id: str, api_key: str) -> None:
+    def __init__(
+        self,
+        bin_id: str,
+        api_key: str,
+        fresh_ttl: float = CACHE_FRESH_SECONDS,
+        stale_ttl: float = CACHE_STALE_SECONDS,
+        snapshot_path: Optional[str] = None,
+        history: Optional[SnapshotRing] = None,
+    ) -> None:
         """
         클라이언트 초기화.
 
         Args:
             bin_id: jsonbin.io Bin ID
             api_key: jsonbin.io Master Key
+            fresh_ttl: 캐시를 그대로 신뢰하는 시간 (초, 0이면 캐시 읽기 끔)
+            stale_ttl: 캐시로 응답하며 재검증하는 최대 시간 (초)
+            snapshot_path: 디스크 스냅샷 파일 경로 (None이면 메모리 캐시만 사용)
+            history: 버전별 스냅샷 링 (None이면 버전 기록 안 함)
         """
         self.bin_id = bin_id
         self.api_key = api_key
         self.base_url = "https://api.jsonbin.io/v3/b"
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
         self._cache: Optional[dict] = None
+        self._cache_version: Optional[str] = None
+        self._cached_at: Optional[float] = None
+        self._pending_ops: List[dict] = []
+        self.snapshot_path = snapshot_path
+        self.history = history
+        if snapshot_path:
+            self._load_snapshot()
 
     @property
     def _headers(self) -> dict:
@@ -62,6 +265,10 @@ class JsonBinClient:
         Raises:
             JsonBinError: API 호출 실패 시 (캐시도 없는 경우)
         """
+        if self._is_fresh():
+            logger.debug("jsonbin 캐시 적중 (%.1f초 경과)", self._cache_age())
+            return self._cache
+
         url = f"{self.base_url}/{self.bin_id}/latest"
 
         try:
@@ -77,7 +284,7 @@ class JsonBinClient:
             record = data.get("record", data)
 
             # 캐시 업데이트
-            self._cache = record
+            self._store_cache(record)
             logger.info("jsonbin GET 성공, 캐시 업데이트 완료")
             return record
 
@@ -115,7 +322,8 @@ class JsonBinClient:
         """
         url = f"{self.base_url}/{self.bin_id}"
 
-        # meta.lastUpdated를 현재 KST 시각으로 업데이트
+        # 진행 통계를 맞추고 meta.lastUpdated를 현재 KST 시각으로 업데이트
+        refresh_stats(data)
         self._update_last_updated(data)
 
         try:
@@ -128,7 +336,7 @@ class JsonBinClient:
             response.raise_for_status()
 
             # 성공 시 캐시도 업데이트
-            self._cache = data
+            self._store_cache(data)
             logger.info("jsonbin PUT 성공, 데이터 업데이트 완료")
             return True
 
@@ -160,6 +368,110 @@ class JsonBinClient:
         """
         return self._cache
 
+    def invalidate_cache(self) -> None:
+        """
+        캐시를 신선하지 않은 상태로 표시한다.
+
+        다음 get_data()는 jsonbin을 다시 확인한다. 폴백용 데이터는 유지한다.
+        """
+        self._cached_at = None
+
+    def _store_cache(self, record: dict) -> None:
+        """
+        캐시를 갱신하고 신선도 기준 시각과 버전을 기록한다.
+
+        Args:
+            record: 여행 일정 데이터
+        """
+        version = self._extract_version(record)
+        changed = self._cache is None or version is None or version != self._cache_version
+        self._cache = record
+        self._cache_version = version
+        self._cached_at = time.monotonic()
+        if changed and self.snapshot_path:
+            self._save_snapshot(record)
+        if changed and self.history is not None:
+            self.history.record(record)
+
+    def _save_snapshot(self, record: dict) -> None:
+        """
+        마지막 정상 데이터를 디스크 스냅샷으로 저장한다.
+
+        버전이 바뀐 경우에만 호출된다. 아직 jsonbin에 전송되지 않은 데이터면
+        pending 표시를 함께 남겨 재시작 후 다시 전송할 수 있게 한다.
+        저장 실패는 로그만 남긴다.
+
+        Args:
+            record: 여행 일정 데이터
+        """
+        snapshot = {
+            "savedAt": time.time(),
+            "pending": bool(self._pending_ops),
+            "pendingOps": self._pending_ops,
+            "record": record,
+        }
+        try:
+            write_json_atomic(self.snapshot_path, snapshot)
+            logger.debug("스냅샷 저장 완료: %s", self.snapshot_path)
+        except OSError as e:
+            logger.warning("스냅샷 저장 실패 (%s): %s", self.snapshot_path, e)
+
+    def _load_snapshot(self) -> None:
+        """
+        디스크 스냅샷을 캐시로 불러온다.
+
+        저장 시각만큼 경과한 캐시로 취급하므로, 오래된 스냅샷은 첫 읽기에서
+        버전 확인을 거친다. jsonbin이 응답하지 않으면 폴백으로 쓰인다.
+        """
+        snapshot = read_json(self.snapshot_path)
+        if not isinstance(snapshot, dict) or not isinstance(snapshot.get("record"), dict):
+            return
+
+        saved_at = snapshot.get("savedAt")
+        age = max(0.0, time.time() - saved_at) if isinstance(saved_at, (int, float)) else None
+
+        self._cache = snapshot["record"]
+        self._cache_version = self._extract_version(self._cache)
+        self._cached_at = time.monotonic() - age if age is not None else None
+        if snapshot.get("pending"):
+            ops = snapshot.get("pendingOps")
+            if not isinstance(ops, list) or not ops:
+                ops = [{"op": "replace", "path": "", "value": self._cache}]
+            self._pending_ops = ops
+            logger.warning("전송되지 않은 변경 %d건이 스냅샷에 남아 있음, 다시 전송 예정", len(ops))
+        logger.info(
+            "스냅샷 로드 완료 (버전: %s, 경과: %s초)",
+            self._cache_version,
+            f"{age:.0f}" if age is not None else "?",
+        )
+
+    def _cache_age(self) -> Optional[float]:
+        """캐시가 마지막으로 확인된 뒤 지난 시간(초). 캐시가 없으면 None."""
+        if self._cache is None or self._cached_at is None:
+            return None
+        return time.monotonic() - self._cached_at
+
+    def _is_fresh(self) -> bool:
+        """캐시를 네트워크 확인 없이 그대로 써도 되는지 여부"""
+        age = self._cache_age()
+        return age is not None and age < self.fresh_ttl
+
+    @staticmethod
+    def _extract_version(record: dict) -> Optional[str]:
+        """
+        데이터 버전(meta.lastUpdated)을 추출한다.
+
+        Args:
+            record: 여행 일정 데이터
+
+        Returns:
+            버전 문자열 또는 None
+        """
+        meta = record.get("meta") if isinstance(record, dict) else None
+        if isinstance(meta, dict):
+            return meta.get("lastUpdated")
+        return None
+
     def _fallback_to_cache(self, reason: str) -> dict:
         """
         캐시 폴백 처리.
@@ -182,14 +494,12 @@ class JsonBinClient:
     def _update_last_updated(data: dict) -> None:
         """
         data의 meta.lastUpdated를 현재 KST 시각(ISO8601)으로 업데이트한다.
+        진행 통계가 최신이었으면 통계 버전도 함께 옮긴다 (trip_stats).
 
         Args:
             data: 여행 일정 데이터
         """
-        if "meta" not in data:
-            data["meta"] = {}
-        now_kst = datetime.now(KST)
-        data["meta"]["lastUpdated"] = now_kst.isoformat()
+        set_last_updated(data, datetime.now(KST).isoformat())
 
     @staticmethod
     def _log_http_error(status_code: Optional[int]) -> None:
@@ -209,3 +519,617 @@ class JsonBinClient:
         }
         message = error_messages.get(status_code, f"HTTP 오류 ({status_code})")
         logger.error("jsonbin 오류: %s", message)
+
+
+class AsyncJsonBinClient(JsonBinClient):
+    """jsonbin.io GET/PUT 비동기 클라이언트
+
+    프로세스 수명 동안 하나의 aiohttp 세션(keep-alive 연결 풀)을 재사용한다.
+    jsonbin이 느려도 이벤트 루프를 막지 않으며, 캐시 폴백 동작은
+    JsonBinClient와 동일하다.
+    """
+
+    def __init__(
+        self,
+        bin_id: str,
+        api_key: str,
+        write_delay: float = WRITE_BEHIND_DELAY,
+        retry_attempts: int = RETRY_ATTEMPTS,
+        retry_base_delay: float = RETRY_BASE_DELAY,
+        breaker: Optional[CircuitBreaker] = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(bin_id, api_key, **kwargs)
+        self.write_delay = write_delay
+        self.retry_attempts = retry_attempts
+        self.retry_base_delay = retry_base_delay
+        self.breaker = breaker or CircuitBreaker()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._revalidate_task: Optional[asyncio.Task] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._inflight: Optional[asyncio.Future] = None
+        self._base: Optional[dict] = None  # 마지막으로 확인한 원격 데이터 (패치 미적용)
+        self._flush_lock = asyncio.Lock()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        공유 세션을 반환한다. 없거나 닫혔으면 새로 만든다.
+
+        세션은 실행 중인 이벤트 루프에 묶이므로 첫 요청 시점에 지연 생성한다.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=POOL_LIMIT,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self._headers,
+                json_serialize=json_codec.dumps,
+                timeout=aiohttp.ClientTimeout(
+                    total=REQUEST_TIMEOUT,
+                    sock_connect=CONNECT_TIMEOUT,
+                ),
+            )
+        return self._session
+
+    async def _request(self, method: str, url: str, **kwargs) -> Any:
+        """
+        회로 차단기와 재시도를 거쳐 요청을 보낸다.
+
+        타임아웃, 연결 실패, 429, 5xx는 지터를 넣은 지수 백오프로 재시도하며,
+        Retry-After 헤더가 있으면 그 시간을 기다린다. 그 밖의 오류(4xx 등)는
+        바로 발생시킨다.
+
+        Args:
+            method: HTTP 메서드
+            url: 요청 URL
+            **kwargs: aiohttp 요청 인자
+
+        Returns:
+            GET이면 응답 JSON, 그 밖에는 None
+
+        Raises:
+            CircuitOpenError: 회로 차단기가 열려 있는 경우
+            aiohttp.ClientError, asyncio.TimeoutError: 재시도 후에도 실패한 경우
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(
+                f"jsonbin 회로 차단 중 ({self.breaker.retry_in():.0f}초 후 재시도)"
+            )
+
+        trial = self.breaker.trial_in_flight
+        try:
+            return await self._request_with_retry(method, url, **kwargs)
+        finally:
+            # 취소나 예상하지 못한 예외로 결과를 기록하지 못했으면 half_open 시험 요청을 놓아준다
+            if trial:
+                self.breaker.release_trial()
+
+    async def _request_with_retry(self, method: str, url: str, **kwargs) -> Any:
+        """_request의 재시도 루프 (회로 차단기 허용을 받은 뒤 호출한다)."""
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                async with self._get_session().request(method, url, **kwargs) as response:
+                    response.raise_for_status()
+                    data = await response.json(loads=json_codec.loads) if method == "GET" else None
+                self.breaker.record_success()
+                return data
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                retryable, retry_after = self._classify_error(e)
+                if not retryable:
+                    # jsonbin은 응답했으므로 장애로 보지 않는다
+                    self.breaker.record_success()
+                    raise
+                delay = self._retry_delay(attempt, retry_after)
+                if attempt >= self.retry_attempts or delay is None:
+                    self.breaker.record_failure()
+                    raise
+                logger.warning(
+                    "jsonbin %s 실패 (%d/%d), %.2f초 후 재시도: %s",
+                    method, attempt, self.retry_attempts, delay, e or type(e).__name__,
+                )
+                await asyncio.sleep(delay)
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[float]) -> Optional[float]:
+        """
+        다음 재시도까지 기다릴 시간을 계산한다 (full jitter 지수 백오프).
+
+        Args:
+            attempt: 방금 실패한 시도 번호 (1부터)
+            retry_after: 서버가 요구한 대기 시간 (초)
+
+        Returns:
+            대기 시간 (초). Retry-After가 RETRY_MAX_DELAY보다 길면 None (재시도 안 함)
+        """
+        if retry_after is not None:
+            return retry_after if retry_after <= RETRY_MAX_DELAY else None
+        ceiling = min(RETRY_MAX_DELAY, self.retry_base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def _classify_error(error: BaseException) -> tuple:
+        """
+        요청 오류가 재시도 대상인지 판정한다.
+
+        Returns:
+            (재시도 여부, Retry-After 초 또는 None)
+        """
+        if isinstance(error, aiohttp.ClientResponseError):
+            if error.status == 429 or error.status >= 500:
+                headers = error.headers or {}
+                return True, _parse_retry_after(headers.get("Retry-After"))
+            return False, None
+        # 타임아웃, 연결 실패, 응답 중단 등
+        return True, None
+
+    def status(self) -> dict:
+        """운영 확인용 클라이언트 상태 요약"""
+        age = self._cache_age()
+        return {
+            "backend": "jsonbin",
+            "breaker": self.breaker.snapshot(),
+            "pendingOps": len(self._pending_ops),
+            "cacheVersion": self._cache_version,
+            "cacheAge": round(age, 1) if age is not None else None,
+        }
+
+    async def get_data(self) -> dict:
+        """
+        현재 여행 데이터를 비동기로 가져온다.
+
+        - 신선도 구간(fresh_ttl) 안: 캐시를 그대로 반환한다.
+        - 재검증 구간(stale_ttl) 안: 캐시를 즉시 반환하고 백그라운드에서 재검증한다.
+        - 그 밖: jsonbin을 확인한 뒤 반환한다.
+
+        재검증은 먼저 meta.lastUpdated만 조회하여 버전이 같으면 본문을 받지 않는다.
+        실패 시 캐시가 있으면 캐시를 반환하고, 없으면 예외를 발생시킨다.
+
+        Returns:
+            여행 일정 JSON 데이터 (dict)
+
+        Raises:
+            JsonBinError: API 호출 실패 시 (캐시도 없는 경우)
+        """
+        if self._pending_ops:
+            # 아직 전송되지 않은 변경이 최신 상태다
+            self._ensure_flush_scheduled()
+            return self._cache
+
+        age = self._cache_age()
+        if age is not None and age < self.fresh_ttl:
+            logger.debug("jsonbin 캐시 적중 (%.1f초 경과)", age)
+            return self._cache
+        if age is not None and age < self.stale_ttl:
+            logger.debug("jsonbin 캐시 재검증 예약 (%.1f초 경과)", age)
+            self._schedule_revalidate()
+            return self._cache
+
+        try:
+            return await self._revalidate_shared()
+
+        except asyncio.TimeoutError:
+            logger.error("jsonbin GET 타임아웃 (%d초)", REQUEST_TIMEOUT)
+            return self._fallback_to_cache("타임아웃")
+
+        except aiohttp.ClientResponseError as e:
+            self._log_http_error(e.status)
+            return self._fallback_to_cache(f"HTTP {e.status}")
+
+        except aiohttp.ClientConnectionError:
+            logger.error("jsonbin GET 연결 실패")
+            return self._fallback_to_cache("연결 실패")
+
+        except aiohttp.ClientError as e:
+            logger.error("jsonbin GET 요청 실패: %s", e)
+            return self._fallback_to_cache(str(e))
+
+        except CircuitOpenError as e:
+            logger.warning("%s", e)
+            return self._fallback_to_cache("회로 차단")
+
+    async def _revalidate_shared(self) -> dict:
+        """
+        진행 중인 재검증이 있으면 그 결과를 함께 기다린다 (single-flight).
+
+        동시에 호출한 쪽들은 하나의 요청 결과(또는 예외)를 똑같이 받는다.
+        한 호출자가 취소되어도 공유 요청은 계속 진행된다.
+        """
+        if self._inflight is None or self._inflight.done():
+            future = asyncio.ensure_future(self._revalidate())
+            self._inflight = future
+
+            def _clear(done: asyncio.Future) -> None:
+                if self._inflight is done:
+                    self._inflight = None
+                if not done.cancelled():
+                    # 대기자가 없을 때의 "never retrieved" 경고 방지
+                    done.exception()
+
+            future.add_done_callback(_clear)
+        else:
+            logger.debug("jsonbin 진행 중인 요청에 합류")
+        return await asyncio.shield(self._inflight)
+
+    async def _revalidate(self) -> dict:
+        """
+        캐시를 jsonbin과 대조하여 최신 데이터를 반환한다.
+
+        캐시가 있으면 버전만 먼저 확인하고, 같으면 캐시의 신선도만 갱신한다.
+
+        Raises:
+            aiohttp.ClientError, asyncio.TimeoutError: 요청 실패 시
+        """
+        if self._cache is not None and self._cache_version is not None:
+            remote_version = await self._fetch_version()
+            if remote_version == self._cache_version or self._pending_ops:
+                self._cached_at = time.monotonic()
+                logger.debug("jsonbin 버전 동일 (%s), 캐시 유지", remote_version)
+                return self._cache
+
+        return await self._fetch_record()
+
+    async def _fetch_version(self) -> Optional[str]:
+        """
+        jsonbin에서 meta.lastUpdated만 조회한다 (X-JSON-Path).
+
+        Returns:
+            원격 버전 문자열 또는 None (형식이 예상과 다른 경우)
+        """
+        url = f"{self.base_url}/{self.bin_id}/latest"
+        headers = {"X-JSON-Path": VERSION_JSON_PATH, "X-Bin-Meta": "false"}
+        data = await self._request("GET", url, headers=headers)
+
+        if isinstance(data, list) and data and isinstance(data[0], str):
+            return data[0]
+        return None
+
+    async def _fetch_record(self) -> dict:
+        """
+        jsonbin에서 전체 데이터를 가져와 캐시를 갱신한다.
+
+        Raises:
+            aiohttp.ClientError, asyncio.TimeoutError: 요청 실패 시
+        """
+        record = await self._get_record()
+
+        if self._pending_ops:
+            # 요청 중에 쓰기가 예약되었으면 전송 대기 중인 데이터를 우선한다
+            return self._cache
+
+        # 캐시 업데이트
+        self._store_cache(record)
+        logger.info("jsonbin GET 성공, 캐시 업데이트 완료")
+        return record
+
+    async def _get_record(self) -> dict:
+        """
+        jsonbin에서 전체 데이터를 가져온다. 원격 기준 데이터(_base)도 갱신한다.
+
+        Raises:
+            aiohttp.ClientError, asyncio.TimeoutError: 요청 실패 시
+        """
+        url = f"{self.base_url}/{self.bin_id}/latest"
+        data = await self._request("GET", url)
+
+        # jsonbin v3 응답에서 record 추출
+        record = data.get("record", data)
+        self._base = record
+        return record
+
+    def _schedule_revalidate(self) -> None:
+        """백그라운드 재검증을 시작한다. 이미 진행 중이면 아무것도 하지 않는다."""
+        if self._revalidate_task is not None and not self._revalidate_task.done():
+            return
+        self._revalidate_task = asyncio.create_task(self._background_revalidate())
+
+    async def _background_revalidate(self) -> None:
+        """백그라운드 재검증. 실패해도 기존 캐시를 그대로 둔다."""
+        try:
+            await self._revalidate_shared()
+        except (aiohttp.ClientError, asyncio.TimeoutError, JsonBinError) as e:
+            logger.warning("jsonbin 백그라운드 재검증 실패, 캐시 유지: %s", e)
+
+    async def put_data(self, data: dict) -> bool:
+        """
+        여행 데이터를 jsonbin.io에 비동기로 즉시 업데이트한다.
+
+        업데이트 전 meta.lastUpdated를 현재 KST 시각으로 설정한다.
+
+        Args:
+            data: 업데이트할 여행 일정 JSON 데이터
+
+        Returns:
+            성공 여부 (bool)
+
+        Raises:
+            JsonBinError: API 호출 실패 시
+        """
+        # 진행 통계를 맞추고 meta.lastUpdated를 현재 KST 시각으로 업데이트
+        refresh_stats(data)
+        self._update_last_updated(data)
+
+        await self._send_put(data)
+
+        # 성공 시 캐시도 업데이트
+        self._base = data
+        self._store_cache(data)
+        logger.info("jsonbin PUT 성공, 데이터 업데이트 완료")
+        return True
+
+    async def _send_put(self, data: dict) -> None:
+        """
+        데이터를 jsonbin.io에 PUT한다.
+
+        Args:
+            data: 전송할 여행 일정 JSON 데이터
+
+        Raises:
+            JsonBinError: API 호출 실패 시
+        """
+        url = f"{self.base_url}/{self.bin_id}"
+
+        try:
+            await self._request("PUT", url, json=data)
+
+        except asyncio.TimeoutError:
+            logger.error("jsonbin PUT 타임아웃 (%d초)", REQUEST_TIMEOUT)
+            raise JsonBinError(f"jsonbin PUT 타임아웃 ({REQUEST_TIMEOUT}초)")
+
+        except aiohttp.ClientResponseError as e:
+            self._log_http_error(e.status)
+            raise JsonBinError(f"jsonbin PUT 실패: HTTP {e.status}")
+
+        except aiohttp.ClientConnectionError:
+            logger.error("jsonbin PUT 연결 실패")
+            raise JsonBinError("jsonbin PUT 연결 실패")
+
+        except aiohttp.ClientError as e:
+            logger.error("jsonbin PUT 요청 실패: %s", e)
+            raise JsonBinError(f"jsonbin PUT 요청 실패: {e}")
+
+    # -- write-behind -------------------------------------------------------
+
+    @property
+    def has_pending(self) -> bool:
+        """jsonbin에 아직 전송되지 않은 변경이 있는지 여부"""
+        return bool(self._pending_ops)
+
+    def schedule_patch(self, ops: List[dict]) -> None:
+        """
+        변경 연산(trip_patch) 저장을 예약한다 (write-behind).
+
+        연산은 즉시 현재 캐시에 적용되어 이후 get_data()가 이 상태를 반환한다.
+        write_delay 안에 들어온 연산은 모아서 한 번만 PUT하며, 전송 시에는
+        최신 원격 데이터 위에 다시 적용한다. 실패하면 간격을 늘려가며 재시도한다.
+
+        Args:
+            ops: ExecutionContext.patch 형식의 연산 목록
+
+        Raises:
+            JsonBinError: 적용할 캐시 데이터가 없는 경우
+        """
+        if not ops:
+            return
+        if self._cache is None:
+            raise JsonBinError("패치를 적용할 데이터가 없음 (캐시 없음)")
+
+        data, _skipped = apply_patch(copy.deepcopy(self._cache), ops, strict=False)
+        refresh_stats(data, ops)
+        self._enqueue(list(ops), data)
+
+    def schedule_put(self, data: dict) -> None:
+        """
+        여행 데이터 전체 저장을 예약한다 (write-behind).
+
+        전체 덮어쓰기 연산 하나로 취급되므로, 이전에 예약된 연산보다 우선하고
+        이후에 예약된 연산은 이 데이터 위에 적용된다.
+
+        Args:
+            data: 저장할 여행 일정 JSON 데이터
+        """
+        refresh_stats(data)
+        self._enqueue([{"op": "replace", "path": "", "value": data}], data)
+
+    def rollback(self, version: int) -> dict:
+        """
+        스냅샷 링의 버전으로 되돌린다 (전체 덮어쓰기로 저장 예약).
+
+        Args:
+            version: 스냅샷 버전 번호
+
+        Returns:
+            되돌린 여행 데이터
+
+        Raises:
+            JsonBinError: 버전 기록이 꺼져 있거나 보관 중이 아닌 버전인 경우
+        """
+        if self.history is None:
+            raise JsonBinError("버전 기록이 설정되지 않았습니다")
+        try:
+            data = self.history.restore(version)
+        except KeyError:
+            raise JsonBinError(f"보관 중이 아닌 버전입니다: {version}")
+        self.schedule_put(data)
+        logger.warning("%d번 버전으로 되돌림 (jsonbin 저장 예약)", version)
+        return data
+
+    def _enqueue(self, ops: List[dict], data: dict) -> None:
+        """연산을 대기열에 추가하고, 적용 결과를 캐시와 스냅샷에 반영한다."""
+        self._update_last_updated(data)
+        self._pending_ops.extend(ops)
+        self._store_cache(data)
+        self._ensure_flush_scheduled()
+        logger.info(
+            "jsonbin PUT 예약 (대기 연산 %d건, %.1f초 후 전송)",
+            len(self._pending_ops),
+            self.write_delay,
+        )
+
+    async def flush(self) -> bool:
+        """
+        전송 대기 중인 변경을 즉시 PUT한다.
+
+        Returns:
+            전송할 변경이 없거나 전송에 성공하면 True
+
+        Raises:
+            JsonBinError: 전송 실패 시 (변경은 대기 상태로 남는다)
+        """
+        async with self._flush_lock:
+            ops = list(self._pending_ops)
+            if not ops:
+                return True
+
+            data = await self._rebase(ops)
+            await self._send_put(data)
+            self._base = data
+
+            # 전송 중에 새로 예약된 연산은 남겨 두고 다음 전송에서 보낸다
+            del self._pending_ops[: len(ops)]
+            if self._pending_ops:
+                data, _skipped = apply_patch(
+                    copy.deepcopy(data), self._pending_ops, strict=False
+                )
+                refresh_stats(data, self._pending_ops)
+                self._update_last_updated(data)
+            self._store_cache(data)
+            logger.info("jsonbin PUT 성공 (write-behind, 연산 %d건)", len(ops))
+            return True
+
+    async def _rebase(self, ops: List[dict]) -> dict:
+        """
+        최신 원격 데이터 위에 연산을 적용한 전송용 문서를 만든다.
+
+        jsonbin은 조건부 PUT을 지원하지 않으므로, 기반 데이터를 새로 받은 경우
+        전송 직전 원격 버전(meta.lastUpdated)을 다시 확인하여 그 사이에 다른
+        작성자가 저장했으면 최신 데이터로 다시 적용한다.
+
+        Args:
+            ops: 대기 중인 연산 목록
+
+        Returns:
+            전송할 여행 일정 데이터
+
+        Raises:
+            JsonBinError: 원격 확인 실패 또는 충돌이 계속되는 경우
+        """
+        # 전체 덮어쓰기가 있으면 그 이후 연산만 적용하면 된다
+        roots = [i for i, op in enumerate(ops) if op.get("path") == ""]
+        if roots:
+            base = ops[roots[-1]]["value"]
+            data, _skipped = apply_patch(copy.deepcopy(base), ops[roots[-1] + 1:], strict=False)
+            refresh_stats(data, ops[roots[-1] + 1:])
+            self._update_last_updated(data)
+            return data
+
+        try:
+            for attempt in range(1, PATCH_MAX_ATTEMPTS + 1):
+                remote_version = await self._fetch_version()
+                base = self._base
+                if base is None or remote_version != self._extract_version(base):
+                    base = await self._get_record()
+                    # precondition: 받은 데이터가 여전히 최신인지 확인
+                    remote_version = await self._fetch_version()
+                    if remote_version != self._extract_version(base):
+                        logger.warning(
+                            "jsonbin 버전 충돌 (%d/%d), 최신 데이터로 다시 적용",
+                            attempt,
+                            PATCH_MAX_ATTEMPTS,
+                        )
+                        continue
+
+                data, skipped = apply_patch(copy.deepcopy(base), ops, strict=False)
+                if skipped:
+                    logger.warning("원격에서 사라진 대상에 대한 연산 %d건 제외", len(skipped))
+                # 통계는 patch에 없으므로 최신 데이터 기준으로 연산이 닿은 날만 다시 센다
+                refresh_stats(data, ops)
+                self._update_last_updated(data)
+                return data
+
+        except asyncio.TimeoutError:
+            raise JsonBinError("jsonbin 최신 데이터 확인 타임아웃")
+        except aiohttp.ClientResponseError as e:
+            self._log_http_error(e.status)
+            raise JsonBinError(f"jsonbin 최신 데이터 확인 실패: HTTP {e.status}")
+        except aiohttp.ClientError as e:
+            raise JsonBinError(f"jsonbin 최신 데이터 확인 실패: {e}")
+
+        raise JsonBinError(f"jsonbin 버전 충돌이 {PATCH_MAX_ATTEMPTS}회 계속됨")
+
+    def _ensure_flush_scheduled(self) -> None:
+        """대기 중인 변경이 있으면 전송 태스크를 시작한다."""
+        if not self._pending_ops:
+            return
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        """대기 구간이 지나면 전송하고, 실패하면 간격을 두 배로 늘려 재시도한다."""
+        delay = self.write_delay
+        while self._pending_ops:
+            await asyncio.sleep(delay)
+            try:
+                await self.flush()
+                delay = self.write_delay
+            except JsonBinError as e:
+                delay = min(max(delay, 1.0) * 2, WRITE_RETRY_MAX_DELAY)
+                logger.warning("write-behind 전송 실패, %.0f초 후 재시도: %s", delay, e)
+            except Exception:
+                # 예상하지 못한 오류로 전송 태스크가 끝나면 대기 연산이 close()까지 남는다
+                delay = min(max(delay, 1.0) * 2, WRITE_RETRY_MAX_DELAY)
+                logger.exception("write-behind 전송 중 예기치 않은 오류, %.0f초 후 재시도", delay)
+
+    async def close(self) -> None:
+        """
+        대기 중인 변경을 전송하고 공유 세션을 닫는다. 종료 시 한 번 호출한다.
+
+        전송에 실패한 변경은 스냅샷에 pending으로 남아 다음 시작 때 다시 전송된다.
+        """
+        for task in (self._revalidate_task, self._flush_task, self._inflight):
+            if task is not None and not task.done():
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        self._revalidate_task = None
+        self._flush_task = None
+        self._inflight = None
+
+        try:
+            await self.flush()
+        except JsonBinError as e:
+            logger.error("종료 전 write-behind 전송 실패, 스냅샷에 보존: %s", e)
+        except Exception:
+            logger.exception("종료 전 write-behind 전송 중 예기치 않은 오류, 스냅샷에 보존")
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After 헤더 값(초 또는 HTTP 날짜)을 대기 시간(초)으로 변환한다.
+
+    Args:
+        value: 헤더 값
+
+    Returns:
+        대기 시간 (초) 또는 None (없거나 해석할 수 없는 경우)
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,124 @@
+"""
+영업시간 문자열 파서.
+
+옵션의 hours 필드(사람이 쓴 문자열)를 요일별 영업 구간으로 바꾼다.
+
+    "11:00~21:00 (브레이크 15:00~17:00)"     -> 매일 11:00~15:00, 17:00~21:00
+    "평일 11:00~21:00, 주말 10:30~21:00"     -> 요일별 구간
+    "화~토 11:00~20:00 (일·월 휴무)"          -> 화~토만
+    "08:00~21:00 (목요일 휴무)"               -> 목요일 제외
+    "영업시간 유동적 (전화 확인 필요)"          -> None (알 수 없음)
+
+구간은 자정 기준 분 단위 [시작, 끝)이며, 자정을 넘기는 구간은 다음 요일로 나눈다.
+요일 번호는 datetime.weekday()와 같다 (월=0 ... 일=6).
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+Schedule = Dict[int, List[Tuple[int, int]]]
+
+_DAY_NAMES = "월화수목금토일"
+_DAY_MINUTES = 24 * 60
+
+_RANGE_RE = re.compile(
+    r"(?:(평일|주말|매일|[월화수목금토일](?:\s*~\s*[월화수목금토일])?)(?:요일)?\s*)?"
+    r"(\d{1,2}):(\d{2})\s*~\s*(\d{1,2}):(\d{2})"
+)
+_BREAK_RE = re.compile(r"브레이크\s*(\d{1,2}):(\d{2})\s*~\s*(\d{1,2}):(\d{2})")
+_CLOSED_RE = re.compile(r"((?:[월화수목금토일](?:요일)?\s*[·,/]?\s*)+)(?:정기\s*)?휴무")
+_PAREN_RE = re.compile(r"\(([^)]*)\)")
+
+
+def _days_of(spec: Optional[str]) -> List[int]:
+    """요일 지정("평일", "화~토", "목" 등)을 요일 번호 목록으로."""
+    if not spec or spec == "매일":
+        return list(range(7))
+    if spec == "평일":
+        return list(range(5))
+    if spec == "주말":
+        return [5, 6]
+    spec = spec.replace(" ", "")
+    if "~" in spec:
+        start, end = (_DAY_NAMES.index(ch) for ch in spec.split("~"))
+        return [(start + i) % 7 for i in range((end - start) % 7 + 1)]
+    return [_DAY_NAMES.index(spec)]
+
+
+def _subtract(intervals: List[Tuple[int, int]], cut: Tuple[int, int]) -> List[Tuple[int, int]]:
+    result = []
+    for start, end in intervals:
+        if cut[1] <= start or end <= cut[0]:
+            result.append((start, end))
+            continue
+        if start < cut[0]:
+            result.append((start, cut[0]))
+        if cut[1] < end:
+            result.append((cut[1], end))
+    return result
+
+
+def parse_hours(text: Optional[str]) -> Optional[Schedule]:
+    """
+    영업시간 문자열을 요일별 영업 구간으로 바꾼다.
+
+    Args:
+        text: hours 필드 값
+
+    Returns:
+        {요일: [(시작 분, 끝 분), ...]} (영업하지 않는 요일은 빈 목록),
+        시간 구간을 읽을 수 없으면 None
+    """
+    if not isinstance(text, str) or not text.strip():
+        return None
+
+    notes = " ".join(_PAREN_RE.findall(text))
+    main = _PAREN_RE.sub(" ", text)
+
+    schedule: Schedule = {wd: [] for wd in range(7)}
+    found = False
+    for m in _RANGE_RE.finditer(main):
+        spec, h1, m1, h2, m2 = m.groups()
+        start = int(h1) * 60 + int(m1)
+        end = int(h2) * 60 + int(m2)
+        if end <= start:
+            end += _DAY_MINUTES  # 자정 넘김
+        for wd in _days_of(spec):
+            schedule[wd].append((start, min(end, _DAY_MINUTES)))
+            if end > _DAY_MINUTES:
+                schedule[(wd + 1) % 7].append((0, end - _DAY_MINUTES))
+        found = True
+    if not found:
+        return None
+
+    for m in _BREAK_RE.finditer(notes):
+        h1, m1, h2, m2 = m.groups()
+        cut = (int(h1) * 60 + int(m1), int(h2) * 60 + int(m2))
+        for wd in schedule:
+            schedule[wd] = _subtract(schedule[wd], cut)
+
+    for m in _CLOSED_RE.finditer(notes + " " + main):
+        for ch in m.group(1).replace("요일", ""):
+            if ch in _DAY_NAMES:
+                schedule[_DAY_NAMES.index(ch)] = []
+
+    for wd in schedule:
+        schedule[wd].sort()
+    return schedule
+
+
+def is_open(schedule: Optional[Schedule], weekday: int, minute: int) -> Optional[bool]:
+    """
+    영업 중인지 여부.
+
+    Args:
+        schedule: parse_hours 결과
+        weekday: 요일 (월=0)
+        minute: 자정 기준 분
+
+    Returns:
+        영업 중이면 True, 아니면 False, 영업시간을 모르면 None
+    """
+    if schedule is None:
+        return None
+    return any(start <= minute < end for start, end in schedule.get(weekday, []))
@@ -0,0 +1,179 @@
+"""
+일정 개요(시스템 프롬프트의 [일정 개요]) 캐시 모듈.
+
+개요 텍스트는 메시지마다 필요하지만 데이터는 쓰기 때문에만 바뀐다. 저장소는
+기록할 때마다 meta.lastUpdated를 새로 찍으므로 이를 데이터 버전으로 보고,
+버전이 같으면 만들어 둔 텍스트를 그대로 쓴다 (O(1)).
+
+버전이 바뀌면 일차마다 개요에 들어가는 필드만 모은 키(day_key)를 이전 키와
+비교해 달라진 일차만 다시 만들고 나머지는 이전 텍스트를 이어 붙인다.
+데이터 전체를 해시하면 개요를 새로 만드는 것보다 느리므로 버전 비교를 먼저 한다.
+
+공유 파일 경로를 주면 봇/웹 API 프로세스가 같은 캐시를 쓴다. 한 프로세스가
+새 버전의 개요를 만들면 파일을 원자적으로 교체하고, 다른 프로세스는 파일이
+바뀌었을 때(inode/mtime)만 다시 읽는다.
+
+    {"version": "<meta.lastUpdated>",
+     "days": [{"key": [...], "text": "### Day 1 ..."}, ...]}
+"""
+
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from atomic_file import read_json, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# 기본 공유 파일 경로 (봇/웹 API 프로세스가 공유)
+DEFAULT_OVERVIEW_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "overview_cache.json",
+)
+
+_STATUS_ICONS = {"done": "[v]", "skipped": "[x]"}
+
+
+def day_key(day: dict) -> list:
+    """
+    일차의 개요 텍스트를 결정하는 필드만 모은 키.
+
+    JSON으로 저장했다 읽어도 같게 비교되도록 리스트로 만든다.
+    """
+    items = []
+    for item in day.get("items", []):
+        names = [o.get("name", "") for o in item.get("options", []) if o.get("name")]
+        items.append([
+            item.get("status", "planned"), item.get("id", ""), item.get("time", ""),
+            item.get("title", ""), item.get("chosen", ""), names,
+        ])
+    return [day.get("dayNum", ""), day.get("date", ""), day.get("dow", ""), day.get("title", ""), items]
+
+
+def render_day(key: list) -> str:
+    """day_key로 일차 개요 텍스트를 만든다 (헤더 + 항목 줄)."""
+    day_num, date, dow, title, items = key
+    lines = [f"### Day {day_num} ({date}, {dow}) - {title}"]
+    for status, item_id, time, item_title, chosen, names in items:
+        icon = _STATUS_ICONS.get(status, "[ ]")
+        suffix = ""
+        if chosen:
+            suffix = f" [확정: {chosen}]"
+        elif names:
+            suffix = f" (후보: {', '.join(names)})"
+        lines.append(f"  {icon} {item_id} | {time} | {item_title}{suffix}")
+    return "\n".join(lines)
+
+
+def join_days(texts: List[str]) -> str:
+    """일차 텍스트를 빈 줄로 이어 개요를 만든다."""
+    return "\n\n".join(texts).rstrip()
+
+
+def data_version(data: dict) -> Optional[str]:
+    """데이터 버전 (meta.lastUpdated, 없으면 None)."""
+    meta = data.get("meta")
+    if isinstance(meta, dict):
+        return meta.get("lastUpdated") or None
+    return None
+
+
+class OverviewCache:
+    """데이터 버전별 일정 개요 캐시 (일차 단위 증분 갱신, 선택적 프로세스 간 공유)"""
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """
+        캐시를 만든다.
+
+        Args:
+            path: 공유 파일 경로 (None이면 프로세스 메모리에만 둔다)
+        """
+        self.path = path
+        self._version: Optional[str] = None
+        self._text = ""
+        self._days: List[Tuple[list, str]] = []
+        self._signature: Optional[Tuple[int, int]] = None
+        # 계측 (테스트/로그용): 버전 일치, 공유 파일 사용, 다시 만든 일차 수
+        self.hits = 0
+        self.shared_hits = 0
+        self.rebuilt_days = 0
+
+    def get(self, data: dict) -> str:
+        """
+        data의 일정 개요 텍스트.
+
+        Args:
+            data: 여행 데이터
+
+        Returns:
+            build_schedule_overview(data)와 같은 텍스트
+        """
+        version = data_version(data)
+        if version is not None and version == self._version:
+            self.hits += 1
+            return self._text
+
+        if self.path and self._load_shared() and version is not None and version == self._version:
+            self.shared_hits += 1
+            return self._text
+
+        previous: Dict[Any, Tuple[list, str]] = {key[0]: (key, text) for key, text in self._days}
+        days: List[Tuple[list, str]] = []
+        rebuilt = 0
+        for day in data.get("days", []):
+            key = day_key(day)
+            cached = previous.get(key[0])
+            if cached is not None and cached[0] == key:
+                days.append(cached)
+            else:
+                days.append((key, render_day(key)))
+                rebuilt += 1
+        self.rebuilt_days += rebuilt
+
+        self._days = days
+        self._text = join_days([text for _, text in days])
+        self._version = version
+        logger.debug("일정 개요 갱신: 버전 %s, %d/%d일차 다시 만듦", version, rebuilt, len(days))
+        if self.path and version is not None:
+            self._save_shared()
+        return self._text
+
+    # -- 공유 파일 ------------------------------------------------------------
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_mtime_ns
+
+    def _load_shared(self) -> bool:
+        """공유 파일이 바뀌었으면 읽어 캐시로 삼는다. 읽었으면 True."""
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return False
+        self._signature = signature
+        stored = read_json(self.path)
+        try:
+            days = [(entry["key"], entry["text"]) for entry in stored["days"]]
+            version = stored["version"]
+        except (KeyError, TypeError):
+            logger.warning("일정 개요 캐시 파일 형식이 올바르지 않음: %s", self.path)
+            return False
+        self._days = days
+        self._version = version
+        self._text = join_days([text for _, text in days])
+        return True
+
+    def _save_shared(self) -> None:
+        stored = {
+            "version": self._version,
+            "days": [{"key": key, "text": text} for key, text in self._days],
+        }
+        try:
+            write_json_atomic(self.path, stored)
+        except OSError as e:
+            logger.warning("일정 개요 캐시 파일 기록 실패 (%s): %s", self.path, e)
+            return
+        self._signature = self._stat()
@@ -0,0 +1,112 @@
+"""
+읽기 도구 결과 크기 조절 모듈.
+
+도구 결과는 tool_result로 프롬프트에 들어가고, 이후 라운드마다 다시 전송된다.
+읽기 도구(get_schedule, find_item, search_items, get_item_detail)는 이 모듈로
+결과를 작게 만든다.
+
+    필드 선택  fields=[...]로 돌려줄 필드를 고른다 (기본은 작은 필드 묶음)
+    페이지     limit개씩 잘라 next_cursor를 돌려주고, cursor로 이어서 받는다
+    바이트 예산 한 결과의 직렬화 크기가 RESULT_BYTE_BUDGET을 넘기 전에 페이지를 끊는다
+
+커서는 다음 원소의 위치를 담은 문자열이다. 같은 턴 안에서 이어 받는 용도라
+그 사이 데이터가 바뀌면 위치가 어긋날 수 있다.
+"""
+
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+import json_codec
+
+# 결과 하나의 직렬화 크기 상한 (UTF-8 바이트, 첫 원소는 넘더라도 포함)
+RESULT_BYTE_BUDGET = 4000
+
+# 목록 도구의 기본/최대 페이지 크기
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 50
+
+
+def json_size(value: Any) -> int:
+    """값의 JSON 직렬화 크기 (UTF-8 바이트)."""
+    return len(json_codec.dumps_bytes(value))
+
+
+def parse_cursor(cursor: Optional[str]) -> int:
+    """
+    커서를 시작 위치로 바꾼다.
+
+    Raises:
+        ValueError: 이전 결과의 next_cursor가 아닌 값인 경우
+    """
+    if cursor in (None, ""):
+        return 0
+    if not str(cursor).isdigit():
+        raise ValueError(f"잘못된 cursor입니다: {cursor!r} (이전 결과의 next_cursor를 그대로 넣어주세요)")
+    return int(cursor)
+
+
+def page_size(limit: Optional[int], default: int = DEFAULT_PAGE_SIZE) -> int:
+    """요청한 페이지 크기를 1~MAX_PAGE_SIZE로 맞춘다 (없으면 default)."""
+    if limit is None:
+        return default
+    return max(1, min(int(limit), MAX_PAGE_SIZE))
+
+
+def paginate(
+    entries: Sequence[Any],
+    shape: Callable[[Any], dict],
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    budget: int = RESULT_BYTE_BUDGET,
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    entries의 한 페이지를 shape로 변환한다.
+
+    cursor 위치부터 limit개까지, 변환한 원소의 직렬화 크기 합이 budget을
+    넘기 전까지 담는다 (첫 원소는 항상 담는다). 페이지 밖의 원소는 변환하지 않는다.
+
+    Args:
+        entries: 전체 원소 (정렬된 목록)
+        shape: 원소를 결과 dict로 바꾸는 함수
+        cursor: 이전 페이지의 next_cursor (None이면 처음부터)
+        limit: 최대 원소 수
+        budget: 원소 직렬화 크기 합의 상한 (바이트)
+
+    Returns:
+        (변환한 원소 목록, 다음 페이지 커서 - 마지막 페이지면 None)
+
+    Raises:
+        ValueError: 잘못된 cursor인 경우
+    """
+    start = parse_cursor(cursor)
+    page: List[dict] = []
+    used = 0
+    pos = start
+    end = min(len(entries), start + limit)
+    while pos < end:
+        entry = shape(entries[pos])
+        size = json_size(entry) + 1  # 구분자
+        if page and used + size > budget:
+            break
+        page.append(entry)
+        used += size
+        pos += 1
+    return page, (str(pos) if pos < len(entries) else None)
+
+
+def project(source: dict, fields: Iterable[str], defaults: Optional[dict] = None) -> dict:
+    """
+    source에서 fields만 골라 새 dict를 만든다 (없는 필드는 defaults 값, 그것도 없으면 생략).
+
+    fields에 "*"가 있으면 source 전체를 얕게 복사한다.
+    """
+    fields = list(fields)
+    if "*" in fields:
+        return dict(source)
+    defaults = defaults or {}
+    result = {}
+    for field in fields:
+        if field in source:
+            result[field] = source[field]
+        elif field in defaults:
+            result[field] = defaults[field]
+    return result
@@ -0,0 +1,340 @@
+"""
+한국어 검색 인덱스 모듈.
+
+find_item/find_option의 키워드 검색을 띄어쓰기 차이("복길경주본점" vs
+"복길 경주본점"), 초성 검색("ㅂㄱ"), 작은 오타("향화졍")까지 찾도록 정규화한
+n-gram으로 처리한다.
+
+    정규화: NFC, 소문자, 공백/구두점 제거
+    음절 n-gram (1~2글자) -> 키    부분 일치 후보 (모든 gram의 교집합)
+    초성 n-gram (1~2글자)  -> 키    초성 질의 후보
+    자모 3-gram            -> 키    오타 허용 후보 (질의 gram의 60% 이상 공유)
+
+오타 허용 검색은 부분/초성 일치 결과가 없을 때만 한다. 후보를 모은 뒤
+텍스트별 점수(match_score)로 확인하고 점수순으로 정렬한다. 키는 호출자가
+정한다 (TripIndex는 item id를 쓴다).
+"""
+
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# 한글 음절 / 호환 자모 표
+_HANGUL_BASE = 0xAC00
+_HANGUL_END = 0xD7A3
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSEONG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ",
+              "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+_CHOSEONG_SET = frozenset(_CHOSEONG)
+
+_STRIP_RE = re.compile(r"[\W_]+")
+
+# 오타 허용 검색: 질의 자모 3-gram 중 공유해야 하는 비율, 최소 질의 자모 수
+FUZZY_MIN_RATIO = 0.6
+FUZZY_MIN_JAMO = 4
+
+# 부분 일치에 필요한 최소 질의 길이 (정규화 후, 한 글자는 완전/접두 일치만)
+MIN_SUBSTRING_LEN = 2
+
+# 일치 종류별 점수
+SCORE_EXACT = 1.0
+SCORE_PREFIX = 0.9
+SCORE_SUBSTRING = 0.8
+SCORE_CHOSEONG_PREFIX = 0.75
+SCORE_CHOSEONG = 0.7
+SCORE_FUZZY = 0.6
+
+# 필드 가중치 (위치 필드는 여러 항목이 공유하므로 낮게)
+FIELD_WEIGHTS = {"title": 1.0, "name": 1.0, "alias": 1.0, "loc": 0.8}
+
+
+# ---------------------------------------------------------------------------
+# 정규화
+# ---------------------------------------------------------------------------
+
+def normalize(text: str) -> str:
+    """검색용 정규화: NFC, 소문자, 공백/구두점 제거."""
+    return _STRIP_RE.sub("", unicodedata.normalize("NFC", text or "").lower())
+
+
+def choseong(text: str) -> str:
+    """한글 음절을 초성으로 바꾼다 (그 밖의 문자는 그대로)."""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_END:
+            out.append(_CHOSEONG[(code - _HANGUL_BASE) // 588])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def jamo(text: str) -> str:
+    """한글 음절을 초성/중성/종성 자모로 풀어 쓴다 (그 밖의 문자는 그대로)."""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_END:
+            offset = code - _HANGUL_BASE
+            out.append(_CHOSEONG[offset // 588])
+            out.append(_JUNGSEONG[(offset % 588) // 28])
+            out.append(_JONGSEONG[offset % 28])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def is_choseong_query(query: str) -> bool:
+    """정규화된 질의가 초성으로만 이루어졌는지 여부"""
+    return bool(query) and all(ch in _CHOSEONG_SET for ch in query)
+
+
+def _grams(text: str, n: int) -> Set[str]:
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def _syllable_grams(text: str) -> Set[str]:
+    """1~2글자 gram (한 글자 질의도 후보를 찾을 수 있게)"""
+    return _grams(text, 1) | _grams(text, 2)
+
+
+# ---------------------------------------------------------------------------
+# 점수
+# ---------------------------------------------------------------------------
+
+class _Query:
+    """정규화해 둔 질의"""
+
+    __slots__ = ("text", "is_choseong", "jamo_grams")
+
+    def __init__(self, query: str) -> None:
+        self.text = normalize(query)
+        self.is_choseong = is_choseong_query(self.text)
+        jamo_text = jamo(self.text)
+        self.jamo_grams = _grams(jamo_text, 3) if len(jamo_text) >= FUZZY_MIN_JAMO else set()
+
+
+def _word_starts(raw: str) -> Set[int]:
+    """원문의 단어(공백/구두점으로 나뉜 조각)가 정규화된 텍스트에서 시작하는 위치."""
+    starts, pos = set(), 0
+    for word in _STRIP_RE.split(unicodedata.normalize("NFC", raw or "").lower()):
+        if word:
+            starts.add(pos)
+            pos += len(word)
+    return starts
+
+
+def _score_normalized(q: _Query, text: str, text_jamo_grams: Optional[Set[str]] = None,
+                      raw: str = "") -> float:
+    """
+    정규화된 텍스트에 대한 질의 점수 (0이면 불일치).
+
+    초성 질의는 텍스트 맨 앞이나 원문(raw)의 단어 시작에서만 일치로 본다
+    ("ㅂㄱ"이 "장보기"의 "ㅂㄱ"에 걸리지 않게).
+    """
+    if not q.text or not text:
+        return 0.0
+    if text == q.text:
+        return SCORE_EXACT
+    if text.startswith(q.text):
+        return SCORE_PREFIX
+    if len(q.text) >= MIN_SUBSTRING_LEN and q.text in text:
+        return SCORE_SUBSTRING
+    if q.is_choseong:
+        initials = choseong(text)
+        if initials.startswith(q.text):
+            return SCORE_CHOSEONG_PREFIX
+        if q.text in initials:
+            starts = _word_starts(raw)
+            at = initials.find(q.text, 1)
+            while at != -1:
+                if at in starts:
+                    return SCORE_CHOSEONG
+                at = initials.find(q.text, at + 1)
+        return 0.0
+    if q.jamo_grams:
+        if text_jamo_grams is None:
+            text_jamo_grams = _grams(jamo(text), 3)
+        ratio = len(q.jamo_grams & text_jamo_grams) / len(q.jamo_grams)
+        if ratio >= FUZZY_MIN_RATIO:
+            return SCORE_FUZZY * ratio
+    return 0.0
+
+
+def match_score(query: str, text: str) -> float:
+    """
+    질의와 텍스트의 일치 점수.
+
+    완전 일치 1.0 > 접두 0.9 > 부분 0.8 > 초성 접두 0.75 > 초성 단어 시작 0.7
+    > 오타 허용 (최대 0.6). 일치하지 않으면 0. 부분 일치는 두 글자 이상 질의만 본다.
+    """
+    return _score_normalized(_Query(query), normalize(text), raw=text)
+
+
+# ---------------------------------------------------------------------------
+# 인덱스
+# ---------------------------------------------------------------------------
+
+class SearchIndex:
+    """
+    키별 텍스트 목록에 대한 n-gram 검색 인덱스.
+
+    add/remove로 키 단위로 갱신한다. 같은 키를 다시 add하면 순서(동점일 때의
+    정렬 기준)는 처음 추가한 순서를 유지한다.
+    """
+
+    def __init__(self) -> None:
+        # 키 -> [(필드, 원문, 정규화, 자모 3-gram)]
+        self._docs: Dict[str, List[Tuple[str, str, str, Set[str]]]] = {}
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+        self._syllables: Dict[str, Set[str]] = {}
+        self._initials: Dict[str, Set[str]] = {}
+        self._jamo: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def order(self, key: str, default: int = 0) -> int:
+        """키를 추가한 순서 (없으면 default)"""
+        return self._order.get(key, default)
+
+    def add(self, key: str, texts: Iterable[Tuple[str, str]]) -> None:
+        """
+        키의 텍스트를 등록한다 (이미 있으면 교체).
+
+        Args:
+            key: 검색 결과로 돌려줄 키
+            texts: [(필드, 텍스트)] - 필드는 FIELD_WEIGHTS의 키
+        """
+        self.remove(key, keep_order=True)
+        docs = []
+        for field, text in texts:
+            norm = normalize(text)
+            if not norm:
+                continue
+            jamo_grams = _grams(jamo(norm), 3)
+            docs.append((field, text, norm, jamo_grams))
+            for gram in _syllable_grams(norm):
+                self._syllables.setdefault(gram, set()).add(key)
+            for gram in _syllable_grams(choseong(norm)):
+                self._initials.setdefault(gram, set()).add(key)
+            for gram in jamo_grams:
+                self._jamo.setdefault(gram, set()).add(key)
+        self._docs[key] = docs
+        if key not in self._order:
+            self._order[key] = self._next_order
+            self._next_order += 1
+
+    def remove(self, key: str, keep_order: bool = False) -> None:
+        """키를 인덱스에서 뺀다."""
+        docs = self._docs.pop(key, None)
+        if not keep_order:
+            self._order.pop(key, None)
+        if not docs:
+            return
+        for _field, _text, norm, jamo_grams in docs:
+            for gram in _syllable_grams(norm):
+                self._discard(self._syllables, gram, key)
+            for gram in _syllable_grams(choseong(norm)):
+                self._discard(self._initials, gram, key)
+            for gram in jamo_grams:
+                self._discard(self._jamo, gram, key)
+
+    @staticmethod
+    def _discard(postings: Dict[str, Set[str]], gram: str, key: str) -> None:
+        keys = postings.get(gram)
+        if keys is None:
+            return
+        keys.discard(key)
+        if not keys:
+            del postings[gram]
+
+    def _candidates(self, q: _Query) -> Set[str]:
+        """부분/초성 일치 후보: 질의 gram 포스팅의 교집합 (작은 것부터)."""
+        postings = self._initials if q.is_choseong else self._syllables
+        candidates: Optional[Set[str]] = None
+        for gram in sorted(_grams(q.text, 2), key=lambda g: len(postings.get(g, ()))):
+            keys = postings.get(gram)
+            if not keys:
+                return set()
+            candidates = set(keys) if candidates is None else candidates & keys
+            if not candidates:
+                return set()
+        return candidates or set()
+
+    def _fuzzy_candidates(self, q: _Query) -> Set[str]:
+        """오타 허용 후보: 질의 자모 3-gram을 FUZZY_MIN_RATIO 이상 공유하는 키."""
+        needed = math.ceil(len(q.jamo_grams) * FUZZY_MIN_RATIO)
+        counts: Counter = Counter()
+        for gram in q.jamo_grams:
+            counts.update(self._jamo.get(gram, ()))
+        return {key for key, count in counts.items() if count >= needed}
+
+    def _score(self, q: _Query, keys: Iterable[str]) -> List[Tuple[str, float, str]]:
+        results = []
+        for key in keys:
+            best, matched = 0.0, ""
+            for field, text, norm, jamo_grams in self._docs.get(key, ()):
+                score = _score_normalized(q, norm, jamo_grams, text) * FIELD_WEIGHTS.get(field, 1.0)
+                if score > best:
+                    best, matched = score, text
+            if best > 0:
+                results.append((key, best, matched))
+        return results
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float, str]]:
+        """
+        질의와 일치하는 키를 점수순으로 찾는다.
+
+        Args:
+            query: 검색어
+            limit: 최대 결과 수 (None이면 전부)
+
+        Returns:
+            [(키, 점수, 일치한 원문)] - 점수 내림차순, 동점이면 추가한 순서
+        """
+        q = _Query(query)
+        if not q.text:
+            return []
+
+        results = self._score(q, self._candidates(q))
+        if not results and q.jamo_grams and not q.is_choseong:
+            # 부분 일치가 없을 때만 오타 허용 검색 (자모 gram 집계는 비싸다)
+            results = self._score(q, self._fuzzy_candidates(q))
+
+        results.sort(key=lambda r: (-r[1], self.order(r[0])))
+        return results[:limit] if limit is not None else results
+
+
+def item_texts(item: dict) -> List[Tuple[str, str]]:
+    """항목의 검색 대상 텍스트: 제목, 위치, 별칭, 옵션 이름/위치/별칭."""
+    texts = [("title", item.get("title", ""))]
+    texts.extend(_extra_texts(item))
+    for opt in item.get("options", []):
+        texts.append(("name", opt.get("name", "")))
+        texts.extend(_extra_texts(opt))
+    return texts
+
+
+def option_texts(opt: dict) -> List[Tuple[str, str]]:
+    """옵션의 검색 대상 텍스트: 이름과 별칭 (위치는 옵션 구분에 쓰지 않는다)."""
+    return [("name", opt.get("name", ""))] + [t for t in _extra_texts(opt) if t[0] == "alias"]
+
+
+def _extra_texts(node: dict) -> List[Tuple[str, str]]:
+    texts = []
+    loc = node.get("loc")
+    if isinstance(loc, str) and loc:
+        texts.append(("loc", loc))
+    aliases = node.get("aliases")
+    if isinstance(aliases, str):
+        aliases = [aliases]
+    if isinstance(aliases, list):
+        texts.extend(("alias", a) for a in aliases if isinstance(a, str))
+    return texts
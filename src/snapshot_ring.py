@@ -0,0 +1,311 @@
+"""
+버전별 여행 데이터 스냅샷 링 모듈.
+
+저장소에 기록되는 상태마다 버전 번호를 붙여 최근 capacity개를 보관한다.
+직전 상태와의 차이(trip_patch.diff)만 델타로 저장하고, keyframe_interval마다
+전체 데이터(키프레임)를 둔다. 버전 번호는 연속이므로 위치 계산으로 바로 찾고
+(O(1)), 복원은 가장 가까운 키프레임에서 델타를 최대 keyframe_interval - 1개
+적용하면 된다.
+
+파일은 한 줄에 한 버전인 JSON Lines로, 새 버전은 끝에 추가만 한다. 줄 수가
+capacity의 두 배가 되면 최근 capacity개만 남기고(첫 줄은 키프레임으로 바꿔)
+원자적으로 다시 쓴다. 봇/웹 API 프로세스가 같은 파일을 공유하므로 기록은
+파일 잠금 안에서 다른 프로세스가 추가한 줄을 먼저 읽은 뒤 한다.
+
+    {"v": 12, "version": "<meta.lastUpdated>", "savedAt": 1760000000.0,
+     "note": "<meta.updateNote>", "base": {...}}       # 키프레임
+    {"v": 13, "version": "...", "savedAt": ..., "note": "...", "ops": [...]}  # 델타
+"""
+
+import contextlib
+import copy
+import logging
+import os
+import time
+from typing import Iterator, List, Optional, Tuple
+
+import json_codec
+from atomic_file import write_bytes_atomic
+from trip_patch import apply_patch, diff
+
+try:
+    import fcntl
+except ImportError:  # Windows 등 - 프로세스 간 잠금 없이 동작
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# 보관할 버전 수
+SNAPSHOT_RING_CAPACITY = 50
+
+# 키프레임(전체 데이터) 간격 - 복원 시 적용할 델타 수의 상한
+SNAPSHOT_KEYFRAME_INTERVAL = 10
+
+# 기본 파일 경로 (봇/웹 API 프로세스가 공유)
+DEFAULT_HISTORY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "history.jsonl",
+)
+
+
+class SnapshotRing:
+    """델타 기반 버전 스냅샷 링"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        capacity: int = SNAPSHOT_RING_CAPACITY,
+        keyframe_interval: int = SNAPSHOT_KEYFRAME_INTERVAL,
+    ) -> None:
+        """
+        스냅샷 링 초기화.
+
+        Args:
+            path: JSON Lines 파일 경로 (None이면 메모리에만 보관)
+            capacity: 보관할 버전 수
+            keyframe_interval: 키프레임 간격
+        """
+        self.path = path
+        self.capacity = max(1, capacity)
+        self.keyframe_interval = max(1, keyframe_interval)
+        self._entries: List[dict] = []
+        self._head: Optional[dict] = None  # 마지막 버전의 전체 데이터
+        self._file_size = 0  # 마지막으로 읽거나 쓴 파일 크기
+        self._file_id: Optional[Tuple[int, int]] = None
+        if path:
+            self._load()
+
+    # -- 조회 ---------------------------------------------------------------
+
+    @property
+    def latest_version(self) -> Optional[int]:
+        """가장 최근 버전 번호 (없으면 None)"""
+        self._sync()
+        return self._entries[-1]["v"] if self._entries else None
+
+    def versions(self) -> List[dict]:
+        """
+        보관 중인 버전 목록 (최신순).
+
+        Returns:
+            [{"v", "version", "savedAt", "note"}, ...]
+        """
+        self._sync()
+        return [
+            {k: e.get(k) for k in ("v", "version", "savedAt", "note")}
+            for e in reversed(self._entries)
+        ]
+
+    def get(self, v: int) -> dict:
+        """
+        버전 v의 여행 데이터를 복원한다.
+
+        Args:
+            v: 버전 번호
+
+        Returns:
+            복원된 여행 데이터 (호출자가 수정해도 되는 사본)
+
+        Raises:
+            KeyError: 보관 중이 아닌 버전인 경우
+        """
+        self._sync()
+        idx = self._index(v)
+        if idx == len(self._entries) - 1 and self._head is not None:
+            return copy.deepcopy(self._head)
+        return self._materialize(idx)
+
+    def restore(self, v: int) -> dict:
+        """
+        버전 v로 되돌릴 데이터를 만든다 (updateNote에 되돌림 표시).
+
+        Args:
+            v: 버전 번호
+
+        Returns:
+            저장소에 다시 쓸 여행 데이터
+
+        Raises:
+            KeyError: 보관 중이 아닌 버전인 경우
+        """
+        data = self.get(v)
+        data.setdefault("meta", {})["updateNote"] = f"{v}번 버전으로 되돌림"
+        return data
+
+    def _index(self, v: int) -> int:
+        if not self._entries:
+            raise KeyError(v)
+        idx = v - self._entries[0]["v"]
+        if not 0 <= idx < len(self._entries):
+            raise KeyError(v)
+        return idx
+
+    def _materialize(self, idx: int) -> dict:
+        """가장 가까운 키프레임에서 델타를 적용하여 idx 위치의 데이터를 만든다."""
+        start = idx
+        while "base" not in self._entries[start]:
+            start -= 1
+        doc = copy.deepcopy(self._entries[start]["base"])
+        for entry in self._entries[start + 1: idx + 1]:
+            doc, _ = apply_patch(doc, entry["ops"])
+        return doc
+
+    # -- 기록 ---------------------------------------------------------------
+
+    def record(self, data: dict) -> Optional[int]:
+        """
+        새 상태를 기록한다. 직전 버전과 같으면 기록하지 않는다.
+
+        Args:
+            data: 저장소에 기록된 여행 데이터
+
+        Returns:
+            새 버전 번호 (변경이 없으면 None)
+        """
+        with self._locked():
+            self._sync()
+            if self._head is not None:
+                ops = diff(self._head, data)
+                if not ops:
+                    return None
+            else:
+                ops = None
+
+            meta = data.get("meta") if isinstance(data.get("meta"), dict) else {}
+            v = self._entries[-1]["v"] + 1 if self._entries else 1
+            entry = {
+                "v": v,
+                "version": meta.get("lastUpdated"),
+                "savedAt": time.time(),
+                "note": meta.get("updateNote"),
+            }
+            if ops is None or v % self.keyframe_interval == 0 or any(op["path"] == "" for op in ops):
+                entry["base"] = copy.deepcopy(data)
+            else:
+                entry["ops"] = ops
+
+            self._entries.append(entry)
+            self._head = copy.deepcopy(data)
+            self._persist(entry)
+        logger.debug("스냅샷 버전 %d 기록 (%s)", v, "키프레임" if "base" in entry else "델타")
+        return v
+
+    def _persist(self, entry: dict) -> None:
+        """항목을 파일 끝에 추가하고, 길어지면 최근 capacity개로 줄인다."""
+        if len(self._entries) > self.capacity * 2 or not self.path:
+            self._trim()
+            if self.path:
+                self._rewrite()
+            return
+        line = json_codec.dumps_bytes(entry) + b"\n"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "ab") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            logger.warning("스냅샷 기록 실패 (%s): %s", self.path, e)
+            return
+        self._remember_file()
+
+    def _trim(self) -> None:
+        """최근 capacity개만 남기고 첫 항목을 키프레임으로 바꾼다."""
+        drop = len(self._entries) - self.capacity
+        if drop <= 0:
+            return
+        first = dict(self._entries[drop])
+        if "base" not in first:
+            first["base"] = self._materialize(drop)
+            first.pop("ops", None)
+        self._entries = [first] + self._entries[drop + 1:]
+
+    def _rewrite(self) -> None:
+        content = b"".join(json_codec.dumps_bytes(e) + b"\n" for e in self._entries)
+        try:
+            write_bytes_atomic(self.path, content)
+        except OSError as e:
+            logger.warning("스냅샷 파일 정리 실패 (%s): %s", self.path, e)
+            return
+        self._remember_file()
+
+    # -- 파일 동기화 --------------------------------------------------------
+
+    def _load(self) -> None:
+        """파일 전체를 읽어 링을 다시 만든다."""
+        self._entries, self._head = [], None
+        self._file_size, self._file_id = 0, None
+        try:
+            with open(self.path, "rb") as f:
+                content = f.read()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning("스냅샷 파일 읽기 실패 (%s): %s", self.path, e)
+            return
+
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            try:
+                entry = json_codec.loads(line)
+            except json_codec.JSONDecodeError:
+                # 기록 도중 중단된 마지막 줄 등
+                logger.warning("스냅샷 파일의 손상된 줄 무시 (%s)", self.path)
+                continue
+            self._append_loaded(entry)
+        self._trim()
+        if self._entries:
+            self._head = self._materialize(len(self._entries) - 1)
+        self._remember_file()
+
+    def _append_loaded(self, entry: dict) -> None:
+        """파일에서 읽은 항목을 연속성을 확인하며 추가한다."""
+        if not isinstance(entry, dict) or not isinstance(entry.get("v"), int):
+            return
+        contiguous = bool(self._entries) and entry["v"] == self._entries[-1]["v"] + 1
+        if "base" in entry:
+            if not contiguous:
+                self._entries = []
+            self._entries.append(entry)
+        elif contiguous and isinstance(entry.get("ops"), list):
+            self._entries.append(entry)
+        else:
+            # 앞 버전이 없는 델타는 복원할 수 없으므로 버린다
+            self._entries = []
+
+    def _sync(self) -> None:
+        """다른 프로세스가 파일을 바꿨으면 다시 읽는다."""
+        if not self.path:
+            return
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        if (st.st_ino, st.st_dev) == self._file_id and st.st_size == self._file_size:
+            return
+        self._load()
+
+    def _remember_file(self) -> None:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return
+        self._file_id = (st.st_ino, st.st_dev)
+        self._file_size = st.st_size
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        """봇/웹 API 프로세스 간 기록을 직렬화하는 파일 잠금."""
+        if fcntl is None or not self.path:
+            yield
+            return
+        lock_path = self.path + ".lock"
+        os.makedirs(os.path.dirname(os.path.abspath(lock_path)), exist_ok=True)
+        with open(lock_path, "a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,414 @@
+"""
+여행 데이터 저장소 모듈.
+
+봇/웹 API는 저장소 인터페이스(TripStorage)만 사용하고, 실제 저장 위치는
+STORAGE_BACKEND 환경 변수로 고른다.
+
+    jsonbin (기본): AsyncJsonBinClient - jsonbin.io가 원본
+    local: LocalTripStorage - VPS의 로컬 JSON 파일이 원본, 읽기는 메모리에서 응답
+
+local 모드에서 STORAGE_REPLICA=jsonbin이면 변경 연산을 jsonbin에도 복제한다
+(jsonbin 클라이언트의 write-behind 사용). 웹앱(webapp/)은 jsonbin을 직접 읽으므로
+웹앱을 함께 쓸 때는 복제를 켠다. 로컬 파일이 없으면 첫 읽기에서 복제본의
+데이터로 초기화한다.
+"""
+
+import contextlib
+import copy
+import logging
+import os
+from collections import deque
+from typing import Deque, Iterator, List, Optional, Protocol, Tuple
+
+from atomic_file import read_json, write_json_atomic
+from jsonbin_client import AsyncJsonBinClient, JsonBinClient, JsonBinError, process_snapshot_path
+from snapshot_ring import SnapshotRing
+from trip_patch import apply_patch
+from trip_stats import refresh_stats
+
+try:
+    import fcntl
+except ImportError:  # Windows 등 - 프로세스 간 잠금 없이 동작
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# 저장소 종류 (STORAGE_BACKEND 값)
+BACKEND_JSONBIN = "jsonbin"
+BACKEND_LOCAL = "local"
+
+# 로컬 데이터 파일 기본 경로 (봇/웹 API 프로세스가 공유)
+DEFAULT_LOCAL_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "trip.json",
+)
+
+
+# /undo로 되돌릴 수 있는 최근 턴 수
+UNDO_DEPTH = 10
+
+
+class StorageError(Exception):
+    """저장소 읽기/쓰기 실패"""
+    pass
+
+
+class TripStorage(Protocol):
+    """봇/웹 API가 사용하는 저장소 인터페이스 (AsyncJsonBinClient와 같은 형태)"""
+
+    async def get_data(self) -> dict: ...
+
+    def get_cached(self) -> Optional[dict]: ...
+
+    async def put_data(self, data: dict) -> bool: ...
+
+    def schedule_patch(self, ops: List[dict]) -> None: ...
+
+    def schedule_put(self, data: dict) -> None: ...
+
+    async def flush(self) -> bool: ...
+
+    async def close(self) -> None: ...
+
+    def rollback(self, version: int) -> dict: ...
+
+    def status(self) -> dict: ...
+
+
+class LocalTripStorage:
+    """
+    로컬 JSON 파일 저장소.
+
+    데이터는 메모리에 두고 읽기는 파일 상태(inode, mtime)만 확인하여 응답한다.
+    다른 프로세스가 파일을 교체했으면 다시 읽는다. 쓰기는 잠금 파일로
+    프로세스 간 직렬화한 뒤, 최신 파일 내용 위에 연산을 적용하고 원자적으로
+    교체한다. 임계 구역이 짧아 잠금은 이벤트 루프에서 바로 잡는다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        replica: Optional[AsyncJsonBinClient] = None,
+        history: Optional[SnapshotRing] = None,
+    ) -> None:
+        """
+        저장소 초기화.
+
+        Args:
+            path: 여행 데이터 JSON 파일 경로
+            replica: 변경을 복제할 jsonbin 클라이언트 (None이면 복제하지 않음)
+            history: 버전별 스냅샷 링 (None이면 버전 기록 안 함)
+        """
+        self.path = path
+        self.replica = replica
+        self.history = history
+        self._data: Optional[dict] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._reload_if_changed()
+
+    # -- 읽기 ---------------------------------------------------------------
+
+    async def get_data(self) -> dict:
+        """
+        현재 여행 데이터를 반환한다.
+
+        파일이 없으면 복제본에서 가져와 로컬 파일을 만든다.
+
+        Returns:
+            여행 일정 JSON 데이터 (dict)
+
+        Raises:
+            StorageError: 로컬 파일도 복제본도 없는 경우
+        """
+        self._reload_if_changed()
+        if self._data is not None:
+            return self._data
+
+        if self.replica is None:
+            raise StorageError(f"로컬 데이터 파일이 없습니다: {self.path}")
+
+        try:
+            data = await self.replica.get_data()
+        except JsonBinError as e:
+            raise StorageError(f"복제본에서 초기 데이터를 가져오지 못함: {e}")
+        with self._locked():
+            self._reload_if_changed()
+            if self._data is None:
+                self._write(data)
+                logger.info("로컬 데이터 파일이 없어 jsonbin 데이터로 초기화: %s", self.path)
+        return self._data
+
+    def get_cached(self) -> Optional[dict]:
+        """메모리에 있는 데이터를 반환한다 (없으면 None)."""
+        return self._data
+
+    def _reload_if_changed(self) -> None:
+        """파일이 교체되었으면 다시 읽는다."""
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return
+        data = read_json(self.path)
+        if not isinstance(data, dict):
+            logger.warning("로컬 데이터 파일을 읽지 못해 메모리 데이터 유지: %s", self.path)
+            return
+        self._data = data
+        self._signature = signature
+        logger.debug("로컬 데이터 파일 다시 읽음: %s", self.path)
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        """파일 식별값 (inode, mtime). os.replace로 교체될 때마다 바뀐다."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns
+
+    # -- 쓰기 ---------------------------------------------------------------
+
+    def schedule_patch(self, ops: List[dict]) -> None:
+        """
+        변경 연산(trip_patch)을 최신 파일 내용에 적용하여 바로 저장한다.
+
+        로컬 쓰기는 즉시 끝나므로 대기열 없이 저장하고, 복제본에는
+        write-behind로 같은 연산을 보낸다.
+
+        Args:
+            ops: ExecutionContext.patch 형식의 연산 목록
+
+        Raises:
+            StorageError: 적용할 데이터가 없거나 파일 기록에 실패한 경우
+        """
+        if not ops:
+            return
+        with self._locked():
+            self._reload_if_changed()
+            if self._data is None:
+                raise StorageError("패치를 적용할 데이터가 없음 (로컬 파일 없음)")
+            data, skipped = apply_patch(copy.deepcopy(self._data), ops, strict=False)
+            if skipped:
+                logger.warning("대상이 사라진 연산 %d건 제외", len(skipped))
+            refresh_stats(data, ops)
+            JsonBinClient._update_last_updated(data)
+            self._write(data)
+        logger.info("로컬 저장 완료 (연산 %d건)", len(ops))
+
+        if self.replica is not None:
+            try:
+                self.replica.schedule_patch(ops)
+            except JsonBinError:
+                # 복제본 캐시가 아직 없으면 전체 데이터로 맞춘다
+                self.replica.schedule_put(copy.deepcopy(data))
+
+    def schedule_put(self, data: dict) -> None:
+        """
+        여행 데이터 전체를 바로 저장한다.
+
+        Args:
+            data: 저장할 여행 일정 JSON 데이터
+
+        Raises:
+            StorageError: 파일 기록에 실패한 경우
+        """
+        refresh_stats(data)
+        JsonBinClient._update_last_updated(data)
+        with self._locked():
+            self._write(data)
+        logger.info("로컬 저장 완료 (전체)")
+        if self.replica is not None:
+            self.replica.schedule_put(copy.deepcopy(data))
+
+    async def put_data(self, data: dict) -> bool:
+        """
+        여행 데이터 전체를 저장한다. 로컬 기록은 즉시 끝나므로 schedule_put과 같다.
+
+        Args:
+            data: 저장할 여행 일정 JSON 데이터
+
+        Returns:
+            성공 여부 (bool)
+
+        Raises:
+            StorageError: 파일 기록에 실패한 경우
+        """
+        self.schedule_put(data)
+        return True
+
+    def _write(self, data: dict) -> None:
+        """파일을 원자적으로 교체하고 메모리 데이터를 갱신한다. 잠금 안에서 호출한다."""
+        try:
+            write_json_atomic(self.path, data)
+        except OSError as e:
+            raise StorageError(f"로컬 데이터 파일 기록 실패 ({self.path}): {e}")
+        self._data = data
+        self._signature = self._stat()
+        if self.history is not None:
+            self.history.record(data)
+
+    def rollback(self, version: int) -> dict:
+        """
+        스냅샷 링의 버전으로 되돌린다 (전체 덮어쓰기로 바로 저장).
+
+        Args:
+            version: 스냅샷 버전 번호
+
+        Returns:
+            되돌린 여행 데이터
+
+        Raises:
+            StorageError: 버전 기록이 꺼져 있거나 보관 중이 아닌 버전인 경우
+        """
+        if self.history is None:
+            raise StorageError("버전 기록이 설정되지 않았습니다")
+        try:
+            data = self.history.restore(version)
+        except KeyError:
+            raise StorageError(f"보관 중이 아닌 버전입니다: {version}")
+        self.schedule_put(data)
+        logger.warning("%d번 버전으로 되돌림", version)
+        return data
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        """봇/웹 API 프로세스 간 쓰기를 직렬화하는 파일 잠금."""
+        if fcntl is None:
+            yield
+            return
+        lock_path = self.path + ".lock"
+        os.makedirs(os.path.dirname(os.path.abspath(lock_path)), exist_ok=True)
+        with open(lock_path, "a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    # -- 수명 주기 ----------------------------------------------------------
+
+    async def flush(self) -> bool:
+        """복제본에 대기 중인 변경을 전송한다 (로컬 기록은 이미 끝나 있다)."""
+        if self.replica is None:
+            return True
+        return await self.replica.flush()
+
+    async def close(self) -> None:
+        """복제본의 대기 중인 변경을 전송하고 연결을 정리한다."""
+        if self.replica is not None:
+            await self.replica.close()
+
+    def status(self) -> dict:
+        """운영 확인용 저장소 상태 요약"""
+        version = None
+        if self._data is not None:
+            version = JsonBinClient._extract_version(self._data)
+        return {
+            "backend": BACKEND_LOCAL,
+            "path": self.path,
+            "version": version,
+            "replica": self.replica.status() if self.replica is not None else None,
+        }
+
+
+class UndoLog:
+    """
+    최근 저장한 턴의 역연산 스택 (/undo용, 프로세스 메모리).
+
+    턴마다 ExecutionContext.undo_patch(변경 전 값만 담은 trip_patch 연산)를
+    보관하고, 되돌릴 때는 저장소의 schedule_patch로 최신 데이터 위에 적용한다.
+    그 사이 다른 곳에서 삭제된 대상의 연산은 패치 적용 규칙대로 건너뛴다.
+    """
+
+    def __init__(self, depth: int = UNDO_DEPTH) -> None:
+        self._entries: Deque[Tuple[str, List[dict]]] = deque(maxlen=max(1, depth))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def push(self, ops: List[dict], undo: List[dict]) -> None:
+        """
+        저장한 턴의 역연산을 기록한다.
+
+        Args:
+            ops: 저장한 변경 연산 (updateNote를 설명으로 쓴다)
+            undo: ops를 되돌리는 역연산
+        """
+        if not undo:
+            return
+        note = ""
+        for op in ops:
+            if op.get("path") == "/meta/updateNote":
+                note = op.get("value") or ""
+        self._entries.append((note, list(undo)))
+
+    def undo(self, storage: TripStorage) -> Optional[str]:
+        """
+        마지막으로 기록한 턴을 저장소에서 되돌린다.
+
+        Returns:
+            되돌린 턴의 변경 설명 (되돌릴 턴이 없으면 None)
+
+        Raises:
+            StorageError, JsonBinError: 저장소가 연산을 적용하지 못한 경우 (기록은 유지)
+        """
+        if not self._entries:
+            return None
+        note, ops = self._entries[-1]
+        ops = ops + [{"op": "add", "path": "/meta/updateNote", "value": f"되돌림: {note}" if note else "되돌림"}]
+        storage.schedule_patch(ops)
+        self._entries.pop()
+        logger.info("마지막 변경 되돌림 (연산 %d건): %s", len(ops), note)
+        return note
+
+
+def create_storage(
+    backend: str = BACKEND_JSONBIN,
+    *,
+    bin_id: str = "",
+    api_key: str = "",
+    snapshot_path: Optional[str] = None,
+    local_path: str = DEFAULT_LOCAL_PATH,
+    replica: str = "",
+    history_path: Optional[str] = None,
+    role: str = "",
+) -> TripStorage:
+    """
+    설정에 맞는 저장소를 만든다.
+
+    Args:
+        backend: 저장소 종류 (STORAGE_BACKEND: "jsonbin" 또는 "local")
+        bin_id: jsonbin.io Bin ID
+        api_key: jsonbin.io Master Key
+        snapshot_path: jsonbin 디스크 스냅샷 경로
+        local_path: local 저장소의 데이터 파일 경로
+        replica: local 저장소의 복제 대상 (STORAGE_REPLICA: "" 또는 "jsonbin")
+        history_path: 버전별 스냅샷 링 파일 경로 (None이면 버전 기록 안 함)
+        role: 프로세스 이름 ("bot", "web"). 주면 jsonbin 스냅샷을 프로세스별 파일로 나눈다
+
+    Returns:
+        저장소 인스턴스
+
+    Raises:
+        ValueError: 알 수 없는 저장소 종류나 복제 대상인 경우
+    """
+    backend = (backend or BACKEND_JSONBIN).strip().lower()
+    replica = (replica or "").strip().lower()
+    history = SnapshotRing(history_path) if history_path else None
+    if snapshot_path and role:
+        snapshot_path = process_snapshot_path(snapshot_path, role)
+
+    if backend == BACKEND_JSONBIN:
+        return AsyncJsonBinClient(
+            bin_id=bin_id, api_key=api_key, snapshot_path=snapshot_path, history=history
+        )
+
+    if backend == BACKEND_LOCAL:
+        replica_client = None
+        if replica == BACKEND_JSONBIN:
+            replica_client = AsyncJsonBinClient(
+                bin_id=bin_id, api_key=api_key, snapshot_path=snapshot_path
+            )
+        elif replica:
+            raise ValueError(f"알 수 없는 STORAGE_REPLICA: {replica!r}")
+        return LocalTripStorage(local_path, replica=replica_client, history=history)
+
+    raise ValueError(f"알 수 없는 STORAGE_BACKEND: {backend!r}")
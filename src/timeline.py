@@ -0,0 +1,195 @@
+"""
+일정 시간 파서와 일자별 타임라인 모듈.
+
+항목의 time 필드(사람이 쓴 문자열)를 자정 기준 분 단위 구간으로 바꾼다.
+
+    "15:00~17:00"      -> 15:00~17:00
+    "09:00~"           -> 09:00~10:00 (끝은 추정)
+    "점심"              -> 11:30~13:30 (시간대, 추정)
+    "오전~점심"          -> 09:00~13:30 (시간대 범위, 추정)
+    "저녁 식사 후"       -> 19:30~21:30 (시간대 뒤, 추정)
+    "도착 후"            -> None (앞뒤 항목 사이로 추정)
+    "2시간", "1시간 30분" -> None (길이는 시각으로 읽지 않음, "N시"는 오전/오후가 있어야 시각)
+
+Timeline은 하루의 항목을 시작 시각 순으로 정렬해 두고, 특정 시각에 진행 중인
+항목과 다음 항목을 이진 탐색으로 찾는다. 시간을 읽을 수 없는 항목은 문서 순서상
+앞뒤 항목 사이에 놓는다. TripIndex가 일자별로 만들고, 그 날의 항목이 바뀌면
+버렸다가 다음 조회 때 그 날만 다시 만든다.
+"""
+
+import bisect
+import re
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+# 시간대 이름 -> (시작 분, 끝 분)
+SLOTS = {
+    "새벽": (5 * 60, 7 * 60),
+    "아침": (7 * 60, 9 * 60 + 30),
+    "오전": (9 * 60, 12 * 60),
+    "점심": (11 * 60 + 30, 13 * 60 + 30),
+    "오후": (13 * 60 + 30, 17 * 60 + 30),
+    "저녁": (17 * 60 + 30, 19 * 60 + 30),
+    "밤": (20 * 60, 23 * 60),
+    "야간": (20 * 60, 23 * 60),
+}
+
+# 끝 시각이 없는 항목의 길이, "~ 후"/"~ 전" 항목의 길이 (분)
+DEFAULT_DURATION = 60
+RELATIVE_DURATION = 120
+
+_DAY_MINUTES = 24 * 60
+# (오전/오후) 시 : 분  또는  (오전/오후) 시 (반 | 분). "2시간" 같은 길이는 시각이 아니다
+_CLOCK = r"(?:(오전|오후|저녁|밤)\s*)?(\d{1,2})(?::(\d{2})|\s*시(?!간)(?:\s*(반|\d{1,2})\s*분?)?)"
+_CLOCK_RE = re.compile(_CLOCK)
+_RANGE_RE = re.compile(_CLOCK + r"\s*~\s*(?:" + _CLOCK + r")?")
+_SLOT_RE = re.compile("|".join(SLOTS))
+_PAREN_RE = re.compile(r"\([^)]*\)")
+
+
+class Span(NamedTuple):
+    """시간 구간 (자정 기준 분, [start, end))"""
+    start: int
+    end: int
+    approx: bool  # 시간대/추정으로 정한 구간이면 True
+
+
+def _is_clock(groups: Sequence[Optional[str]]) -> bool:
+    """HH:MM이거나 오전/오후가 붙은 "N시"인지 (그냥 "2시"는 순서/횟수일 수 있어 시각으로 보지 않는다)."""
+    period, _, minute, _ = groups
+    return period is not None or minute is not None
+
+
+def _clock_minutes(groups: Sequence[Optional[str]]) -> int:
+    """_CLOCK 그룹 (오전/오후, 시, HH:MM의 분, N시 뒤의 분/반) -> 분"""
+    period, hour, minute, korean_minute = groups
+    hour = int(hour)
+    if period in ("오후", "저녁", "밤") and hour < 12:
+        hour += 12
+    if minute is None:
+        minute = 30 if korean_minute == "반" else korean_minute
+    return hour * 60 + int(minute or 0)
+
+
+def parse_time(text: Optional[str]) -> Optional[Span]:
+    """
+    time 필드를 시간 구간으로 바꾼다.
+
+    Args:
+        text: 항목의 time 값
+
+    Returns:
+        Span (자정을 넘기는 끝은 24:00 이후 분), 읽을 수 없으면 None
+    """
+    if not isinstance(text, str) or not text.strip():
+        return None
+    text = _PAREN_RE.sub(" ", text).strip()
+
+    m = next((m for m in _RANGE_RE.finditer(text) if _is_clock(m.groups()[0:4])), None)
+    if m:
+        start = _clock_minutes(m.groups()[0:4])
+        if m.group(6) is not None:
+            end = _clock_minutes(m.groups()[4:8])
+            if end <= start < end + 12 * 60 and m.group(5) is None:
+                end += 12 * 60  # "오후 2시~4시"
+            if end <= start:
+                end += _DAY_MINUTES
+            return Span(start, end, False)
+        return Span(start, start + DEFAULT_DURATION, True)
+
+    m = next((m for m in _CLOCK_RE.finditer(text) if _is_clock(m.groups())), None)
+    if m:
+        start = _clock_minutes(m.groups())
+        return Span(start, start + DEFAULT_DURATION, True)
+
+    slots = [(s.start(), s.group(0)) for s in _SLOT_RE.finditer(text)]
+    if not slots:
+        return None
+    first, last = SLOTS[slots[0][1]], SLOTS[slots[-1][1]]
+    if len(slots) == 1:
+        rest = text[slots[0][0] + len(slots[0][1]):]
+        if re.search(r"(?:^|\s|식사\s*)(?:후|이후)", rest):
+            return Span(first[1], first[1] + RELATIVE_DURATION, True)
+        if re.search(r"(?:^|\s|식사\s*)(?:전|이전)", rest):
+            return Span(first[0] - RELATIVE_DURATION, first[0], True)
+    return Span(first[0], max(first[1], last[1]), True)
+
+
+class Entry(NamedTuple):
+    """타임라인 원소"""
+    start: int
+    end: int
+    approx: bool
+    position: int  # 날짜 안 문서 순서
+    item_id: str
+
+
+def _fill_unknown(spans: List[Optional[Span]]) -> List[Span]:
+    """시간을 읽을 수 없는 항목을 문서 순서상 앞뒤 항목 사이에 놓는다."""
+    filled: List[Span] = []
+    for i, span in enumerate(spans):
+        if span is not None:
+            filled.append(span)
+            continue
+        prev = filled[-1] if filled else None
+        nxt = next((s for s in spans[i + 1:] if s is not None), None)
+        if prev is not None and nxt is not None:
+            start = min(max(prev.start, nxt.start - DEFAULT_DURATION), nxt.start)
+            filled.append(Span(start, max(nxt.start, start + 1), True))
+        elif prev is not None:
+            filled.append(Span(prev.end, prev.end + DEFAULT_DURATION, True))
+        elif nxt is not None:
+            filled.append(Span(nxt.start - DEFAULT_DURATION, nxt.start, True))
+        else:
+            start = SLOTS["오전"][0]
+            filled.append(Span(start, start + DEFAULT_DURATION, True))
+    return filled
+
+
+class Timeline:
+    """하루 항목의 시작 시각순 타임라인"""
+
+    def __init__(self, items: Sequence[dict]) -> None:
+        """
+        타임라인을 만든다.
+
+        Args:
+            items: day의 items 배열 (문서 순서)
+        """
+        spans = _fill_unknown([parse_time(item.get("time")) for item in items])
+        self.entries: List[Entry] = sorted(
+            Entry(span.start, span.end, span.approx, pos, item.get("id"))
+            for pos, (item, span) in enumerate(zip(items, spans))
+        )
+        self._starts = [e.start for e in self.entries]
+        # 앞에서부터의 최대 끝 시각 (진행 중 항목을 찾을 때 어디까지 되짚을지)
+        self._max_end: List[int] = []
+        for e in self.entries:
+            self._max_end.append(max(e.end, self._max_end[-1]) if self._max_end else e.end)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def at(self, minute: int) -> Tuple[List[Entry], int]:
+        """
+        minute에 진행 중인 항목과 다음 항목의 위치.
+
+        O(log n + 진행 중 항목 수).
+
+        Returns:
+            (진행 중 항목 - 시작 순, minute 이후에 시작하는 첫 항목의 entries 위치)
+        """
+        pos = bisect.bisect_right(self._starts, minute)
+        current = []
+        i = pos - 1
+        while i >= 0 and self._max_end[i] > minute:
+            if self.entries[i].end > minute:
+                current.append(self.entries[i])
+            i -= 1
+        current.reverse()
+        return current, pos
+
+
+def format_minutes(minutes: int) -> str:
+    """분 -> "HH:MM" (24:00 이후는 다음 날 시각)."""
+    minutes %= _DAY_MINUTES
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
@@ -1,19 +1,20 @@
 """경주 여행 봇 도구 정의 모듈.
 
 Anthropic Messages API의 tools 파라미터에 전달할 도구 목록을 정의한다.
-읽기 도구 5개, 쓰기 도구 8개, 메타 도구 1개로 총 14개의 도구를 포함한다.
+읽기 도구 7개, 쓰기 도구 10개, 일괄 변경 도구 1개로 총 18개의 도구를 포함한다.
 옵션 스키마에 lat/lng 좌표 필드를 포함한다.
 """
 
 TOOLS = [
     # ──────────────────────────────────────────────
-    # 읽기 도구 (5개)
+    # 읽기 도구 (7개)
     # ──────────────────────────────────────────────
     {
         "name": "get_schedule",
         "description": (
             "특정 일차의 전체 일정을 조회한다. "
-            "day_num(일차 번호) 또는 date(날짜) 중 하나 이상을 반드시 제공해야 한다."
+            "day_num(일차 번호) 또는 date(날짜) 중 하나 이상을 반드시 제공해야 한다. "
+            "결과가 길면 next_cursor가 함께 오며, cursor로 넘기면 이어서 받는다."
         ),
         "input_schema": {
             "type": "object",
@@ -26,6 +27,19 @@ TOOLS = [
                     "type": "string",
                     "description": "날짜 (YYYY-MM-DD 형식)",
                 },
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "항목마다 받을 필드 (기본: icon, id, time, title, chosen, options(옵션 이름 목록)). 예: [\"id\", \"title\", \"status\", \"note\"]",
+                },
+                "cursor": {
+                    "type": "string",
+                    "description": "이전 결과의 next_cursor (다음 페이지 조회)",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "한 번에 받을 항목 수 (기본 20, 최대 50)",
+                },
             },
             "required": [],
         },
@@ -34,7 +48,8 @@ TOOLS = [
         "name": "find_item",
         "description": (
             "이름 또는 키워드로 항목을 검색한다. "
-            "항목 제목(title)과 옵션 이름(option name) 모두에서 부분 일치로 검색한다."
+            "항목 제목(title), 옵션 이름(option name), 별칭(aliases), 위치(loc)에서 검색한다. "
+            "띄어쓰기 차이, 초성(예: 'ㅎㅎㅈ'), 작은 오타도 찾으며 일치도(score) 높은 순으로 반환한다."
         ),
         "input_schema": {
             "type": "object",
@@ -43,6 +58,19 @@ TOOLS = [
                     "type": "string",
                     "description": "검색 키워드",
                 },
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "항목마다 받을 필드 (기본: id, title, status, chosen). dayNum/matched/score는 항상 포함",
+                },
+                "cursor": {
+                    "type": "string",
+                    "description": "이전 결과의 next_cursor (다음 페이지 조회)",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "한 번에 받을 항목 수 (기본 20, 최대 50)",
+                },
             },
             "required": ["query"],
         },
@@ -51,7 +79,9 @@ TOOLS = [
         "name": "search_items",
         "description": (
             "조건 필터링으로 항목을 검색한다. "
-            "여러 조건을 동시에 지정하면 AND 결합으로 모든 조건을 만족하는 항목만 반환한다."
+            "여러 조건을 동시에 지정하면 AND 결합으로 모든 조건을 만족하는 항목만 반환한다. "
+            "dad/hiro/min_rating/category/open_now는 옵션 중 하나라도 만족하면 된다. "
+            "count는 전체 일치 수이며, 더 있으면 next_cursor로 이어서 받는다."
         ),
         "input_schema": {
             "type": "object",
@@ -80,13 +110,47 @@ TOOLS = [
                     "type": "integer",
                     "description": "일차 번호",
                 },
+                "min_rating": {
+                    "type": "number",
+                    "description": "최소 평점 (옵션 중 하나라도 이 평점 이상)",
+                },
+                "category": {
+                    "type": "string",
+                    "description": "옵션 업종 (예: 카페, 한정식, 국밥 - 부분 일치)",
+                },
+                "open_now": {
+                    "type": "boolean",
+                    "description": "true이면 지금(KST) 영업 중인 옵션이 있는 항목만",
+                },
+                "optional": {
+                    "type": "boolean",
+                    "description": "true이면 선택(optional) 일정만, false이면 필수 일정만",
+                },
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "항목마다 받을 필드 (기본: id, title, cat, status, chosen). dayNum은 항상 포함",
+                },
+                "cursor": {
+                    "type": "string",
+                    "description": "이전 결과의 next_cursor (다음 페이지 조회)",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "한 번에 받을 항목 수 (기본 20, 최대 50)",
+                },
             },
             "required": [],
         },
     },
     {
         "name": "get_item_detail",
-        "description": "특정 항목의 상세 정보를 조회한다.",
+        "description": (
+            "특정 항목의 상세 정보를 조회한다. "
+            "기본으로는 자주 쓰는 필드만 반환하고, 빠진 필드 이름은 omitted에 담는다. "
+            "관광지 가이드는 fields에 \"guide\"를, 메뉴 가격·지도 링크는 option_fields에 "
+            "\"menuDetail\", \"mapUrl\"을 넣어 받는다 ([\"*\"]는 전체)."
+        ),
         "input_schema": {
             "type": "object",
             "properties": {
@@ -94,6 +158,23 @@ TOOLS = [
                     "type": "string",
                     "description": "항목 ID (예: d1_dinner)",
                 },
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "받을 항목 필드 (기본: date, time, cat, title, options, chosen, status, note)",
+                },
+                "option_fields": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": (
+                        "받을 옵션 필드 (기본: name, menu, loc, hours, priceRange, rating, category, "
+                        "dad, dadNote, hiro, hiroNote)"
+                    ),
+                },
+                "cursor": {
+                    "type": "string",
+                    "description": "이전 결과의 next_cursor (옵션이 많아 잘린 경우 다음 옵션 조회)",
+                },
             },
             "required": ["item_id"],
         },
@@ -107,6 +188,94 @@ TOOLS = [
             "required": [],
         },
     },
+    {
+        "name": "get_now_next",
+        "description": (
+            "지금(한국 시간) 진행 중인 일정과 다음 일정을 조회한다. "
+            "time 값을 시각으로 해석하며, '점심'/'저녁' 같은 시간대나 시간이 없는 항목은 "
+            "추정 시각(approx=true)이다. 다음 일정은 아직 하지 않은(planned) 항목 중에서 고른다."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "at": {
+                    "type": "string",
+                    "description": "기준 시각 (KST, 예: 2026-02-19T12:30). 생략하면 현재 시각",
+                },
+            },
+            "required": [],
+        },
+    },
+    {
+        "name": "find_nearby",
+        "description": (
+            "기준 위치에서 가까운 장소(옵션 식당/카페/관광지, 숙소)를 직선 거리순으로 찾는다. "
+            "기준은 lat/lng 좌표 또는 place(장소 이름, '숙소' 가능) 중 하나로 지정한다. "
+            "필터는 search_items와 같으며 장소(옵션)마다 판정한다. 필터를 주면 숙소는 결과에서 빠진다."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "lat": {
+                    "type": "number",
+                    "description": "기준 위도",
+                },
+                "lng": {
+                    "type": "number",
+                    "description": "기준 경도",
+                },
+                "place": {
+                    "type": "string",
+                    "description": "기준 장소 이름 (예: 불국사 근처 카페면 '카페 메이플', 숙소 기준이면 '숙소')",
+                },
+                "radius_m": {
+                    "type": "number",
+                    "description": "최대 거리 (미터). 생략하면 거리 제한 없이 가까운 순",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "받을 장소 수 (기본 5, 최대 50)",
+                },
+                "cat": {
+                    "type": "string",
+                    "enum": ["meal", "cafe", "activity"],
+                    "description": "카테고리",
+                },
+                "dad": {
+                    "type": "string",
+                    "enum": ["good", "caution"],
+                    "description": "아버지 당뇨 적합성",
+                },
+                "hiro": {
+                    "type": "string",
+                    "enum": ["good", "caution"],
+                    "description": "히로 알러지 적합성",
+                },
+                "status": {
+                    "type": "string",
+                    "enum": ["planned", "done", "skipped"],
+                    "description": "항목 상태",
+                },
+                "day_num": {
+                    "type": "integer",
+                    "description": "일차 번호",
+                },
+                "min_rating": {
+                    "type": "number",
+                    "description": "최소 평점",
+                },
+                "category": {
+                    "type": "string",
+                    "description": "업종 (예: 카페, 한정식 - 부분 일치)",
+                },
+                "open_now": {
+                    "type": "boolean",
+                    "description": "true이면 지금(KST) 영업 중인 곳만",
+                },
+            },
+            "required": [],
+        },
+    },
     # ──────────────────────────────────────────────
     # 쓰기 도구 (8개)
     # ──────────────────────────────────────────────
@@ -170,14 +339,14 @@ TOOLS = [
                 },
                 "visited": {
                     "type": "boolean",
-                    "description": "방문 여부 (true: 방문함, false: 방문 취소)",
+                    "description": "방문 여부 (true: 방문함, false: 방문 취소, 기본: true)",
                 },
                 "option_name": {
                     "type": "string",
                     "description": "방문한 옵션 이름 (식당 등 옵션이 있는 항목만. 부분 일치 가능)",
                 },
             },
-            "required": ["item_id", "visited"],
+            "required": ["item_id"],
         },
     },
     {
@@ -315,7 +484,7 @@ TOOLS = [
                 "cat": {
                     "type": "string",
                     "enum": ["meal", "cafe", "activity"],
-                    "description": "카테고리",
+                    "description": "카테고리 (기본: activity)",
                 },
                 "time": {
                     "type": "string",
@@ -366,7 +535,7 @@ TOOLS = [
                     },
                 },
             },
-            "required": ["day_num", "title", "cat"],
+            "required": ["day_num", "title"],
         },
     },
     {
@@ -459,4 +628,45 @@ TOOLS = [
             "required": ["item_id"],
         },
     },
+    # ──────────────────────────────────────────────
+    # 일괄 변경 도구 (1개)
+    # ──────────────────────────────────────────────
+    {
+        "name": "apply_batch",
+        "description": (
+            "여러 변경을 한 번에 실행한다. 모든 작업의 입력을 먼저 검증한 뒤 순서대로 적용하며, "
+            "하나라도 실패하면 전부 취소하고 아무것도 바꾸지 않는다. "
+            "한 메시지에 변경이 2개 이상이면 도구를 하나씩 호출하지 말고 이 도구로 묶는다. "
+            "앞 작업의 결과(예: add_item이 만든 item_id)는 같은 배치 안에서 쓸 수 없다."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "operations": {
+                    "type": "array",
+                    "description": "순서대로 적용할 작업 목록 (최대 20개)",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "tool": {
+                                "type": "string",
+                                "enum": [
+                                    "update_item", "update_status", "update_visit", "update_review",
+                                    "update_note", "update_option", "add_item", "add_option",
+                                    "move_item", "remove_item",
+                                ],
+                                "description": "실행할 쓰기 도구 이름",
+                            },
+                            "input": {
+                                "type": "object",
+                                "description": "해당 도구의 입력 (그 도구의 input_schema와 같다)",
+                            },
+                        },
+                        "required": ["tool", "input"],
+                    },
+                },
+            },
+            "required": ["operations"],
+        },
+    },
 ]
@@ -5,8 +5,19 @@ Tool 실행 로직: Claude tool_use 응답을 처리하고 in-memory JSON 여행
 
 import copy
 import logging
+import time
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Tuple, List
+from typing import Any, Dict, List, Optional, Tuple
+
+import filter_index
+import geo_index
+import result_budget
+import trip_stats
+from timeline import format_minutes
+from tool_stats import STATS
+from tool_validation import validate_input
+from trip_index import TripIndex
+from trip_patch import item_path, make_path, option_path
 
 logger = logging.getLogger(__name__)
 
@@ -18,11 +29,39 @@ KST = timezone(timedelta(hours=9))
 # ---------------------------------------------------------------------------
 
 class ExecutionContext:
-    """Tool 실행 컨텍스트. in-memory 데이터와 변경 추적."""
-
-    def __init__(self, data: dict):
-        self._data = copy.deepcopy(data)
+    """Tool 실행 컨텍스트. in-memory 데이터와 변경 추적.
+
+    입력 데이터를 복사하지 않고 공유하며(copy-on-write), 변경할 때 루트에서
+    대상 노드까지의 경로(root/days/day/items/item/options/option, meta)만
+    얕게 복사한다. 조회만 하는 메시지는 복사가 전혀 일어나지 않는다.
+    따라서 data 속성과 조회 결과는 입력 데이터와 노드를 공유하므로 읽기
+    전용으로 다뤄야 한다.
+
+    데이터 변경은 아래 mutation helper를 통해서만 하며, 각 변경은
+    trip_patch 형식의 연산으로 기록된다 (patch 속성).
+    조회는 TripIndex로 처리하고, mutation helper가 인덱스를 함께 갱신한다.
+    변경할 항목은 find_item(item_id, for_update=True)로 가져온다.
+
+    mutation helper는 데이터에 저장된 진행 통계(days[].stats, meta.stats;
+    trip_stats 참고)도 항목 기여분의 차이만큼 갱신한다. 통계는 patch에 넣지
+    않으며 저장소가 적용 후 다시 센다. check_stats=True이면
+    변경할 때마다 전체를 다시 세어 비교한다 (테스트용).
+
+    각 변경의 역연산도 함께 기록한다 (undo_patch 속성). 역연산은 변경 전 값만
+    담은 trip_patch 연산이라 작으며, 저장된 데이터에 적용하면 이 컨텍스트의
+    변경을 되돌린다. savepoint/rollback_to로 컨텍스트 안에서 되돌릴 수도 있다.
+    """
+
+    def __init__(self, data: dict, check_stats: bool = False):
+        self._data = data
+        self._check_stats = check_stats
+        self._stats_ready = False
         self._modified = False
+        self._patch: List[dict] = []
+        self._undo: List[dict] = []  # 역연산 (기록 순서, 적용은 역순)
+        self._index: Optional[TripIndex] = None
+        # 이 컨텍스트가 복사해서 소유한 노드 (id -> 객체, 객체를 살려 두어 id 재사용 방지)
+        self._owned: Dict[int, Any] = {}
 
     # -- properties ---------------------------------------------------------
 
@@ -34,66 +73,346 @@ class ExecutionContext:
     def data(self) -> dict:
         return self._data
 
+    @property
+    def patch(self) -> List[dict]:
+        """Mutations recorded so far, as trip_patch operations."""
+        return self._patch
+
+    @property
+    def undo_patch(self) -> List[dict]:
+        """Inverse operations that revert the recorded mutations, in apply order."""
+        return self._undo[::-1]
+
+    @property
+    def index(self) -> TripIndex:
+        """Lookup index over the data, built on first use."""
+        if self._index is None:
+            self._index = TripIndex(self._data)
+        return self._index
+
+    # -- copy-on-write ------------------------------------------------------
+
+    def _is_owned(self, node: Any) -> bool:
+        return id(node) in self._owned
+
+    def _adopt(self, node: Any) -> Any:
+        """새로 만들었거나 복사한 노드를 소유 노드로 등록한다."""
+        self._owned[id(node)] = node
+        return node
+
+    def _own_child(self, parent: Any, key: Any, default: Any) -> Any:
+        """소유한 parent의 key 자식을 소유 노드로 만들어 반환한다 (없으면 default)."""
+        child = parent.get(key) if isinstance(parent, dict) else parent[key]
+        if child is None:
+            child = default
+        elif self._is_owned(child):
+            return child
+        else:
+            child = copy.copy(child)
+        parent[key] = child
+        return self._adopt(child)
+
+    def _own_root(self) -> dict:
+        if not self._is_owned(self._data):
+            self._data = self._adopt(dict(self._data))
+        return self._data
+
+    def _own_day(self, day: dict) -> dict:
+        """day를 소유 노드로 만든다 (days 배열 포함)."""
+        if self._is_owned(day):
+            return day
+        days = self._own_child(self._own_root(), "days", [])
+        pos = _position(days, day)
+        if pos is None:
+            # 이미 복사된 day의 이전 객체를 받은 경우
+            current = self.index.day(day_num=day.get("dayNum"))
+            if current is not None and self._is_owned(current):
+                return current
+            raise ValueError(f"day를 찾을 수 없습니다: {day.get('dayNum')}")
+        owned = self._adopt(dict(day))
+        days[pos] = owned
+        self.index.replace_day(day, owned)
+        return owned
+
+    def _own_item(self, day: dict, item: dict) -> Tuple[dict, dict]:
+        """item을 소유 노드로 만든다 (day, items 배열 포함)."""
+        day = self._own_day(day)
+        if self._is_owned(item):
+            return day, item
+        items = self._own_child(day, "items", [])
+        pos = _position(items, item)
+        if pos is None:
+            found = self.index.item(item.get("id"))
+            if found is not None and self._is_owned(found[1]):
+                return found
+            raise ValueError(f"아이템을 찾을 수 없습니다: {item.get('id')}")
+        owned = self._adopt(dict(item))
+        items[pos] = owned
+        self.index.replace_item(item, owned)
+        return day, owned
+
+    def _own_option(self, day: dict, item: dict, opt: dict) -> Tuple[dict, dict, dict]:
+        """option을 소유 노드로 만든다 (item, options 배열 포함)."""
+        day, item = self._own_item(day, item)
+        if self._is_owned(opt):
+            return day, item, opt
+        options = self._own_child(item, "options", [])
+        pos = _position(options, opt)
+        if pos is None:
+            current = self.index.option(item, opt.get("name", ""))
+            if current is not None and self._is_owned(current):
+                return day, item, current
+            raise ValueError(f"옵션을 찾을 수 없습니다: {opt.get('name')}")
+        owned = self._adopt(dict(opt))
+        options[pos] = owned
+        self.index.invalidate_options(item)
+        return day, item, owned
+
     # -- mutation helpers ---------------------------------------------------
 
     def mark_modified(self, update_note: str = ""):
         """Mark data as modified, update meta.lastUpdated (KST ISO8601) and optionally meta.updateNote."""
         self._modified = True
-        meta = self._data.setdefault("meta", {})
-        meta["lastUpdated"] = datetime.now(KST).isoformat()
+        meta = self._own_child(self._own_root(), "meta", {})
+        trip_stats.set_last_updated(self._data, datetime.now(KST).isoformat())
         if update_note:
+            self._record_undo(_field_undo(make_path("meta", "updateNote"), meta, "updateNote"))
             meta["updateNote"] = update_note
+            self._record("add", make_path("meta", "updateNote"), update_note)
+
+    def set_item_field(self, day: dict, item: dict, key: str, value) -> None:
+        """Set a field on an item and record it."""
+        self._ensure_stats()
+        day, item = self._own_item(day, item)
+        before = trip_stats.item_counts(item)
+        path = item_path(day.get("dayNum"), item.get("id"), key)
+        self._record_undo(_field_undo(path, item, key))
+        item[key] = value
+        self.index.touch(item.get("id"))
+        self._record("add", path, value)
+        self._apply_stats(day, before, trip_stats.item_counts(item))
+
+    def set_option_field(self, day: dict, item: dict, opt: dict, key: str, value) -> None:
+        """Set a field on an option and record it."""
+        day, item, opt = self._own_option(day, item, opt)
+        path = option_path(day.get("dayNum"), item.get("id"), opt.get("name"), key)
+        undo = _field_undo(path, opt, key)
+        opt[key] = value
+        # 이름을 바꾸면 역연산은 새 이름으로 옵션을 찾는다
+        undo["path"] = option_path(day.get("dayNum"), item.get("id"), opt.get("name"), key)
+        self._record_undo(undo)
+        if key in ("name", "aliases"):
+            self.index.invalidate_options(item)
+        self.index.touch(item.get("id"))
+        self._record("add", path, value)
+
+    def insert_item(self, day: dict, item: dict, after_id: str = "") -> None:
+        """Insert an item into a day (after `after_id`, or at the end) and record it."""
+        self._ensure_stats()
+        day = self._own_day(day)
+        items = self._own_child(day, "items", [])
+        self._adopt(item)
+        inserted = False
+        if after_id:
+            for i, existing in enumerate(items):
+                if existing.get("id") == after_id:
+                    items.insert(i + 1, item)
+                    inserted = True
+                    break
+        if not inserted:
+            items.append(item)
+        self.index.add_item(day, item)
+        path = make_path("days", day.get("dayNum"), "items", "-")
+        self._record("add", path, item, after=after_id if inserted else None)
+        self._record_undo({"op": "remove", "path": item_path(day.get("dayNum"), item.get("id"))})
+        self._apply_stats(day, trip_stats.item_counts(None), trip_stats.item_counts(item))
+
+    def delete_item(self, day: dict, item: dict) -> None:
+        """Remove an item from its day and record it."""
+        item_id = item.get("id")
+        self._ensure_stats()
+        day = self._own_day(day)
+        items = self._own_child(day, "items", [])
+        pos = _position(items, item)
+        if pos is None:
+            # 이미 복사된 item의 이전 객체를 받은 경우
+            found = self.index.item(item_id)
+            if found is not None and self._is_owned(found[1]):
+                item = found[1]
+                pos = _position(items, item)
+        if pos is not None:
+            self._record_undo(_reinsert_undo(day, items, pos))
+            del items[pos]
+        self.index.remove_item(item)
+        self._record("remove", item_path(day.get("dayNum"), item_id))
+        if pos is not None:
+            self._apply_stats(day, trip_stats.item_counts(item), trip_stats.item_counts(None))
+
+    def append_option(self, day: dict, item: dict, opt: dict) -> None:
+        """Append an option to an item and record it."""
+        self._ensure_stats()
+        day, item = self._own_item(day, item)
+        before = trip_stats.item_counts(item)
+        self._own_child(item, "options", []).append(self._adopt(opt))
+        self.index.add_option(item, opt)
+        self._record("add", item_path(day.get("dayNum"), item.get("id"), "options", "-"), opt)
+        self._record_undo({"op": "remove", "path": option_path(day.get("dayNum"), item.get("id"), opt.get("name"))})
+        self._apply_stats(day, before, trip_stats.item_counts(item))
+
+    # -- 진행 통계 ----------------------------------------------------------
+
+    def _ensure_stats(self) -> None:
+        """
+        저장된 통계가 최신인지 확인하고, 아니면 전체를 다시 세어 컨텍스트 안에 기록한다.
+
+        컨텍스트당 한 번만 확인한다 (O(days)). 이후로는 _apply_stats가 차이만 반영한다.
+        """
+        if self._stats_ready:
+            return
+        self._stats_ready = True
+        days = self._data.get("days", [])
+        trusted = trip_stats.stats_current(self._data)
+        stored = [trip_stats.stored_day_stats(day) if trusted else None for day in days]
+        if trusted and all(s is not None for s in stored):
+            totals = trip_stats.empty_counts()
+            for stats in stored:
+                totals = trip_stats.add_counts(totals, stats)
+            if self._data["meta"].get("stats") == totals:
+                return
+
+        totals = trip_stats.empty_counts()
+        for day, stats in zip(list(days), stored):
+            if stats is None:
+                stats = trip_stats.count_day(day)
+                if day.get("stats") != stats:
+                    self._set_day_stats(day, stats)
+            totals = trip_stats.add_counts(totals, stats)
+        self._set_total_stats(totals)
+        meta = self._data["meta"]
+        meta["statsVersion"] = meta.get("lastUpdated")
+        logger.info("진행 통계 초기화: %s", totals)
+
+    def _apply_stats(self, day: dict, before: Dict[str, int], after: Dict[str, int]) -> None:
+        """항목 기여분이 before에서 after로 바뀐 만큼 day와 전체 통계를 갱신한다."""
+        delta = trip_stats.add_counts(after, before, -1)
+        if any(delta.values()):
+            self._set_day_stats(day, trip_stats.add_counts(self._own_day(day)["stats"], delta))
+            self._set_total_stats(trip_stats.add_counts(self._data["meta"]["stats"], delta))
+        if self._check_stats:
+            problems = trip_stats.verify_stats(self._data)
+            if problems:
+                raise AssertionError("진행 통계 불일치: " + "; ".join(problems))
+
+    # 통계는 컨텍스트 안에서만 갱신하고 patch/역연산에는 기록하지 않는다.
+    # 저장소가 patch를 적용한 뒤 바뀐 날만 다시 센다 (trip_stats.refresh_stats).
+
+    def _set_day_stats(self, day: dict, stats: Dict[str, int]) -> None:
+        self._own_day(day)["stats"] = stats
+
+    def _set_total_stats(self, stats: Dict[str, int]) -> None:
+        self._own_child(self._own_root(), "meta", {})["stats"] = stats
+
+    def _record(self, op: str, path: str, value=None, after: Optional[str] = None) -> None:
+        entry: dict = {"op": op, "path": path}
+        if op != "remove":
+            entry["value"] = copy.deepcopy(value)
+        if after:
+            entry["after"] = after
+        self._patch.append(entry)
+
+    def _record_undo(self, entry: dict) -> None:
+        self._undo.append(entry)
+
+    # -- savepoints ---------------------------------------------------------
+
+    def savepoint(self) -> tuple:
+        """
+        현재 상태를 되돌릴 수 있게 표시한다.
+
+        이후 변경은 이미 소유한 노드도 다시 복사하므로(copy-on-write 세대 교체)
+        표시 시점의 트리는 그대로 남는다. rollback_to로 되돌리거나 release로 확정한다.
+        """
+        sp = (self._data, self._owned, len(self._patch), len(self._undo),
+              self._modified, self._stats_ready)
+        self._owned = {}
+        return sp
+
+    def changed_since(self, sp: tuple) -> bool:
+        """savepoint 이후 기록된 변경이 있는지 여부."""
+        return len(self._patch) > sp[2]
+
+    def rollback_to(self, sp: tuple) -> None:
+        """savepoint 이후의 변경(데이터, patch, 역연산, 인덱스)을 모두 취소한다."""
+        self._data, self._owned, patch_len, undo_len, self._modified, self._stats_ready = sp
+        del self._patch[patch_len:]
+        del self._undo[undo_len:]
+        if self._index is not None:
+            self._index = self._index.rebuilt(self._data)
+
+    def release(self, sp: tuple) -> None:
+        """savepoint 이후의 변경을 확정한다."""
+        self._owned.update(sp[1])
 
     # -- lookup helpers -----------------------------------------------------
 
-    def find_item(self, item_id: str) -> Optional[Tuple[dict, dict]]:
-        """Find item by ID. Returns (day_dict, item_dict) or None."""
-        for day in self._data.get("days", []):
-            for item in day.get("items", []):
-                if item.get("id") == item_id:
-                    return day, item
-        return None
+    def find_item(self, item_id: str, for_update: bool = False) -> Optional[Tuple[dict, dict]]:
+        """Find item by ID. Returns (day_dict, item_dict) or None.
+
+        for_update=True이면 변경 가능한(이 컨텍스트가 소유한) day/item을 반환한다.
+        """
+        found = self.index.item(item_id)
+        if found is None or not for_update:
+            return found
+        return self._own_item(*found)
 
     def find_items_by_query(self, query: str) -> List[dict]:
-        """Partial match search on item titles and option names.
-        Returns list of items with added '_dayNum' field."""
-        query_lower = query.lower()
-        results: List[dict] = []
-        for day in self._data.get("days", []):
-            day_num = day.get("dayNum")
-            for item in day.get("items", []):
-                matched = False
-                # title 검색
-                if query_lower in item.get("title", "").lower():
-                    matched = True
-                # option name 검색
-                if not matched:
-                    for opt in item.get("options", []):
-                        if query_lower in opt.get("name", "").lower():
-                            matched = True
-                            break
-                if matched:
-                    entry = copy.deepcopy(item)
-                    entry["_dayNum"] = day_num
-                    results.append(entry)
-        return results
+        """Search item titles, option names, aliases and loc (TripIndex.search).
+
+        띄어쓰기 차이, 초성 질의, 작은 오타도 찾으며 점수순으로 정렬한다.
+        Returns shallow copies of the items with added '_dayNum', '_score'
+        and '_matched' (일치한 텍스트) fields."""
+        return [
+            dict(item, _dayNum=day.get("dayNum"), _score=round(score, 2), _matched=matched)
+            for day, item, score, matched in self.index.search(query)
+        ]
 
     def find_day(self, day_num: int = None, date: str = None) -> Optional[dict]:
         """Find day by day_num or date string."""
-        for day in self._data.get("days", []):
-            if day_num is not None and day.get("dayNum") == day_num:
-                return day
-            if date is not None and day.get("date") == date:
-                return day
-        return None
-
-    def find_option(self, item: dict, option_name: str) -> Optional[dict]:
-        """Find option by partial name match within an item's options list."""
-        name_lower = option_name.lower()
-        for opt in item.get("options", []):
-            if name_lower in opt.get("name", "").lower():
-                return opt
-        return None
+        return self.index.day(day_num=day_num, date=date)
+
+    def find_option(self, item: dict, option_name: str, for_update: bool = False) -> Optional[dict]:
+        """Find option by name within an item's options list (exact match first, then partial).
+
+        for_update=True이면(쓰기 대상) 완전 일치나 하나뿐인 부분 일치만 인정한다
+        (초성/오타로 다른 옵션을 고쳐 쓰지 않게).
+        """
+        return self.index.option(item, option_name, unique=for_update)
+
+
+def _field_undo(path: str, container: dict, key: str) -> dict:
+    """container[key]를 바꾸기 전에 만드는 역연산 (원래 값 복원, 없던 키면 삭제)."""
+    if key in container:
+        return {"op": "add", "path": path, "value": copy.deepcopy(container[key])}
+    return {"op": "remove", "path": path}
+
+
+def _reinsert_undo(day: dict, items: list, pos: int) -> dict:
+    """items[pos]를 삭제하기 전에 만드는 역연산 (이웃 항목 기준으로 같은 자리에 다시 추가)."""
+    entry = {"op": "add", "path": make_path("days", day.get("dayNum"), "items", "-"),
+             "value": copy.deepcopy(items[pos])}
+    if pos > 0:
+        entry["after"] = items[pos - 1].get("id")
+    elif len(items) > 1:
+        entry["before"] = items[1].get("id")
+    return entry
+
+
+def _position(seq: list, node: Any) -> Optional[int]:
+    """seq에서 node 객체(동일성 기준)의 위치."""
+    for i, existing in enumerate(seq):
+        if existing is node:
+            return i
+    return None
 
 
 # ---------------------------------------------------------------------------
@@ -112,11 +431,28 @@ def _register(tool_name: str):
 
 
 def execute_tool(ctx: ExecutionContext, tool_name: str, tool_input: dict) -> dict:
-    """Dispatch tool call to the appropriate handler. Returns a result dict."""
+    """Dispatch tool call to the appropriate handler. Returns a result dict.
+
+    입력은 핸들러 실행 전에 input_schema로 검증한다 (tool_validation).
+    호출마다 소요 시간과 오류 여부를 tool_stats에 기록한다 (검증 포함).
+    """
     handler = _HANDLERS.get(tool_name)
     if handler is None:
         logger.warning("Unknown tool requested: %s", tool_name)
         return {"error": f"Unknown tool: {tool_name}"}
+    started = time.perf_counter()
+    problem = validate_input(tool_name, tool_input)
+    if problem:
+        logger.info("Invalid input for %s: %s", tool_name, problem)
+        result = {"error": f"입력 오류: {problem}"}
+    else:
+        result = _run_handler(ctx, handler, tool_name, tool_input)
+    STATS.record_call(tool_name, time.perf_counter() - started, "error" in result)
+    return result
+
+
+def _run_handler(ctx: ExecutionContext, handler, tool_name: str, tool_input: dict) -> dict:
+    """검증된 입력으로 핸들러를 실행한다 (예외는 오류 결과로 바꾼다, 계측하지 않음)."""
     try:
         return handler(ctx, tool_input)
     except Exception as exc:
@@ -133,6 +469,50 @@ def _status_icon(status: str) -> str:
     return {"planned": "[ ]", "done": "[v]", "skipped": "[x]"}.get(status, "[?]")
 
 
+# 목록 도구의 항목 필드 (fields 기본값). icon, options(옵션 이름 목록)는 만들어 넣는다.
+_SCHEDULE_FIELDS = ("icon", "id", "time", "title", "chosen", "options")
+_LIST_FIELDS = ("id", "title", "status", "chosen")
+_SEARCH_FIELDS = ("id", "title", "cat", "status", "chosen")
+_ENTRY_DEFAULTS = {"time": "", "chosen": ""}
+
+# get_item_detail 기본 필드. 옵션은 대화에 자주 쓰는 필드만 (menuDetail, mapUrl 등은 요청 시)
+_DETAIL_FIELDS = ("date", "time", "cat", "title", "options", "chosen", "status", "note")
+_DETAIL_DEFAULTS = {"time": "", "cat": "", "options": [], "chosen": "", "status": "planned", "note": ""}
+_DETAIL_OPTION_FIELDS = ("name", "menu", "loc", "hours", "priceRange", "rating", "category",
+                         "dad", "dadNote", "hiro", "hiroNote")
+
+
+def _item_entry(item: dict, fields) -> dict:
+    """목록 도구의 항목 요약 (fields 순서)."""
+    entry = {}
+    for field in fields:
+        if field == "icon":
+            entry["icon"] = _status_icon(item.get("status", "planned"))
+        elif field == "options":
+            entry["options"] = [o.get("name", "") for o in item.get("options", [])]
+        elif field in item or field in _ENTRY_DEFAULTS:
+            entry[field] = item.get(field, _ENTRY_DEFAULTS.get(field))
+        elif field in ("title", "status", "cat"):
+            entry[field] = None
+    return entry
+
+
+def _list_fields(inp: dict, default) -> list:
+    """요청한 fields (id는 항상 포함)."""
+    fields = inp.get("fields") or default
+    return fields if "id" in fields else ["id", *fields]
+
+
+def _paged(inp: dict, entries, shape, **extra) -> dict:
+    """목록 결과 한 페이지 ({count, items, next_cursor?, ...extra})."""
+    items, next_cursor = result_budget.paginate(
+        entries, shape, inp.get("cursor"), result_budget.page_size(inp.get("limit")))
+    result = {"count": len(entries), **extra, "items": items}
+    if next_cursor is not None:
+        result["next_cursor"] = next_cursor
+    return result
+
+
 @_register("get_schedule")
 def _handle_get_schedule(ctx: ExecutionContext, inp: dict) -> dict:
     """일정 조회 (day_num 또는 date 기준)."""
@@ -140,171 +520,263 @@ def _handle_get_schedule(ctx: ExecutionContext, inp: dict) -> dict:
     if day is None:
         return {"error": "해당 일자를 찾을 수 없습니다."}
 
-    items_summary = []
-    for item in day.get("items", []):
-        icon = _status_icon(item.get("status", "planned"))
-        chosen = item.get("chosen", "")
-        options = [o.get("name", "") for o in item.get("options", [])]
-        items_summary.append({
-            "icon": icon,
-            "id": item.get("id"),
-            "time": item.get("time", ""),
-            "title": item.get("title", ""),
-            "chosen": chosen,
-            "options": options,
-        })
-
-    return {
+    fields = _list_fields(inp, _SCHEDULE_FIELDS)
+    page = _paged(inp, day.get("items", []), lambda item: _item_entry(item, fields))
+    result = {
         "dayNum": day.get("dayNum"),
         "date": day.get("date"),
         "dow": day.get("dow"),
         "title": day.get("title", ""),
-        "items": items_summary,
+        "items": page["items"],
     }
+    if "next_cursor" in page:
+        result.update(count=page["count"], next_cursor=page["next_cursor"])
+    return result
 
 
 @_register("find_item")
 def _handle_find_item(ctx: ExecutionContext, inp: dict) -> dict:
-    """키워드 부분 일치 검색."""
+    """키워드 검색 (띄어쓰기/초성/오타 허용, 점수순)."""
     query = inp.get("query", "")
     if not query:
         return {"error": "query가 필요합니다."}
 
-    results = ctx.find_items_by_query(query)
-    return {
-        "count": len(results),
-        "items": [
-            {
-                "dayNum": r.get("_dayNum"),
-                "id": r.get("id"),
-                "title": r.get("title"),
-                "status": r.get("status"),
-                "chosen": r.get("chosen", ""),
-            }
-            for r in results
-        ],
-    }
+    fields = _list_fields(inp, _LIST_FIELDS)
+
+    def shape(hit):
+        day, item, score, matched = hit
+        return {"dayNum": day.get("dayNum"), **_item_entry(item, fields),
+                "matched": matched, "score": round(score, 2)}
+
+    return _paged(inp, ctx.index.search(query), shape)
+
+
+def _search_filters(inp: dict) -> dict:
+    """도구 입력 -> filter_index 필터 조건 (search_items, find_nearby 공용)."""
+    filters = {}
+    for field in ("cat", "dad", "hiro", "status", "category"):
+        if inp.get(field):
+            filters[field] = inp[field]
+    for field in ("day_num", "min_rating", "optional"):
+        if inp.get(field) is not None:
+            filters[field] = inp[field]
+    if inp.get("open_now"):
+        filters["open_at"] = datetime.now(KST)
+    return filters
 
 
 @_register("search_items")
 def _handle_search_items(ctx: ExecutionContext, inp: dict) -> dict:
-    """필터 기반 검색 (cat, dad, hiro, status, day_num AND 조합)."""
-    cat_filter = inp.get("cat")
-    dad_filter = inp.get("dad")
-    hiro_filter = inp.get("hiro")
-    status_filter = inp.get("status")
-    day_num_filter = inp.get("day_num")
-
-    results: List[dict] = []
-
-    for day in ctx.data.get("days", []):
-        d_num = day.get("dayNum")
-        if day_num_filter is not None and d_num != day_num_filter:
-            continue
-
-        for item in day.get("items", []):
-            # cat 필터
-            if cat_filter and item.get("cat") != cat_filter:
-                continue
-            # status 필터
-            if status_filter and item.get("status") != status_filter:
-                continue
-            # dad / hiro 필터: ANY option 일치
-            if dad_filter:
-                if not any(o.get("dad") == dad_filter for o in item.get("options", [])):
-                    continue
-            if hiro_filter:
-                if not any(o.get("hiro") == hiro_filter for o in item.get("options", [])):
-                    continue
-
-            results.append({
-                "dayNum": d_num,
-                "id": item.get("id"),
-                "title": item.get("title"),
-                "cat": item.get("cat"),
-                "status": item.get("status"),
-                "chosen": item.get("chosen", ""),
-            })
-
-    return {"count": len(results), "items": results}
+    """필터 기반 검색 (cat, dad, hiro, status, day_num, min_rating, category, open_now, optional AND 조합)."""
+    filters = _search_filters(inp)
+    fields = _list_fields(inp, _SEARCH_FIELDS)
+    return _paged(inp, ctx.index.filter(filters),
+                  lambda hit: {"dayNum": hit[0].get("dayNum"), **_item_entry(hit[1], fields)})
 
 
 @_register("get_item_detail")
 def _handle_get_item_detail(ctx: ExecutionContext, inp: dict) -> dict:
-    """아이템 상세 조회."""
+    """아이템 상세 조회 (fields/option_fields로 필드 선택, 옵션은 바이트 예산 안에서 페이지)."""
     item_id = inp.get("item_id", "")
     found = ctx.find_item(item_id)
     if found is None:
         return {"error": f"아이템을 찾을 수 없습니다: {item_id}"}
     day, item = found
 
-    result = {
+    fields = list(inp.get("fields") or _DETAIL_FIELDS)
+    option_fields = list(inp.get("option_fields") or _DETAIL_OPTION_FIELDS)
+    if "name" not in option_fields:
+        option_fields.insert(0, "name")
+
+    source = dict(item, date=day.get("date"))
+    result = {"dayNum": day.get("dayNum"), "id": item.get("id")}
+    result.update(result_budget.project(source, [f for f in fields if f != "options"], _DETAIL_DEFAULTS))
+    omitted = sorted(k for k in item if k not in result and (k != "options" or "options" not in fields))
+
+    if "options" in fields or "*" in fields:
+        options = item.get("options", [])
+        budget = result_budget.RESULT_BYTE_BUDGET - result_budget.json_size(result)
+        page, next_cursor = result_budget.paginate(
+            options, lambda opt: result_budget.project(opt, option_fields),
+            inp.get("cursor"), len(options) or 1, max(budget, 0))
+        result["options"] = page
+        if next_cursor is not None:
+            result["options_total"] = len(options)
+            result["next_cursor"] = next_cursor
+        option_keys = {k for opt in options for k in opt}
+        omitted += sorted(f"options.{k}" for k in option_keys if k not in option_fields and "*" not in option_fields)
+    if omitted:
+        result["omitted"] = omitted
+    return result
+
+
+def _timeline_entry(day: dict, entry) -> dict:
+    """타임라인 원소 -> 결과 항목 (파싱한 시작/끝 시각 포함)."""
+    item = day.get("items", [])[entry.position]
+    return {
         "dayNum": day.get("dayNum"),
-        "date": day.get("date"),
         "id": item.get("id"),
+        "title": item.get("title"),
         "time": item.get("time", ""),
-        "cat": item.get("cat", ""),
-        "title": item.get("title", ""),
-        "options": copy.deepcopy(item.get("options", [])),
-        "chosen": item.get("chosen", ""),
+        "start": format_minutes(entry.start),
+        "end": format_minutes(entry.end),
+        "approx": entry.approx,
         "status": item.get("status", "planned"),
-        "note": item.get("note", ""),
+        "chosen": item.get("chosen", ""),
     }
-    if "guide" in item:
-        result["guide"] = copy.deepcopy(item["guide"])
+
+
+def _upcoming(ctx: ExecutionContext, day: dict, pos: int):
+    """day 타임라인의 pos부터 아직 하지 않은(planned) 첫 항목, 그 날에 없으면 다음 날들에서 찾는다."""
+    while day is not None:
+        items = day.get("items", [])
+        for entry in ctx.index.timeline(day).entries[pos:]:
+            if items[entry.position].get("status", "planned") not in ("done", "skipped"):
+                return day, entry
+        day_num = day.get("dayNum")
+        day = ctx.find_day(day_num=day_num + 1) if isinstance(day_num, int) else None
+        pos = 0
+    return None
+
+
+@_register("get_now_next")
+def _handle_get_now_next(ctx: ExecutionContext, inp: dict) -> dict:
+    """지금(KST) 진행 중인 항목과 다음 항목 (그 날 타임라인에서 이진 탐색)."""
+    if inp.get("at"):
+        try:
+            now = datetime.fromisoformat(inp["at"])
+        except ValueError:
+            return {"error": f"at 형식이 잘못되었습니다: {inp['at']} (예: 2026-02-19T12:30)"}
+        now = now.replace(tzinfo=KST) if now.tzinfo is None else now.astimezone(KST)
+    else:
+        now = datetime.now(KST)
+    today = now.date().isoformat()
+    result = {"now": now.strftime("%Y-%m-%dT%H:%M")}
+
+    dates = [d.get("date") for d in ctx.data.get("days", []) if d.get("date")]
+    if not dates:
+        return {"error": "일정에 날짜가 없습니다."}
+    day = ctx.find_day(date=today)
+    if day is None:
+        if today < min(dates):
+            first = ctx.find_day(date=min(dates))
+            upcoming = _upcoming(ctx, first, 0)
+            result.update(phase="before_trip", current=[],
+                          next=_timeline_entry(*upcoming) if upcoming else None)
+        elif today > max(dates):
+            result.update(phase="after_trip", current=[], next=None)
+        else:
+            # 일정에 없는 중간 날짜 - 그 뒤 첫 날의 첫 항목
+            later = ctx.find_day(date=min(d for d in dates if d > today))
+            upcoming = _upcoming(ctx, later, 0)
+            result.update(phase="free_day", current=[],
+                          next=_timeline_entry(*upcoming) if upcoming else None)
+        return result
+
+    timeline = ctx.index.timeline(day)
+    current, pos = timeline.at(now.hour * 60 + now.minute)
+    items = day.get("items", [])
+    current = [e for e in current if items[e.position].get("status", "planned") != "skipped"]
+    upcoming = _upcoming(ctx, day, pos)
+    remaining = sum(
+        1 for e in timeline.entries[pos:]
+        if items[e.position].get("status", "planned") not in ("done", "skipped")
+    )
+    result.update(
+        phase="on_trip",
+        dayNum=day.get("dayNum"),
+        current=[_timeline_entry(day, e) for e in current],
+        next=_timeline_entry(*upcoming) if upcoming else None,
+        remaining_today=remaining,
+    )
     return result
 
 
+# find_nearby 기본 결과 수, 장소마다 돌려줄 옵션 필드
+_NEARBY_LIMIT = 5
+_NEARBY_FIELDS = ("loc", "category", "rating", "dad", "hiro")
+
+
+def _nearby_origin(ctx: ExecutionContext, inp: dict):
+    """find_nearby 기준 위치 {name, lat, lng} (찾을 수 없으면 오류 문자열)."""
+    if inp.get("lat") is not None or inp.get("lng") is not None:
+        if inp.get("lat") is None or inp.get("lng") is None:
+            return "lat과 lng를 함께 지정해야 합니다."
+        return {"name": inp.get("place") or "지정 좌표", "lat": inp["lat"], "lng": inp["lng"]}
+
+    place = (inp.get("place") or "").strip()
+    if not place:
+        return "lat/lng 또는 place가 필요합니다."
+    stay = ctx.index.accommodation()
+    if place.lower() in geo_index.ACCOMMODATION_ALIASES or place == stay.get("name"):
+        return {"name": stay.get("name"), "lat": stay["lat"], "lng": stay["lng"]}
+
+    for _day, item, _score, _matched in ctx.index.search(place):
+        candidates = [ctx.index.option(item, place)]
+        if item.get("chosen"):
+            candidates.append(ctx.index.option(item, item["chosen"]))
+        candidates.append(item)
+        for candidate in candidates:
+            point = geo_index.coords(candidate) if candidate else None
+            if point is not None:
+                name = candidate.get("name") or candidate.get("title", "")
+                return {"name": name, "lat": point[0], "lng": point[1]}
+    return f"좌표가 있는 장소를 찾을 수 없습니다: {place}"
+
+
+@_register("find_nearby")
+def _handle_find_nearby(ctx: ExecutionContext, inp: dict) -> dict:
+    """기준 위치에서 가까운 장소 (격자 인덱스에서 거리순으로 꺼내며 필터 판정)."""
+    origin = _nearby_origin(ctx, inp)
+    if isinstance(origin, str):
+        return {"error": origin}
+    filters = _search_filters(inp)
+    limit = result_budget.page_size(inp.get("limit"), _NEARBY_LIMIT)
+
+    places: List[dict] = []
+    by_name: Dict[str, dict] = {}
+    last_dist = None
+    for dist, place in ctx.index.nearby(origin["lat"], origin["lng"], inp.get("radius_m")):
+        if len(places) >= limit and dist > last_dist:
+            break  # 같은 거리(같은 장소의 다른 일정)까지는 모은다
+        if place.name == origin["name"]:
+            continue
+        if place.item_id is None:
+            if filters:
+                continue
+            entry = {"name": place.name, "distance_m": round(dist), "kind": "accommodation"}
+        else:
+            found = ctx.find_item(place.item_id)
+            if found is None:
+                continue
+            day, item = found
+            opt = ctx.index.option(item, place.option_name) if place.option_name else None
+            if filters and not filter_index.matches(day, dict(item, options=[opt] if opt else []), filters):
+                continue
+            ref = {"dayNum": day.get("dayNum"), "id": item.get("id"), "title": item.get("title")}
+            if place.name in by_name:
+                by_name[place.name]["items"].append(ref)
+                continue
+            entry = {"name": place.name, "distance_m": round(dist), "items": [ref]}
+            entry.update(result_budget.project(opt or {}, _NEARBY_FIELDS))
+            by_name[place.name] = entry
+        if len(places) >= limit:
+            continue
+        places.append(entry)
+        last_dist = dist
+    return {"origin": origin, "count": len(places), "places": places}
+
+
 @_register("get_trip_summary")
 def _handle_get_trip_summary(ctx: ExecutionContext, inp: dict) -> dict:
-    """여행 전체 요약 통계."""
-    per_day: List[dict] = []
-    total = planned = done = skipped = chosen_cnt = with_options = 0
-
-    for day in ctx.data.get("days", []):
-        d_total = d_planned = d_done = d_skipped = d_chosen = d_with_opts = 0
-        for item in day.get("items", []):
-            d_total += 1
-            st = item.get("status", "planned")
-            if st == "planned":
-                d_planned += 1
-            elif st == "done":
-                d_done += 1
-            elif st == "skipped":
-                d_skipped += 1
-            if item.get("chosen"):
-                d_chosen += 1
-            if item.get("options") and not item.get("chosen"):
-                d_with_opts += 1
-
-        per_day.append({
-            "dayNum": day.get("dayNum"),
-            "date": day.get("date"),
-            "title": day.get("title", ""),
-            "total": d_total,
-            "planned": d_planned,
-            "done": d_done,
-            "skipped": d_skipped,
-            "chosen": d_chosen,
-            "with_options": d_with_opts,
-        })
-        total += d_total
-        planned += d_planned
-        done += d_done
-        skipped += d_skipped
-        chosen_cnt += d_chosen
-        with_options += d_with_opts
-
+    """여행 전체 요약 통계 (데이터에 저장된 진행 통계 사용, O(days))."""
+    per_day, totals = trip_stats.summarize(ctx.data)
     return {
-        "days": per_day,
-        "totals": {
-            "total": total,
-            "planned": planned,
-            "done": done,
-            "skipped": skipped,
-            "chosen": chosen_cnt,
-            "with_options": with_options,
-        },
+        "days": [
+            dict({"dayNum": day.get("dayNum"), "date": day.get("date"), "title": day.get("title", "")}, **stats)
+            for day, stats in per_day
+        ],
+        "totals": totals,
     }
 
 
@@ -317,7 +789,7 @@ def _handle_update_item(ctx: ExecutionContext, inp: dict) -> dict:
     """아이템 기본 정보(시간, 제목) 수정."""
     item_id = inp.get("item_id", "")
 
-    found = ctx.find_item(item_id)
+    found = ctx.find_item(item_id, for_update=True)
     if found is None:
         return {"error": f"아이템을 찾을 수 없습니다: {item_id}"}
     _day, item = found
@@ -325,11 +797,11 @@ def _handle_update_item(ctx: ExecutionContext, inp: dict) -> dict:
     updated = []
     if "time" in inp:
         old_time = item.get("time", "")
-        item["time"] = inp["time"]
+        ctx.set_item_field(_day, item, "time", inp["time"])
         updated.append(f"time: {old_time} -> {inp['time']}")
     if "title" in inp:
         old_title = item.get("title", "")
-        item["title"] = inp["title"]
+        ctx.set_item_field(_day, item, "title", inp["title"])
         updated.append(f"title: {old_title} -> {inp['title']}")
 
     if not updated:
@@ -353,13 +825,13 @@ def _handle_update_status(ctx: ExecutionContext, inp: dict) -> dict:
     if new_status not in _VALID_STATUSES:
         return {"error": f"유효하지 않은 상태값입니다: {new_status} (허용: {_VALID_STATUSES})"}
 
-    found = ctx.find_item(item_id)
+    found = ctx.find_item(item_id, for_update=True)
     if found is None:
         return {"error": f"아이템을 찾을 수 없습니다: {item_id}"}
     _day, item = found
 
     old_status = item.get("status", "planned")
-    item["status"] = new_status
+    ctx.set_item_field(_day, item, "status", new_status)
     ctx.mark_modified(f"{item_id} 상태 변경: {old_status} -> {new_status}")
     logger.info("Status updated: %s %s -> %s", item_id, old_status, new_status)
 
@@ -373,24 +845,26 @@ def _handle_update_visit(ctx: ExecutionContext, inp: dict) -> dict:
     visited = inp.get("visited", True)
     option_name = inp.get("option_name", "")
 
-    found = ctx.find_item(item_id)
+    found = ctx.find_item(item_id, for_update=True)
     if found is None:
         return {"error": f"아이템을 찾을 수 없습니다: {item_id}"}
     _day, item = found
 
-    item["visited"] = visited
-
+    # 옵션을 먼저 확인한다 - 실패하면 아무것도 바꾸지 않는다
+    matched = None
     if option_name:
-        matched = ctx.find_option(item, option_name)
-        if matched:
-            item["visitedOption"] = matched["name"]
-        else:
+        matched = ctx.find_option(item, option_name, for_update=True)
+        if matched is None:
             available = [o.get("name", "") for o in item.get("options", [])]
             return {"error": f"옵션을 찾을 수 없습니다: '{option_name}'. 가능한 옵션: {available}"}
 
+    ctx.set_item_field(_day, item, "visited", visited)
+    if matched is not None:
+        ctx.set_item_field(_day, item, "visitedOption", matched["name"])
+
     # 방문 시 자동으로 status를 done으로 변경
     if visited and item.get("status") == "planned":
-        item["status"] = "done"
+        ctx.set_item_field(_day, item, "status", "done")
 
     action = "방문 기록" if visited else "방문 취소"
     visited_opt = item.get("visitedOption", "")
@@ -408,12 +882,12 @@ def _handle_update_review(ctx: ExecutionContext, inp: dict) -> dict:
     item_id = inp.get("item_id", "")
     review = inp.get("review", "")
 
-    found = ctx.find_item(item_id)
+    found = ctx.find_item(item_id, for_update=True)
     if found is None:
         return {"error": f"아이템을 찾을 수 없습니다: {item_id}"}
     _day, item = found
 
-    item["review"] = review
+    ctx.set_item_field(_day, item, "review", review)
     ctx.mark_modified(f"{item_id} 리뷰: {review[:30]}")
     logger.info("Review updated: %s -> %s", item_id, review[:50])
 
@@ -427,19 +901,19 @@ def _handle_update_note(ctx: ExecutionContext, inp: dict) -> dict:
     note = inp.get("note", "")
     mode = inp.get("mode", "append")
 
-    found = ctx.find_item(item_id)
+    found = ctx.find_item(item_id, for_update=True)
     if found is None:
         return {"error": f"아이템을 찾을 수 없습니다: {item_id}"}
     _day, item = found
 
     if mode == "replace":
-        item["note"] = note
+        ctx.set_item_field(_day, item, "note", note)
     else:  # append
         existing = item.get("note", "")
         if existing:
-            item["note"] = existing + "\n" + note
+            ctx.set_item_field(_day, item, "note", existing + "\n" + note)
         else:
-            item["note"] = note
+            ctx.set_item_field(_day, item, "note", note)
 
     ctx.mark_modified(f"{item_id} 메모 업데이트 ({mode})")
     logger.info("Note updated (%s): %s", mode, item_id)
@@ -457,21 +931,23 @@ def _handle_update_option(ctx: ExecutionContext, inp: dict) -> dict:
     option_name = inp.get("option_name", "")
     fields = inp.get("fields", {})
 
-    found = ctx.find_item(item_id)
+    found = ctx.find_item(item_id, for_update=True)
     if found is None:
         return {"error": f"아이템을 찾을 수 없습니다: {item_id}"}
     _day, item = found
 
-    opt = ctx.find_option(item, option_name)
+    opt = ctx.find_option(item, option_name, for_update=True)
     if opt is None:
         available = [o.get("name", "") for o in item.get("options", [])]
         return {"error": f"옵션을 찾을 수 없습니다: '{option_name}'. 가능한 옵션: {available}"}
 
+    unsupported = [key for key in fields if key not in _OPTION_FIELDS]
+    if unsupported:
+        return {"error": f"지원하지 않는 필드입니다: {unsupported[0]} (허용: {_OPTION_FIELDS})"}
+
     updated_fields = []
     for key, value in fields.items():
-        if key not in _OPTION_FIELDS:
-            return {"error": f"지원하지 않는 필드입니다: {key} (허용: {_OPTION_FIELDS})"}
-        opt[key] = value
+        ctx.set_option_field(_day, item, opt, key, value)
         updated_fields.append(key)
 
     ctx.mark_modified(f"{item_id} 옵션 '{opt['name']}' 수정: {updated_fields}")
@@ -496,9 +972,12 @@ def _handle_add_item(ctx: ExecutionContext, inp: dict) -> dict:
     if day is None:
         return {"error": f"Day {day_num}을(를) 찾을 수 없습니다."}
 
-    # 아이템 ID 생성
+    # 아이템 ID 생성 (기존 id와 겹치지 않게)
     item_index = len(day.get("items", [])) + 1
     item_id = f"d{day_num}_item{item_index}"
+    while ctx.index.has_item(item_id):
+        item_index += 1
+        item_id = f"d{day_num}_item{item_index}"
 
     new_item: dict = {
         "id": item_id,
@@ -519,17 +998,8 @@ def _handle_add_item(ctx: ExecutionContext, inp: dict) -> dict:
                 opt_entry[field] = opt_data[field]
         new_item["options"].append(opt_entry)
 
-    items = day.setdefault("items", [])
     after_id = inp.get("after_item_id", "")
-    inserted = False
-    if after_id:
-        for i, existing in enumerate(items):
-            if existing.get("id") == after_id:
-                items.insert(i + 1, new_item)
-                inserted = True
-                break
-    if not inserted:
-        items.append(new_item)
+    ctx.insert_item(day, new_item, after_id)
 
     ctx.mark_modified(f"아이템 추가: {item_id} ({title})")
     logger.info("Item added: %s to day %s (after=%s)", item_id, day_num, after_id or "end")
@@ -546,17 +1016,17 @@ def _handle_add_option(ctx: ExecutionContext, inp: dict) -> dict:
     if not name:
         return {"error": "name이 필요합니다."}
 
-    found = ctx.find_item(item_id)
+    found = ctx.find_item(item_id, for_update=True)
     if found is None:
         return {"error": f"아이템을 찾을 수 없습니다: {item_id}"}
     _day, item = found
 
     opt_entry: dict = {"name": name}
-    for field in ("menu", "dad", "hiro", "hiroNote"):
+    for field in ("menu", "dad", "hiro", "hiroNote", "lat", "lng"):
         if field in inp:
             opt_entry[field] = inp[field]
 
-    item.setdefault("options", []).append(opt_entry)
+    ctx.append_option(_day, item, opt_entry)
     ctx.mark_modified(f"{item_id} 옵션 추가: {name}")
     logger.info("Option added: %s -> %s", item_id, name)
 
@@ -570,7 +1040,7 @@ def _handle_move_item(ctx: ExecutionContext, inp: dict) -> dict:
     to_day_num = inp.get("to_day_num")
     new_time = inp.get("new_time")
 
-    found = ctx.find_item(item_id)
+    found = ctx.find_item(item_id, for_update=True)
     if found is None:
         return {"error": f"아이템을 찾을 수 없습니다: {item_id}"}
     src_day, item = found
@@ -580,7 +1050,7 @@ def _handle_move_item(ctx: ExecutionContext, inp: dict) -> dict:
         return {"error": f"Day {to_day_num}을(를) 찾을 수 없습니다."}
 
     # source 에서 제거
-    src_day["items"] = [i for i in src_day["items"] if i.get("id") != item_id]
+    ctx.delete_item(src_day, item)
 
     # 시간 변경
     if new_time is not None:
@@ -596,17 +1066,8 @@ def _handle_move_item(ctx: ExecutionContext, inp: dict) -> dict:
 
     new_id = item["id"]
 
-    tgt_items = tgt_day.setdefault("items", [])
     after_id = inp.get("after_item_id", "")
-    inserted = False
-    if after_id:
-        for i, existing in enumerate(tgt_items):
-            if existing.get("id") == after_id:
-                tgt_items.insert(i + 1, item)
-                inserted = True
-                break
-    if not inserted:
-        tgt_items.append(item)
+    ctx.insert_item(tgt_day, item, after_id)
 
     ctx.mark_modified(f"아이템 이동: {item_id} -> Day {to_day_num} ({new_id})")
     logger.info("Item moved: %s -> day %s as %s (after=%s)", item_id, to_day_num, new_id, after_id or "end")
@@ -624,8 +1085,75 @@ def _handle_remove_item(ctx: ExecutionContext, inp: dict) -> dict:
         return {"error": f"아이템을 찾을 수 없습니다: {item_id}"}
     day, item = found
 
-    day["items"] = [i for i in day["items"] if i.get("id") != item_id]
+    ctx.delete_item(day, item)
     ctx.mark_modified(f"아이템 삭제: {item_id} ({item.get('title', '')})")
     logger.info("Item removed: %s", item_id)
 
     return {"ok": True, "item_id": item_id, "title": item.get("title", "")}
+
+
+# ---------------------------------------------------------------------------
+# Batch Handler
+# ---------------------------------------------------------------------------
+
+# apply_batch로 묶을 수 있는 쓰기 도구
+_BATCH_TOOLS = frozenset({
+    "update_item", "update_status", "update_visit", "update_review", "update_note",
+    "update_option", "add_item", "add_option", "move_item", "remove_item",
+})
+# 데이터를 바꾸는 도구 (실패 시 턴 단위로 되돌리는 대상)
+WRITE_TOOLS = _BATCH_TOOLS | {"apply_batch"}
+MAX_BATCH_OPERATIONS = 20
+
+def _validate_batch_operation(op) -> Optional[str]:
+    """배치 작업 하나의 도구 이름과 입력을 검증한다. 문제가 없으면 None."""
+    if not isinstance(op, dict):
+        return "작업은 {tool, input} 객체여야 합니다"
+    tool_name = op.get("tool")
+    if tool_name not in _BATCH_TOOLS:
+        return f"apply_batch로 실행할 수 없는 도구입니다: {tool_name}"
+    return validate_input(tool_name, op.get("input", {}))
+
+
+@_register("apply_batch")
+def _handle_apply_batch(ctx: ExecutionContext, inp: dict) -> dict:
+    """여러 쓰기 작업을 원자적으로 적용 (전부 검증 후 적용, 하나라도 실패하면 전부 취소)."""
+    operations = inp.get("operations")
+    if not isinstance(operations, list) or not operations:
+        return {"error": "operations 목록이 필요합니다."}
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        return {"error": f"작업은 최대 {MAX_BATCH_OPERATIONS}개까지 묶을 수 있습니다 (요청: {len(operations)}개)"}
+
+    # 1. 모든 작업 입력 검증 - 하나라도 잘못되면 아무것도 적용하지 않는다
+    invalid = []
+    for i, op in enumerate(operations):
+        problem = _validate_batch_operation(op)
+        if problem:
+            invalid.append({"index": i, "error": problem})
+    if invalid:
+        return {"error": "입력 검증에 실패하여 아무것도 적용하지 않았습니다.", "invalid": invalid}
+
+    # 2. 순서대로 적용 - 실패하면 savepoint로 되돌린다.
+    # 검증은 위에서 끝났고, 계측은 바깥 apply_batch 호출 1건으로만 남긴다 (도구별 횟수 중복 방지)
+    sp = ctx.savepoint()
+    results = []
+    notes = []
+    for i, op in enumerate(operations):
+        tool_name = op["tool"]
+        result = _run_handler(ctx, _HANDLERS[tool_name], tool_name, op.get("input", {}))
+        if "error" in result:
+            ctx.rollback_to(sp)
+            logger.info("Batch rolled back at %d/%d (%s): %s", i + 1, len(operations), tool_name, result["error"])
+            return {
+                "error": f"{i + 1}번째 작업({tool_name})이 실패하여 전체 변경을 취소했습니다: {result['error']}",
+                "failed_index": i,
+                "rolled_back": True,
+            }
+        results.append(dict(result, tool=tool_name))
+        notes.append(ctx.data.get("meta", {}).get("updateNote", ""))
+    ctx.release(sp)
+
+    ctx.mark_modified(f"일괄 변경 {len(results)}건: " + "; ".join(n for n in notes if n))
+    logger.info("Batch applied: %d operations", len(results))
+
+    return {"ok": True, "count": len(results), "results": results}
@@ -0,0 +1,215 @@
+"""
+도구 실행 계측 모듈.
+
+execute_tool이 도구마다 호출 수, 오류 수, 소요 시간 히스토그램을 기록하고
+(apply_batch 안의 작업은 따로 세지 않고 apply_batch 1건으로만 센다),
+claude_api_handler가 프롬프트에 들어가는 결과 JSON 크기와 턴 수, API 호출마다
+첫 토큰까지 걸린 시간과 입력 토큰(캐시 읽기/쓰기 포함) 수를 기록한다.
+프로세스 안에서 snapshot()으로 조회한다 (웹 API의 GET /stats).
+
+기록 1회는 perf_counter 차이, 고정 버킷의 이진 탐색, 정수 덧셈뿐이라
+운영 중에도 켜 둔다. 백분위수는 버킷 상한으로 추정한다.
+
+    {"turns": 12, "tools": {"find_item": {"calls": 20, "errors": 1,
+        "callsPerTurn": 1.67, "latencyMs": {"mean": 0.4, "p50": 0.5, "p95": 1.0,
+        "max": 2.1, "buckets": {"0.5": 15, "1": 4, "2.5": 1}},
+        "resultBytes": {"mean": 812, "max": 2048, "total": 16240}}},
+     "api": {"calls": 30, "firstTokenMs": {"mean": 950.2, "max": 2100.0}, "totalMs": {...},
+        "tokens": {"input": 4200, "cacheRead": 150000, "cacheWrite": 9000, "output": 3100},
+        "cacheReadRatio": 0.92}}
+"""
+
+import bisect
+import time
+from typing import Dict, Iterable, List, Optional
+
+# 소요 시간 히스토그램 버킷 상한 (밀리초, 마지막 버킷은 그 이상 전부)
+LATENCY_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class _ToolCounters:
+    """도구 하나의 누적 값"""
+
+    __slots__ = ("calls", "errors", "total_ms", "max_ms", "buckets",
+                 "sized", "total_bytes", "max_bytes")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.sized = 0
+        self.total_bytes = 0
+        self.max_bytes = 0
+
+
+def _bucket_label(i: int) -> str:
+    if i < len(LATENCY_BUCKETS_MS):
+        return f"{LATENCY_BUCKETS_MS[i]:g}"
+    return f">{LATENCY_BUCKETS_MS[-1]:g}"
+
+
+def _percentile(buckets: List[int], calls: int, q: float) -> Optional[float]:
+    """버킷 상한으로 추정한 백분위수 (마지막 버킷이면 None)."""
+    if not calls:
+        return None
+    target = q * calls
+    seen = 0
+    for i, count in enumerate(buckets):
+        seen += count
+        if seen >= target:
+            return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else None
+    return None
+
+
+class _ApiCounters:
+    """Messages API 호출 누적 값"""
+
+    __slots__ = ("calls", "first_token_ms", "max_first_token_ms", "total_ms", "max_ms",
+                 "input_tokens", "cache_read_tokens", "cache_write_tokens", "output_tokens")
+
+    def __init__(self) -> None:
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+
+class ToolStats:
+    """도구별 호출/오류/소요 시간/결과 크기 누적기"""
+
+    def __init__(self) -> None:
+        self._tools: Dict[str, _ToolCounters] = {}
+        self._turns = 0
+        self._api = _ApiCounters()
+        self._since = time.time()
+
+    def _counters(self, tool_name: str) -> _ToolCounters:
+        counters = self._tools.get(tool_name)
+        if counters is None:
+            counters = self._tools[tool_name] = _ToolCounters()
+        return counters
+
+    def record_call(self, tool_name: str, elapsed: float, error: bool = False) -> None:
+        """
+        도구 실행 한 번을 기록한다.
+
+        Args:
+            tool_name: 도구 이름
+            elapsed: 소요 시간 (초)
+            error: 오류 결과였는지 여부
+        """
+        counters = self._counters(tool_name)
+        ms = elapsed * 1000
+        counters.calls += 1
+        counters.errors += error
+        counters.total_ms += ms
+        if ms > counters.max_ms:
+            counters.max_ms = ms
+        counters.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+
+    def record_result_size(self, tool_name: str, nbytes: int) -> None:
+        """프롬프트에 들어간 도구 결과 JSON 크기 (바이트)를 기록한다."""
+        counters = self._counters(tool_name)
+        counters.sized += 1
+        counters.total_bytes += nbytes
+        if nbytes > counters.max_bytes:
+            counters.max_bytes = nbytes
+
+    def record_turn(self) -> None:
+        """메시지 처리(턴) 한 번을 기록한다 (턴당 호출 수 계산용)."""
+        self._turns += 1
+
+    def record_api_call(self, first_token: float, elapsed: float, usage) -> None:
+        """
+        Messages API 호출 한 번(라운드)을 기록한다.
+
+        Args:
+            first_token: 첫 토큰까지 걸린 시간 (초)
+            elapsed: 응답 완료까지 걸린 시간 (초)
+            usage: 응답의 usage (input_tokens, output_tokens, cache_*_input_tokens)
+        """
+        api = self._api
+        first_ms, total_ms = first_token * 1000, elapsed * 1000
+        api.calls += 1
+        api.first_token_ms += first_ms
+        api.max_first_token_ms = max(api.max_first_token_ms, first_ms)
+        api.total_ms += total_ms
+        api.max_ms = max(api.max_ms, total_ms)
+        api.input_tokens += getattr(usage, "input_tokens", 0) or 0
+        api.cache_read_tokens += getattr(usage, "cache_read_input_tokens", 0) or 0
+        api.cache_write_tokens += getattr(usage, "cache_creation_input_tokens", 0) or 0
+        api.output_tokens += getattr(usage, "output_tokens", 0) or 0
+
+    def _api_snapshot(self) -> dict:
+        api = self._api
+        prompt_tokens = api.input_tokens + api.cache_read_tokens + api.cache_write_tokens
+        return {
+            "calls": api.calls,
+            "firstTokenMs": {
+                "mean": round(api.first_token_ms / api.calls, 1) if api.calls else None,
+                "max": round(api.max_first_token_ms, 1),
+            },
+            "totalMs": {
+                "mean": round(api.total_ms / api.calls, 1) if api.calls else None,
+                "max": round(api.max_ms, 1),
+            },
+            "tokens": {
+                "input": api.input_tokens,
+                "cacheRead": api.cache_read_tokens,
+                "cacheWrite": api.cache_write_tokens,
+                "output": api.output_tokens,
+            },
+            # 프롬프트 토큰 중 캐시에서 읽은 비율 (캐시 읽기는 입력 단가의 10%)
+            "cacheReadRatio": round(api.cache_read_tokens / prompt_tokens, 3) if prompt_tokens else None,
+        }
+
+    def snapshot(self, tool_names: Optional[Iterable[str]] = None) -> dict:
+        """
+        누적 통계를 dict로 반환한다 (JSON 직렬화 가능).
+
+        Args:
+            tool_names: 조회할 도구 이름 (None이면 기록된 전체)
+        """
+        names = sorted(self._tools) if tool_names is None else [n for n in tool_names if n in self._tools]
+        tools = {}
+        for name in names:
+            c = self._tools[name]
+            tools[name] = {
+                "calls": c.calls,
+                "errors": c.errors,
+                "callsPerTurn": round(c.calls / self._turns, 2) if self._turns else None,
+                "latencyMs": {
+                    "mean": round(c.total_ms / c.calls, 3) if c.calls else None,
+                    "p50": _percentile(c.buckets, c.calls, 0.5),
+                    "p95": _percentile(c.buckets, c.calls, 0.95),
+                    "max": round(c.max_ms, 3),
+                    "buckets": {_bucket_label(i): n for i, n in enumerate(c.buckets) if n},
+                },
+                "resultBytes": {
+                    "mean": round(c.total_bytes / c.sized) if c.sized else None,
+                    "max": c.max_bytes,
+                    "total": c.total_bytes,
+                },
+            }
+        return {"since": self._since, "turns": self._turns, "tools": tools, "api": self._api_snapshot()}
+
+    def reset(self) -> None:
+        """누적 통계를 비운다."""
+        self._tools.clear()
+        self._turns = 0
+        self._api = _ApiCounters()
+        self._since = time.time()
+
+
+# 프로세스 전역 누적기 (execute_tool, claude_api_handler가 기록)
+STATS = ToolStats()
+
+
+def snapshot(tool_names: Optional[Iterable[str]] = None) -> dict:
+    """프로세스 전역 도구 통계 (ToolStats.snapshot)."""
+    return STATS.snapshot(tool_names)
+
+
+def reset() -> None:
+    """프로세스 전역 도구 통계를 비운다."""
+    STATS.reset()
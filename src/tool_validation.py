@@ -0,0 +1,114 @@
+"""
+도구 입력 검증 모듈.
+
+tool_definitions.TOOLS의 input_schema를 임포트 시점에 한 번 검증 함수로
+컴파일한다. execute_tool이 핸들러 실행 전에 호출하여, 모델이 보낸 잘못된
+입력을 핸들러 깊숙이 들어가기 전에 짧고 정확한 오류로 돌려준다.
+
+지원하는 스키마 키워드 (tool_definitions가 쓰는 부분집합):
+    type, enum, required, properties, items
+
+스키마를 해석하는 대신 키워드마다 검사 함수를 미리 만들어 두므로, 검사
+1회에 드는 일은 입력에 실제로 있는 키의 타입/값 확인뿐이다 (스키마의 속성
+수와 무관).
+검증 함수는 문제가 없으면 None, 있으면 "input.fields.dad: ..." 형태의
+오류 문자열 하나를 반환한다 (첫 번째 문제만).
+"""
+
+from typing import Any, Callable, Dict, Optional
+
+from tool_definitions import TOOLS
+
+Validator = Callable[[Any], Optional[str]]
+
+_JSON_TYPES = {
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "object": dict,
+    "array": list,
+}
+
+
+def _type_name(value: Any) -> str:
+    for name, py_type in _JSON_TYPES.items():
+        if isinstance(value, py_type) and (name == "boolean") == isinstance(value, bool):
+            return name
+    return "null" if value is None else type(value).__name__
+
+
+def compile_schema(schema: dict, where: str = "input") -> Validator:
+    """
+    JSON Schema 부분집합을 검증 함수로 컴파일한다.
+
+    Args:
+        schema: input_schema (또는 그 하위 스키마)
+        where: 오류 메시지에 쓸 값의 위치
+
+    Returns:
+        값을 받아 문제가 없으면 None, 있으면 오류 문자열을 반환하는 함수
+    """
+    type_name = schema.get("type")
+    py_type = _JSON_TYPES.get(type_name)
+    reject_bool = type_name != "boolean"
+    allowed = None
+    if "enum" in schema:
+        allowed = tuple(schema["enum"])
+        if py_type is str:
+            allowed = frozenset(allowed)
+        allowed_text = "|".join(map(str, schema["enum"]))
+    required = tuple(schema.get("required", ()))
+    properties = {
+        key: compile_schema(sub, f"{where}.{key}")
+        for key, sub in schema.get("properties", {}).items()
+    }
+    check_fields = bool(required or properties)
+    validate_item = compile_schema(schema["items"], f"{where}[]") if "items" in schema else None
+
+    # 키워드별 검사를 함수 하나에 모아 값마다 호출 한 번으로 끝낸다
+    def validate(value: Any) -> Optional[str]:
+        if py_type is not None and (
+            not isinstance(value, py_type) or (reject_bool and value.__class__ is bool)
+        ):
+            return f"{where}: {type_name} 타입이어야 합니다 ({_type_name(value)})"
+        if allowed is not None and value not in allowed:
+            return f"{where}: 허용되지 않는 값 {value!r} (허용: {allowed_text})"
+        if check_fields and value.__class__ is dict:
+            for key in required:
+                if key not in value:
+                    return f"{where}: {key}가 필요합니다"
+            # 스키마의 속성 대신 입력에 있는 키만 본다 (모르는 키는 핸들러가 판단)
+            for key, field_value in value.items():
+                validate_field = properties.get(key)
+                if validate_field is not None:
+                    problem = validate_field(field_value)
+                    if problem:
+                        return problem
+        if validate_item is not None and value.__class__ is list:
+            for i, element in enumerate(value):
+                problem = validate_item(element)
+                if problem:
+                    return problem.replace(f"{where}[]", f"{where}[{i}]", 1)
+        return None
+
+    return validate
+
+
+# 도구 이름 -> 입력 검증 함수 (임포트 시 한 번 컴파일)
+VALIDATORS: Dict[str, Validator] = {
+    tool["name"]: compile_schema(tool["input_schema"]) for tool in TOOLS
+}
+
+
+def validate_input(tool_name: str, tool_input: Any) -> Optional[str]:
+    """
+    도구 입력을 input_schema로 검증한다.
+
+    Returns:
+        문제가 없으면 None (알 수 없는 도구도 None), 있으면 오류 문자열
+    """
+    validate = VALIDATORS.get(tool_name)
+    if validate is None:
+        return None
+    return validate(tool_input)
@@ -0,0 +1,348 @@
+"""
+여행 데이터 조회 인덱스 모듈.
+
+ExecutionContext의 조회(find_item/find_day/find_option)를 전체 순회 없이
+상수 시간에 처리하기 위한 인덱스. 인덱스는 데이터 안의 day/item/option 객체를
+그대로 가리키며, ExecutionContext의 mutation helper가 변경할 때마다
+add_item/remove_item/add_option으로 갱신한다.
+
+    id -> [(day, item), ...]   (같은 id가 여러 개면 문서 순서대로, 조회는 첫 번째)
+    dayNum -> day, date -> day
+    item -> {옵션 이름(소문자): option}   (항목별로 처음 조회할 때 만든다)
+    item id -> 검색 텍스트                 (SearchIndex, 처음 검색할 때 만든다)
+    필터 키 -> 항목 위치 집합               (FilterIndex, 처음 필터링할 때 만든다)
+    dayNum -> 시작 시각순 타임라인          (Timeline, 그 날을 처음 조회할 때 만든다)
+    격자 칸 -> 좌표가 있는 장소             (GeoIndex, 처음 거리 조회할 때 만든다)
+
+검색/필터 인덱스는 만드는 비용이 커서 메시지(ExecutionContext)마다 새로 만들지
+않고, 같은 데이터(days 배열 객체)를 보는 인덱스끼리 공유한다. ExecutionContext는
+copy-on-write라 days 배열이 같으면 내용도 같다. 이 컨텍스트에서 바뀐 항목(touch)은
+공유 인덱스 결과에서 빼고 따로 검색/판정한다 (장소 인덱스도 같다). 타임라인은 항목이 바뀐 날의 것만
+버리고 다음 조회 때 다시 만든다.
+"""
+
+import heapq
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import filter_index
+import geo_index
+from filter_index import FilterIndex
+from geo_index import GeoIndex, Place
+from search_index import SCORE_SUBSTRING, SearchIndex, item_texts, match_score, option_texts
+from timeline import Timeline
+
+
+class TripIndex:
+    """day/item/option 조회 인덱스"""
+
+    def __init__(self, data: dict) -> None:
+        """
+        인덱스를 만든다.
+
+        Args:
+            data: 여행 일정 데이터 (인덱스는 이 객체의 원소를 가리킨다)
+        """
+        self._items: Dict[Any, List[Tuple[dict, dict]]] = {}
+        self._days_by_num: Dict[Any, dict] = {}
+        self._days_by_date: Dict[Any, dict] = {}
+        # id(item) -> (옵션 수, {소문자 이름: option})
+        self._options: Dict[int, Tuple[int, Dict[str, dict]]] = {}
+        self._days = data.get("days")
+        self._accommodation = geo_index.accommodation(data)
+        self._search_local = SearchIndex()  # 이 인덱스에서 바뀐 항목만
+        self._changed: set = set()  # 공유 인덱스 대신 따로 검색/판정할 item id
+        self._stale: set = set()  # 로컬 인덱스에 아직 반영하지 않은 item id
+        self._timelines: Dict[Any, Timeline] = {}  # dayNum -> Timeline
+
+        for day in data.get("days", []):
+            self._days_by_num.setdefault(day.get("dayNum"), day)
+            self._days_by_date.setdefault(day.get("date"), day)
+            for item in day.get("items", []):
+                self._items.setdefault(item.get("id"), []).append((day, item))
+
+    # -- 조회 ---------------------------------------------------------------
+
+    def item(self, item_id: str) -> Optional[Tuple[dict, dict]]:
+        """id로 (day, item)을 찾는다."""
+        entries = self._items.get(item_id)
+        return entries[0] if entries else None
+
+    def has_item(self, item_id: str) -> bool:
+        """해당 id의 항목이 있는지 여부"""
+        return item_id in self._items
+
+    def day(self, day_num: Any = None, date: Optional[str] = None) -> Optional[dict]:
+        """dayNum 또는 날짜로 day를 찾는다 (dayNum 우선)."""
+        if day_num is not None:
+            day = self._days_by_num.get(day_num)
+            if day is not None:
+                return day
+        if date is not None:
+            return self._days_by_date.get(date)
+        return None
+
+    def option(self, item: dict, option_name: str, unique: bool = False) -> Optional[dict]:
+        """
+        항목의 옵션을 이름으로 찾는다.
+
+        대소문자 무시 완전 일치를 먼저 보고, 없으면 이름/별칭에 대한 검색 점수
+        (search_index.match_score)가 가장 높은 옵션을 반환한다 (동점이면 앞 옵션).
+
+        unique=True(쓰기 대상)이면 초성/오타 일치는 쓰지 않고, 이름/별칭에 질의가
+        들어 있는 옵션이 하나뿐일 때만 그 옵션을 반환한다 (여럿이면 None).
+        """
+        options = item.get("options", [])
+        name_lower = option_name.lower()
+        cached = self._options.get(id(item))
+        if cached is None or cached[0] != len(options):
+            by_name: Dict[str, dict] = {}
+            for opt in options:
+                by_name.setdefault(opt.get("name", "").lower(), opt)
+            cached = (len(options), by_name)
+            self._options[id(item)] = cached
+
+        opt = cached[1].get(name_lower)
+        if opt is not None:
+            return opt
+        if unique:
+            matches = [
+                opt for opt in options
+                if any(match_score(option_name, text) >= SCORE_SUBSTRING for _, text in option_texts(opt))
+            ]
+            return matches[0] if len(matches) == 1 else None
+        best, best_score = None, 0.0
+        for opt in options:
+            score = max((match_score(option_name, text) for _, text in option_texts(opt)), default=0.0)
+            if score > best_score:
+                best, best_score = opt, score
+        return best
+
+    def timeline(self, day: dict) -> Timeline:
+        """day의 타임라인 (없거나 그 날 항목이 바뀌었으면 새로 만든다)."""
+        day_num = day.get("dayNum")
+        timeline = self._timelines.get(day_num)
+        if timeline is None:
+            timeline = self._timelines[day_num] = Timeline(day.get("items", []))
+        return timeline
+
+    def accommodation(self) -> dict:
+        """숙소 정보 (name, address, lat, lng)."""
+        return self._accommodation
+
+    def nearby(self, lat: float, lng: float, radius_m: Optional[float] = None) -> Iterator[Tuple[float, Place]]:
+        """
+        기준 좌표에서 가까운 순으로 (거리 m, 장소)를 내보낸다 (옵션/항목 좌표 + 숙소).
+
+        바뀐 항목은 공유 인덱스 결과에서 빼고, 현재 값으로 만든 작은 인덱스와
+        거리순으로 합친다.
+        """
+        base = _shared(self._days).geo.nearest(lat, lng, radius_m)
+        if self._changed:
+            base = (hit for hit in base if hit[1].item_id not in self._changed)
+        local_places = [Place(self._accommodation.get("name", "숙소"),
+                              self._accommodation["lat"], self._accommodation["lng"])]
+        for item_id in self._changed:
+            for _day, item in self._items.get(item_id, []):
+                local_places.extend(geo_index.item_places(item))
+        local = GeoIndex(local_places).nearest(lat, lng, radius_m)
+        return heapq.merge(base, local, key=lambda hit: hit[0])
+
+    def search(self, query: str) -> List[Tuple[dict, dict, float, str]]:
+        """
+        제목/옵션 이름/별칭/위치에서 검색어와 일치하는 항목을 점수순으로 찾는다.
+
+        Returns:
+            [(day, item, 점수, 일치한 텍스트)]
+        """
+        base = _shared(self._days).search
+        for item_id in self._stale:
+            entries = self._items.get(item_id)
+            if entries:
+                self._search_local.add(item_id, _entry_texts(entries))
+            else:
+                self._search_local.remove(item_id)
+        self._stale.clear()
+
+        matches = [m for m in base.search(query) if m[0] not in self._changed]
+        matches.extend(self._search_local.search(query))
+        unseen = len(base)
+        matches.sort(key=lambda m: (-m[1], base.order(m[0], unseen)))
+
+        results = []
+        for item_id, score, matched in matches:
+            for day, item in self._items.get(item_id, []):
+                results.append((day, item, score, matched))
+        return results
+
+    def filter(self, filters: Dict[str, Any]) -> List[Tuple[dict, dict]]:
+        """
+        필터 조건(filter_index.FILTER_FIELDS)을 모두 만족하는 항목을 찾는다.
+
+        Args:
+            filters: {필터 이름: 값} - 값이 None인 조건은 넣지 않는다
+
+        Returns:
+            [(day, item)] - dayNum 순, 같은 날은 문서 순서
+        """
+        base = _shared(self._days).filters
+        if not self._changed:
+            # 바뀐 항목이 없으면 공유 인덱스의 객체가 곧 이 데이터의 객체다
+            return [base.entry(pos) for pos in base.match(filters)]
+        found = []
+        for pos in base.match(filters):
+            _day, base_item = base.entry(pos)
+            item_id = base_item.get("id")
+            if item_id in self._changed:
+                continue
+            for day, item in self._items.get(item_id, []):
+                if item is base_item:
+                    found.append((day, item))
+        for item_id in self._changed:
+            for day, item in self._items.get(item_id, []):
+                if filter_index.matches(day, item, filters):
+                    found.append((day, item))
+
+        # 바뀐 항목이 섞였으므로 현재 데이터의 (dayNum, 날짜 안 위치) 순으로 정렬
+        positions: Dict[int, Dict[int, int]] = {}
+
+        def order(entry: Tuple[dict, dict]) -> Tuple[int, int]:
+            day, item = entry
+            if id(day) not in positions:
+                positions[id(day)] = {id(it): i for i, it in enumerate(day.get("items", []))}
+            day_num = day.get("dayNum")
+            return (day_num if isinstance(day_num, int) else 0, positions[id(day)].get(id(item), 0))
+
+        found.sort(key=order)
+        return found
+
+    # -- 갱신 ---------------------------------------------------------------
+
+    def rebuilt(self, data: dict) -> "TripIndex":
+        """
+        되돌린 데이터(savepoint)에 맞춰 새로 만든 인덱스.
+
+        공유 검색/필터 인덱스의 기준(days 배열)과 바뀐 항목 목록은 이어받는다.
+        되돌린 뒤 실제로는 바뀌지 않은 항목이 목록에 남아도 따로 판정될 뿐 결과는 같다.
+        """
+        index = TripIndex(data)
+        index._days = self._days
+        index._changed = set(self._changed)
+        index._stale = set(self._changed)
+        return index
+
+    def add_item(self, day: dict, item: dict) -> None:
+        """day에 추가된 항목을 등록한다."""
+        self._items.setdefault(item.get("id"), []).append((day, item))
+        self.touch(item.get("id"))
+
+    def remove_item(self, item: dict) -> None:
+        """삭제된 항목(객체 기준)을 인덱스에서 뺀다."""
+        item_id = item.get("id")
+        self._drop_timelines(item_id)
+        entries = [e for e in self._items.get(item_id, []) if e[1] is not item]
+        if entries:
+            self._items[item_id] = entries
+        else:
+            self._items.pop(item_id, None)
+        self._options.pop(id(item), None)
+        self.touch(item_id)
+
+    def touch(self, item_id: Any) -> None:
+        """항목(또는 그 옵션)이 바뀌었음을 기록한다. 검색/필터는 이 항목을 따로 다룬다."""
+        self._changed.add(item_id)
+        self._stale.add(item_id)
+        self._drop_timelines(item_id)
+
+    def _drop_timelines(self, item_id: Any) -> None:
+        """항목이 있는 날의 타임라인을 버린다."""
+        if self._timelines:
+            for day, _item in self._items.get(item_id, []):
+                self._timelines.pop(day.get("dayNum"), None)
+
+    def replace_day(self, old: dict, new: dict) -> None:
+        """day 객체가 복사본으로 바뀌었을 때 참조를 옮긴다 (copy-on-write)."""
+        if self._days_by_num.get(new.get("dayNum")) is old:
+            self._days_by_num[new.get("dayNum")] = new
+        if self._days_by_date.get(new.get("date")) is old:
+            self._days_by_date[new.get("date")] = new
+        for item in new.get("items", []):
+            entries = self._items.get(item.get("id"), [])
+            for i, (day, indexed) in enumerate(entries):
+                if day is old:
+                    entries[i] = (new, indexed)
+
+    def replace_item(self, old: dict, new: dict) -> None:
+        """item 객체가 복사본으로 바뀌었을 때 참조를 옮긴다 (copy-on-write)."""
+        entries = self._items.get(new.get("id"), [])
+        for i, (day, indexed) in enumerate(entries):
+            if indexed is old:
+                entries[i] = (day, new)
+        self._options.pop(id(old), None)
+
+    def invalidate_options(self, item: dict) -> None:
+        """항목의 옵션 객체가 바뀌었을 때 이름 맵을 버린다 (다음 조회 때 다시 만든다)."""
+        self._options.pop(id(item), None)
+
+    def add_option(self, item: dict, opt: dict) -> None:
+        """항목에 추가된 옵션을 이름 맵과 검색/필터 인덱스에 반영한다."""
+        self.touch(item.get("id"))
+        cached = self._options.get(id(item))
+        if cached is None:
+            return  # 아직 만들지 않은 맵은 처음 조회할 때 만든다
+        by_name = cached[1]
+        by_name.setdefault(opt.get("name", "").lower(), opt)
+        self._options[id(item)] = (len(item.get("options", [])), by_name)
+
+
+def _entry_texts(entries: List[Tuple[dict, dict]]) -> List[Tuple[str, str]]:
+    texts = []
+    for _day, item in entries:
+        texts.extend(item_texts(item))
+    return texts
+
+
+class _SharedIndexes:
+    """같은 days 배열을 보는 TripIndex끼리 공유하는 검색/필터 인덱스 (처음 쓸 때 만든다)"""
+
+    def __init__(self, days: Any) -> None:
+        self.days = days
+        self._search: Optional[SearchIndex] = None
+        self._filters: Optional[FilterIndex] = None
+        self._geo: Optional[GeoIndex] = None
+
+    @property
+    def search(self) -> SearchIndex:
+        if self._search is None:
+            index = SearchIndex()
+            entries: Dict[Any, List[Tuple[dict, dict]]] = {}
+            for day in self.days or []:
+                for item in day.get("items", []):
+                    entries.setdefault(item.get("id"), []).append((day, item))
+            for item_id, item_entries in entries.items():
+                index.add(item_id, _entry_texts(item_entries))
+            self._search = index
+        return self._search
+
+    @property
+    def filters(self) -> FilterIndex:
+        if self._filters is None:
+            self._filters = FilterIndex(self.days)
+        return self._filters
+
+    @property
+    def geo(self) -> GeoIndex:
+        if self._geo is None:
+            self._geo = GeoIndex(geo_index.day_places(self.days))
+        return self._geo
+
+
+# 마지막 데이터 하나의 공유 인덱스 (days 배열 객체를 붙잡아 두어 id 재사용 방지)
+_last_shared: Optional[_SharedIndexes] = None
+
+
+def _shared(days: Any) -> _SharedIndexes:
+    """days 배열에 대한 공유 인덱스 (다른 배열이면 새로 만든다)."""
+    global _last_shared
+    if _last_shared is None or _last_shared.days is not days:
+        _last_shared = _SharedIndexes(days)
+    return _last_shared
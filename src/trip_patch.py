@@ -0,0 +1,327 @@
+"""
+여행 데이터 패치(JSON-Patch 스타일) 모듈.
+
+ExecutionContext가 기록한 변경 연산을 최신 원격 데이터 위에 다시 적용하여,
+봇/웹 챗/관리자 저장이 서로의 변경을 덮어쓰지 않도록 한다.
+
+연산 형식 (RFC 6902의 부분집합):
+    {"op": "add",     "path": "/days/2/items/-", "value": {...}, "after": "d2_lunch"}
+    {"op": "replace", "path": "/days/2/items/d2_lunch/status", "value": "done"}
+    {"op": "remove",  "path": "/days/2/items/d2_cafe"}
+
+경로 규칙 (RFC 6901 JSON Pointer + 선택자):
+    - 배열 원소는 인덱스 대신 식별자로 가리킨다.
+      days는 dayNum, items는 id, options는 name으로 찾는다.
+      그 밖의 배열은 숫자 인덱스를 쓴다.
+    - "-"는 배열 끝을 뜻한다. add 연산에 "after"를 주면 해당 id/name 뒤에,
+      "before"를 주면 앞에 삽입한다 (되돌리기 연산이 맨 앞 항목을 복원할 때).
+    - 식별자 배열의 add는 같은 식별자의 원소가 이미 있으면 건너뛴다. 대기 연산이
+      스냅샷에서 복원되거나 rebase로 다시 적용되어도 원소가 중복되지 않는다.
+    - 경로 ""는 문서 전체를 뜻한다 (replace 전용, 전체 덮어쓰기).
+
+식별자로 주소를 지정하므로 다른 곳에서 항목이 추가/삭제되어 인덱스가 밀려도
+같은 대상에 적용된다.
+
+diff(old, new)는 두 문서의 차이를 같은 형식의 연산으로 만든다 (스냅샷 델타 저장용).
+"""
+
+import copy
+import logging
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 배열 이름별 원소 식별 키
+_SELECTOR_KEYS = {
+    "days": "dayNum",
+    "items": "id",
+    "options": "name",
+}
+
+
+class PatchError(Exception):
+    """패치 적용 실패 (대상 경로가 없거나 연산이 잘못된 경우)"""
+    pass
+
+
+# ---------------------------------------------------------------------------
+# 경로 구성
+# ---------------------------------------------------------------------------
+
+def escape_token(token: Any) -> str:
+    """JSON Pointer 토큰 이스케이프 (~ -> ~0, / -> ~1)."""
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def unescape_token(token: str) -> str:
+    """JSON Pointer 토큰 복원."""
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def make_path(*tokens: Any) -> str:
+    """토큰들로 JSON Pointer 경로를 만든다."""
+    return "".join("/" + escape_token(t) for t in tokens)
+
+
+def item_path(day_num: Any, item_id: str, *rest: Any) -> str:
+    """항목(또는 항목 하위 필드) 경로."""
+    return make_path("days", day_num, "items", item_id, *rest)
+
+
+def option_path(day_num: Any, item_id: str, option_name: str, *rest: Any) -> str:
+    """옵션(또는 옵션 하위 필드) 경로."""
+    return make_path("days", day_num, "items", item_id, "options", option_name, *rest)
+
+
+# ---------------------------------------------------------------------------
+# 경로 해석
+# ---------------------------------------------------------------------------
+
+def _split(path: str) -> List[str]:
+    if path == "":
+        return []
+    if not path.startswith("/"):
+        raise PatchError(f"잘못된 경로: {path!r}")
+    return [unescape_token(t) for t in path[1:].split("/")]
+
+
+def _find_in_list(container: list, list_name: Optional[str], token: str) -> Optional[int]:
+    """배열에서 토큰이 가리키는 원소의 인덱스를 찾는다."""
+    key = _SELECTOR_KEYS.get(list_name)
+    if key is not None:
+        for i, elem in enumerate(container):
+            if isinstance(elem, dict) and str(elem.get(key)) == token:
+                return i
+        return None
+    if token.isdigit() and int(token) < len(container):
+        return int(token)
+    return None
+
+
+def _resolve_parent(doc: Any, tokens: List[str]) -> Tuple[Any, Optional[str], str]:
+    """
+    경로의 부모 컨테이너를 찾는다.
+
+    Returns:
+        (부모 컨테이너, 부모가 배열일 때 그 배열의 이름, 마지막 토큰)
+    """
+    node = doc
+    name: Optional[str] = None
+    for token in tokens[:-1]:
+        if isinstance(node, dict):
+            if token not in node:
+                raise PatchError(f"경로를 찾을 수 없습니다: {token!r}")
+            node, name = node[token], token
+        elif isinstance(node, list):
+            idx = _find_in_list(node, name, token)
+            if idx is None:
+                raise PatchError(f"배열 원소를 찾을 수 없습니다: {name}/{token}")
+            node, name = node[idx], None
+        else:
+            raise PatchError(f"경로가 값 내부를 가리킵니다: {token!r}")
+    return node, name, tokens[-1]
+
+
+# ---------------------------------------------------------------------------
+# 적용
+# ---------------------------------------------------------------------------
+
+def apply_op(doc: Any, op: dict) -> Any:
+    """
+    연산 하나를 문서에 적용한다 (제자리 수정).
+
+    Args:
+        doc: 대상 문서
+        op: 패치 연산
+
+    Returns:
+        적용 후 문서 (경로 ""의 replace만 새 객체를 반환한다)
+
+    Raises:
+        PatchError: 대상이 없거나 연산이 잘못된 경우
+    """
+    kind = op.get("op")
+    tokens = _split(op.get("path", ""))
+
+    if not tokens:
+        if kind != "replace":
+            raise PatchError(f"문서 전체에는 replace만 가능합니다: {kind}")
+        return copy.deepcopy(op["value"])
+
+    parent, list_name, last = _resolve_parent(doc, tokens)
+
+    if isinstance(parent, dict):
+        if kind in ("add", "replace"):
+            parent[last] = copy.deepcopy(op["value"])
+        elif kind == "remove":
+            if last not in parent:
+                raise PatchError(f"삭제할 키가 없습니다: {last!r}")
+            del parent[last]
+        else:
+            raise PatchError(f"지원하지 않는 연산: {kind}")
+        return doc
+
+    if isinstance(parent, list):
+        if kind == "add":
+            if last != "-":
+                raise PatchError(f"배열 추가는 '-' 경로만 지원합니다: {last!r}")
+            key = _SELECTOR_KEYS.get(list_name)
+            if key is not None and isinstance(op["value"], dict) and op["value"].get(key) is not None:
+                if _find_in_list(parent, list_name, str(op["value"][key])) is not None:
+                    # 같은 연산을 다시 적용한 경우 (스냅샷의 대기 연산 재전송, rebase)
+                    logger.info("이미 있는 원소 추가 건너뜀: %s/%s", list_name, op["value"][key])
+                    return doc
+            value = copy.deepcopy(op["value"])
+            after, before = op.get("after"), op.get("before")
+            if after:
+                idx = _find_in_list(parent, list_name, str(after))
+                idx = None if idx is None else idx + 1
+            elif before:
+                idx = _find_in_list(parent, list_name, str(before))
+            else:
+                idx = None
+            if idx is None:
+                parent.append(value)
+            else:
+                parent.insert(idx, value)
+            return doc
+
+        idx = _find_in_list(parent, list_name, last)
+        if idx is None:
+            raise PatchError(f"배열 원소를 찾을 수 없습니다: {list_name}/{last}")
+        if kind == "replace":
+            parent[idx] = copy.deepcopy(op["value"])
+        elif kind == "remove":
+            del parent[idx]
+        else:
+            raise PatchError(f"지원하지 않는 연산: {kind}")
+        return doc
+
+    raise PatchError(f"경로가 값 내부를 가리킵니다: {op.get('path')!r}")
+
+
+def apply_patch(doc: Any, ops: List[dict], strict: bool = True) -> Tuple[Any, List[dict]]:
+    """
+    연산 목록을 순서대로 적용한다 (제자리 수정).
+
+    Args:
+        doc: 대상 문서
+        ops: 패치 연산 목록
+        strict: True이면 첫 실패에서 PatchError를 발생시킨다.
+            False이면 대상이 사라진 연산(예: 다른 곳에서 삭제된 항목의 수정)을
+            건너뛰고 계속한다.
+
+    Returns:
+        (적용 후 문서, 건너뛴 연산 목록)
+
+    Raises:
+        PatchError: strict=True에서 적용 실패 시
+    """
+    skipped: List[dict] = []
+    for op in ops:
+        try:
+            doc = apply_op(doc, op)
+        except PatchError as e:
+            if strict:
+                raise
+            logger.warning("패치 연산 건너뜀 (%s %s): %s", op.get("op"), op.get("path"), e)
+            skipped.append(op)
+    return doc, skipped
+
+
+# ---------------------------------------------------------------------------
+# 차이 계산
+# ---------------------------------------------------------------------------
+
+def diff(old: Any, new: Any) -> List[dict]:
+    """
+    old를 new로 바꾸는 연산 목록을 만든다.
+
+    apply_patch(old, diff(old, new))의 결과는 new와 같다. 식별자 배열(days/items/
+    options)은 원소 단위로, 그 밖의 배열은 통째로 교체한다. 식별자 배열이라도
+    순서가 바뀌었거나 식별자가 없거나 겹치면 통째로 교체한다.
+
+    Args:
+        old: 이전 문서
+        new: 새 문서
+
+    Returns:
+        패치 연산 목록 (같으면 빈 목록)
+    """
+    ops: List[dict] = []
+    if not _same(old, new):
+        _diff_value(old, new, [], None, ops)
+    return ops
+
+
+def _same(a: Any, b: Any) -> bool:
+    return type(a) is type(b) and a == b
+
+
+def _diff_value(old: Any, new: Any, tokens: List[Any], list_name: Optional[str],
+                ops: List[dict]) -> None:
+    """old와 new가 다를 때 호출된다. tokens는 현재 위치의 경로 토큰."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        _diff_dict(old, new, tokens, ops)
+    elif isinstance(old, list) and isinstance(new, list) and list_name in _SELECTOR_KEYS:
+        _diff_selector_list(old, new, tokens, list_name, ops)
+    else:
+        ops.append({"op": "replace", "path": make_path(*tokens), "value": copy.deepcopy(new)})
+
+
+def _diff_dict(old: dict, new: dict, tokens: List[Any], ops: List[dict]) -> None:
+    for key in old:
+        if key not in new:
+            ops.append({"op": "remove", "path": make_path(*tokens, key)})
+    for key, value in new.items():
+        if key not in old:
+            ops.append({"op": "add", "path": make_path(*tokens, key), "value": copy.deepcopy(value)})
+        elif not _same(old[key], value):
+            _diff_value(old[key], value, tokens + [key], key, ops)
+
+
+def _selector_values(elems: list, key: str) -> Optional[List[str]]:
+    """원소들의 식별자 목록. 식별할 수 없는 원소가 있거나 겹치면 None."""
+    values = []
+    for elem in elems:
+        if not isinstance(elem, dict) or elem.get(key) is None:
+            return None
+        values.append(str(elem[key]))
+    return values if len(set(values)) == len(values) else None
+
+
+def _diff_selector_list(old: list, new: list, tokens: List[Any], list_name: str,
+                        ops: List[dict]) -> None:
+    key = _SELECTOR_KEYS[list_name]
+    old_keys = _selector_values(old, key)
+    new_keys = _selector_values(new, key)
+    replace = {"op": "replace", "path": make_path(*tokens), "value": copy.deepcopy(new)}
+    if old_keys is None or new_keys is None:
+        ops.append(replace)
+        return
+
+    old_set, new_set = set(old_keys), set(new_keys)
+    kept_old = [k for k in old_keys if k in new_set]
+    kept_new = [k for k in new_keys if k in old_set]
+    # 맨 앞 삽입은 after로 표현할 수 없고, 순서 변경은 원소 연산으로 표현하지 않는다
+    if kept_old != kept_new or (new_keys and new_keys[0] not in old_set and old_keys):
+        ops.append(replace)
+        return
+
+    changes: List[dict] = []
+    for k in old_keys:
+        if k not in new_set:
+            changes.append({"op": "remove", "path": make_path(*tokens, k)})
+    prev: Optional[str] = None
+    for k, elem in zip(new_keys, new):
+        if k not in old_set:
+            op = {"op": "add", "path": make_path(*tokens, "-"), "value": copy.deepcopy(elem)}
+            if prev is not None:
+                op["after"] = prev
+            changes.append(op)
+        prev = k
+    old_by_key = dict(zip(old_keys, old))
+    for k, elem in zip(new_keys, new):
+        if k in old_set and not _same(old_by_key[k], elem):
+            _diff_value(old_by_key[k], elem, tokens + [k], None, changes)
+    ops.extend(changes)
@@ -0,0 +1,215 @@
+"""
+여행 진행 통계 모듈.
+
+get_trip_summary, 시스템 프롬프트, 웹앱 진행 표시가 쓰는 항목 수 집계를
+데이터 안에 함께 저장한다.
+
+    days[].stats = {"total", "planned", "done", "skipped", "chosen", "with_options"}
+    meta.stats   = 전체 합계 (같은 키)
+
+    meta.statsVersion = 통계를 맞춘 시점의 meta.lastUpdated
+
+ExecutionContext의 mutation helper가 항목을 바꿀 때마다 항목의 기여분
+(item_counts) 차이만큼 컨텍스트 안에서 갱신한다. 통계는 patch 연산으로
+기록하지 않는다. 절대값 연산은 다른 작성자의 변경 위에 다시 적용(rebase)될 때
+서로의 집계를 덮어쓰기 때문이다. 대신 저장소가 patch를 적용할 때마다
+refresh_stats로 연산이 닿은 날만 다시 세고 합계를 맞춘다.
+
+meta.statsVersion은 저장된 통계를 믿어도 되는지 O(1)로 확인하는 지문이다.
+refresh_stats가 현재 버전으로 찍고, 저장소가 버전을 올릴 때(set_last_updated)
+함께 옮긴다. 통계를 맞추지 않고 저장한 데이터(관리자 저장, 레거시 CLI 등)는
+버전만 바뀌어 지문이 어긋나므로 모든 날을 다시 센다. 지문이 맞더라도 total이
+항목 수와 맞지 않는 날은 그 날만 다시 센다.
+verify_stats는 전체를 다시 세어 저장된 값과 비교한다 (테스트/점검용).
+"""
+
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+from trip_patch import unescape_token
+
+logger = logging.getLogger(__name__)
+
+STAT_KEYS = ("total", "planned", "done", "skipped", "chosen", "with_options")
+
+Counts = Dict[str, int]
+
+
+def empty_counts() -> Counts:
+    return {key: 0 for key in STAT_KEYS}
+
+
+def item_counts(item: Optional[dict]) -> Counts:
+    """항목 하나의 기여분 (item이 None이면 0)."""
+    counts = empty_counts()
+    if item is None:
+        return counts
+    counts["total"] = 1
+    status = item.get("status", "planned")
+    if status in ("planned", "done", "skipped"):
+        counts[status] = 1
+    if item.get("chosen"):
+        counts["chosen"] = 1
+    elif item.get("options"):
+        counts["with_options"] = 1
+    return counts
+
+
+def add_counts(base: Counts, delta: Counts, sign: int = 1) -> Counts:
+    """base + sign * delta (새 dict)."""
+    return {key: base.get(key, 0) + sign * delta.get(key, 0) for key in STAT_KEYS}
+
+
+def count_day(day: dict) -> Counts:
+    """day의 항목을 모두 세어 통계를 만든다."""
+    counts = empty_counts()
+    for item in day.get("items", []):
+        counts = add_counts(counts, item_counts(item))
+    return counts
+
+
+def stats_current(data: dict) -> bool:
+    """저장된 통계가 현재 데이터 버전에서 맞춘 것인지 (meta.statsVersion == meta.lastUpdated)."""
+    meta = data.get("meta")
+    if not isinstance(meta, dict):
+        return False
+    version = meta.get("statsVersion")
+    return version is not None and version == meta.get("lastUpdated")
+
+
+def set_last_updated(data: dict, value: str) -> None:
+    """meta.lastUpdated를 바꾼다. 통계가 최신이었으면 statsVersion도 함께 옮긴다."""
+    current = stats_current(data)
+    meta = data.setdefault("meta", {})
+    meta["lastUpdated"] = value
+    if current:
+        meta["statsVersion"] = value
+
+
+def stored_day_stats(day: dict) -> Optional[Counts]:
+    """
+    day에 저장된 통계 (없거나 항목 수와 맞지 않으면 None).
+
+    total을 항목 수와 비교하여 통계 없이 항목을 추가/삭제한 날을 걸러낸다.
+    데이터 전체의 신뢰 여부는 stats_current로 따로 확인한다.
+    """
+    stats = day.get("stats")
+    if not isinstance(stats, dict) or any(not isinstance(stats.get(k), int) for k in STAT_KEYS):
+        return None
+    if stats["total"] != len(day.get("items", [])):
+        return None
+    return stats
+
+
+def day_stats(day: dict, trusted: bool = True) -> Counts:
+    """day의 통계 (trusted이고 저장된 값이 맞으면 그대로, 아니면 다시 센다)."""
+    stats = stored_day_stats(day) if trusted else None
+    return dict(stats) if stats is not None else count_day(day)
+
+
+def summarize(data: dict) -> Tuple[List[Tuple[dict, Counts]], Counts]:
+    """
+    일자별 통계와 합계.
+
+    저장된 통계가 최신이면 O(days), 아니면 모든 날을 다시 센다.
+
+    Returns:
+        ([(day, 통계)], 합계)
+    """
+    trusted = stats_current(data)
+    per_day = [(day, day_stats(day, trusted)) for day in data.get("days", []) if isinstance(day, dict)]
+    totals = empty_counts()
+    for _day, stats in per_day:
+        totals = add_counts(totals, stats)
+    return per_day, totals
+
+
+def touched_days(ops: List[dict]) -> Optional[Set[str]]:
+    """
+    연산이 바꾼 날의 dayNum (경로 토큰 문자열).
+
+    Returns:
+        dayNum 집합, 문서 전체나 days 배열 전체를 바꾸는 연산이 있으면 None (모든 날)
+    """
+    day_nums: Set[str] = set()
+    for op in ops:
+        path = op.get("path", "")
+        if not path.startswith("/"):
+            return None
+        tokens = [unescape_token(t) for t in path[1:].split("/")]
+        if tokens[0] == "days" and len(tokens) == 1:
+            return None
+        if tokens[0] == "days" and tokens[1] != "-":
+            day_nums.add(tokens[1])
+    return day_nums
+
+
+def refresh_stats(data: dict, ops: Optional[List[dict]] = None) -> dict:
+    """
+    patch를 적용한 데이터의 통계를 맞춘다 (제자리 수정).
+
+    저장소가 apply_patch 직후, 버전(meta.lastUpdated)을 올리기 전에 호출한다.
+    기반 데이터의 통계가 최신이면 ops가 닿은 날과 total이 맞지 않는 날만,
+    아니면(또는 ops가 None이면) 모든 날을 다시 센다. meta.stats는 일자별 통계의
+    합으로 다시 쓰고 meta.statsVersion을 현재 버전으로 찍는다.
+
+    저장 경로(flush/close)에서 호출되므로 예외를 내보내지 않는다. 세다가 실패하면
+    통계 버전을 지워 읽는 쪽이 다시 세게 한다.
+
+    Args:
+        data: patch를 적용한 여행 데이터
+        ops: 적용한 연산 목록 (None이면 전체 저장)
+
+    Returns:
+        data
+    """
+    try:
+        _refresh_stats(data, ops)
+    except Exception:
+        logger.exception("진행 통계 갱신 실패 (읽을 때 다시 센다)")
+        meta = data.get("meta") if isinstance(data, dict) else None
+        if isinstance(meta, dict):
+            meta.pop("statsVersion", None)
+    return data
+
+
+def _refresh_stats(data: dict, ops: Optional[List[dict]]) -> None:
+    touched = None if ops is None or not stats_current(data) else touched_days(ops)
+    totals = empty_counts()
+    for day in data.get("days", []):
+        if not isinstance(day, dict):
+            continue
+        stats = None
+        if touched is not None and str(day.get("dayNum")) not in touched:
+            stats = stored_day_stats(day)
+        if stats is None:
+            stats = count_day(day)
+            day["stats"] = stats
+        totals = add_counts(totals, stats)
+    meta = data.get("meta")
+    if not isinstance(meta, dict):
+        meta = data["meta"] = {}
+    meta["stats"] = totals
+    meta["statsVersion"] = meta.get("lastUpdated")
+
+
+def verify_stats(data: dict) -> List[str]:
+    """
+    저장된 통계를 전체를 다시 센 값과 비교한다.
+
+    Returns:
+        불일치 설명 목록 (일치하면 빈 목록)
+    """
+    problems = []
+    totals = empty_counts()
+    for day in data.get("days", []):
+        if not isinstance(day, dict):
+            continue
+        actual = count_day(day)
+        totals = add_counts(totals, actual)
+        if day.get("stats") != actual:
+            problems.append(f"Day {day.get('dayNum')}: 저장 {day.get('stats')} != 실제 {actual}")
+    meta_stats = data.get("meta", {}).get("stats")
+    if meta_stats != totals:
+        problems.append(f"합계: 저장 {meta_stats} != 실제 {totals}")
+    return problems
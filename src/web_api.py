@@ -8,11 +8,14 @@ HTTP API 엔드포인트를 제공한다.
 
 엔드포인트:
     POST /chat  - 포저와 대화
-    GET  /health - 헬스체크
+    GET  /health - 헬스체크 (저장소/jsonbin 회로 차단기 상태 포함)
+    GET  /stats  - 도구별 호출/오류/소요 시간/결과 크기 통계 (이 프로세스,
+                   Bearer CHAT_SECRET 또는 localhost만)
 """
 
 import asyncio
-import json
+import functools
+import ipaddress
 import logging
 import os
 import secrets
@@ -22,8 +25,13 @@ from collections import defaultdict
 from aiohttp import web
 from dotenv import load_dotenv
 
-from jsonbin_client import JsonBinClient
-from claude_api_handler import process_message_api
+import json_codec
+import tool_stats
+from jsonbin_client import DEFAULT_SNAPSHOT_PATH
+from overview_cache import DEFAULT_OVERVIEW_PATH
+from snapshot_ring import DEFAULT_HISTORY_PATH
+from storage import DEFAULT_LOCAL_PATH, create_storage
+from claude_api_handler import close_client, configure_overview_cache, process_message_api, start_client
 
 # 환경 변수 로드
 load_dotenv()
@@ -39,14 +47,32 @@ logger = logging.getLogger(__name__)
 
 JSONBIN_BIN_ID = os.getenv("JSONBIN_BIN_ID", "")
 JSONBIN_API_KEY = os.getenv("JSONBIN_API_KEY", "")
+JSONBIN_SNAPSHOT_PATH = os.getenv("JSONBIN_SNAPSHOT_PATH", DEFAULT_SNAPSHOT_PATH)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "jsonbin")  # jsonbin | local
+STORAGE_REPLICA = os.getenv("STORAGE_REPLICA", "")  # local 모드의 복제 대상 (jsonbin)
+LOCAL_DATA_PATH = os.getenv("LOCAL_DATA_PATH", DEFAULT_LOCAL_PATH)
+SNAPSHOT_HISTORY_PATH = os.getenv("SNAPSHOT_HISTORY_PATH", DEFAULT_HISTORY_PATH)  # 빈 값이면 버전 기록 끔
+OVERVIEW_CACHE_PATH = os.getenv("OVERVIEW_CACHE_PATH", DEFAULT_OVERVIEW_PATH)  # 빈 값이면 프로세스 메모리에만 캐시
 CHAT_SECRET = os.getenv("CHAT_SECRET", "")
 WEB_API_PORT = int(os.getenv("WEB_API_PORT", "8080"))
 
 # Rate limiting: IP당 분당 최대 요청 수
 RATE_LIMIT_PER_MIN = 10
 
-# jsonbin 클라이언트
-jsonbin = JsonBinClient(bin_id=JSONBIN_BIN_ID, api_key=JSONBIN_API_KEY)
+# 여행 데이터 저장소 (연결 풀 공유)
+storage = create_storage(
+    STORAGE_BACKEND,
+    bin_id=JSONBIN_BIN_ID,
+    api_key=JSONBIN_API_KEY,
+    snapshot_path=JSONBIN_SNAPSHOT_PATH,
+    local_path=LOCAL_DATA_PATH,
+    replica=STORAGE_REPLICA,
+    history_path=SNAPSHOT_HISTORY_PATH or None,
+    role="web",
+)
+
+# 응답 직렬화는 json_codec 사용 (orjson이 있으면 orjson)
+json_response = functools.partial(web.json_response, dumps=json_codec.dumps)
 
 # Rate limiter 저장소: {ip: [timestamp, ...]}
 _rate_store: dict[str, list[float]] = defaultdict(list)
@@ -92,8 +118,34 @@ async def cors_middleware(request, handler):
 # ── 핸들러 ────────────────────────────────────────────────────
 
 async def health_handler(request: web.Request) -> web.Response:
-    """헬스체크 엔드포인트"""
-    return web.json_response({"status": "ok", "service": "gyeongju-web-api"})
+    """헬스체크 엔드포인트 (저장소/jsonbin 회로 차단기 상태 포함)"""
+    return json_response({
+        "status": "ok",
+        "service": "gyeongju-web-api",
+        "storage": storage.status(),
+    })
+
+
+def _is_loopback(request: web.Request) -> bool:
+    """같은 서버(localhost)에서 온 요청인지."""
+    try:
+        return ipaddress.ip_address(request.remote or "").is_loopback
+    except ValueError:
+        return False
+
+
+async def stats_handler(request: web.Request) -> web.Response:
+    """GET /stats — 도구 실행 통계 (프로세스 시작 이후 누적)
+
+    Authorization: Bearer <CHAT_SECRET>이 맞거나 localhost에서 온 요청만 허용한다.
+    CHAT_SECRET이 없으면 localhost에서만 조회할 수 있다.
+    """
+    auth = request.headers.get("Authorization", "")
+    token = auth[len("Bearer "):] if auth.startswith("Bearer ") else ""
+    authorized = bool(CHAT_SECRET) and secrets.compare_digest(token, CHAT_SECRET)
+    if not authorized and not _is_loopback(request):
+        return json_response({"error": "인증 실패"}, status=401)
+    return json_response(tool_stats.snapshot())
 
 
 async def chat_handler(request: web.Request) -> web.Response:
@@ -114,40 +166,40 @@ async def chat_handler(request: web.Request) -> web.Response:
     # Rate limit 체크
     ip = request.remote or "unknown"
     if not _check_rate_limit(ip):
-        return web.json_response(
+        return json_response(
             {"error": "요청이 너무 많습니다. 잠시 후 다시 시도해주세요."},
             status=429,
         )
 
     # 요청 파싱
     try:
-        body = await request.json()
-    except (json.JSONDecodeError, Exception):
-        return web.json_response({"error": "잘못된 요청 형식"}, status=400)
+        body = await request.json(loads=json_codec.loads)
+    except (json_codec.JSONDecodeError, Exception):
+        return json_response({"error": "잘못된 요청 형식"}, status=400)
 
     message = body.get("message", "").strip()
     history = body.get("history", [])
     secret = body.get("secret", "")
 
     if not message:
-        return web.json_response({"error": "메시지가 비어있습니다"}, status=400)
+        return json_response({"error": "메시지가 비어있습니다"}, status=400)
 
     # 인증 확인
     if CHAT_SECRET and not secrets.compare_digest(secret, CHAT_SECRET):
-        return web.json_response({"error": "인증 실패"}, status=401)
+        return json_response({"error": "인증 실패"}, status=401)
 
     logger.info("웹 챗 요청: %s (IP: %s)", message[:100], ip)
 
     # 데이터 조회
     try:
-        json_data = jsonbin.get_data()
+        json_data = await storage.get_data()
     except Exception as e:
-        logger.error("jsonbin 데이터 조회 실패: %s", e)
-        cached = jsonbin.get_cached()
+        logger.error("여행 데이터 조회 실패: %s", e)
+        cached = storage.get_cached()
         if cached:
             json_data = cached
         else:
-            return web.json_response(
+            return json_response(
                 {"error": "데이터를 가져올 수 없습니다"},
                 status=503,
             )
@@ -157,21 +209,20 @@ async def chat_handler(request: web.Request) -> web.Response:
         response = await process_message_api(json_data, message, history=history)
     except Exception as e:
         logger.error("AI 처리 중 에러: %s", e, exc_info=True)
-        return web.json_response(
+        return json_response(
             {"error": "처리 중 문제가 발생했습니다"},
             status=500,
         )
 
-    # 데이터 변경이 있으면 jsonbin에 저장
-    if response.data_modified and response.updated_data:
+    # 데이터 변경이 있으면 변경 연산만 저장 예약
+    # (짧은 구간의 변경은 한 번의 PUT으로 합쳐지고, 최신 원격 데이터 위에 다시 적용됨)
+    if response.data_modified and response.patch:
         try:
-            success = jsonbin.put_data(response.updated_data)
-            if not success:
-                logger.error("jsonbin PUT 실패 (웹 챗)")
+            storage.schedule_patch(response.patch)
         except Exception as e:
-            logger.error("jsonbin PUT 실패 (웹 챗): %s", e)
+            logger.error("저장 예약 실패 (웹 챗): %s", e)
 
-    return web.json_response({
+    return json_response({
         "reply": response.text or "처리 중 문제가 발생했어요.",
         "data_modified": response.data_modified,
     })
@@ -179,17 +230,38 @@ async def chat_handler(request: web.Request) -> web.Response:
 
 # ── 앱 설정 ──────────────────────────────────────────────────
 
+async def _start_api_client(app: web.Application) -> None:
+    """서버 시작 시 모든 요청이 공유할 Anthropic 클라이언트와 일정 개요 캐시를 만든다."""
+    start_client()
+    configure_overview_cache(OVERVIEW_CACHE_PATH or None)
+
+
+async def _close_storage(app: web.Application) -> None:
+    """서버 종료 시 대기 중인 변경을 전송하고 저장소 연결을 정리한다."""
+    await storage.close()
+
+
+async def _close_api_client(app: web.Application) -> None:
+    """서버 종료 시 Anthropic 클라이언트 연결 풀을 닫는다."""
+    await close_client()
+
+
 def create_app() -> web.Application:
     """aiohttp 앱을 생성한다."""
     app = web.Application(middlewares=[cors_middleware])
     app.router.add_get("/health", health_handler)
+    app.router.add_get("/stats", stats_handler)
     app.router.add_post("/chat", chat_handler)
+    app.on_startup.append(_start_api_client)
+    app.on_cleanup.append(_close_storage)
+    app.on_cleanup.append(_close_api_client)
     return app
 
 
 def main():
     """서버를 시작한다."""
-    if not JSONBIN_BIN_ID or not JSONBIN_API_KEY:
+    uses_jsonbin = STORAGE_BACKEND == "jsonbin" or STORAGE_REPLICA == "jsonbin"
+    if uses_jsonbin and (not JSONBIN_BIN_ID or not JSONBIN_API_KEY):
         logger.error("JSONBIN_BIN_ID / JSONBIN_API_KEY가 설정되지 않았습니다")
         return
 
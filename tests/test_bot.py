@@ -69,12 +69,13 @@ class TestHandleMessage(unittest.TestCase):
         update.effective_user.id = user_id
         update.message.text = text
         update.message.reply_text = AsyncMock()
+        update.message.chat.send_action = AsyncMock()
         update.message.chat_id = 12345
         return update
 
     @patch.object(bot, "process_message")
-    @patch.object(bot, "jsonbin")
-    def test_unauthorized_user_ignored(self, mock_jsonbin, mock_process):
+    @patch.object(bot, "storage")
+    def test_unauthorized_user_ignored(self, mock_storage, mock_process):
         """허용되지 않은 사용자의 메시지는 무시해야 한다"""
         update = self._make_update(user_id=99999, text="일정 보여줘")
         context = MagicMock()
@@ -87,12 +88,12 @@ class TestHandleMessage(unittest.TestCase):
         update.message.reply_text.assert_not_called()
 
     @patch.object(bot, "process_message")
-    @patch.object(bot, "jsonbin")
-    def test_authorized_user_text_response(self, mock_jsonbin, mock_process):
+    @patch.object(bot, "storage")
+    def test_authorized_user_text_response(self, mock_storage, mock_process):
         """허용된 사용자의 메시지에 대해 텍스트 응답을 전송해야 한다"""
         from claude_handler import ClaudeResponse
 
-        mock_jsonbin.get_data.return_value = SAMPLE_DATA
+        mock_storage.get_data = AsyncMock(return_value=SAMPLE_DATA)
         mock_process.return_value = ClaudeResponse(
             success=True,
             response_type="text",
@@ -110,14 +111,14 @@ class TestHandleMessage(unittest.TestCase):
         update.message.reply_text.assert_called()
 
     @patch.object(bot, "process_message")
-    @patch.object(bot, "jsonbin")
-    def test_authorized_user_update_response(self, mock_jsonbin, mock_process):
+    @patch.object(bot, "storage")
+    def test_authorized_user_update_response(self, mock_storage, mock_process):
         """JSON 업데이트 응답 시 jsonbin PUT 후 확인 메시지를 전송해야 한다"""
         from claude_handler import ClaudeResponse
 
         updated = {**SAMPLE_DATA, "meta": {"lastUpdated": "2026-02-10T10:00:00+09:00", "updateNote": "저녁 확정"}}
-        mock_jsonbin.get_data.return_value = SAMPLE_DATA
-        mock_jsonbin.put_data.return_value = True
+        mock_storage.get_data = AsyncMock(return_value=SAMPLE_DATA)
+        mock_storage.put_data = AsyncMock(return_value=True)
         mock_process.return_value = ClaudeResponse(
             success=True,
             response_type="update",
@@ -132,7 +133,7 @@ class TestHandleMessage(unittest.TestCase):
         run_async(bot.handle_message(update, context))
 
         # jsonbin PUT이 호출되어야 한다
-        mock_jsonbin.put_data.assert_called_once_with(updated)
+        mock_storage.put_data.assert_awaited_once_with(updated)
         # 확인 메시지가 전송되어야 한다
         update.message.reply_text.assert_called()
 
@@ -166,6 +167,123 @@ class TestStartCommand(unittest.TestCase):
         update.message.reply_text.assert_not_called()
 
 
+@unittest.skipIf(not bot_available, "bot 모듈 미구현")
+class TestStatusCommand(unittest.TestCase):
+    """status 명령어 테스트"""
+
+    @patch.object(bot, "storage")
+    def test_status_reports_breaker_state(self, mock_storage):
+        """/status는 회로 차단기 상태를 응답해야 한다"""
+        mock_storage.status.return_value = {
+            "backend": "jsonbin",
+            "breaker": {"state": "open", "consecutiveFailures": 5, "retryIn": 12.0},
+            "pendingOps": 2,
+            "cacheVersion": "2026-02-10T09:00:00+09:00",
+            "cacheAge": 3.0,
+        }
+        update = MagicMock()
+        update.effective_user.id = 12345
+        update.message.reply_text = AsyncMock()
+
+        run_async(bot.status_command(update, MagicMock()))
+
+        reply_text = update.message.reply_text.call_args[0][0]
+        self.assertIn("open", reply_text)
+        self.assertIn("2건", reply_text)
+
+    @patch.object(bot, "storage")
+    def test_status_local_without_replica(self, mock_storage):
+        """로컬 저장소만 쓰면 회로 차단기 없이 데이터 버전을 응답해야 한다"""
+        mock_storage.status.return_value = {
+            "backend": "local",
+            "path": "/tmp/trip.json",
+            "version": "2026-02-10T09:00:00+09:00",
+            "replica": None,
+        }
+        update = MagicMock()
+        update.effective_user.id = 12345
+        update.message.reply_text = AsyncMock()
+
+        run_async(bot.status_command(update, MagicMock()))
+
+        reply_text = update.message.reply_text.call_args[0][0]
+        self.assertIn("local", reply_text)
+        self.assertNotIn("회로 차단기", reply_text)
+
+
+@unittest.skipIf(not bot_available, "bot 모듈 미구현")
+class TestRollbackCommand(unittest.TestCase):
+    """rollback 명령어 테스트"""
+
+    def _make_command_update(self):
+        update = MagicMock()
+        update.effective_user.id = 12345
+        update.message.reply_text = AsyncMock()
+        return update
+
+    @patch.object(bot, "storage")
+    def test_lists_versions_without_args(self, mock_storage):
+        """인자가 없으면 최근 버전 목록을 보여줘야 한다"""
+        mock_storage.history.versions.return_value = [
+            {"v": 7, "version": "v7", "savedAt": 1771459200.0, "note": "점심 변경"},
+        ]
+        update = self._make_command_update()
+        context = MagicMock()
+        context.args = []
+
+        run_async(bot.rollback_command(update, context))
+
+        reply_text = update.message.reply_text.call_args[0][0]
+        self.assertIn("7.", reply_text)
+        self.assertIn("점심 변경", reply_text)
+        mock_storage.rollback.assert_not_called()
+
+    @patch.object(bot, "storage")
+    def test_rolls_back_given_version(self, mock_storage):
+        """버전 번호를 주면 저장소의 rollback을 호출해야 한다"""
+        update = self._make_command_update()
+        context = MagicMock()
+        context.args = ["7"]
+
+        run_async(bot.rollback_command(update, context))
+
+        mock_storage.rollback.assert_called_once_with(7)
+        self.assertIn("7번 버전", update.message.reply_text.call_args[0][0])
+
+
+@unittest.skipIf(not bot_available, "bot 모듈 미구현")
+class TestUndoCommand(unittest.TestCase):
+    """undo 명령어 테스트"""
+
+    def _make_command_update(self):
+        update = MagicMock()
+        update.effective_user.id = 12345
+        update.message.reply_text = AsyncMock()
+        return update
+
+    @patch.object(bot, "undo_log")
+    @patch.object(bot, "storage")
+    def test_undo_applies_through_storage(self, mock_storage, mock_undo_log):
+        """마지막 변경을 저장소를 통해 되돌려야 한다"""
+        mock_undo_log.undo.return_value = "점심 변경"
+        update = self._make_command_update()
+
+        run_async(bot.undo_command(update, MagicMock()))
+
+        mock_undo_log.undo.assert_called_once_with(mock_storage)
+        self.assertIn("점심 변경", update.message.reply_text.call_args[0][0])
+
+    @patch.object(bot, "undo_log")
+    def test_nothing_to_undo(self, mock_undo_log):
+        """되돌릴 변경이 없으면 안내해야 한다"""
+        mock_undo_log.undo.return_value = None
+        update = self._make_command_update()
+
+        run_async(bot.undo_command(update, MagicMock()))
+
+        self.assertIn("되돌릴 변경이 없어요", update.message.reply_text.call_args[0][0])
+
+
 @unittest.skipIf(not bot_available, "bot 모듈 미구현")
 class TestSendLongMessage(unittest.TestCase):
     """긴 메시지 분할 전송 테스트"""
@@ -0,0 +1,192 @@
+"""
+claude_api_handler 공유 클라이언트/프롬프트 캐시 테스트.
+
+실제 API는 호출하지 않고 messages.stream을 모킹한다.
+"""
+
+import asyncio
+import copy
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# src/ 디렉토리를 모듈 경로에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+os.environ.setdefault("ANTHROPIC_API_KEY", "test_key")
+
+import claude_api_handler
+import tool_stats
+from claude_api_handler import (
+    CACHED_TOOLS, SYSTEM_PROMPT_STATIC, build_system_blocks, close_client, create_client,
+    get_client, process_message_api, start_client,
+)
+
+SAMPLE_DATA = {
+    "meta": {},
+    "days": [
+        {"dayNum": 1, "date": "2026-02-19", "dow": "목", "title": "출발", "items": [
+            {"id": "d1_lunch", "time": "점심", "title": "점심", "status": "planned"},
+        ]},
+    ],
+}
+
+_USAGE = SimpleNamespace(input_tokens=100, output_tokens=20,
+                         cache_creation_input_tokens=0, cache_read_input_tokens=5000)
+
+
+def _end_turn(text):
+    return SimpleNamespace(stop_reason="end_turn", usage=_USAGE,
+                           content=[SimpleNamespace(type="text", text=text)])
+
+
+def _tool_use(name, tool_input):
+    block = SimpleNamespace(type="tool_use", id="toolu_1", name=name, input=tool_input)
+    return SimpleNamespace(stop_reason="tool_use", usage=_USAGE, content=[block])
+
+
+class _FakeStream:
+    """messages.stream(...) 대역 (이벤트 하나 뒤 최종 메시지)"""
+
+    def __init__(self, response):
+        self._response = response
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __aiter__(self):
+        async def events():
+            yield SimpleNamespace(type="content_block_start")
+        return events()
+
+    async def get_final_message(self):
+        return self._response
+
+
+def _fake_stream(responses):
+    """응답을 차례로 돌려주고, 호출마다 요청 인자를 (cache_control 상태 그대로) 복사해 둔다"""
+    requests = []
+    responses = iter(responses)
+
+    def stream(**request):
+        requests.append(copy.deepcopy(request))
+        return _FakeStream(next(responses))
+
+    return MagicMock(side_effect=stream), requests
+
+
+class TestSharedClient(unittest.TestCase):
+    """공유 AsyncAnthropic 클라이언트 테스트"""
+
+    def tearDown(self):
+        asyncio.run(close_client())
+
+    def test_create_client_settings(self):
+        client = create_client(timeout=30, connect_timeout=2, max_connections=3, max_retries=0)
+
+        self.assertEqual(client.timeout.read, 30)
+        self.assertEqual(client.timeout.connect, 2)
+        self.assertEqual(client.max_retries, 0)
+        asyncio.run(client.close())
+
+    def test_env_options(self):
+        with patch.dict(os.environ, {"ANTHROPIC_MAX_CONNECTIONS": "4", "ANTHROPIC_TIMEOUT": "12.5"}):
+            options = claude_api_handler.client_options_from_env()
+
+        self.assertEqual(options["max_connections"], 4)
+        self.assertEqual(options["timeout"], 12.5)
+        self.assertEqual(options["max_retries"], claude_api_handler.API_MAX_RETRIES)
+
+    def test_reused_across_messages(self):
+        """메시지마다 새 클라이언트를 만들지 않고 공유 클라이언트를 써야 한다"""
+        client = start_client(max_retries=0)
+        self.assertIs(start_client(), client)
+        self.assertIs(get_client(), client)
+
+        stream, requests = _fake_stream([_end_turn("첫 번째"), _end_turn("두 번째")])
+        with patch.object(client.messages, "stream", stream), \
+                patch("claude_api_handler.AsyncAnthropic") as constructor:
+            first = asyncio.run(process_message_api(SAMPLE_DATA, "오늘 일정"))
+            second = asyncio.run(process_message_api(SAMPLE_DATA, "내일 일정"))
+
+        self.assertEqual((first.text, second.text), ("첫 번째", "두 번째"))
+        self.assertEqual(len(requests), 2)
+        constructor.assert_not_called()
+
+    def test_close_resets(self):
+        client = start_client()
+        asyncio.run(close_client())
+
+        self.assertIsNone(claude_api_handler._client)
+        self.assertIsNot(get_client(), client)
+        asyncio.run(close_client())
+        asyncio.run(close_client())  # 두 번 닫아도 문제없어야 한다
+
+
+def _cache_points(request):
+    """요청 안의 cache_control 위치 목록"""
+    points = [("tools", i) for i, tool in enumerate(request["tools"]) if "cache_control" in tool]
+    points += [("system", i) for i, block in enumerate(request["system"]) if "cache_control" in block]
+    for m, message in enumerate(request["messages"]):
+        if isinstance(message["content"], list):
+            points += [("messages", m) for block in message["content"]
+                       if isinstance(block, dict) and "cache_control" in block]
+    return points
+
+
+class TestPromptCache(unittest.TestCase):
+    """시스템 프롬프트 분리와 캐시 지점 테스트"""
+
+    def setUp(self):
+        tool_stats.reset()
+
+    def tearDown(self):
+        asyncio.run(close_client())
+        tool_stats.reset()
+
+    def test_static_block_has_no_volatile_values(self):
+        """고정 블록은 날짜/데이터와 무관해야 캐시가 메시지 사이에 유지된다"""
+        self.assertNotIn("{", SYSTEM_PROMPT_STATIC)
+        static, volatile = build_system_blocks(SAMPLE_DATA)
+
+        self.assertEqual(static["text"], SYSTEM_PROMPT_STATIC)
+        self.assertIn("cache_control", static)
+        self.assertNotIn("cache_control", volatile)
+        self.assertIn("d1_lunch", volatile["text"])
+        self.assertNotIn("d1_lunch", static["text"])
+
+    def test_cached_tools(self):
+        self.assertEqual([t["name"] for t in CACHED_TOOLS], [t["name"] for t in claude_api_handler.TOOLS])
+        self.assertEqual([i for i, t in enumerate(CACHED_TOOLS) if "cache_control" in t], [len(CACHED_TOOLS) - 1])
+        self.assertNotIn("cache_control", claude_api_handler.TOOLS[-1])
+
+    def test_cache_points_follow_rounds(self):
+        """라운드마다 캐시 지점은 도구/고정 블록/마지막 메시지 3개여야 한다"""
+        client = start_client(max_retries=0)
+        stream, requests = _fake_stream([
+            _tool_use("get_schedule", {"day_num": 1}),
+            _end_turn("1일차 일정입니다"),
+        ])
+        history = [{"role": "user", "content": "안녕"}, {"role": "assistant", "content": "네"},
+                   {"role": "user", "content": "1일차 일정"}]
+        with patch.object(client.messages, "stream", stream):
+            result = asyncio.run(process_message_api(SAMPLE_DATA, "1일차 일정", history=history))
+
+        self.assertEqual(result.text, "1일차 일정입니다")
+        last_tool = len(CACHED_TOOLS) - 1
+        self.assertEqual(_cache_points(requests[0]), [("tools", last_tool), ("system", 0), ("messages", 2)])
+        self.assertEqual(_cache_points(requests[1]), [("tools", last_tool), ("system", 0), ("messages", 4)])
+        self.assertEqual(requests[1]["messages"][4]["content"][0]["type"], "tool_result")
+
+        api = tool_stats.snapshot()["api"]
+        self.assertEqual(api["calls"], 2)
+        self.assertEqual(api["tokens"]["cacheRead"], 10000)
+
+
+if __name__ == "__main__":
+    unittest.main()
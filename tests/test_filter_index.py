@@ -0,0 +1,156 @@
+"""
+filter_index / opening_hours 모듈 테스트.
+
+영업시간 파싱과 포스팅 집합 필터가 항목별 전체 순회 결과와 같은지 검증한다.
+"""
+
+import os
+import random
+import sys
+import unittest
+from datetime import datetime
+
+# src/ 디렉토리를 모듈 경로에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from filter_index import FilterIndex, matches
+from opening_hours import is_open, parse_hours
+
+
+HOURS = [
+    "11:00~21:00 (브레이크 15:00~17:00)",
+    "평일 11:00~21:00, 주말 10:30~21:00",
+    "화~토 11:00~20:00 (일·월 휴무)",
+    "08:00~21:00 (목요일 휴무)",
+    "18:00~02:00",
+    "영업시간 유동적 (전화 확인 필요)",
+]
+CATEGORIES = ["한식 · 국밥", "카페 · 베이커리", "한정식", "카페", "해산물 · 조개찜"]
+
+
+def make_trip(total_items, items_per_day=50, seed=7):
+    """필터 검증용 합성 여행 데이터"""
+    rng = random.Random(seed)
+    days = []
+    for d in range(1, total_items // items_per_day + 1):
+        items = []
+        for i in range(items_per_day):
+            options = []
+            for k in range(rng.randint(0, 3)):
+                opt = {"name": f"옵션 {d}-{i}-{k}",
+                       "dad": rng.choice(["good", "caution"]),
+                       "hiro": rng.choice(["good", "caution"])}
+                if rng.random() < 0.8:
+                    opt["rating"] = round(rng.uniform(3.0, 5.0), 1)
+                    opt["category"] = rng.choice(CATEGORIES)
+                    opt["hours"] = rng.choice(HOURS)
+                options.append(opt)
+            item = {"id": f"d{d}_item{i}", "cat": rng.choice(["meal", "cafe", "activity"]),
+                    "title": f"장소 {d}-{i}", "options": options,
+                    "status": rng.choice(["planned", "done", "skipped"])}
+            if rng.random() < 0.1:
+                item["optional"] = True
+            items.append(item)
+        days.append({"dayNum": d, "date": f"2026-03-{d:02d}", "items": items})
+    return {"meta": {}, "days": days}
+
+
+def scan(data, filters):
+    """인덱스 없이 항목마다 조건을 확인한 결과 (id 목록)"""
+    result = []
+    for day in data["days"]:
+        for item in day["items"]:
+            opts = item.get("options", [])
+            ok = True
+            for field, value in filters.items():
+                if field in ("cat", "status"):
+                    ok = item.get(field) == value
+                elif field == "day_num":
+                    ok = day["dayNum"] == value
+                elif field in ("dad", "hiro"):
+                    ok = any(o.get(field) == value for o in opts)
+                elif field == "min_rating":
+                    ok = any(o.get("rating", 0) >= value for o in opts)
+                elif field == "category":
+                    ok = any(value in o.get("category", "") for o in opts)
+                elif field == "optional":
+                    ok = bool(item.get("optional")) == value
+                elif field == "open_at":
+                    minute = value.hour * 60 + value.minute
+                    ok = any(is_open(parse_hours(o.get("hours")), value.weekday(), minute) for o in opts)
+                if not ok:
+                    break
+            if ok:
+                result.append(item["id"])
+    return result
+
+
+class TestOpeningHours(unittest.TestCase):
+    """영업시간 파서 테스트"""
+
+    def test_break_and_closed_days(self):
+        schedule = parse_hours("08:00~21:00 (브레이크 16:00~17:00, 목요일 휴무)")
+        self.assertEqual(schedule[0], [(480, 960), (1020, 1260)])
+        self.assertEqual(schedule[3], [])
+        self.assertEqual(schedule[6], [(480, 960), (1020, 1260)])
+
+    def test_day_ranges(self):
+        schedule = parse_hours("화~토 11:00~20:00 (일·월 휴무)")
+        self.assertEqual([wd for wd in range(7) if schedule[wd]], [1, 2, 3, 4, 5])
+
+        weekend = parse_hours("평일 11:00~21:00, 주말 10:30~21:00")
+        self.assertEqual(weekend[5], [(630, 1260)])
+        self.assertEqual(weekend[4], [(660, 1260)])
+
+    def test_past_midnight_and_unknown(self):
+        schedule = parse_hours("18:00~02:00")
+        self.assertTrue(is_open(schedule, 1, 60))  # 월요일 밤에 연 가게의 화요일 새벽
+        self.assertFalse(is_open(schedule, 1, 600))
+        self.assertIsNone(parse_hours("영업시간 유동적 (전화 확인 필요)"))
+        self.assertIsNone(is_open(None, 0, 600))
+
+
+class TestFilterIndex(unittest.TestCase):
+    """포스팅 집합 필터 테스트 (합성 10k 항목)"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.data = make_trip(10000)
+        cls.index = FilterIndex(cls.data["days"])
+
+    def _ids(self, filters):
+        return [self.index.entry(pos)[1]["id"] for pos in self.index.match(filters)]
+
+    def test_matches_scan(self):
+        """조건 조합마다 전체 순회 결과와 같아야 한다"""
+        cases = [
+            {},
+            {"cat": "meal"},
+            {"cat": "meal", "hiro": "good", "status": "planned"},
+            {"dad": "good", "hiro": "good", "day_num": 3},
+            {"min_rating": 4.5},
+            {"min_rating": 4.25, "cat": "cafe"},
+            {"category": "카페"},
+            {"category": "국밥", "dad": "caution"},
+            {"optional": True},
+            {"optional": False, "status": "done"},
+            {"open_at": datetime(2026, 3, 2, 12, 0)},  # 월요일 점심
+            {"open_at": datetime(2026, 3, 5, 16, 0), "cat": "meal"},  # 목요일 브레이크
+            {"open_at": datetime(2026, 3, 3, 1, 30)},  # 화요일 새벽
+            {"cat": "unknown"},
+        ]
+        for filters in cases:
+            with self.subTest(filters=filters):
+                self.assertEqual(self._ids(filters), scan(self.data, filters))
+
+    def test_single_item_matches(self):
+        """matches()는 인덱스와 같은 규칙으로 판정해야 한다"""
+        filters = {"hiro": "good", "min_rating": 4.0, "category": "카페"}
+        expected = set(self._ids(filters))
+        for day in self.data["days"][:5]:
+            for item in day["items"]:
+                self.assertEqual(matches(day, item, filters), item["id"] in expected, item["id"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+geo_index 모듈과 find_nearby 도구 테스트.
+"""
+
+import os
+import random
+import sys
+import unittest
+
+# src/ 디렉토리를 모듈 경로에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from geo_index import ACCOMMODATION, GeoIndex, Place, haversine_m
+from tool_executor import ExecutionContext, execute_tool
+
+
+SAMPLE_DATA = {
+    "meta": {},
+    "days": [
+        {"dayNum": 2, "date": "2026-02-20", "items": [
+            {"id": "d2_lunch", "title": "점심 (황리단길)", "cat": "meal", "status": "planned", "options": [
+                {"name": "향화정", "lat": 35.8380, "lng": 129.2092, "category": "한정식", "dad": "good"},
+                {"name": "온목당", "lat": 35.8378, "lng": 129.2088, "category": "곰탕", "dad": "caution"},
+                {"name": "좌표 없는 식당"},
+            ]},
+            {"id": "d2_cafe", "title": "카페 휴식", "cat": "cafe", "status": "planned", "options": [
+                {"name": "올리브", "lat": 35.8374, "lng": 129.2091, "category": "카페"},
+            ]},
+        ]},
+        {"dayNum": 3, "date": "2026-02-21", "items": [
+            {"id": "d3_lunch", "title": "점심 (불국사 근처)", "cat": "meal", "status": "planned", "options": [
+                {"name": "전주시골밥상", "lat": 35.7900, "lng": 129.3310, "category": "정식", "dad": "good"},
+            ]},
+            {"id": "d3_dinner", "title": "저녁", "cat": "meal", "status": "planned", "options": [
+                {"name": "온목당", "lat": 35.8378, "lng": 129.2088, "category": "곰탕", "dad": "caution"},
+            ]},
+        ]},
+    ],
+}
+
+
+class TestGeoIndex(unittest.TestCase):
+    """GeoIndex 테스트"""
+
+    def test_haversine(self):
+        # 위도 0.01도 ≈ 1.11km
+        self.assertAlmostEqual(haversine_m(35.80, 129.20, 35.81, 129.20), 1112, delta=2)
+        self.assertEqual(haversine_m(35.8, 129.2, 35.8, 129.2), 0)
+
+    def test_nearest_matches_linear_scan(self):
+        """격자 조회 순서가 전체 정렬과 같아야 한다 (반경 포함)"""
+        rng = random.Random(7)
+        places = [Place(f"p{i}", 35.7 + rng.random() * 0.2, 129.1 + rng.random() * 0.3) for i in range(300)]
+        index = GeoIndex(places)
+
+        for _ in range(20):
+            lat, lng = 35.7 + rng.random() * 0.2, 129.1 + rng.random() * 0.3
+            expected = sorted(haversine_m(lat, lng, p.lat, p.lng) for p in places)
+            self.assertEqual([round(d, 6) for d, _ in index.nearest(lat, lng)],
+                             [round(d, 6) for d in expected])
+            within = [d for d in expected if d <= 2500]
+            self.assertEqual(len(list(index.nearest(lat, lng, 2500))), len(within))
+
+    def test_empty(self):
+        self.assertEqual(list(GeoIndex([]).nearest(35.8, 129.2)), [])
+
+
+class TestFindNearby(unittest.TestCase):
+    """find_nearby 도구 테스트"""
+
+    def setUp(self):
+        self.ctx = ExecutionContext(SAMPLE_DATA)
+
+    def test_from_place_ranked(self):
+        result = execute_tool(self.ctx, "find_nearby", {"place": "향화정", "limit": 3})
+
+        self.assertEqual(result["origin"]["name"], "향화정")
+        names = [p["name"] for p in result["places"]]
+        self.assertEqual(names, ["온목당", "올리브", ACCOMMODATION["name"]])
+        distances = [p["distance_m"] for p in result["places"]]
+        self.assertEqual(distances, sorted(distances))
+        # 같은 장소의 다른 일정은 한 결과로 묶는다
+        self.assertEqual([i["id"] for i in result["places"][0]["items"]], ["d2_lunch", "d3_dinner"])
+
+    def test_filters_per_option(self):
+        """필터는 항목이 아니라 장소(옵션)마다 판정하고, 숙소는 빠져야 한다"""
+        result = execute_tool(self.ctx, "find_nearby", {"place": "향화정", "dad": "good"})
+
+        self.assertEqual([p["name"] for p in result["places"]], ["전주시골밥상"])
+
+    def test_from_coords_with_radius(self):
+        result = execute_tool(self.ctx, "find_nearby", {"lat": 35.79, "lng": 129.331, "radius_m": 1000})
+        self.assertEqual([p["name"] for p in result["places"]], ["전주시골밥상"])
+
+        result = execute_tool(self.ctx, "find_nearby", {"place": "숙소", "limit": 1})
+        self.assertEqual(result["origin"]["name"], ACCOMMODATION["name"])
+        self.assertEqual(result["count"], 1)
+
+    def test_sees_changes_in_context(self):
+        """같은 컨텍스트에서 바뀐 좌표를 반영해야 한다"""
+        execute_tool(self.ctx, "find_nearby", {"place": "향화정"})
+        execute_tool(self.ctx, "add_option", {
+            "item_id": "d3_lunch", "name": "새 식당", "lat": 35.8381, "lng": 129.2093})
+
+        result = execute_tool(self.ctx, "find_nearby", {"place": "향화정", "limit": 1})
+        self.assertEqual(result["places"][0]["name"], "새 식당")
+
+    def test_errors(self):
+        self.assertIn("error", execute_tool(self.ctx, "find_nearby", {}))
+        self.assertIn("error", execute_tool(self.ctx, "find_nearby", {"lat": 35.8}))
+        self.assertIn("error", execute_tool(self.ctx, "find_nearby", {"place": "없는 장소"}))
+
+
+if __name__ == "__main__":
+    unittest.main()
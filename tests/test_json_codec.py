@@ -0,0 +1,65 @@
+"""
+json_codec 모듈 테스트.
+
+orjson 사용 여부와 관계없이 표준 json(ensure_ascii=False)과 같은 결과를 내야 한다.
+"""
+
+import importlib
+import json
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+# src/ 디렉토리를 모듈 경로에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+import json_codec
+
+
+SAMPLE = {"meta": {"updateNote": "경주 여행"}, "days": [{"dayNum": 1, "items": [], "rating": 4.5}]}
+
+
+class TestJsonCodec(unittest.TestCase):
+    """json_codec 테스트 (설치된 구현과 표준 json 폴백 모두)"""
+
+    def _codecs(self):
+        yield json_codec
+        with patch.dict(sys.modules, {"orjson": None}):
+            fallback = importlib.reload(json_codec)
+        try:
+            self.assertEqual(fallback.BACKEND, "json")
+            yield fallback
+        finally:
+            importlib.reload(json_codec)
+
+    def test_roundtrip(self):
+        """직렬화 후 역직렬화하면 같은 값이어야 한다"""
+        for codec in self._codecs():
+            with self.subTest(backend=codec.BACKEND):
+                self.assertEqual(codec.loads(codec.dumps(SAMPLE)), SAMPLE)
+                self.assertEqual(codec.loads(codec.dumps_bytes(SAMPLE)), SAMPLE)
+
+    def test_korean_not_escaped(self):
+        """한글은 \\u 이스케이프 없이 그대로 나와야 한다"""
+        for codec in self._codecs():
+            with self.subTest(backend=codec.BACKEND):
+                self.assertIn("경주 여행", codec.dumps(SAMPLE))
+                self.assertIn("경주 여행".encode("utf-8"), codec.dumps_bytes(SAMPLE))
+
+    def test_non_str_keys(self):
+        """표준 json처럼 정수 키를 문자열로 바꿔야 한다"""
+        for codec in self._codecs():
+            with self.subTest(backend=codec.BACKEND):
+                self.assertEqual(codec.loads(codec.dumps({1: "a"})), {"1": "a"})
+
+    def test_decode_error(self):
+        """잘못된 입력은 JSONDecodeError(ValueError)를 발생시켜야 한다"""
+        for codec in self._codecs():
+            with self.subTest(backend=codec.BACKEND):
+                with self.assertRaises(json.JSONDecodeError):
+                    codec.loads(b"{not json")
+
+
+if __name__ == "__main__":
+    unittest.main()
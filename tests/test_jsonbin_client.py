@@ -4,15 +4,22 @@ jsonbin_client 모듈 테스트.
 mock을 사용하여 실제 jsonbin.io API를 호출하지 않고 테스트한다.
 """
 
+import asyncio
+import json
 import os
 import sys
+import tempfile
+import time
 import unittest
 from unittest.mock import patch, MagicMock
 
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
 # src/ 디렉토리를 모듈 경로에 추가
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
 
-from jsonbin_client import JsonBinClient, JsonBinError, KST
+from jsonbin_client import AsyncJsonBinClient, CircuitBreaker, JsonBinClient, JsonBinError, KST
 
 
 class TestJsonBinClient(unittest.TestCase):
@@ -235,6 +242,96 @@ class TestJsonBinClient(unittest.TestCase):
 
         self.assertEqual(self.client.get_cached(), self.sample_data)
 
+    @patch("jsonbin_client.requests.get")
+    def test_fresh_cache_skips_request(self, mock_get):
+        """신선도 구간 안의 두 번째 GET은 요청 없이 캐시를 반환해야 한다"""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"record": self.sample_data}
+        mock_response.raise_for_status.return_value = None
+        mock_get.return_value = mock_response
+
+        self.client.get_data()
+        result = self.client.get_data()
+
+        self.assertEqual(result, self.sample_data)
+        mock_get.assert_called_once()
+
+    @patch("jsonbin_client.requests.get")
+    def test_invalidate_cache_forces_request(self, mock_get):
+        """invalidate_cache() 후에는 다시 요청해야 한다"""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"record": self.sample_data}
+        mock_response.raise_for_status.return_value = None
+        mock_get.return_value = mock_response
+
+        self.client.get_data()
+        self.client.invalidate_cache()
+        self.client.get_data()
+
+        self.assertEqual(mock_get.call_count, 2)
+
+    # --- 디스크 스냅샷 테스트 ---
+
+    def _snapshot_client(self, path):
+        return JsonBinClient(bin_id="test_bin_id", api_key="test_api_key", snapshot_path=path)
+
+    @patch("jsonbin_client.requests.get")
+    def test_snapshot_written_after_get(self, mock_get):
+        """GET 성공 시 스냅샷 파일이 기록되어야 한다"""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"record": self.sample_data}
+        mock_response.raise_for_status.return_value = None
+        mock_get.return_value = mock_response
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sub", "snapshot.json")
+            self._snapshot_client(path).get_data()
+
+            with open(path, encoding="utf-8") as f:
+                saved = json.load(f)
+            self.assertEqual(saved["record"], self.sample_data)
+            # 임시 파일이 남지 않아야 한다
+            self.assertEqual(os.listdir(os.path.dirname(path)), ["snapshot.json"])
+
+    @patch("jsonbin_client.requests.get")
+    def test_snapshot_survives_restart_during_outage(self, mock_get):
+        """재시작 후 jsonbin 장애 시에도 스냅샷으로 폴백해야 한다"""
+        import requests as req
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "snapshot.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"savedAt": time.time() - 3600, "record": self.sample_data}, f)
+
+            mock_get.side_effect = req.exceptions.ConnectionError("conn error")
+            client = self._snapshot_client(path)
+
+            self.assertEqual(client.get_cached(), self.sample_data)
+            self.assertEqual(client.get_data(), self.sample_data)
+            mock_get.assert_called_once()
+
+    @patch("jsonbin_client.requests.get")
+    def test_recent_snapshot_served_warm(self, mock_get):
+        """방금 저장된 스냅샷은 재시작 직후 요청 없이 응답해야 한다"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "snapshot.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"savedAt": time.time(), "record": self.sample_data}, f)
+
+            result = self._snapshot_client(path).get_data()
+
+            self.assertEqual(result, self.sample_data)
+            mock_get.assert_not_called()
+
+    def test_corrupt_snapshot_ignored(self):
+        """손상된 스냅샷은 무시하고 빈 캐시로 시작해야 한다"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "snapshot.json")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("{not json")
+
+            self.assertIsNone(self._snapshot_client(path).get_cached())
+
     # --- 헤더 테스트 ---
 
     def test_headers_contain_required_fields(self):
@@ -274,5 +371,757 @@ class TestJsonBinClient(unittest.TestCase):
         self.assertNotIn("latest", url)
 
 
+class TestCircuitBreaker(unittest.TestCase):
+    """CircuitBreaker 상태 전이 테스트"""
+
+    def setUp(self):
+        self.now = 0.0
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: self.now)
+
+    def test_opens_after_threshold(self):
+        """연속 실패가 기준에 이르면 열려야 한다"""
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, "open")
+        self.assertFalse(self.breaker.allow())
+
+    def test_success_resets_failures(self):
+        """성공하면 연속 실패 횟수가 초기화되어야 한다"""
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, "closed")
+
+    def test_half_open_allows_single_trial(self):
+        """reset_timeout 후에는 시험 요청 하나만 허용해야 한다"""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.now = 10
+
+        self.assertEqual(self.breaker.state, "half_open")
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+
+    def test_half_open_success_closes(self):
+        """시험 요청이 성공하면 닫혀야 한다"""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.now = 10
+        self.breaker.allow()
+        self.breaker.record_success()
+
+        self.assertEqual(self.breaker.state, "closed")
+        self.assertTrue(self.breaker.allow())
+
+    def test_half_open_failure_reopens(self):
+        """시험 요청이 실패하면 다시 열려야 한다"""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.now = 10
+        self.breaker.allow()
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, "open")
+        self.assertEqual(self.breaker.snapshot()["retryIn"], 10)
+
+
+class TestAsyncJsonBinClient(unittest.IsolatedAsyncioTestCase):
+    """AsyncJsonBinClient 테스트 (로컬 aiohttp 서버를 jsonbin 대역으로 사용)"""
+
+    async def asyncSetUp(self):
+        self.sample_data = {
+            "meta": {"lastUpdated": "2026-02-10T09:00:00+09:00"},
+            "days": [],
+        }
+        self.stored = {"record": self.sample_data}
+        self.get_status = 200
+        self.put_statuses = []
+        self.requests = []
+
+        async def handle_get(request):
+            self.requests.append(("GET", request.path, dict(request.headers)))
+            if self.get_status != 200:
+                return web.Response(status=self.get_status)
+            if request.headers.get("X-JSON-Path") == "$.meta.lastUpdated":
+                return web.json_response([self.stored["record"]["meta"]["lastUpdated"]])
+            return web.json_response(self.stored)
+
+        async def handle_put(request):
+            body = await request.json()
+            self.requests.append(("PUT", request.path, dict(request.headers)))
+            if self.put_statuses:
+                status = self.put_statuses.pop(0)
+                if status != 200:
+                    return web.Response(status=status)
+            self.stored = {"record": body}
+            return web.json_response({"record": body})
+
+        app = web.Application()
+        app.router.add_get("/v3/b/{bin_id}/latest", handle_get)
+        app.router.add_put("/v3/b/{bin_id}", handle_put)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+        self.client = AsyncJsonBinClient(
+            bin_id="test_bin_id", api_key="test_api_key",
+            write_delay=0.02, retry_base_delay=0.001,
+        )
+        self.client.base_url = str(self.server.make_url("/v3/b"))
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.close()
+
+    async def test_get_data_success(self):
+        """GET 성공 시 record를 반환하고 캐시에 저장해야 한다"""
+        result = await self.client.get_data()
+
+        self.assertEqual(result, self.sample_data)
+        self.assertEqual(self.client.get_cached(), self.sample_data)
+        method, path, headers = self.requests[0]
+        self.assertEqual(path, "/v3/b/test_bin_id/latest")
+        self.assertEqual(headers["X-Master-Key"], "test_api_key")
+
+    async def test_get_data_http_error_with_cache(self):
+        """HTTP 에러 시 캐시가 있으면 캐시를 반환해야 한다"""
+        self.client._cache = self.sample_data
+        self.get_status = 500
+
+        result = await self.client.get_data()
+
+        self.assertEqual(result, self.sample_data)
+
+    async def test_get_data_http_error_without_cache(self):
+        """HTTP 에러 시 캐시가 없으면 JsonBinError를 발생시켜야 한다"""
+        self.get_status = 404
+
+        with self.assertRaises(JsonBinError) as ctx:
+            await self.client.get_data()
+
+        self.assertIn("404", str(ctx.exception))
+
+    async def test_get_data_connection_error_with_cache(self):
+        """연결 실패 시 캐시 폴백"""
+        self.client._cache = self.sample_data
+        await self.server.close()
+
+        result = await self.client.get_data()
+
+        self.assertEqual(result, self.sample_data)
+
+    async def test_put_data_success(self):
+        """PUT 성공 시 lastUpdated를 갱신하고 캐시를 업데이트해야 한다"""
+        data = {"meta": {"lastUpdated": "old_value"}, "days": []}
+
+        result = await self.client.put_data(data)
+
+        self.assertTrue(result)
+        self.assertIn("+09:00", data["meta"]["lastUpdated"])
+        self.assertEqual(self.client.get_cached(), data)
+        self.assertEqual(self.stored["record"], data)
+
+    async def test_put_data_connection_error(self):
+        """PUT 연결 실패 시 JsonBinError를 발생시켜야 한다"""
+        await self.server.close()
+
+        with self.assertRaises(JsonBinError):
+            await self.client.put_data({"meta": {}, "days": []})
+
+    async def test_session_reused_across_requests(self):
+        """여러 요청이 하나의 세션(연결 풀)을 공유해야 한다"""
+        await self.client.get_data()
+        session = self.client._session
+        await self.client.put_data({"meta": {}, "days": []})
+        await self.client.get_data()
+
+        self.assertIs(self.client._session, session)
+
+    async def test_get_data_does_not_block_event_loop(self):
+        """느린 응답을 기다리는 동안 다른 코루틴이 실행되어야 한다"""
+        release = asyncio.Event()
+
+        async def slow_get(request):
+            await release.wait()
+            return web.json_response({"record": self.sample_data})
+
+        app = web.Application()
+        app.router.add_get("/v3/b/{bin_id}/latest", slow_get)
+        slow_server = TestServer(app)
+        await slow_server.start_server()
+        self.client.base_url = str(slow_server.make_url("/v3/b"))
+
+        try:
+            fetch = asyncio.create_task(self.client.get_data())
+            await asyncio.sleep(0.05)
+            self.assertFalse(fetch.done())
+            release.set()
+            self.assertEqual(await fetch, self.sample_data)
+        finally:
+            await self.client.close()
+            await slow_server.close()
+
+    # --- 신선도 캐시 테스트 ---
+
+    def _full_gets(self):
+        return [r for r in self.requests if r[0] == "GET" and "X-JSON-Path" not in r[2]]
+
+    def _version_gets(self):
+        return [r for r in self.requests if r[0] == "GET" and "X-JSON-Path" in r[2]]
+
+    async def test_fresh_cache_served_from_memory(self):
+        """신선도 구간 안의 읽기는 요청 없이 캐시로 응답해야 한다"""
+        await self.client.get_data()
+        await self.client.get_data()
+        await self.client.get_data()
+
+        self.assertEqual(len(self.requests), 1)
+
+    async def test_stale_cache_returned_and_revalidated(self):
+        """재검증 구간에서는 캐시를 즉시 반환하고 백그라운드에서 버전만 확인해야 한다"""
+        await self.client.get_data()
+        self.client._cached_at -= self.client.fresh_ttl + 1
+
+        result = await self.client.get_data()
+        await self.client._revalidate_task
+
+        self.assertEqual(result, self.sample_data)
+        self.assertEqual(len(self._full_gets()), 1)
+        self.assertEqual(len(self._version_gets()), 1)
+        self.assertTrue(self.client._is_fresh())
+
+    async def test_version_change_triggers_full_fetch(self):
+        """원격 버전이 바뀌었으면 전체 데이터를 다시 받아야 한다"""
+        await self.client.get_data()
+        changed = {"meta": {"lastUpdated": "2026-02-11T09:00:00+09:00"}, "days": [1]}
+        self.stored = {"record": changed}
+        self.client.invalidate_cache()
+
+        result = await self.client.get_data()
+
+        self.assertEqual(result, changed)
+        self.assertEqual(len(self._full_gets()), 2)
+        self.assertEqual(len(self._version_gets()), 1)
+
+    async def test_expired_cache_fetches_before_returning(self):
+        """재검증 구간을 지나면 응답 전에 jsonbin을 확인해야 한다"""
+        await self.client.get_data()
+        changed = {"meta": {"lastUpdated": "2026-02-11T09:00:00+09:00"}, "days": [1]}
+        self.stored = {"record": changed}
+        self.client._cached_at -= self.client.stale_ttl + 1
+
+        result = await self.client.get_data()
+
+        self.assertEqual(result, changed)
+
+    async def test_background_revalidate_failure_keeps_cache(self):
+        """백그라운드 재검증이 실패해도 캐시는 유지되어야 한다"""
+        await self.client.get_data()
+        self.client._cached_at -= self.client.fresh_ttl + 1
+        self.get_status = 500
+
+        result = await self.client.get_data()
+        await self.client._revalidate_task
+
+        self.assertEqual(result, self.sample_data)
+        self.assertEqual(self.client.get_cached(), self.sample_data)
+
+    async def test_put_refreshes_cache(self):
+        """PUT 성공 후의 읽기는 요청 없이 새 데이터를 반환해야 한다"""
+        data = {"meta": {}, "days": [2]}
+        await self.client.put_data(data)
+
+        result = await self.client.get_data()
+
+        self.assertEqual(result, data)
+        self.assertEqual(self._full_gets(), [])
+
+    # --- 재시도 / 회로 차단기 테스트 ---
+
+    async def test_transient_error_retried(self):
+        """5xx는 재시도하여 성공해야 한다"""
+        statuses = [503, 502]
+
+        async def flaky_get(request):
+            self.requests.append(("GET", request.path, dict(request.headers)))
+            if statuses:
+                return web.Response(status=statuses.pop(0))
+            return web.json_response(self.stored)
+
+        await self._swap_get_handler(flaky_get)
+        try:
+            result = await self.client.get_data()
+        finally:
+            await self.client.close()
+            await self.swap_server.close()
+
+        self.assertEqual(result, self.sample_data)
+        self.assertEqual(len(self.requests), 3)
+        self.assertEqual(self.client.breaker.state, "closed")
+
+    async def test_client_error_not_retried(self):
+        """4xx(429 제외)는 재시도하지 않아야 한다"""
+        self.get_status = 401
+
+        with self.assertRaises(JsonBinError):
+            await self.client.get_data()
+
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(self.client.breaker.state, "closed")
+
+    async def test_retry_after_honored(self):
+        """429의 Retry-After 시간을 기다린 뒤 재시도해야 한다"""
+        calls = []
+
+        async def limited_get(request):
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                return web.Response(status=429, headers={"Retry-After": "0.2"})
+            return web.json_response(self.stored)
+
+        await self._swap_get_handler(limited_get)
+        try:
+            await self.client.get_data()
+        finally:
+            await self.client.close()
+            await self.swap_server.close()
+
+        self.assertEqual(len(calls), 2)
+        self.assertGreaterEqual(calls[1] - calls[0], 0.19)
+
+    async def test_long_retry_after_fails_fast(self):
+        """Retry-After가 상한보다 길면 기다리지 않고 캐시로 폴백해야 한다"""
+        self.client._cache = self.sample_data
+
+        async def limited_get(request):
+            self.requests.append(("GET", request.path, dict(request.headers)))
+            return web.Response(status=429, headers={"Retry-After": "3600"})
+
+        await self._swap_get_handler(limited_get)
+        try:
+            result = await asyncio.wait_for(self.client.get_data(), timeout=2)
+        finally:
+            await self.client.close()
+            await self.swap_server.close()
+
+        self.assertEqual(result, self.sample_data)
+        self.assertEqual(len(self.requests), 1)
+
+    async def test_breaker_opens_and_fails_fast_to_cache(self):
+        """연속 실패 후에는 요청 없이 캐시로 응답해야 한다"""
+        self.client._cache = self.sample_data
+        self.get_status = 503
+        threshold = self.client.breaker.failure_threshold
+
+        for _ in range(threshold):
+            await self.client.get_data()
+        sent = len(self.requests)
+        result = await self.client.get_data()
+
+        self.assertEqual(self.client.breaker.state, "open")
+        self.assertEqual(len(self.requests), sent)
+        self.assertEqual(result, self.sample_data)
+        self.assertEqual(self.client.status()["breaker"]["state"], "open")
+
+    async def test_breaker_open_without_cache_raises(self):
+        """회로가 열렸고 캐시가 없으면 JsonBinError를 발생시켜야 한다"""
+        for _ in range(self.client.breaker.failure_threshold):
+            self.client.breaker.record_failure()
+
+        with self.assertRaises(JsonBinError):
+            await self.client.get_data()
+        self.assertEqual(self.requests, [])
+
+    def _open_breaker_for_trial(self):
+        for _ in range(self.client.breaker.failure_threshold):
+            self.client.breaker.record_failure()
+        self.client.breaker.reset_timeout = 0
+        self.assertEqual(self.client.breaker.state, "half_open")
+
+    async def test_cancelled_trial_released(self):
+        """half_open 시험 요청이 취소되어도 다음 요청이 시험 요청이 될 수 있어야 한다"""
+        started = asyncio.Event()
+
+        async def slow_get(request):
+            started.set()
+            await asyncio.sleep(10)
+            return web.json_response(self.stored)
+
+        await self._swap_get_handler(slow_get)
+        try:
+            self._open_breaker_for_trial()
+            url = f"{self.client.base_url}/test_bin_id/latest"
+            task = asyncio.create_task(self.client._request("GET", url))
+            await asyncio.wait_for(started.wait(), timeout=2)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+            self.assertFalse(self.client.breaker.trial_in_flight)
+            self.assertTrue(self.client.breaker.allow())
+        finally:
+            await self.client.close()
+            await self.swap_server.close()
+
+    async def test_malformed_trial_response_released(self):
+        """시험 요청의 응답 본문을 해석하지 못해도 회로 차단기가 멈추지 않아야 한다"""
+        async def broken_get(request):
+            return web.Response(text="{not json", content_type="application/json")
+
+        await self._swap_get_handler(broken_get)
+        try:
+            self._open_breaker_for_trial()
+            url = f"{self.client.base_url}/test_bin_id/latest"
+            with self.assertRaises(ValueError):
+                await self.client._request("GET", url)
+
+            self.assertTrue(self.client.breaker.allow())
+        finally:
+            await self.client.close()
+            await self.swap_server.close()
+
+    async def _swap_get_handler(self, handler):
+        app = web.Application()
+        app.router.add_get("/v3/b/{bin_id}/latest", handler)
+        self.swap_server = TestServer(app)
+        await self.swap_server.start_server()
+        self.client.base_url = str(self.swap_server.make_url("/v3/b"))
+
+    # --- single-flight 테스트 ---
+
+    async def _start_slow_server(self, status=200):
+        """release 이벤트가 설정될 때까지 응답을 미루는 서버로 교체한다."""
+        self.release = asyncio.Event()
+        self.slow_gets = 0
+
+        async def slow_get(request):
+            self.slow_gets += 1
+            await self.release.wait()
+            if status != 200:
+                return web.Response(status=status)
+            return web.json_response({"record": self.sample_data})
+
+        app = web.Application()
+        app.router.add_get("/v3/b/{bin_id}/latest", slow_get)
+        self.slow_server = TestServer(app)
+        await self.slow_server.start_server()
+        self.client.base_url = str(self.slow_server.make_url("/v3/b"))
+
+    async def test_concurrent_reads_share_one_fetch(self):
+        """동시에 들어온 읽기는 하나의 요청을 공유해야 한다"""
+        await self._start_slow_server()
+        try:
+            readers = [asyncio.create_task(self.client.get_data()) for _ in range(5)]
+            await asyncio.sleep(0.05)
+            self.release.set()
+            results = await asyncio.gather(*readers)
+        finally:
+            await self.client.close()
+            await self.slow_server.close()
+
+        self.assertEqual(self.slow_gets, 1)
+        for result in results:
+            self.assertIs(result, results[0])
+
+    async def test_concurrent_reads_share_failure(self):
+        """공유 요청이 실패하면 모든 호출자가 같은 실패 처리를 받아야 한다"""
+        await self._start_slow_server(status=404)
+        try:
+            readers = [asyncio.create_task(self.client.get_data()) for _ in range(3)]
+            await asyncio.sleep(0.05)
+            self.release.set()
+            results = await asyncio.gather(*readers, return_exceptions=True)
+        finally:
+            await self.client.close()
+            await self.slow_server.close()
+
+        self.assertEqual(self.slow_gets, 1)
+        for result in results:
+            self.assertIsInstance(result, JsonBinError)
+
+    async def test_cancelled_reader_does_not_cancel_shared_fetch(self):
+        """한 호출자가 취소되어도 다른 호출자는 결과를 받아야 한다"""
+        await self._start_slow_server()
+        try:
+            first = asyncio.create_task(self.client.get_data())
+            second = asyncio.create_task(self.client.get_data())
+            await asyncio.sleep(0.05)
+            first.cancel()
+            self.release.set()
+            result = await second
+        finally:
+            await self.client.close()
+            await self.slow_server.close()
+
+        self.assertEqual(result, self.sample_data)
+        self.assertEqual(self.slow_gets, 1)
+
+    async def test_new_fetch_after_shared_fetch_completes(self):
+        """공유 요청이 끝난 뒤의 재검증은 새 요청을 보내야 한다"""
+        await self.client.get_data()
+        self.client.invalidate_cache()
+        await self.client.get_data()
+
+        self.assertIsNone(self.client._inflight)
+        self.assertEqual(len(self._version_gets()), 1)
+
+    # --- write-behind 테스트 ---
+
+    def _puts(self):
+        return [r for r in self.requests if r[0] == "PUT"]
+
+    async def _wait_flushed(self):
+        while self.client.has_pending:
+            await asyncio.sleep(0.01)
+
+    async def test_schedule_put_coalesces_burst(self):
+        """짧은 구간의 여러 변경은 마지막 데이터로 한 번만 PUT해야 한다"""
+        for i in range(3):
+            self.client.schedule_put({"meta": {}, "days": [i]})
+
+        await self._wait_flushed()
+
+        self.assertEqual(len(self._puts()), 1)
+        self.assertEqual(self.stored["record"]["days"], [2])
+
+    async def test_reads_see_pending_state(self):
+        """전송 전에도 get_data()는 예약된 데이터를 반환해야 한다"""
+        await self.client.get_data()
+        pending = {"meta": {}, "days": ["pending"]}
+        self.client.schedule_put(pending)
+
+        result = await self.client.get_data()
+
+        self.assertIs(result, pending)
+        self.assertEqual(self._puts(), [])
+
+    async def test_pending_not_overwritten_by_revalidation(self):
+        """재검증 결과가 전송 대기 중인 데이터를 덮어쓰면 안 된다"""
+        await self.client.get_data()
+        self.client.write_delay = 10
+        pending = {"meta": {}, "days": ["pending"]}
+        self.client.schedule_put(pending)
+        self.client.invalidate_cache()
+
+        result = await self.client.get_data()
+
+        self.assertIs(result, pending)
+        self.assertIs(self.client.get_cached(), pending)
+
+    async def test_failed_flush_is_retried(self):
+        """전송이 실패하면 재시도해야 한다"""
+        self.put_statuses = [500]
+        self.client.schedule_put({"meta": {}, "days": [1]})
+
+        with patch("jsonbin_client.WRITE_RETRY_MAX_DELAY", 0.02):
+            await asyncio.wait_for(self._wait_flushed(), timeout=5)
+
+        self.assertEqual(len(self._puts()), 2)
+        self.assertEqual(self.stored["record"]["days"], [1])
+
+    async def test_close_flushes_pending(self):
+        """close()는 대기 중인 변경을 전송해야 한다"""
+        self.client.write_delay = 10
+        self.client.schedule_put({"meta": {}, "days": ["closing"]})
+
+        await self.client.close()
+
+        self.assertEqual(self.stored["record"]["days"], ["closing"])
+        self.assertFalse(self.client.has_pending)
+
+    async def test_flush_loop_survives_unexpected_error(self):
+        """예기치 않은 오류가 나도 전송 태스크가 살아 있어 다시 전송해야 한다"""
+        rebase = self.client._rebase
+        calls = []
+
+        async def failing_rebase(ops):
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("예기치 않은 오류")
+            return await rebase(ops)
+
+        self.client._rebase = failing_rebase
+        with patch("jsonbin_client.WRITE_RETRY_MAX_DELAY", 0.02), \
+                self.assertLogs("jsonbin_client", level="ERROR"):
+            self.client.schedule_put({"meta": {}, "days": ["retried"]})
+            await self._wait_flushed()
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(self.stored["record"]["days"], ["retried"])
+
+    async def test_pending_snapshot_resent_after_restart(self):
+        """전송 전에 종료되면 재시작 후 스냅샷의 변경을 다시 전송해야 한다"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "snapshot.json")
+            self.put_statuses = [503] * self.client.retry_attempts
+            self.client.snapshot_path = path
+            self.client.schedule_put({"meta": {}, "days": ["unsent"]})
+            await self.client.close()
+            self.assertEqual(self.stored["record"], self.sample_data)
+
+            restarted = AsyncJsonBinClient(
+                bin_id="test_bin_id", api_key="test_api_key",
+                write_delay=0.02, snapshot_path=path,
+            )
+            restarted.base_url = self.client.base_url
+            try:
+                self.assertTrue(restarted.has_pending)
+                result = await restarted.get_data()
+                self.assertEqual(result["days"], ["unsent"])
+                await restarted.close()
+            finally:
+                await restarted.close()
+
+            self.assertEqual(self.stored["record"]["days"], ["unsent"])
+            with open(path, encoding="utf-8") as f:
+                self.assertFalse(json.load(f)["pending"])
+
+    # --- 패치 기반 저장 테스트 ---
+
+    def _trip(self, version, note="", status="planned"):
+        return {
+            "meta": {"lastUpdated": version},
+            "days": [{"dayNum": 1, "items": [
+                {"id": "d1_a", "status": status, "note": note},
+                {"id": "d1_b", "status": "planned", "note": ""},
+            ]}],
+        }
+
+    async def test_schedule_patch_applies_to_cache(self):
+        """패치는 즉시 캐시에 반영되어야 한다"""
+        self.stored = {"record": self._trip("v1")}
+        await self.client.get_data()
+
+        self.client.write_delay = 10
+        self.client.schedule_patch([
+            {"op": "replace", "path": "/days/1/items/d1_a/status", "value": "done"},
+        ])
+        result = await self.client.get_data()
+
+        self.assertEqual(result["days"][0]["items"][0]["status"], "done")
+        self.assertTrue(self.client.has_pending)
+
+    async def test_patch_rebased_on_concurrent_remote_change(self):
+        """다른 작성자가 먼저 저장했으면 그 위에 패치를 적용해야 한다 (덮어쓰기 금지)"""
+        self.stored = {"record": self._trip("v1")}
+        await self.client.get_data()
+
+        # 웹 관리자가 다른 항목을 수정하여 저장
+        self.stored = {"record": self._trip("v2", note="웹에서 수정")}
+
+        self.client.schedule_patch([
+            {"op": "replace", "path": "/days/1/items/d1_b/status", "value": "done"},
+        ])
+        await self._wait_flushed()
+
+        items = self.stored["record"]["days"][0]["items"]
+        self.assertEqual(items[0]["note"], "웹에서 수정")
+        self.assertEqual(items[1]["status"], "done")
+        # 캐시도 병합된 상태여야 한다
+        self.assertEqual(self.client.get_cached(), self.stored["record"])
+
+    async def test_patch_skips_full_get_when_version_unchanged(self):
+        """원격 버전이 그대로면 전체 GET 없이 PUT해야 한다"""
+        self.stored = {"record": self._trip("v1")}
+        await self.client.get_data()
+
+        self.client.schedule_patch([
+            {"op": "replace", "path": "/days/1/items/d1_a/note", "value": "메모"},
+        ])
+        await self._wait_flushed()
+
+        self.assertEqual(len(self._full_gets()), 1)
+        self.assertEqual(len(self._puts()), 1)
+        self.assertEqual(self.stored["record"]["days"][0]["items"][0]["note"], "메모")
+
+    async def test_patch_retries_on_version_conflict(self):
+        """받은 데이터가 전송 직전 바뀌었으면 최신 데이터로 다시 적용해야 한다"""
+        self.stored = {"record": self._trip("v1")}
+        await self.client.get_data()
+        self.stored = {"record": self._trip("v2")}
+
+        fetch_version = self.client._fetch_version
+        calls = []
+
+        async def racing_fetch_version():
+            calls.append(1)
+            if len(calls) == 2:
+                # 전체 GET 직후 다른 작성자가 저장
+                self.stored = {"record": self._trip("v3", note="경쟁 저장")}
+            return await fetch_version()
+
+        self.client._fetch_version = racing_fetch_version
+        self.client.schedule_patch([
+            {"op": "replace", "path": "/days/1/items/d1_b/status", "value": "done"},
+        ])
+        await self._wait_flushed()
+
+        items = self.stored["record"]["days"][0]["items"]
+        self.assertEqual(items[0]["note"], "경쟁 저장")
+        self.assertEqual(items[1]["status"], "done")
+
+    async def test_pending_ops_persisted_in_snapshot(self):
+        """전송 전 연산은 스냅샷에 보존되어 재시작 후 다시 적용되어야 한다"""
+        self.stored = {"record": self._trip("v1")}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "snapshot.json")
+            self.client.snapshot_path = path
+            await self.client.get_data()
+            self.client.write_delay = 10
+            op = {"op": "replace", "path": "/days/1/items/d1_a/status", "value": "done"}
+            self.client.schedule_patch([op])
+
+            with open(path, encoding="utf-8") as f:
+                saved = json.load(f)
+            self.assertEqual(saved["pendingOps"], [op])
+
+            # 그 사이 원격이 바뀌어도 재시작 후 연산이 그 위에 적용되어야 한다
+            self.stored = {"record": self._trip("v2", note="원격")}
+            restarted = AsyncJsonBinClient(
+                bin_id="test_bin_id", api_key="test_api_key", snapshot_path=path,
+            )
+            restarted.base_url = self.client.base_url
+            await restarted.close()
+
+        items = self.stored["record"]["days"][0]["items"]
+        self.assertEqual(items[0]["status"], "done")
+        self.assertEqual(items[0]["note"], "원격")
+
+    async def test_pending_add_replayed_once(self):
+        """이미 원격에 반영된 추가 연산을 재시작 후 다시 보내도 항목이 중복되지 않아야 한다"""
+        self.stored = {"record": self._trip("v1")}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "snapshot.json")
+            self.client.snapshot_path = path
+            await self.client.get_data()
+            self.client.write_delay = 10
+            self.client.schedule_patch([
+                {"op": "add", "path": "/days/1/items/-", "value": {"id": "d1_c", "status": "planned"}},
+            ])
+
+            # 전송은 됐지만 스냅샷의 대기 연산을 지우기 전에 종료된 경우
+            remote = self._trip("v2")
+            remote["days"][0]["items"].append({"id": "d1_c", "status": "done"})
+            self.stored = {"record": remote}
+            restarted = AsyncJsonBinClient(
+                bin_id="test_bin_id", api_key="test_api_key", snapshot_path=path,
+            )
+            restarted.base_url = self.client.base_url
+            await restarted.close()
+
+        items = self.stored["record"]["days"][0]["items"]
+        self.assertEqual([i["id"] for i in items], ["d1_a", "d1_b", "d1_c"])
+        self.assertEqual(items[2]["status"], "done")
+
+    async def test_close_is_idempotent(self):
+        """close()는 여러 번 호출해도 안전해야 한다"""
+        await self.client.get_data()
+        await self.client.close()
+        await self.client.close()
+        self.assertIsNone(self.client._session)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,131 @@
+"""
+overview_cache 모듈 테스트.
+"""
+
+import copy
+import os
+import sys
+import tempfile
+import unittest
+
+# src/ 디렉토리를 모듈 경로에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+os.environ.setdefault("ANTHROPIC_API_KEY", "test_key")
+
+from claude_api_handler import build_schedule_overview
+from overview_cache import OverviewCache
+
+
+SAMPLE_DATA = {
+    "meta": {"lastUpdated": "2026-02-19T09:00:00+09:00"},
+    "days": [
+        {"dayNum": 1, "date": "2026-02-19", "dow": "목", "title": "출발", "items": [
+            {"id": "d1_move", "time": "09:00~11:00", "title": "KTX 이동", "status": "done"},
+            {"id": "d1_lunch", "time": "점심", "title": "점심", "status": "planned",
+             "options": [{"name": "향화정"}, {"name": "온목당"}]},
+        ]},
+        {"dayNum": 2, "date": "2026-02-20", "dow": "금", "title": "시내", "items": [
+            {"id": "d2_dinner", "time": "18:00~", "title": "저녁", "status": "skipped", "chosen": "교리김밥"},
+        ]},
+        {"dayNum": 3, "date": "2026-02-21", "dow": "토", "title": "", "items": []},
+    ],
+}
+
+
+def _updated(data, version, title):
+    """버전과 2일차 저녁 제목을 바꾼 사본"""
+    data = copy.deepcopy(data)
+    data["meta"]["lastUpdated"] = version
+    data["days"][1]["items"][0]["title"] = title
+    return data
+
+
+class TestOverviewCache(unittest.TestCase):
+    """버전별 캐시와 일차 단위 증분 갱신 테스트"""
+
+    def test_same_text_as_full_build(self):
+        cache = OverviewCache()
+        text = cache.get(SAMPLE_DATA)
+
+        self.assertEqual(text, build_schedule_overview(SAMPLE_DATA))
+        self.assertIn("[v] d1_move", text)
+        self.assertIn("(후보: 향화정, 온목당)", text)
+        self.assertIn("[x] d2_dinner | 18:00~ | 저녁 [확정: 교리김밥]", text)
+        self.assertTrue(text.endswith("### Day 3 (2026-02-21, 토) -"))
+
+    def test_version_hit(self):
+        """버전이 같으면 일차를 다시 보지 않는다"""
+        cache = OverviewCache()
+        first = cache.get(SAMPLE_DATA)
+        self.assertIs(cache.get(copy.deepcopy(SAMPLE_DATA)), first)
+        self.assertEqual((cache.hits, cache.rebuilt_days), (1, 3))
+
+    def test_rebuilds_changed_day_only(self):
+        cache = OverviewCache()
+        cache.get(SAMPLE_DATA)
+
+        data = _updated(SAMPLE_DATA, "2026-02-19T10:00:00+09:00", "늦은 저녁")
+        text = cache.get(data)
+
+        self.assertEqual(text, build_schedule_overview(data))
+        self.assertIn("늦은 저녁", text)
+        self.assertEqual(cache.rebuilt_days, 3 + 1)
+
+    def test_without_version(self):
+        """버전이 없으면 매번 일차 키를 비교해 바뀐 내용을 반영한다"""
+        cache = OverviewCache()
+        data = copy.deepcopy(SAMPLE_DATA)
+        del data["meta"]["lastUpdated"]
+        cache.get(data)
+
+        data["days"][0]["items"][1]["chosen"] = "향화정"
+        text = cache.get(data)
+
+        self.assertIn("[확정: 향화정]", text)
+        self.assertEqual((cache.hits, cache.rebuilt_days), (0, 3 + 1))
+
+
+class TestSharedOverviewCache(unittest.TestCase):
+    """프로세스 간 공유 파일 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "overview_cache.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_shared_between_instances(self):
+        bot, web = OverviewCache(self.path), OverviewCache(self.path)
+        text = bot.get(SAMPLE_DATA)
+
+        self.assertEqual(web.get(SAMPLE_DATA), text)
+        self.assertEqual((web.shared_hits, web.rebuilt_days), (1, 0))
+
+        # 다른 프로세스가 만든 새 버전도 파일에서 가져온다
+        data = _updated(SAMPLE_DATA, "2026-02-19T10:00:00+09:00", "늦은 저녁")
+        web.get(data)
+        self.assertEqual(bot.get(data), build_schedule_overview(data))
+        self.assertEqual((bot.shared_hits, bot.rebuilt_days), (1, 3))
+
+    def test_incremental_from_shared_days(self):
+        """파일의 버전이 다르면 파일의 일차 텍스트를 바탕으로 바뀐 일차만 만든다"""
+        OverviewCache(self.path).get(SAMPLE_DATA)
+
+        cache = OverviewCache(self.path)
+        data = _updated(SAMPLE_DATA, "2026-02-19T10:00:00+09:00", "늦은 저녁")
+        self.assertEqual(cache.get(data), build_schedule_overview(data))
+        self.assertEqual((cache.shared_hits, cache.rebuilt_days), (0, 1))
+
+    def test_corrupt_file(self):
+        with open(self.path, "w") as f:
+            f.write("{\"version\": ")
+
+        cache = OverviewCache(self.path)
+        self.assertEqual(cache.get(SAMPLE_DATA), build_schedule_overview(SAMPLE_DATA))
+        self.assertEqual(OverviewCache(self.path).get(SAMPLE_DATA), build_schedule_overview(SAMPLE_DATA))
+
+
+if __name__ == "__main__":
+    unittest.main()
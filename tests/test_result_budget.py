@@ -0,0 +1,129 @@
+"""
+result_budget 모듈과 읽기 도구의 필드 선택/페이지/바이트 예산 테스트.
+"""
+
+import os
+import sys
+import unittest
+
+# src/ 디렉토리를 모듈 경로에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+import result_budget
+from result_budget import json_size, paginate, project
+from tool_executor import ExecutionContext, execute_tool
+
+
+def _option(k):
+    return {"name": f"식당 {k}", "menu": "한정식", "dad": "good", "hiro": "caution",
+            "menuDetail": [{"item": f"메뉴 {m}", "price": 10000 + m} for m in range(10)],
+            "mapUrl": f"https://map.naver.com/p/search/식당{k}"}
+
+
+SAMPLE_DATA = {
+    "meta": {},
+    "days": [
+        {"dayNum": 1, "date": "2026-02-19", "title": "출발", "items": [
+            {"id": f"d1_item{i}", "title": f"장소 {i}", "cat": "meal", "status": "planned",
+             "note": "메모", "options": [_option(k) for k in range(3)]}
+            for i in range(30)
+        ] + [
+            {"id": "d1_big", "title": "큰 식당 모음", "cat": "meal", "status": "planned",
+             "guide": {"subtitle": "가이드", "mustDo": ["야경"] * 5},
+             "options": [_option(k) for k in range(40)]},
+        ]},
+    ],
+}
+
+
+class TestPaginate(unittest.TestCase):
+    """paginate / project 테스트"""
+
+    def test_limit_and_cursor(self):
+        entries = list(range(7))
+        shape = lambda n: {"n": n}  # noqa: E731
+
+        page, cursor = paginate(entries, shape, limit=3)
+        self.assertEqual([e["n"] for e in page], [0, 1, 2])
+        page, cursor = paginate(entries, shape, cursor, limit=3)
+        self.assertEqual([e["n"] for e in page], [3, 4, 5])
+        page, cursor = paginate(entries, shape, cursor, limit=3)
+        self.assertEqual(([e["n"] for e in page], cursor), ([6], None))
+
+    def test_byte_budget(self):
+        """예산을 넘기 전에 끊고, 첫 원소는 예산을 넘어도 담아야 한다"""
+        entries = ["가" * 100] * 10
+        shape = lambda text: {"text": text}  # noqa: E731
+        one = json_size(shape(entries[0])) + 1
+
+        page, cursor = paginate(entries, shape, limit=10, budget=one * 3 + 1)
+        self.assertEqual((len(page), cursor), (3, "3"))
+        page, cursor = paginate(entries, shape, limit=10, budget=1)
+        self.assertEqual((len(page), cursor), (1, "1"))
+
+    def test_bad_cursor(self):
+        with self.assertRaises(ValueError):
+            paginate([1], lambda n: {"n": n}, cursor="abc")
+
+    def test_project(self):
+        source = {"a": 1, "b": 2}
+        self.assertEqual(project(source, ["b", "c"], {"c": ""}), {"b": 2, "c": ""})
+        self.assertEqual(project(source, ["*"]), source)
+
+
+class TestReadTools(unittest.TestCase):
+    """읽기 도구 결과 크기 테스트"""
+
+    def setUp(self):
+        self.ctx = ExecutionContext(SAMPLE_DATA)
+
+    def test_search_items_pages(self):
+        """다음 페이지를 이어 받으면 전체 결과와 같아야 한다"""
+        first = execute_tool(self.ctx, "search_items", {"cat": "meal", "limit": 25})
+        self.assertEqual(first["count"], 31)
+        self.assertEqual(len(first["items"]), 25)
+
+        rest = execute_tool(self.ctx, "search_items", {"cat": "meal", "cursor": first["next_cursor"]})
+        self.assertNotIn("next_cursor", rest)
+        ids = [i["id"] for i in first["items"] + rest["items"]]
+        self.assertEqual(ids, [i["id"] for i in SAMPLE_DATA["days"][0]["items"]])
+
+    def test_fields_projection(self):
+        result = execute_tool(self.ctx, "search_items", {"cat": "meal", "fields": ["note"], "limit": 1})
+        self.assertEqual(result["items"], [{"dayNum": 1, "id": "d1_item0", "note": "메모"}])
+
+        schedule = execute_tool(self.ctx, "get_schedule", {"day_num": 1, "fields": ["title"]})
+        self.assertEqual(schedule["items"][0], {"id": "d1_item0", "title": "장소 0"})
+        self.assertEqual(schedule["count"], 31)
+
+    def test_item_detail_compact_by_default(self):
+        """기본 상세 조회는 큰 필드를 빼고 omitted로 알려야 한다"""
+        result = execute_tool(self.ctx, "get_item_detail", {"item_id": "d1_item0"})
+
+        self.assertNotIn("menuDetail", result["options"][0])
+        self.assertEqual(result["options"][0]["dad"], "good")
+        self.assertIn("options.menuDetail", result["omitted"])
+
+        full = execute_tool(self.ctx, "get_item_detail", {
+            "item_id": "d1_item0", "fields": ["options"], "option_fields": ["*"]})
+        self.assertEqual(full["options"], SAMPLE_DATA["days"][0]["items"][0]["options"])
+        self.assertIn("title", full["omitted"])
+
+    def test_item_detail_respects_budget(self):
+        """옵션이 예산을 넘으면 잘라서 next_cursor로 이어 받아야 한다"""
+        inp = {"item_id": "d1_big", "fields": ["guide", "options"], "option_fields": ["*"]}
+        result = execute_tool(self.ctx, "get_item_detail", inp)
+
+        self.assertLessEqual(json_size(result), result_budget.RESULT_BYTE_BUDGET + 200)
+        self.assertEqual(result["options_total"], 40)
+        self.assertIn("guide", result)
+
+        names = [o["name"] for o in result["options"]]
+        while "next_cursor" in result:
+            result = execute_tool(self.ctx, "get_item_detail", dict(inp, cursor=result["next_cursor"]))
+            names += [o["name"] for o in result["options"]]
+        self.assertEqual(names, [f"식당 {k}" for k in range(40)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+search_index 모듈 테스트.
+
+정규화, 초성/자모 분해, 점수와 n-gram 인덱스의 검색/갱신을 검증한다.
+"""
+
+import os
+import sys
+import unittest
+
+# src/ 디렉토리를 모듈 경로에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from search_index import (SCORE_CHOSEONG, SCORE_PREFIX, SCORE_SUBSTRING, SearchIndex, choseong, jamo,
+                          match_score, normalize)
+
+
+class TestNormalize(unittest.TestCase):
+    """정규화/자모 분해 테스트"""
+
+    def test_normalize_strips_spacing_and_case(self):
+        self.assertEqual(normalize("복길 경주본점"), "복길경주본점")
+        self.assertEqual(normalize("Cafe  Ondo!"), "cafeondo")
+
+    def test_choseong_and_jamo(self):
+        self.assertEqual(choseong("복길a"), "ㅂㄱa")
+        self.assertEqual(jamo("각"), "ㄱㅏㄱ")
+
+
+class TestMatchScore(unittest.TestCase):
+    """일치 종류별 점수 테스트"""
+
+    def test_ranking_order(self):
+        """완전 > 접두 > 부분 > 초성 > 오타 순이어야 한다"""
+        exact = match_score("향화정", "향화정")
+        prefix = match_score("향화", "향화정 본점")
+        substring = match_score("화정", "향화정")
+        initials = match_score("ㅎㅎㅈ", "향화정")
+        fuzzy = match_score("향화졍", "향화정")
+
+        self.assertGreater(exact, prefix)
+        self.assertGreater(prefix, substring)
+        self.assertGreater(substring, initials)
+        self.assertGreater(initials, fuzzy)
+        self.assertGreater(fuzzy, 0)
+
+    def test_no_match(self):
+        self.assertEqual(match_score("교동", "향화정"), 0)
+        self.assertEqual(match_score("ㄱㄷ", "향화정"), 0)
+        self.assertEqual(match_score("", "향화정"), 0)
+
+    def test_short_query_needs_prefix(self):
+        """한 글자 질의는 부분 일치로 보지 않는다"""
+        self.assertEqual(match_score("a", "Cafe Latte"), 0)
+        self.assertEqual(match_score("a", "Apple Store"), SCORE_PREFIX)
+        self.assertEqual(match_score("af", "Cafe Latte"), SCORE_SUBSTRING)
+
+    def test_choseong_at_word_start_only(self):
+        """초성 질의는 맨 앞이나 단어 시작에서만 일치한다"""
+        self.assertEqual(match_score("ㅂㄱ", "홈플러스 장보기"), 0)
+        self.assertEqual(match_score("ㅈㅂ", "홈플러스 장보기"), SCORE_CHOSEONG)
+        self.assertEqual(match_score("ㄱㅈ", "복길 경주본점"), SCORE_CHOSEONG)
+
+
+class TestSearchIndex(unittest.TestCase):
+    """SearchIndex 검색/갱신 테스트"""
+
+    def setUp(self):
+        self.index = SearchIndex()
+        self.index.add("a", [("title", "점심"), ("name", "복길 경주본점"), ("loc", "황리단길")])
+        self.index.add("b", [("title", "저녁"), ("name", "향화정"), ("loc", "황리단길")])
+        self.index.add("c", [("title", "황리단길 산책")])
+
+    def _keys(self, query):
+        return [key for key, _, _ in self.index.search(query)]
+
+    def test_spacing_choseong_and_typo(self):
+        self.assertEqual(self._keys("복길경주본점"), ["a"])
+        self.assertEqual(self._keys("ㅂㄱ"), ["a"])
+        self.assertEqual(self._keys("향화졍"), ["b"])
+
+    def test_title_outranks_loc(self):
+        """제목 일치가 위치 일치보다 앞서고, 동점은 추가한 순서여야 한다"""
+        self.assertEqual(self._keys("황리단길"), ["c", "a", "b"])
+
+    def test_matched_text(self):
+        _, _, matched = self.index.search("ㅎㅎㅈ")[0]
+        self.assertEqual(matched, "향화정")
+
+    def test_incremental_update(self):
+        self.index.add("b", [("title", "저녁"), ("name", "교동쌈밥")])
+        self.assertEqual(self._keys("향화정"), [])
+        self.assertEqual(self._keys("교동"), ["b"])
+
+        self.index.remove("a")
+        self.assertEqual(self._keys("복길"), [])
+        self.assertEqual(len(self.index), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
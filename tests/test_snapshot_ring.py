@@ -0,0 +1,164 @@
+"""
+snapshot_ring 모듈 테스트.
+"""
+
+import copy
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# src/ 디렉토리를 모듈 경로에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+import trip_stats
+from snapshot_ring import SnapshotRing
+from storage import LocalTripStorage, StorageError
+from trip_patch import item_path
+
+
+def _make_data(n):
+    """n번째 변경 상태의 여행 데이터"""
+    return {
+        "meta": {"lastUpdated": f"2026-02-10T09:{n:02d}:00+09:00", "updateNote": f"변경 {n}"},
+        "days": [
+            {"dayNum": 1, "items": [
+                {"id": "d1_lunch", "title": "점심", "note": f"메모 {n}", "options": []},
+            ] + [{"id": f"d1_extra{i}", "title": "추가"} for i in range(n % 3)]},
+        ],
+    }
+
+
+class TestSnapshotRing(unittest.TestCase):
+    """SnapshotRing 테스트"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "history.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_record_and_get_every_version(self):
+        """키프레임 사이의 어느 버전이든 정확히 복원해야 한다"""
+        ring = SnapshotRing(self.path, capacity=50, keyframe_interval=4)
+        for n in range(1, 12):
+            self.assertEqual(ring.record(_make_data(n)), n)
+
+        for n in range(1, 12):
+            self.assertEqual(ring.get(n), _make_data(n))
+
+    def test_deltas_are_compact(self):
+        """키프레임이 아닌 버전은 델타만 저장해야 한다"""
+        ring = SnapshotRing(self.path, keyframe_interval=10)
+        ring.record(_make_data(1))
+        ring.record(_make_data(2))
+
+        self.assertIn("base", ring._entries[0])
+        self.assertNotIn("base", ring._entries[1])
+
+    def test_unchanged_not_recorded(self):
+        """직전 버전과 같으면 기록하지 않아야 한다"""
+        ring = SnapshotRing(self.path)
+        ring.record(_make_data(1))
+
+        self.assertIsNone(ring.record(_make_data(1)))
+        self.assertEqual(ring.latest_version, 1)
+
+    def test_capacity_bound(self):
+        """capacity를 넘으면 오래된 버전부터 버리고 남은 버전은 복원되어야 한다"""
+        ring = SnapshotRing(self.path, capacity=5, keyframe_interval=3)
+        for n in range(1, 30):
+            ring.record(_make_data(n))
+
+        versions = [v["v"] for v in ring.versions()]
+        self.assertLessEqual(len(versions), 10)
+        self.assertEqual(versions[0], 29)
+        with self.assertRaises(KeyError):
+            ring.get(1)
+        for v in versions:
+            self.assertEqual(ring.get(v), _make_data(v))
+
+    def test_reload_from_file(self):
+        """파일에서 다시 읽어도 같은 버전을 복원해야 한다"""
+        ring = SnapshotRing(self.path, keyframe_interval=4)
+        for n in range(1, 8):
+            ring.record(_make_data(n))
+
+        reloaded = SnapshotRing(self.path, keyframe_interval=4)
+
+        self.assertEqual(reloaded.latest_version, 7)
+        self.assertEqual(reloaded.get(6), _make_data(6))
+
+    def test_shared_file_between_processes(self):
+        """같은 파일을 쓰는 다른 인스턴스의 기록을 이어받아야 한다"""
+        bot_ring = SnapshotRing(self.path)
+        web_ring = SnapshotRing(self.path)
+
+        bot_ring.record(_make_data(1))
+        self.assertEqual(web_ring.record(_make_data(2)), 2)
+        self.assertIsNone(bot_ring.record(_make_data(2)))
+
+        self.assertEqual(bot_ring.get(1), _make_data(1))
+
+    def test_truncated_last_line_ignored(self):
+        """기록 도중 잘린 마지막 줄은 무시해야 한다"""
+        ring = SnapshotRing(self.path)
+        ring.record(_make_data(1))
+        ring.record(_make_data(2))
+        with open(self.path, "ab") as f:
+            f.write(b'{"v": 3, "ops": [')
+
+        reloaded = SnapshotRing(self.path)
+
+        self.assertEqual(reloaded.latest_version, 2)
+
+    def test_restore_marks_note(self):
+        """restore는 되돌림 표시를 남긴 사본을 반환해야 한다"""
+        ring = SnapshotRing(self.path)
+        ring.record(_make_data(1))
+
+        data = ring.restore(1)
+        data["days"].clear()
+
+        self.assertEqual(ring.restore(1)["meta"]["updateNote"], "1번 버전으로 되돌림")
+        self.assertEqual(ring.get(1), _make_data(1))
+
+
+class TestStorageRollback(unittest.IsolatedAsyncioTestCase):
+    """저장소를 통한 rollback 테스트"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.storage = LocalTripStorage(
+            os.path.join(self.tmpdir, "trip.json"),
+            history=SnapshotRing(os.path.join(self.tmpdir, "history.jsonl")),
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    async def test_rollback_restores_old_state(self):
+        """rollback은 이전 버전 데이터를 저장소에 다시 써야 한다"""
+        self.storage.schedule_put(copy.deepcopy(_make_data(1)))
+        self.storage.schedule_patch([
+            {"op": "replace", "path": item_path(1, "d1_lunch", "title"), "value": "잘못된 변경"},
+        ])
+        self.assertEqual(self.storage.history.latest_version, 2)
+
+        self.storage.rollback(1)
+
+        data = await self.storage.get_data()
+        # 저장소는 기록할 때 진행 통계를 함께 맞춘다
+        self.assertEqual(data["days"], trip_stats.refresh_stats(_make_data(1))["days"])
+        self.assertEqual(self.storage.history.latest_version, 3)
+
+    async def test_rollback_unknown_version(self):
+        """보관 중이 아닌 버전은 StorageError"""
+        with self.assertRaises(StorageError):
+            self.storage.rollback(99)
+
+
+if __name__ == "__main__":
+    unittest.main()
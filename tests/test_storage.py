@@ -0,0 +1,243 @@
+"""
+storage 모듈 테스트.
+
+로컬 파일 저장소는 임시 디렉토리에서, jsonbin 복제는 로컬 aiohttp 서버를
+jsonbin 대역으로 사용하여 검증한다.
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+# src/ 디렉토리를 모듈 경로에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from jsonbin_client import AsyncJsonBinClient
+from storage import LocalTripStorage, StorageError, UndoLog, create_storage
+from trip_patch import item_path
+
+
+SAMPLE_DATA = {
+    "meta": {"lastUpdated": "2026-02-10T09:00:00+09:00"},
+    "days": [
+        {"dayNum": 1, "date": "2026-02-19", "items": [
+            {"id": "d1_lunch", "title": "점심", "status": "planned", "options": []},
+        ]},
+    ],
+}
+
+
+class TestLocalTripStorage(unittest.IsolatedAsyncioTestCase):
+    """LocalTripStorage 테스트"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "trip.json")
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(SAMPLE_DATA, f, ensure_ascii=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    async def test_get_data_reads_file(self):
+        """파일 내용을 그대로 반환해야 한다"""
+        storage = LocalTripStorage(self.path)
+
+        self.assertEqual(await storage.get_data(), SAMPLE_DATA)
+
+    async def test_missing_file_without_replica(self):
+        """파일도 복제본도 없으면 StorageError를 발생시켜야 한다"""
+        storage = LocalTripStorage(os.path.join(self.tmpdir, "none.json"))
+
+        with self.assertRaises(StorageError):
+            await storage.get_data()
+
+    async def test_schedule_patch_writes_file(self):
+        """패치는 즉시 파일에 반영되고 lastUpdated를 갱신해야 한다"""
+        storage = LocalTripStorage(self.path)
+        await storage.get_data()
+
+        storage.schedule_patch([
+            {"op": "replace", "path": item_path(1, "d1_lunch", "status"), "value": "done"},
+        ])
+
+        with open(self.path, encoding="utf-8") as f:
+            saved = json.load(f)
+        self.assertEqual(saved["days"][0]["items"][0]["status"], "done")
+        self.assertNotEqual(saved["meta"]["lastUpdated"], SAMPLE_DATA["meta"]["lastUpdated"])
+        self.assertEqual(storage.get_cached(), saved)
+
+    async def test_sees_other_process_writes(self):
+        """다른 프로세스가 파일을 교체하면 다음 읽기에서 반영해야 한다"""
+        storage = LocalTripStorage(self.path)
+        other = LocalTripStorage(self.path)
+        await storage.get_data()
+
+        other.schedule_patch([
+            {"op": "replace", "path": item_path(1, "d1_lunch", "status"), "value": "done"},
+        ])
+
+        data = await storage.get_data()
+        self.assertEqual(data["days"][0]["items"][0]["status"], "done")
+
+    async def test_patch_applies_on_latest_file(self):
+        """패치는 메모리 사본이 아니라 최신 파일 내용 위에 적용되어야 한다"""
+        storage = LocalTripStorage(self.path)
+        other = LocalTripStorage(self.path)
+        await storage.get_data()
+
+        other.schedule_patch([
+            {"op": "replace", "path": item_path(1, "d1_lunch", "note"), "value": "웹에서 수정"},
+        ])
+        storage.schedule_patch([
+            {"op": "replace", "path": item_path(1, "d1_lunch", "status"), "value": "done"},
+        ])
+
+        item = (await other.get_data())["days"][0]["items"][0]
+        self.assertEqual(item["note"], "웹에서 수정")
+        self.assertEqual(item["status"], "done")
+
+    async def test_status(self):
+        """status()는 저장소 종류와 데이터 버전을 보고해야 한다"""
+        storage = LocalTripStorage(self.path)
+
+        status = storage.status()
+
+        self.assertEqual(status["backend"], "local")
+        self.assertEqual(status["version"], SAMPLE_DATA["meta"]["lastUpdated"])
+        self.assertIsNone(status["replica"])
+
+
+class TestUndoLog(unittest.IsolatedAsyncioTestCase):
+    """UndoLog 테스트 (로컬 파일 저장소)"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "trip.json")
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(SAMPLE_DATA, f, ensure_ascii=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    async def test_undo_reverts_last_turn(self):
+        """마지막으로 기록한 턴의 역연산을 저장소에 적용해야 한다"""
+        storage = LocalTripStorage(self.path)
+        await storage.get_data()
+        undo_log = UndoLog()
+        path = item_path(1, "d1_lunch", "status")
+        for status, before in (("done", "planned"), ("skipped", "done")):
+            ops = [{"op": "add", "path": path, "value": status},
+                   {"op": "add", "path": "/meta/updateNote", "value": f"점심 {status}"}]
+            storage.schedule_patch(ops)
+            undo_log.push(ops, [{"op": "add", "path": path, "value": before}])
+
+        self.assertEqual(undo_log.undo(storage), "점심 skipped")
+        self.assertEqual(storage.get_cached()["days"][0]["items"][0]["status"], "done")
+        self.assertEqual(storage.get_cached()["meta"]["updateNote"], "되돌림: 점심 skipped")
+
+        self.assertEqual(undo_log.undo(storage), "점심 done")
+        self.assertEqual(storage.get_cached()["days"][0]["items"][0]["status"], "planned")
+        self.assertIsNone(undo_log.undo(storage))
+
+
+class TestLocalStorageReplica(unittest.IsolatedAsyncioTestCase):
+    """jsonbin 복제 테스트 (로컬 aiohttp 서버를 jsonbin 대역으로 사용)"""
+
+    async def asyncSetUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "trip.json")
+        self.stored = {"record": json.loads(json.dumps(SAMPLE_DATA))}
+        self.puts = 0
+
+        async def handle_get(request):
+            if request.headers.get("X-JSON-Path") == "$.meta.lastUpdated":
+                return web.json_response([self.stored["record"]["meta"]["lastUpdated"]])
+            return web.json_response(self.stored)
+
+        async def handle_put(request):
+            self.puts += 1
+            self.stored = {"record": await request.json()}
+            return web.json_response(self.stored)
+
+        app = web.Application()
+        app.router.add_get("/v3/b/{bin_id}/latest", handle_get)
+        app.router.add_put("/v3/b/{bin_id}", handle_put)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+        replica = AsyncJsonBinClient(
+            bin_id="test_bin_id", api_key="test_api_key", write_delay=0.02,
+        )
+        replica.base_url = str(self.server.make_url("/v3/b"))
+        self.storage = LocalTripStorage(self.path, replica=replica)
+
+    async def asyncTearDown(self):
+        await self.storage.close()
+        await self.server.close()
+        shutil.rmtree(self.tmpdir)
+
+    async def test_seeds_from_replica(self):
+        """로컬 파일이 없으면 복제본 데이터로 초기화해야 한다"""
+        data = await self.storage.get_data()
+
+        self.assertEqual(data, SAMPLE_DATA)
+        self.assertTrue(os.path.exists(self.path))
+
+    async def test_patch_replicated(self):
+        """로컬에 저장한 패치는 write-behind로 jsonbin에도 반영되어야 한다"""
+        await self.storage.get_data()
+
+        self.storage.schedule_patch([
+            {"op": "replace", "path": item_path(1, "d1_lunch", "status"), "value": "done"},
+        ])
+        self.assertEqual(self.puts, 0)
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(self.puts, 1)
+        self.assertEqual(self.stored["record"]["days"][0]["items"][0]["status"], "done")
+        self.assertIsNotNone(self.storage.status()["replica"])
+
+
+class TestCreateStorage(unittest.TestCase):
+    """create_storage 테스트"""
+
+    def test_default_is_jsonbin(self):
+        """기본 저장소는 jsonbin 클라이언트여야 한다"""
+        storage = create_storage(bin_id="b", api_key="k")
+
+        self.assertIsInstance(storage, AsyncJsonBinClient)
+
+    def test_local_with_replica(self):
+        """local + jsonbin 복제 설정"""
+        path = os.path.join(tempfile.mkdtemp(), "trip.json")
+        storage = create_storage("local", local_path=path, replica="jsonbin", bin_id="b", api_key="k")
+
+        self.assertIsInstance(storage, LocalTripStorage)
+        self.assertIsInstance(storage.replica, AsyncJsonBinClient)
+
+    def test_snapshot_per_process(self):
+        """봇/웹 API는 같은 설정 경로에서도 서로 다른 스냅샷 파일을 써야 한다"""
+        path = os.path.join(tempfile.mkdtemp(), "jsonbin_snapshot.json")
+        bot = create_storage(bin_id="b", api_key="k", snapshot_path=path, role="bot")
+        web = create_storage("local", local_path=os.path.join(os.path.dirname(path), "trip.json"),
+                             replica="jsonbin", bin_id="b", api_key="k", snapshot_path=path, role="web")
+
+        self.assertEqual(os.path.basename(bot.snapshot_path), "jsonbin_snapshot.bot.json")
+        self.assertEqual(os.path.basename(web.replica.snapshot_path), "jsonbin_snapshot.web.json")
+
+    def test_unknown_backend(self):
+        """알 수 없는 저장소 종류는 ValueError"""
+        with self.assertRaises(ValueError):
+            create_storage("s3")
+
+
+if __name__ == "__main__":
+    unittest.main()
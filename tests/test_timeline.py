@@ -0,0 +1,178 @@
+"""
+timeline 모듈과 get_now_next 도구 테스트.
+"""
+
+import os
+import sys
+import unittest
+
+# src/ 디렉토리를 모듈 경로에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from timeline import Span, Timeline, format_minutes, parse_time
+from tool_executor import ExecutionContext, execute_tool
+
+
+def _hm(text):
+    h, m = text.split(":")
+    return int(h) * 60 + int(m)
+
+
+SAMPLE_DATA = {
+    "meta": {},
+    "days": [
+        {"dayNum": 1, "date": "2026-02-19", "items": [
+            {"id": "d1_move", "title": "KTX 이동", "time": "09:00~11:00", "status": "done"},
+            {"id": "d1_checkin", "title": "체크인", "time": "도착 후", "status": "planned"},
+            {"id": "d1_lunch", "title": "점심", "time": "점심", "status": "planned"},
+            {"id": "d1_bulguksa", "title": "불국사", "time": "14:00~16:00", "status": "planned"},
+            {"id": "d1_dinner", "title": "저녁", "time": "저녁", "status": "skipped"},
+            {"id": "d1_night", "title": "동궁과 월지 야경", "time": "저녁 식사 후", "status": "planned"},
+        ]},
+        {"dayNum": 2, "date": "2026-02-20", "items": [
+            {"id": "d2_breakfast", "title": "조식", "time": "08:00~09:00", "status": "planned"},
+        ]},
+    ],
+}
+
+
+class TestParseTime(unittest.TestCase):
+    """time 문자열 파싱 테스트"""
+
+    def test_exact_range(self):
+        self.assertEqual(parse_time("15:00~17:00"), Span(_hm("15:00"), _hm("17:00"), False))
+        self.assertEqual(parse_time("오후 2시~4시"), Span(_hm("14:00"), _hm("16:00"), False))
+        self.assertEqual(parse_time("22:00~01:00"), Span(_hm("22:00"), _hm("25:00"), False))
+
+    def test_open_end_and_single_clock(self):
+        self.assertEqual(parse_time("09:00~"), Span(_hm("09:00"), _hm("10:00"), True))
+        self.assertEqual(parse_time("오후 3시 반"), Span(_hm("15:30"), _hm("16:30"), True))
+
+    def test_fuzzy_slots(self):
+        self.assertEqual(parse_time("점심"), Span(_hm("11:30"), _hm("13:30"), True))
+        self.assertEqual(parse_time("오전~점심"), Span(_hm("09:00"), _hm("13:30"), True))
+        self.assertEqual(parse_time("오후 (선택)"), Span(_hm("13:30"), _hm("17:30"), True))
+        self.assertEqual(parse_time("저녁 식사 후"), Span(_hm("19:30"), _hm("21:30"), True))
+        self.assertEqual(parse_time("점심 전").end, _hm("11:30"))
+
+    def test_unparseable(self):
+        for text in ("도착 후", "미정", "", None):
+            self.assertIsNone(parse_time(text), text)
+
+    def test_duration_is_not_clock(self):
+        """길이("2시간")나 오전/오후 없는 "N시"는 시각으로 읽지 않는다"""
+        for text in ("2시간", "1시간 30분", "약 2시간 소요", "2시~3시"):
+            self.assertIsNone(parse_time(text), text)
+        self.assertEqual(parse_time("10:00~ 2시간"), Span(_hm("10:00"), _hm("11:00"), True))
+        self.assertEqual(parse_time("오후 자유 시간"), Span(_hm("13:30"), _hm("17:30"), True))
+        self.assertEqual(parse_time("1시간 뒤 오후 4시"), Span(_hm("16:00"), _hm("17:00"), True))
+
+    def test_format_minutes(self):
+        self.assertEqual(format_minutes(_hm("09:05")), "09:05")
+        self.assertEqual(format_minutes(_hm("25:00")), "01:00")
+
+
+class TestTimeline(unittest.TestCase):
+    """Timeline 테스트"""
+
+    def setUp(self):
+        self.timeline = Timeline(SAMPLE_DATA["days"][0]["items"])
+
+    def test_unknown_time_between_neighbours(self):
+        """시간을 읽을 수 없는 항목은 앞뒤 항목 사이에 놓여야 한다"""
+        checkin = next(e for e in self.timeline.entries if e.item_id == "d1_checkin")
+        self.assertTrue(checkin.approx)
+        self.assertGreaterEqual(checkin.start, _hm("09:00"))
+        self.assertLessEqual(checkin.end, _hm("11:30"))
+
+    def test_sorted_by_start(self):
+        starts = [e.start for e in self.timeline.entries]
+        self.assertEqual(starts, sorted(starts))
+        self.assertEqual(len(self.timeline), 6)
+
+    def test_at(self):
+        current, pos = self.timeline.at(_hm("12:00"))
+        self.assertEqual([e.item_id for e in current], ["d1_lunch"])
+        self.assertEqual(self.timeline.entries[pos].item_id, "d1_bulguksa")
+
+        current, pos = self.timeline.at(_hm("23:30"))
+        self.assertEqual((current, pos), ([], 6))
+
+        # 긴 항목은 뒤에 시작한 짧은 항목이 끝난 뒤에도 진행 중이어야 한다
+        timeline = Timeline([{"id": "a", "time": "09:00~18:00"}, {"id": "b", "time": "10:00~11:00"}])
+        current, _ = timeline.at(_hm("12:00"))
+        self.assertEqual([e.item_id for e in current], ["a"])
+
+
+class TestTimelineIndex(unittest.TestCase):
+    """TripIndex 타임라인 갱신 테스트"""
+
+    def test_rebuilt_after_time_change(self):
+        ctx = ExecutionContext(SAMPLE_DATA)
+        day = ctx.find_day(day_num=1)
+        before = ctx.index.timeline(day)
+        self.assertIs(ctx.index.timeline(day), before)
+
+        execute_tool(ctx, "update_item", {"item_id": "d1_bulguksa", "time": "16:00~17:00"})
+        after = ctx.index.timeline(ctx.find_day(day_num=1))
+
+        self.assertIsNot(after, before)
+        entry = next(e for e in after.entries if e.item_id == "d1_bulguksa")
+        self.assertEqual(entry.start, _hm("16:00"))
+        self.assertIs(ctx.index.timeline(ctx.find_day(day_num=2)),
+                      ctx.index.timeline(ctx.find_day(day_num=2)))
+
+    def test_move_updates_both_days(self):
+        ctx = ExecutionContext(SAMPLE_DATA)
+        day2 = ctx.index.timeline(ctx.find_day(day_num=2))
+        ctx.index.timeline(ctx.find_day(day_num=1))
+
+        result = execute_tool(ctx, "move_item", {"item_id": "d1_bulguksa", "to_day_num": 2})
+        self.assertTrue(result.get("ok"), result)
+
+        ids1 = [e.item_id for e in ctx.index.timeline(ctx.find_day(day_num=1)).entries]
+        ids2 = [e.item_id for e in ctx.index.timeline(ctx.find_day(day_num=2)).entries]
+        self.assertNotIn("d1_bulguksa", ids1)
+        self.assertEqual(ids2, ["d2_breakfast", result["new_id"]])
+        self.assertEqual(len(day2), 1)
+
+
+class TestGetNowNext(unittest.TestCase):
+    """get_now_next 도구 테스트"""
+
+    def setUp(self):
+        self.ctx = ExecutionContext(SAMPLE_DATA)
+
+    def test_current_and_next(self):
+        result = execute_tool(self.ctx, "get_now_next", {"at": "2026-02-19T12:10"})
+
+        self.assertEqual(result["phase"], "on_trip")
+        self.assertEqual([e["id"] for e in result["current"]], ["d1_lunch"])
+        self.assertTrue(result["current"][0]["approx"])
+        self.assertEqual(result["next"]["id"], "d1_bulguksa")
+        self.assertEqual(result["next"]["start"], "14:00")
+        self.assertEqual(result["remaining_today"], 2)
+
+    def test_skips_done_and_skipped(self):
+        """다음 일정은 planned 항목에서 고르고, 그 날에 없으면 다음 날로 넘어가야 한다"""
+        result = execute_tool(self.ctx, "get_now_next", {"at": "2026-02-19T17:00"})
+        self.assertEqual(result["next"]["id"], "d1_night")
+
+        result = execute_tool(self.ctx, "get_now_next", {"at": "2026-02-19T22:00+09:00"})
+        self.assertEqual(result["next"]["id"], "d2_breakfast")
+        self.assertEqual(result["next"]["dayNum"], 2)
+
+    def test_outside_trip(self):
+        result = execute_tool(self.ctx, "get_now_next", {"at": "2026-02-10T09:00"})
+        self.assertEqual((result["phase"], result["next"]["id"]), ("before_trip", "d1_checkin"))
+
+        result = execute_tool(self.ctx, "get_now_next", {"at": "2026-03-01T09:00"})
+        self.assertEqual((result["phase"], result["next"]), ("after_trip", None))
+
+    def test_bad_at(self):
+        result = execute_tool(self.ctx, "get_now_next", {"at": "내일"})
+        self.assertIn("error", result)
+
+
+if __name__ == "__main__":
+    unittest.main()
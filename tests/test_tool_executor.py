@@ -0,0 +1,414 @@
+"""
+tool_executor 모듈 테스트.
+
+ExecutionContext의 조회 인덱스와 도구 핸들러 동작을 검증한다.
+"""
+
+import copy
+import os
+import sys
+import unittest
+from unittest import mock
+
+# src/ 디렉토리를 모듈 경로에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+import trip_stats
+from tool_executor import ExecutionContext, execute_tool
+from tool_stats import ToolStats
+from trip_index import TripIndex
+from trip_patch import apply_patch
+
+
+SAMPLE_DATA = {
+    "meta": {"lastUpdated": "2026-02-10T09:00:00+09:00"},
+    "days": [
+        {
+            "date": "2026-02-19", "dow": "목", "dayNum": 1, "title": "출발",
+            "items": [
+                {"id": "d1_move", "time": "오전", "cat": "activity", "title": "이동",
+                 "options": [], "status": "planned"},
+                {"id": "d1_dinner", "time": "저녁", "cat": "meal", "title": "저녁 식사",
+                 "options": [
+                     {"name": "반월성한우", "dad": "good"},
+                     {"name": "반월성", "dad": "caution"},
+                 ],
+                 "status": "planned"},
+            ],
+        },
+        {
+            "date": "2026-02-20", "dow": "금", "dayNum": 2, "title": "황리단길",
+            "items": [
+                {"id": "d2_item2", "time": "점심", "cat": "meal", "title": "점심",
+                 "options": [{"name": "향화정"}], "status": "planned"},
+            ],
+        },
+    ],
+}
+
+
+def _scan_item(data, item_id):
+    """인덱스 없이 찾은 (dayNum, item)"""
+    for day in data["days"]:
+        for item in day["items"]:
+            if item["id"] == item_id:
+                return day["dayNum"], item
+    return None
+
+
+class TestTripIndex(unittest.TestCase):
+    """ExecutionContext 조회 인덱스 테스트"""
+
+    def setUp(self):
+        self.ctx = ExecutionContext(SAMPLE_DATA)
+
+    def test_find_item_and_day(self):
+        """id, dayNum, date로 찾은 객체는 데이터 안의 객체여야 한다"""
+        day, item = self.ctx.find_item("d1_dinner")
+
+        self.assertIs(day, self.ctx.data["days"][0])
+        self.assertIs(item, self.ctx.data["days"][0]["items"][1])
+        self.assertIs(self.ctx.find_day(day_num=2), self.ctx.data["days"][1])
+        self.assertIs(self.ctx.find_day(date="2026-02-20"), self.ctx.data["days"][1])
+        self.assertIsNone(self.ctx.find_item("d9_none"))
+
+    def test_find_option_prefers_exact_name(self):
+        """옵션은 완전 일치를 먼저, 없으면 부분 일치를 찾아야 한다"""
+        _, item = self.ctx.find_item("d1_dinner")
+
+        self.assertEqual(self.ctx.find_option(item, "반월성")["dad"], "caution")
+        self.assertEqual(self.ctx.find_option(item, "한우")["name"], "반월성한우")
+        self.assertEqual(self.ctx.find_option(item, "반월성 한우")["name"], "반월성한우")
+        self.assertIsNone(self.ctx.find_option(item, "교동"))
+
+    def test_find_option_for_update_is_strict(self):
+        """쓰기 대상 옵션은 완전 일치나 하나뿐인 부분 일치만 인정한다 (초성/오타/모호한 질의는 거부)"""
+        _, item = self.ctx.find_item("d1_dinner")
+
+        self.assertEqual(self.ctx.find_option(item, "반월성", for_update=True)["dad"], "caution")
+        self.assertEqual(self.ctx.find_option(item, "한우", for_update=True)["name"], "반월성한우")
+        self.assertIsNotNone(self.ctx.find_option(item, "ㅂㅇㅅㅎㅇ"))
+        self.assertIsNone(self.ctx.find_option(item, "ㅂㅇㅅㅎㅇ", for_update=True))
+        self.assertIsNone(self.ctx.find_option(item, "월성", for_update=True))
+
+        result = execute_tool(self.ctx, "update_option", {
+            "item_id": "d1_dinner", "option_name": "반월셩한우", "fields": {"hiro": "good"}})
+        self.assertIn("옵션을 찾을 수 없습니다", result["error"])
+        self.assertFalse(self.ctx.modified)
+
+    def test_failed_write_changes_nothing(self):
+        """옵션/필드 확인에 실패한 쓰기는 일부만 반영되지 않아야 한다"""
+        result = execute_tool(self.ctx, "update_visit", {"item_id": "d1_dinner", "option_name": "교동"})
+        self.assertIn("error", result)
+
+        result = execute_tool(self.ctx, "update_option", {
+            "item_id": "d1_dinner", "option_name": "반월성", "fields": {"hiro": "good", "price": 1}})
+        self.assertIn("price", result["error"])
+
+        self.assertFalse(self.ctx.modified)
+        self.assertEqual(self.ctx.patch, [])
+        self.assertEqual(self.ctx.data, SAMPLE_DATA)
+
+    def test_index_follows_mutations(self):
+        """변경 도구를 거친 뒤에도 인덱스 조회가 전체 순회 결과와 같아야 한다"""
+        calls = [
+            ("add_item", {"day_num": 1, "title": "카페", "after_item_id": "d1_move"}),
+            ("move_item", {"item_id": "d1_move", "to_day_num": 2}),
+            ("add_option", {"item_id": "d2_item2", "name": "교동쌈밥"}),
+            ("remove_item", {"item_id": "d1_dinner"}),
+        ]
+        for name, inp in calls:
+            self.assertNotIn("error", execute_tool(self.ctx, name, inp))
+
+        for item_id in ("d1_move", "d2_move", "d1_dinner", "d1_item3", "d2_item2"):
+            found = self.ctx.find_item(item_id)
+            expected = _scan_item(self.ctx.data, item_id)
+            if expected is None:
+                self.assertIsNone(found, item_id)
+            else:
+                self.assertEqual(found[0]["dayNum"], expected[0])
+                self.assertIs(found[1], expected[1])
+
+        _, item = self.ctx.find_item("d2_item2")
+        self.assertEqual(self.ctx.find_option(item, "교동쌈밥")["name"], "교동쌈밥")
+
+    def test_find_item_search_variants(self):
+        """띄어쓰기, 초성, 오타 질의도 찾고 점수순으로 정렬해야 한다"""
+        result = execute_tool(self.ctx, "find_item", {"query": "반월성 한우"})
+        self.assertEqual([r["id"] for r in result["items"]], ["d1_dinner"])
+        self.assertEqual(result["items"][0]["matched"], "반월성한우")
+
+        self.assertEqual(execute_tool(self.ctx, "find_item", {"query": "ㅎㅎㅈ"})["items"][0]["id"], "d2_item2")
+        self.assertEqual(execute_tool(self.ctx, "find_item", {"query": "향화졍"})["items"][0]["id"], "d2_item2")
+        self.assertEqual(execute_tool(self.ctx, "find_item", {"query": "교동"})["count"], 0)
+
+    def test_search_follows_mutations(self):
+        """옵션 추가/항목 이동/제목 변경 뒤에도 검색 결과가 맞아야 한다"""
+        self.ctx.find_items_by_query("이동")  # 검색 인덱스 생성
+        execute_tool(self.ctx, "add_option", {"item_id": "d2_item2", "name": "교동쌈밥"})
+        execute_tool(self.ctx, "move_item", {"item_id": "d1_move", "to_day_num": 2})
+        execute_tool(self.ctx, "update_item", {"item_id": "d1_dinner", "title": "한정식"})
+
+        self.assertEqual([r["id"] for r in self.ctx.find_items_by_query("교동")], ["d2_item2"])
+        self.assertEqual([r["id"] for r in self.ctx.find_items_by_query("이동")], ["d2_move"])
+        self.assertEqual([r["id"] for r in self.ctx.find_items_by_query("한정식")], ["d1_dinner"])
+        self.assertEqual(self.ctx.find_items_by_query("저녁 식사"), [])
+
+        # 공유 검색 인덱스는 다른 컨텍스트의 변경에 영향받지 않아야 한다
+        other = ExecutionContext(SAMPLE_DATA)
+        self.assertEqual(other.find_items_by_query("교동"), [])
+        self.assertEqual([r["id"] for r in other.find_items_by_query("저녁 식사")], ["d1_dinner"])
+
+    def test_search_items_filters(self):
+        """search_items의 새 필터(평점/업종/선택 일정)가 AND로 결합되어야 한다"""
+        data = copy.deepcopy(SAMPLE_DATA)
+        data["days"][0]["items"][1]["options"][0].update(rating=4.6, category="한식 · 한우")
+        data["days"][1]["items"][0]["options"][0].update(rating=4.3, category="한식 · 꼬막")
+        data["days"][0]["items"][0]["optional"] = True
+        ctx = ExecutionContext(data)
+
+        def ids(**inp):
+            return [r["id"] for r in execute_tool(ctx, "search_items", inp)["items"]]
+
+        self.assertEqual(ids(min_rating=4.3), ["d1_dinner", "d2_item2"])
+        self.assertEqual(ids(min_rating=4.5, category="한식"), ["d1_dinner"])
+        self.assertEqual(ids(category="꼬막", dad="good"), [])
+        self.assertEqual(ids(optional=True), ["d1_move"])
+        self.assertEqual(ids(cat="meal", optional=False), ["d1_dinner", "d2_item2"])
+
+    def test_search_items_follows_mutations(self):
+        """변경 도구를 거친 뒤에도 필터 결과가 현재 데이터와 같아야 한다"""
+        self.assertEqual(execute_tool(self.ctx, "search_items", {"status": "done"})["count"], 0)
+        execute_tool(self.ctx, "update_status", {"item_id": "d2_item2", "status": "done"})
+        execute_tool(self.ctx, "move_item", {"item_id": "d1_dinner", "to_day_num": 2})
+
+        done = execute_tool(self.ctx, "search_items", {"status": "done"})["items"]
+        self.assertEqual([r["id"] for r in done], ["d2_item2"])
+        day2 = execute_tool(self.ctx, "search_items", {"day_num": 2, "cat": "meal"})["items"]
+        self.assertEqual([r["id"] for r in day2], ["d2_item2", "d2_dinner"])
+        self.assertEqual(execute_tool(self.ctx, "search_items", {"day_num": 1})["count"], 1)
+
+        other = ExecutionContext(SAMPLE_DATA)
+        self.assertEqual(execute_tool(other, "search_items", {"status": "done"})["count"], 0)
+
+    def test_add_item_avoids_id_collision(self):
+        """새 항목 id는 기존 id와 겹치지 않아야 한다"""
+        result = execute_tool(self.ctx, "add_item", {"day_num": 2, "title": "카페"})
+
+        self.assertEqual(result["item_id"], "d2_item3")
+        self.assertEqual(len(self.ctx.data["days"][1]["items"]), 2)
+
+    def test_duplicate_ids_resolve_in_document_order(self):
+        """같은 id가 여럿이면 문서 순서상 첫 항목을 찾고, 삭제 후에는 다음 항목을 찾아야 한다"""
+        data = copy.deepcopy(SAMPLE_DATA)
+        data["days"][1]["items"].append({"id": "d1_move", "title": "중복"})
+        index = TripIndex(data)
+
+        first = index.item("d1_move")[1]
+        self.assertEqual(first["title"], "이동")
+
+        index.remove_item(first)
+        self.assertEqual(index.item("d1_move")[1]["title"], "중복")
+
+
+class TestCopyOnWrite(unittest.TestCase):
+    """ExecutionContext copy-on-write 테스트"""
+
+    def setUp(self):
+        self.data = copy.deepcopy(SAMPLE_DATA)
+        self.ctx = ExecutionContext(self.data)
+
+    def test_read_tools_do_not_copy(self):
+        """조회 도구만 실행하면 입력 데이터를 그대로 공유해야 한다"""
+        for name, inp in [
+            ("get_schedule", {"day_num": 1}),
+            ("get_item_detail", {"item_id": "d1_dinner"}),
+            ("find_item", {"query": "반월성"}),
+        ]:
+            self.assertNotIn("error", execute_tool(self.ctx, name, inp))
+
+        self.assertIs(self.ctx.data, self.data)
+        self.assertFalse(self.ctx.modified)
+
+    def test_write_tools_leave_input_unchanged(self):
+        """변경 도구를 실행해도 입력 데이터는 바뀌지 않아야 한다"""
+        calls = [
+            ("update_status", {"item_id": "d1_dinner", "status": "done"}),
+            ("update_option", {"item_id": "d1_dinner", "option_name": "반월성",
+                               "fields": {"dad": "good", "menu": "불고기"}}),
+            ("update_note", {"item_id": "d1_dinner", "note": "예약함"}),
+            ("update_note", {"item_id": "d1_dinner", "note": "7시"}),
+            ("add_option", {"item_id": "d2_item2", "name": "교동쌈밥"}),
+            ("move_item", {"item_id": "d1_move", "to_day_num": 2, "new_time": "오후"}),
+        ]
+        for name, inp in calls:
+            self.assertNotIn("error", execute_tool(self.ctx, name, inp))
+
+        self.assertEqual(self.data, SAMPLE_DATA)
+
+        _, item = self.ctx.find_item("d1_dinner")
+        self.assertEqual(item["status"], "done")
+        self.assertEqual(item["note"], "예약함\n7시")
+        self.assertEqual(self.ctx.find_option(item, "반월성")["menu"], "불고기")
+        self.assertEqual(self.ctx.find_item("d2_move")[1]["time"], "오후")
+        self.assertEqual(len(self.ctx.data["days"][0]["items"]), 1)
+
+    def test_untouched_nodes_are_shared(self):
+        """변경하지 않은 day/item은 복사하지 않고 공유해야 한다"""
+        for day in self.data["days"]:
+            day["stats"] = trip_stats.count_day(day)
+        self.data["meta"]["stats"] = trip_stats.summarize(self.data)[1]
+        self.ctx = ExecutionContext(self.data)
+        execute_tool(self.ctx, "update_status", {"item_id": "d1_dinner", "status": "done"})
+
+        self.assertIsNot(self.ctx.data, self.data)
+        self.assertIsNot(self.ctx.data["days"][0], self.data["days"][0])
+        self.assertIs(self.ctx.data["days"][1], self.data["days"][1])
+        self.assertIs(self.ctx.data["days"][0]["items"][0], self.data["days"][0]["items"][0])
+        self.assertIs(self.ctx.data["days"][0]["items"][1]["options"],
+                      self.data["days"][0]["items"][1]["options"])
+
+
+
+class TestApplyBatch(unittest.TestCase):
+    """apply_batch 테스트"""
+
+    def setUp(self):
+        self.ctx = ExecutionContext(SAMPLE_DATA)
+
+    def test_applies_all_operations(self):
+        """여러 변경을 한 번에 적용하고 patch 재적용 결과도 같아야 한다"""
+        result = execute_tool(self.ctx, "apply_batch", {"operations": [
+            {"tool": "update_status", "input": {"item_id": "d1_dinner", "status": "skipped"}},
+            {"tool": "update_status", "input": {"item_id": "d2_item2", "status": "skipped"}},
+            {"tool": "add_item", "input": {"day_num": 2, "title": "카페", "cat": "cafe"}},
+        ]})
+
+        self.assertTrue(result["ok"])
+        self.assertEqual([r["tool"] for r in result["results"]], ["update_status", "update_status", "add_item"])
+        self.assertEqual(self.ctx.find_item("d1_dinner")[1]["status"], "skipped")
+        self.assertIn("일괄 변경 3건", self.ctx.data["meta"]["updateNote"])
+
+        replayed, skipped = apply_patch(copy.deepcopy(SAMPLE_DATA), self.ctx.patch)
+        self.assertEqual(skipped, [])
+        # 진행 통계는 patch에 없고 저장소가 적용 후 다시 센다
+        trip_stats.refresh_stats(replayed, self.ctx.patch)
+        self.assertEqual(replayed["days"], self.ctx.data["days"])
+
+    def test_stats_count_outer_call_only(self):
+        """배치 안의 작업은 도구별 통계에 따로 세지 않는다 (apply_batch 1건만)"""
+        stats = ToolStats()
+        with mock.patch("tool_executor.STATS", stats):
+            execute_tool(self.ctx, "apply_batch", {"operations": [
+                {"tool": "update_status", "input": {"item_id": "d1_dinner", "status": "skipped"}},
+                {"tool": "update_status", "input": {"item_id": "d2_item2", "status": "skipped"}},
+            ]})
+            execute_tool(self.ctx, "update_status", {"item_id": "d1_move", "status": "done"})
+
+        tools = stats.snapshot()["tools"]
+        self.assertEqual(tools["apply_batch"]["calls"], 1)
+        self.assertEqual(tools["update_status"]["calls"], 1)
+
+    def test_invalid_input_applies_nothing(self):
+        """입력 검증에 실패하면 어떤 작업도 실행하지 않아야 한다"""
+        result = execute_tool(self.ctx, "apply_batch", {"operations": [
+            {"tool": "update_status", "input": {"item_id": "d1_dinner", "status": "done"}},
+            {"tool": "update_status", "input": {"item_id": "d2_item2", "status": "finished"}},
+            {"tool": "move_item", "input": {"item_id": "d1_move"}},
+        ]})
+
+        self.assertEqual([e["index"] for e in result["invalid"]], [1, 2])
+        self.assertFalse(self.ctx.modified)
+        self.assertEqual(self.ctx.patch, [])
+        self.assertIs(self.ctx.data, SAMPLE_DATA)
+
+        result = execute_tool(self.ctx, "apply_batch", {"operations": [
+            {"tool": "get_schedule", "input": {}},
+        ]})
+        self.assertIn("operations[0].tool", result["error"])
+
+    def test_failure_rolls_back(self):
+        """중간 작업이 실패하면 배치 이전 상태로 돌아가야 한다 (이전 변경은 유지)"""
+        execute_tool(self.ctx, "update_note", {"item_id": "d1_move", "note": "KTX"})
+        before = copy.deepcopy(self.ctx.data)
+        patch_before = list(self.ctx.patch)
+        self.ctx.find_items_by_query("이동")  # 검색 인덱스 생성
+
+        result = execute_tool(self.ctx, "apply_batch", {"operations": [
+            {"tool": "add_item", "input": {"day_num": 1, "title": "야경 산책", "cat": "activity"}},
+            {"tool": "update_note", "input": {"item_id": "d1_move", "note": "취소될 메모"}},
+            {"tool": "remove_item", "input": {"item_id": "d9_none"}},
+        ]})
+
+        self.assertTrue(result["rolled_back"])
+        self.assertEqual(result["failed_index"], 2)
+        self.assertEqual(self.ctx.data, before)
+        self.assertEqual(self.ctx.patch, patch_before)
+        self.assertTrue(self.ctx.modified)
+        self.assertIsNone(self.ctx.find_item("d1_item3"))
+        self.assertEqual(self.ctx.find_items_by_query("야경 산책"), [])
+        self.assertEqual(self.ctx.find_item("d1_move")[1]["note"], "KTX")
+        self.assertEqual(SAMPLE_DATA["days"][0]["items"][0].get("note"), None)
+
+
+
+class TestUndoLog(unittest.TestCase):
+    """역연산 기록(undo_patch) 테스트"""
+
+    CALLS = [
+        ("update_status", {"item_id": "d1_move", "status": "done"}),
+        ("update_note", {"item_id": "d1_dinner", "note": "예약함"}),
+        ("update_option", {"item_id": "d1_dinner", "option_name": "반월성", "fields": {"hiro": "good"}}),
+        ("add_item", {"day_num": 2, "title": "카페", "cat": "cafe"}),
+        ("add_option", {"item_id": "d2_item2", "name": "교리김밥"}),
+        ("move_item", {"item_id": "d1_move", "to_day_num": 2, "after_item_id": "d2_item2"}),
+        ("remove_item", {"item_id": "d1_dinner"}),
+    ]
+
+    @staticmethod
+    def _without_timestamp(data):
+        """버전과 진행 통계를 뺀 데이터 (통계는 역연산에 없고 저장소가 다시 센다)"""
+        data = copy.deepcopy(data)
+        for key in ("lastUpdated", "stats", "statsVersion"):
+            data["meta"].pop(key, None)
+        for day in data["days"]:
+            day.pop("stats", None)
+        return data
+
+    def test_undo_restores_original(self):
+        """변경 후 데이터에 역연산을 적용하면 원래 데이터로 돌아가야 한다"""
+        ctx = ExecutionContext(SAMPLE_DATA)
+        for name, inp in self.CALLS:
+            self.assertNotIn("error", execute_tool(ctx, name, inp), name)
+
+        restored, skipped = apply_patch(copy.deepcopy(ctx.data), ctx.undo_patch)
+
+        self.assertEqual(skipped, [])
+        self.assertEqual(self._without_timestamp(restored), self._without_timestamp(SAMPLE_DATA))
+
+    def test_undo_restores_first_item_position(self):
+        """맨 앞 항목을 삭제해도 같은 자리로 복원해야 한다"""
+        ctx = ExecutionContext(SAMPLE_DATA)
+        execute_tool(ctx, "remove_item", {"item_id": "d1_move"})
+
+        restored, _ = apply_patch(copy.deepcopy(ctx.data), ctx.undo_patch)
+
+        self.assertEqual([i["id"] for i in restored["days"][0]["items"]], ["d1_move", "d1_dinner"])
+
+    def test_rollback_truncates_undo(self):
+        """savepoint로 되돌리면 그 이후의 역연산도 지워야 한다"""
+        ctx = ExecutionContext(SAMPLE_DATA)
+        execute_tool(ctx, "update_status", {"item_id": "d1_move", "status": "done"})
+        undo = ctx.undo_patch
+        sp = ctx.savepoint()
+        execute_tool(ctx, "remove_item", {"item_id": "d2_item2"})
+        self.assertTrue(ctx.changed_since(sp))
+
+        ctx.rollback_to(sp)
+
+        self.assertFalse(ctx.changed_since(sp))
+        self.assertEqual(ctx.undo_patch, undo)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+tool_stats 모듈 테스트.
+
+도구별 호출/오류/소요 시간 히스토그램/결과 크기 집계와 execute_tool 계측을 검증한다.
+"""
+
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+# src/ 디렉토리를 모듈 경로에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+import tool_stats
+from tool_executor import ExecutionContext, execute_tool
+from tool_stats import ToolStats
+
+
+SAMPLE_DATA = {
+    "meta": {"lastUpdated": "2026-02-10T09:00:00+09:00"},
+    "days": [
+        {"dayNum": 1, "date": "2026-02-19", "items": [
+            {"id": "d1_lunch", "title": "점심", "status": "planned", "options": []},
+        ]},
+    ],
+}
+
+
+class TestToolStats(unittest.TestCase):
+    """ToolStats 집계 테스트"""
+
+    def test_latency_histogram(self):
+        stats = ToolStats()
+        for ms in (0.3, 0.4, 0.4, 0.9, 30):
+            stats.record_call("find_item", ms / 1000)
+        stats.record_call("find_item", 0.0002, error=True)
+
+        latency = stats.snapshot()["tools"]["find_item"]["latencyMs"]
+
+        self.assertEqual(latency["buckets"], {"0.25": 1, "0.5": 3, "1": 1, "50": 1})
+        self.assertEqual(latency["p50"], 0.5)
+        self.assertEqual(latency["p95"], 50)
+        self.assertAlmostEqual(latency["max"], 30)
+        self.assertEqual(stats.snapshot()["tools"]["find_item"]["errors"], 1)
+
+    def test_sizes_and_turns(self):
+        stats = ToolStats()
+        stats.record_turn()
+        stats.record_turn()
+        for nbytes in (100, 300, 200):
+            stats.record_call("get_schedule", 0.001)
+            stats.record_result_size("get_schedule", nbytes)
+
+        tool = stats.snapshot()["tools"]["get_schedule"]
+
+        self.assertEqual(tool["callsPerTurn"], 1.5)
+        self.assertEqual(tool["resultBytes"], {"mean": 200, "max": 300, "total": 600})
+
+        stats.reset()
+        self.assertEqual(stats.snapshot()["tools"], {})
+        self.assertEqual(stats.snapshot()["turns"], 0)
+
+    def test_api_calls(self):
+        """API 호출의 첫 토큰 시간과 캐시 토큰 비율을 집계해야 한다"""
+        stats = ToolStats()
+        stats.record_api_call(1.0, 2.0, SimpleNamespace(
+            input_tokens=3000, output_tokens=100, cache_creation_input_tokens=7000, cache_read_input_tokens=0))
+        stats.record_api_call(0.5, 1.0, SimpleNamespace(
+            input_tokens=200, output_tokens=50, cache_creation_input_tokens=None, cache_read_input_tokens=9800))
+
+        api = stats.snapshot()["api"]
+
+        self.assertEqual(api["calls"], 2)
+        self.assertEqual(api["firstTokenMs"], {"mean": 750.0, "max": 1000.0})
+        self.assertEqual(api["tokens"], {"input": 3200, "cacheRead": 9800, "cacheWrite": 7000, "output": 150})
+        self.assertEqual(api["cacheReadRatio"], 0.49)
+
+        stats.reset()
+        self.assertEqual(stats.snapshot()["api"]["calls"], 0)
+
+
+class TestExecuteToolInstrumentation(unittest.TestCase):
+    """execute_tool 계측 테스트 (프로세스 전역 통계)"""
+
+    def setUp(self):
+        tool_stats.reset()
+
+    def tearDown(self):
+        tool_stats.reset()
+
+    def test_calls_and_errors_recorded(self):
+        ctx = ExecutionContext(SAMPLE_DATA)
+        execute_tool(ctx, "get_item_detail", {"item_id": "d1_lunch"})
+        execute_tool(ctx, "get_item_detail", {"item_id": "d9_none"})
+        execute_tool(ctx, "get_item_detail", {})  # 입력 검증 실패
+
+        tool = tool_stats.snapshot()["tools"]["get_item_detail"]
+
+        self.assertEqual(tool["calls"], 3)
+        self.assertEqual(tool["errors"], 2)
+        self.assertEqual(sum(tool["latencyMs"]["buckets"].values()), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
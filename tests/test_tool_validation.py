@@ -0,0 +1,94 @@
+"""
+tool_validation 모듈 테스트.
+
+컴파일한 input_schema 검증 함수의 오류 메시지와, execute_tool이 핸들러 실행
+전에 검증하는지 확인한다.
+"""
+
+import os
+import sys
+import unittest
+
+# src/ 디렉토리를 모듈 경로에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from tool_definitions import TOOLS
+from tool_executor import ExecutionContext, execute_tool
+from tool_validation import VALIDATORS, compile_schema, validate_input
+
+
+SAMPLE_DATA = {
+    "meta": {"lastUpdated": "2026-02-10T09:00:00+09:00"},
+    "days": [
+        {"dayNum": 1, "date": "2026-02-19", "items": [
+            {"id": "d1_lunch", "title": "점심", "status": "planned",
+             "options": [{"name": "향화정"}]},
+        ]},
+    ],
+}
+
+
+class TestCompileSchema(unittest.TestCase):
+    """스키마 컴파일 테스트"""
+
+    def test_types(self):
+        validate = compile_schema({"type": "object", "properties": {
+            "day_num": {"type": "integer"},
+            "min_rating": {"type": "number"},
+            "open_now": {"type": "boolean"},
+        }})
+
+        self.assertIsNone(validate({"day_num": 2, "min_rating": 4, "open_now": False}))
+        self.assertIsNone(validate({}))
+        self.assertEqual(validate({"day_num": "2"}), "input.day_num: integer 타입이어야 합니다 (string)")
+        self.assertIn("input.day_num", validate({"day_num": True}))
+        self.assertIn("input.min_rating", validate({"min_rating": None}))
+        self.assertIn("input.open_now", validate({"open_now": 1}))
+        self.assertEqual(validate([]), "input: object 타입이어야 합니다 (array)")
+
+    def test_enum_and_required(self):
+        validate = VALIDATORS["update_status"]
+
+        self.assertIsNone(validate({"item_id": "d1_lunch", "status": "done"}))
+        self.assertEqual(validate({"item_id": "d1_lunch"}), "input: status가 필요합니다")
+        self.assertEqual(
+            validate({"item_id": "d1_lunch", "status": "finished"}),
+            "input.status: 허용되지 않는 값 'finished' (허용: planned|done|skipped)",
+        )
+
+    def test_nested_array_path(self):
+        """배열 원소의 오류는 원소 위치를 포함해야 한다"""
+        problem = validate_input("add_item", {
+            "day_num": 1, "title": "카페",
+            "options": [{"name": "A"}, {"name": "B", "dad": "bad"}],
+        })
+
+        self.assertTrue(problem.startswith("input.options[1].dad:"), problem)
+
+    def test_every_tool_compiled(self):
+        self.assertEqual(set(VALIDATORS), {tool["name"] for tool in TOOLS})
+        self.assertIsNone(validate_input("unknown_tool", {}))
+
+
+class TestExecuteToolValidation(unittest.TestCase):
+    """execute_tool 사전 검증 테스트"""
+
+    def test_invalid_input_rejected_before_handler(self):
+        ctx = ExecutionContext(SAMPLE_DATA)
+
+        result = execute_tool(ctx, "update_visit", {"item_id": "d1_lunch", "visited": "yes"})
+
+        self.assertEqual(result, {"error": "입력 오류: input.visited: boolean 타입이어야 합니다 (string)"})
+        self.assertFalse(ctx.modified)
+
+    def test_valid_input_reaches_handler(self):
+        ctx = ExecutionContext(SAMPLE_DATA)
+
+        result = execute_tool(ctx, "update_visit", {"item_id": "d1_lunch"})
+
+        self.assertTrue(result.get("ok"), result)
+        self.assertEqual(ctx.data["days"][0]["items"][0]["status"], "done")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,298 @@
+"""
+trip_patch 모듈 및 ExecutionContext 변경 기록 테스트.
+"""
+
+import copy
+import os
+import sys
+import unittest
+
+# src/ 디렉토리를 모듈 경로에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+import trip_stats
+from trip_patch import PatchError, apply_patch, diff, item_path, make_path, option_path
+from tool_executor import ExecutionContext, execute_tool
+
+
+SAMPLE_DATA = {
+    "meta": {"lastUpdated": "2026-02-10T09:00:00+09:00", "updateNote": "초기"},
+    "days": [
+        {
+            "date": "2026-02-19", "dow": "목", "dayNum": 1, "title": "출발",
+            "items": [
+                {"id": "d1_move", "time": "오전", "cat": "activity", "title": "이동",
+                 "options": [], "chosen": "", "status": "planned", "note": ""},
+                {"id": "d1_dinner", "time": "저녁", "cat": "meal", "title": "저녁 식사",
+                 "options": [
+                     {"name": "반월성한우", "menu": "한우", "dad": "good", "hiro": "caution"},
+                     {"name": "A/B 식당", "menu": "국밥", "dad": "good", "hiro": "good"},
+                 ],
+                 "chosen": "", "status": "planned", "note": ""},
+            ],
+        },
+        {
+            "date": "2026-02-20", "dow": "금", "dayNum": 2, "title": "황리단길",
+            "items": [
+                {"id": "d2_lunch", "time": "점심", "cat": "meal", "title": "점심",
+                 "options": [{"name": "향화정", "dad": "good", "hiro": "caution"}],
+                 "chosen": "", "status": "planned", "note": "기존 메모"},
+            ],
+        },
+    ],
+    "reference": {"shopping": [{"item": "잡곡밥", "done": False}]},
+}
+
+
+class TestApplyPatch(unittest.TestCase):
+    """apply_patch 테스트"""
+
+    def setUp(self):
+        self.data = copy.deepcopy(SAMPLE_DATA)
+
+    def test_replace_item_field_by_id(self):
+        """항목은 인덱스가 아닌 id로 찾아야 한다"""
+        ops = [{"op": "replace", "path": item_path(1, "d1_dinner", "status"), "value": "done"}]
+        # 앞에 다른 항목이 끼어들어도 같은 대상에 적용되어야 한다
+        self.data["days"][0]["items"].insert(0, {"id": "d1_new", "title": "새 항목"})
+
+        apply_patch(self.data, ops)
+
+        self.assertEqual(self.data["days"][0]["items"][2]["status"], "done")
+
+    def test_option_name_with_slash_escaped(self):
+        """옵션 이름의 '/'는 이스케이프되어야 한다"""
+        path = option_path(1, "d1_dinner", "A/B 식당", "hiro")
+        self.assertIn("A~1B", path)
+
+        apply_patch(self.data, [{"op": "replace", "path": path, "value": "caution"}])
+
+        self.assertEqual(self.data["days"][0]["items"][1]["options"][1]["hiro"], "caution")
+
+    def test_add_item_after(self):
+        """add 연산의 after는 해당 항목 뒤에 삽입해야 한다"""
+        op = {"op": "add", "path": make_path("days", 1, "items", "-"),
+              "value": {"id": "d1_cafe"}, "after": "d1_move"}
+
+        apply_patch(self.data, [op])
+
+        ids = [i["id"] for i in self.data["days"][0]["items"]]
+        self.assertEqual(ids, ["d1_move", "d1_cafe", "d1_dinner"])
+
+    def test_add_item_after_missing_appends(self):
+        """after 대상이 없으면 끝에 추가해야 한다"""
+        op = {"op": "add", "path": make_path("days", 1, "items", "-"),
+              "value": {"id": "d1_cafe"}, "after": "d1_gone"}
+
+        apply_patch(self.data, [op])
+
+        self.assertEqual(self.data["days"][0]["items"][-1]["id"], "d1_cafe")
+
+    def test_add_existing_id_is_skipped(self):
+        """같은 id의 추가 연산을 다시 적용해도 항목이 중복되지 않아야 한다 (대기 연산 재적용)"""
+        ops = [
+            {"op": "add", "path": make_path("days", 1, "items", "-"), "value": {"id": "d1_cafe"}},
+            {"op": "replace", "path": item_path(1, "d1_cafe", "status"), "value": "done"},
+        ]
+
+        apply_patch(self.data, ops)
+        _, skipped = apply_patch(self.data, ops[:1], strict=False)
+
+        items = self.data["days"][0]["items"]
+        self.assertEqual(skipped, [])
+        self.assertEqual([i["id"] for i in items], ["d1_move", "d1_dinner", "d1_cafe"])
+        self.assertEqual(items[-1]["status"], "done")
+
+    def test_add_item_before(self):
+        """add 연산의 before는 해당 항목 앞에 삽입해야 한다"""
+        op = {"op": "add", "path": make_path("days", 1, "items", "-"),
+              "value": {"id": "d1_cafe"}, "before": "d1_move"}
+
+        apply_patch(self.data, [op])
+
+        ids = [i["id"] for i in self.data["days"][0]["items"]]
+        self.assertEqual(ids, ["d1_cafe", "d1_move", "d1_dinner"])
+
+    def test_remove_item(self):
+        """remove 연산은 항목을 삭제해야 한다"""
+        apply_patch(self.data, [{"op": "remove", "path": item_path(2, "d2_lunch")}])
+
+        self.assertEqual(self.data["days"][1]["items"], [])
+
+    def test_numeric_index_for_other_lists(self):
+        """식별자 규칙이 없는 배열은 숫자 인덱스를 써야 한다"""
+        path = make_path("reference", "shopping", 0, "done")
+
+        apply_patch(self.data, [{"op": "replace", "path": path, "value": True}])
+
+        self.assertTrue(self.data["reference"]["shopping"][0]["done"])
+
+    def test_root_replace(self):
+        """경로 ''의 replace는 문서 전체를 교체해야 한다"""
+        doc, _ = apply_patch(self.data, [{"op": "replace", "path": "", "value": {"days": []}}])
+
+        self.assertEqual(doc, {"days": []})
+
+    def test_missing_target_strict(self):
+        """strict 모드에서 대상이 없으면 PatchError를 발생시켜야 한다"""
+        ops = [{"op": "replace", "path": item_path(1, "d1_gone", "status"), "value": "done"}]
+
+        with self.assertRaises(PatchError):
+            apply_patch(self.data, ops)
+
+    def test_missing_target_lenient(self):
+        """strict=False면 대상이 사라진 연산만 건너뛰어야 한다"""
+        ops = [
+            {"op": "replace", "path": item_path(1, "d1_gone", "status"), "value": "done"},
+            {"op": "replace", "path": item_path(1, "d1_move", "status"), "value": "done"},
+        ]
+
+        _, skipped = apply_patch(self.data, ops, strict=False)
+
+        self.assertEqual(skipped, ops[:1])
+        self.assertEqual(self.data["days"][0]["items"][0]["status"], "done")
+
+    def test_values_are_copied(self):
+        """적용된 값은 연산의 값과 별개 객체여야 한다"""
+        value = {"id": "d1_cafe", "options": []}
+        apply_patch(self.data, [{"op": "add", "path": make_path("days", 1, "items", "-"), "value": value}])
+        value["options"].append("변경")
+
+        self.assertEqual(self.data["days"][0]["items"][-1]["options"], [])
+
+
+class TestDiff(unittest.TestCase):
+    """diff 테스트: diff 결과를 이전 문서에 적용하면 새 문서가 되어야 한다"""
+
+    def _assert_roundtrip(self, old, new):
+        ops = diff(old, new)
+        result, skipped = apply_patch(copy.deepcopy(old), ops)
+        self.assertEqual(skipped, [])
+        self.assertEqual(result, new)
+        return ops
+
+    def test_same_document(self):
+        """같은 문서면 빈 목록"""
+        self.assertEqual(diff(SAMPLE_DATA, copy.deepcopy(SAMPLE_DATA)), [])
+
+    def test_field_change_uses_selector_path(self):
+        """필드 변경은 id/name 경로의 replace 하나여야 한다"""
+        new = copy.deepcopy(SAMPLE_DATA)
+        new["days"][0]["items"][1]["options"][1]["hiro"] = "caution"
+
+        ops = self._assert_roundtrip(SAMPLE_DATA, new)
+
+        self.assertEqual(ops, [{"op": "replace", "path": option_path(1, "d1_dinner", "A/B 식당", "hiro"),
+                                "value": "caution"}])
+
+    def test_item_added_removed(self):
+        """항목 추가/삭제는 원소 단위 연산이어야 한다"""
+        new = copy.deepcopy(SAMPLE_DATA)
+        del new["days"][0]["items"][0]
+        new["days"][0]["items"].append({"id": "d1_cafe", "title": "카페"})
+        new["days"][1]["items"].insert(1, {"id": "d2_walk", "title": "산책"})
+
+        ops = self._assert_roundtrip(SAMPLE_DATA, new)
+
+        self.assertEqual(sorted(op["op"] for op in ops), ["add", "add", "remove"])
+
+    def test_reorder_and_front_insert_replace_list(self):
+        """순서 변경이나 맨 앞 삽입은 배열 교체로 처리해야 한다"""
+        reordered = copy.deepcopy(SAMPLE_DATA)
+        reordered["days"][0]["items"].reverse()
+        front = copy.deepcopy(SAMPLE_DATA)
+        front["days"][1]["items"].insert(0, {"id": "d2_first"})
+
+        for new in (reordered, front):
+            ops = self._assert_roundtrip(SAMPLE_DATA, new)
+            self.assertEqual(len(ops), 1)
+            self.assertEqual(ops[0]["op"], "replace")
+
+    def test_keys_and_plain_lists(self):
+        """dict 키 추가/삭제와 일반 배열 변경"""
+        new = copy.deepcopy(SAMPLE_DATA)
+        del new["meta"]["updateNote"]
+        new["meta"]["tags"] = ["가족"]
+        new["reference"]["shopping"][0]["done"] = True
+        new["reference"]["shopping"].append({"item": "물티슈", "done": False})
+
+        self._assert_roundtrip(SAMPLE_DATA, new)
+
+    def test_type_change_detected(self):
+        """값이 같아도 타입이 바뀌면 변경으로 본다"""
+        old = {"a": 1}
+        self._assert_roundtrip(old, {"a": True})
+
+
+class TestExecutionContextPatch(unittest.TestCase):
+    """ExecutionContext가 기록한 패치를 원본에 적용하면 같은 결과가 나와야 한다"""
+
+    def _assert_replays(self, calls):
+        ctx = ExecutionContext(SAMPLE_DATA)
+        for name, inp in calls:
+            result = execute_tool(ctx, name, inp)
+            self.assertNotIn("error", result, result)
+
+        replayed, skipped = apply_patch(copy.deepcopy(SAMPLE_DATA), ctx.patch)
+
+        self.assertEqual(skipped, [])
+        # 진행 통계는 patch에 없고 저장소가 적용 후 다시 센다
+        trip_stats.refresh_stats(replayed, ctx.patch)
+        replayed["meta"]["lastUpdated"] = ctx.data["meta"]["lastUpdated"]
+        replayed["meta"]["statsVersion"] = ctx.data["meta"].get("statsVersion")
+        self.assertEqual(replayed, ctx.data)
+        self.assertFalse([op for op in ctx.patch if "stats" in op["path"]])
+        return ctx
+
+    def test_field_updates(self):
+        """필드 수정 도구들의 패치가 재현되어야 한다"""
+        self._assert_replays([
+            ("update_item", {"item_id": "d1_move", "time": "09:00", "title": "출발"}),
+            ("update_status", {"item_id": "d1_move", "status": "skipped"}),
+            ("update_visit", {"item_id": "d1_dinner", "visited": True, "option_name": "반월성"}),
+            ("update_review", {"item_id": "d1_dinner", "review": "좋았어"}),
+            ("update_note", {"item_id": "d2_lunch", "note": "추가 메모"}),
+            ("update_option", {"item_id": "d1_dinner", "option_name": "A/B",
+                               "fields": {"menu": "순대국", "tags": ["국밥"]}}),
+        ])
+
+    def test_structural_changes(self):
+        """추가/이동/삭제 도구들의 패치가 재현되어야 한다"""
+        ctx = self._assert_replays([
+            ("add_item", {"day_num": 2, "title": "카페", "cat": "cafe",
+                          "options": [{"name": "카페 A"}]}),
+            ("add_option", {"item_id": "d2_lunch", "name": "교동쌈밥", "dad": "good"}),
+            ("move_item", {"item_id": "d1_move", "to_day_num": 2, "after_item_id": "d2_lunch"}),
+            ("update_status", {"item_id": "d2_move", "status": "done"}),
+            ("remove_item", {"item_id": "d1_dinner"}),
+        ])
+        ops = [op["op"] for op in ctx.patch]
+        self.assertIn("remove", ops)
+
+    def test_read_tools_record_nothing(self):
+        """조회 도구는 패치를 남기지 않아야 한다"""
+        ctx = ExecutionContext(SAMPLE_DATA)
+        execute_tool(ctx, "get_schedule", {"day_num": 1})
+        execute_tool(ctx, "find_item", {"query": "점심"})
+        execute_tool(ctx, "get_trip_summary", {})
+
+        self.assertEqual(ctx.patch, [])
+        self.assertFalse(ctx.modified)
+
+    def test_patch_merges_with_concurrent_change(self):
+        """다른 곳에서 바뀐 원격 데이터에 적용해도 양쪽 변경이 모두 남아야 한다"""
+        ctx = ExecutionContext(SAMPLE_DATA)
+        execute_tool(ctx, "update_status", {"item_id": "d1_dinner", "status": "done"})
+
+        remote = copy.deepcopy(SAMPLE_DATA)
+        remote["days"][1]["items"][0]["note"] = "웹에서 수정"
+        remote["days"][0]["items"].insert(0, {"id": "d1_shop", "title": "장보기"})
+
+        merged, _ = apply_patch(remote, ctx.patch)
+
+        self.assertEqual(merged["days"][0]["items"][2]["status"], "done")
+        self.assertEqual(merged["days"][1]["items"][0]["note"], "웹에서 수정")
+
+
+if __name__ == "__main__":
+    unittest.main()
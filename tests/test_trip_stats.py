@@ -0,0 +1,180 @@
+"""
+trip_stats 모듈 테스트.
+
+저장된 진행 통계가 변경 도구를 거치면서 전체를 다시 센 값과 계속 같은지
+(ExecutionContext check_stats 모드) 검증한다.
+"""
+
+import copy
+import os
+import sys
+import unittest
+
+# src/ 디렉토리를 모듈 경로에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+import trip_stats
+from tool_executor import ExecutionContext, execute_tool
+from trip_patch import apply_patch
+
+
+SAMPLE_DATA = {
+    "meta": {"lastUpdated": "2026-02-10T09:00:00+09:00"},
+    "days": [
+        {
+            "date": "2026-02-19", "dayNum": 1, "title": "출발",
+            "items": [
+                {"id": "d1_move", "title": "이동", "options": [], "status": "planned"},
+                {"id": "d1_dinner", "title": "저녁 식사", "status": "planned",
+                 "options": [{"name": "반월성한우"}, {"name": "교동쌈밥"}]},
+            ],
+        },
+        {
+            "date": "2026-02-20", "dayNum": 2, "title": "황리단길",
+            "items": [
+                {"id": "d2_lunch", "title": "점심", "status": "done", "chosen": "향화정",
+                 "options": [{"name": "향화정"}]},
+                {"id": "d2_cafe", "title": "카페", "status": "skipped", "options": []},
+            ],
+        },
+    ],
+}
+
+
+class TestCounts(unittest.TestCase):
+    """집계 함수 테스트"""
+
+    def test_item_counts(self):
+        self.assertEqual(trip_stats.item_counts({"status": "done", "options": [{}]}),
+                         {"total": 1, "planned": 0, "done": 1, "skipped": 0,
+                          "chosen": 0, "with_options": 1})
+        self.assertEqual(trip_stats.item_counts({"chosen": "향화정", "options": [{}]})["with_options"], 0)
+        self.assertEqual(sum(trip_stats.item_counts(None).values()), 0)
+
+    def test_summarize_without_stored_stats(self):
+        """저장된 통계가 없으면 다시 세어야 한다"""
+        per_day, totals = trip_stats.summarize(SAMPLE_DATA)
+
+        self.assertEqual(per_day[0][1]["with_options"], 1)
+        self.assertEqual(totals, {"total": 4, "planned": 2, "done": 1, "skipped": 1,
+                                  "chosen": 1, "with_options": 1})
+
+    def test_stale_stats_are_ignored(self):
+        """통계 버전이 맞지 않거나 항목 수와 맞지 않는 저장 통계는 쓰지 않아야 한다"""
+        data = trip_stats.refresh_stats(copy.deepcopy(SAMPLE_DATA))
+        self.assertTrue(trip_stats.stats_current(data))
+        data["days"][0]["stats"] = dict(data["days"][0]["stats"], with_options=5)
+        self.assertEqual(trip_stats.summarize(data)[1]["with_options"], 5)
+
+        # 통계를 맞추지 않고 저장한 데이터 (버전만 바뀜)
+        data["meta"]["lastUpdated"] = "2026-02-11T09:00:00+09:00"
+        self.assertFalse(trip_stats.stats_current(data))
+        self.assertEqual(trip_stats.summarize(data)[1], trip_stats.summarize(SAMPLE_DATA)[1])
+
+        data["meta"]["statsVersion"] = data["meta"]["lastUpdated"]
+        data["days"][0]["items"].pop()
+        self.assertEqual(trip_stats.day_stats(data["days"][0]), trip_stats.count_day(data["days"][0]))
+        self.assertTrue(trip_stats.verify_stats(data))
+
+    def test_version_follows_writes(self):
+        """통계가 최신일 때만 버전을 올리면서 통계 버전도 옮긴다"""
+        data = trip_stats.refresh_stats(copy.deepcopy(SAMPLE_DATA))
+        trip_stats.set_last_updated(data, "2026-02-12T09:00:00+09:00")
+        self.assertTrue(trip_stats.stats_current(data))
+
+        data["meta"]["lastUpdated"] = "2026-02-13T09:00:00+09:00"
+        trip_stats.set_last_updated(data, "2026-02-14T09:00:00+09:00")
+        self.assertFalse(trip_stats.stats_current(data))
+
+    def test_refresh_skips_bad_days(self):
+        """형식이 어긋난 데이터에서도 예외를 내보내지 않아야 한다 (저장 경로에서 호출)"""
+        data = {"meta": {"lastUpdated": "v1"}, "days": ["bad", {"dayNum": 1, "items": [{"status": "done"}]}]}
+        trip_stats.refresh_stats(data, [{"op": "replace", "path": "/days/1/title", "value": "x"}])
+        self.assertEqual(data["meta"]["stats"]["done"], 1)
+
+        data = {"meta": {"lastUpdated": "v1"}, "days": [{"dayNum": 1, "items": ["bad"]}]}
+        trip_stats.refresh_stats(data)
+        self.assertNotIn("statsVersion", data["meta"])
+
+
+class TestIncrementalStats(unittest.TestCase):
+    """변경 도구의 증분 갱신 테스트 (check_stats 모드)"""
+
+    CALLS = [
+        ("update_status", {"item_id": "d1_move", "status": "done"}),
+        ("update_visit", {"item_id": "d1_dinner", "option_name": "교동쌈밥"}),
+        ("add_item", {"day_num": 2, "title": "야경", "after_item_id": "d2_lunch"}),
+        ("add_option", {"item_id": "d2_cafe", "name": "스컹크웍스"}),
+        ("move_item", {"item_id": "d2_cafe", "to_day_num": 1}),
+        ("remove_item", {"item_id": "d2_lunch"}),
+        ("update_status", {"item_id": "d1_cafe", "status": "planned"}),
+    ]
+
+    def test_mutations_keep_stats_consistent(self):
+        """변경할 때마다 저장된 통계가 전체를 다시 센 값과 같아야 한다"""
+        ctx = ExecutionContext(SAMPLE_DATA, check_stats=True)
+        for name, inp in self.CALLS:
+            self.assertNotIn("error", execute_tool(ctx, name, inp), name)
+
+        self.assertEqual(trip_stats.verify_stats(ctx.data), [])
+        self.assertEqual(ctx.data["meta"]["stats"]["done"], 2)
+        self.assertNotIn("stats", SAMPLE_DATA["meta"])
+
+    def test_patch_has_no_stats(self):
+        """통계는 patch에 넣지 않고, 적용 후 refresh_stats로 맞춘다"""
+        ctx = ExecutionContext(SAMPLE_DATA)
+        for name, inp in self.CALLS:
+            execute_tool(ctx, name, inp)
+        self.assertFalse([op for op in ctx.patch + ctx.undo_patch if "stats" in op["path"]])
+
+        replayed, skipped = apply_patch(copy.deepcopy(SAMPLE_DATA), ctx.patch)
+        self.assertEqual(skipped, [])
+        trip_stats.refresh_stats(replayed, ctx.patch)
+        self.assertEqual(trip_stats.verify_stats(replayed), [])
+
+    def test_concurrent_patches(self):
+        """같은 날을 바꾼 두 patch를 차례로 적용(rebase)해도 집계가 맞아야 한다"""
+        base = trip_stats.refresh_stats(copy.deepcopy(SAMPLE_DATA))
+        patches = []
+        for item_id in ("d1_move", "d1_dinner"):
+            ctx = ExecutionContext(base)
+            execute_tool(ctx, "update_status", {"item_id": item_id, "status": "done"})
+            patches.append(ctx.patch)
+
+        data = copy.deepcopy(base)
+        for ops in patches:
+            data, _ = apply_patch(data, ops)
+            trip_stats.refresh_stats(data, ops)
+
+        self.assertEqual(trip_stats.verify_stats(data), [])
+        self.assertEqual(data["days"][0]["stats"]["done"], 2)
+        self.assertEqual(trip_stats.summarize(data)[1]["done"], 3)
+
+    def test_refresh_touched_days_only(self):
+        data = trip_stats.refresh_stats(copy.deepcopy(SAMPLE_DATA))
+        day2_stats = data["days"][1]["stats"]
+        ops = [{"op": "replace", "path": "/days/1/items/d1_move/status", "value": "skipped"}]
+        self.assertEqual(trip_stats.touched_days(ops), {"1"})
+        self.assertIsNone(trip_stats.touched_days([{"op": "replace", "path": "", "value": {}}]))
+
+        apply_patch(data, ops)
+        trip_stats.refresh_stats(data, ops)
+        self.assertIs(data["days"][1]["stats"], day2_stats)
+        self.assertEqual(data["meta"]["stats"]["skipped"], 2)
+
+    def test_summary_matches_recount(self):
+        """get_trip_summary는 저장된 통계가 있든 없든 같은 결과여야 한다"""
+        ctx = ExecutionContext(SAMPLE_DATA)
+        execute_tool(ctx, "update_status", {"item_id": "d1_move", "status": "done"})
+        stored = execute_tool(ctx, "get_trip_summary", {})
+
+        plain = copy.deepcopy(ctx.data)
+        for day in plain["days"]:
+            del day["stats"]
+        del plain["meta"]["stats"]
+        self.assertEqual(execute_tool(ExecutionContext(plain), "get_trip_summary", {}), stored)
+        self.assertEqual(stored["totals"]["done"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+"""
+web_api 모듈 테스트.
+
+aiohttp의 make_mocked_request로 핸들러를 직접 호출한다 (서버를 띄우지 않음).
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+# src/ 디렉토리를 모듈 경로에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+os.environ.setdefault("ANTHROPIC_API_KEY", "test_key")
+
+from aiohttp.test_utils import make_mocked_request
+
+import web_api
+
+
+def _stats_request(remote: str, headers=None):
+    """remote 주소에서 온 GET /stats 요청"""
+    transport = MagicMock()
+    transport.get_extra_info.return_value = (remote, 50000)
+    return make_mocked_request("GET", "/stats", headers=headers or {}, transport=transport)
+
+
+def _status(request) -> int:
+    return asyncio.run(web_api.stats_handler(request)).status
+
+
+class TestStatsAuth(unittest.TestCase):
+    """GET /stats 인증 테스트"""
+
+    def test_remote_needs_secret(self):
+        with patch.object(web_api, "CHAT_SECRET", "s3cret"):
+            self.assertEqual(_status(_stats_request("203.0.113.5")), 401)
+            self.assertEqual(_status(_stats_request("203.0.113.5", {"Authorization": "Bearer wrong"})), 401)
+            self.assertEqual(_status(_stats_request("203.0.113.5", {"Authorization": "Bearer s3cret"})), 200)
+
+    def test_without_secret_localhost_only(self):
+        """CHAT_SECRET이 없으면 외부에서는 조회할 수 없다"""
+        with patch.object(web_api, "CHAT_SECRET", ""):
+            self.assertEqual(_status(_stats_request("203.0.113.5", {"Authorization": "Bearer "})), 401)
+            self.assertEqual(_status(_stats_request("127.0.0.1")), 200)
+            self.assertEqual(_status(_stats_request("::1")), 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
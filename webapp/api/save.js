@@ -1,4 +1,10 @@
 // jsonbin.io PUT 프록시 — 관리자 모드 저장용
+//
+// If-Match 헤더에 편집을 시작할 때의 meta.lastUpdated를 담아 보내야 한다 (없으면 428).
+// 그 사이 봇/웹 챗이 저장한 경우 412와 현재 버전을 돌려주어 변경을 덮어쓰지 않는다.
+// 호출하는 쪽은 412를 받으면 최신 데이터를 다시 읽어 편집을 다시 적용한다.
+// 저장할 때 meta.lastUpdated를 새로 찍어 다른 작성자의 버전 확인과 진행 통계
+// 지문(meta.statsVersion)이 이 저장을 알아차리게 한다.
 export default async function handler(req, res) {
   if (req.method !== 'PUT') {
     return res.status(405).json({ error: 'Method not allowed' });
@@ -14,13 +20,40 @@ export default async function handler(req, res) {
   const url = `https://api.jsonbin.io/v3/b/${BIN_ID}`;
 
   try {
+    const expected = req.headers['if-match'];
+    if (!expected) {
+      return res.status(428).json({ error: 'If-Match 헤더(편집 시작 시의 meta.lastUpdated)가 필요합니다.' });
+    }
+    // 원격 버전(meta.lastUpdated)만 조회하여 편집 시작 시점과 비교
+    const check = await fetch(`${url}/latest`, {
+      headers: {
+        'X-Master-Key': API_KEY,
+        'X-JSON-Path': '$.meta.lastUpdated',
+        'X-Bin-Meta': 'false',
+      },
+    });
+    if (!check.ok) {
+      return res.status(check.status).json({ error: 'jsonbin 버전 확인 실패' });
+    }
+    const [current] = await check.json();
+    if (current !== expected) {
+      return res.status(412).json({
+        error: '다른 곳에서 먼저 저장되었습니다. 새로고침 후 다시 시도해주세요.',
+        lastUpdated: current,
+      });
+    }
+
+    const body = req.body || {};
+    const lastUpdated = new Date().toISOString();
+    body.meta = Object.assign({}, body.meta, { lastUpdated });
+
     const response = await fetch(url, {
       method: 'PUT',
       headers: {
         'Content-Type': 'application/json',
         'X-Master-Key': API_KEY,
       },
-      body: JSON.stringify(req.body),
+      body: JSON.stringify(body),
     });
 
     if (!response.ok) {
@@ -28,7 +61,7 @@ export default async function handler(req, res) {
     }
 
     const data = await response.json();
-    return res.status(200).json(data);
+    return res.status(200).json(Object.assign({ lastUpdated }, data));
   } catch (err) {
     return res.status(500).json({ error: '데이터를 저장할 수 없습니다.' });
   }